@@ -3,10 +3,11 @@
 ASR Hub 主程式入口
 
 基於 PyStoreX 事件驅動架構和無狀態服務
-支援多種通訊協定：Redis、HTTP SSE、WebSocket、Socket.IO
+支援多種通訊協定：Redis、HTTP SSE、WebSocket、gRPC、Socket.IO
 """
 
 import asyncio
+import importlib
 import sys
 import signal
 import socket
@@ -31,6 +32,7 @@ warnings.filterwarnings(
 from src.utils.logger import logger, setup_global_exception_handler
 from src.config.manager import ConfigManager
 from src.utils.id_provider import new_id
+from src.core.startup import startup
 
 # 設定專案根目錄
 PROJECT_ROOT = Path(__file__).parent
@@ -44,7 +46,10 @@ class ASRHubServer:
         self.config = ConfigManager()
         self.is_running = False
         self.redis_enabled = False
+        self.redis_streams_enabled = False
         self.http_sse_enabled = False
+        self.websocket_enabled = False
+        self.grpc_enabled = False
         self.webrtc_enabled = False
         
     def check_and_clean_ports(self):
@@ -78,6 +83,14 @@ class ASRHubServer:
                 self.config.api.websocket.host
             ))
         
+        # gRPC port
+        if hasattr(self.config.api, 'grpc') and self.config.api.grpc.enabled:
+            ports_to_check.append((
+                self.config.api.grpc.port,
+                "gRPC",
+                self.config.api.grpc.host
+            ))
+        
         # Socket.IO port
         if hasattr(self.config.api, 'socketio') and self.config.api.socketio.enabled:
             ports_to_check.append((
@@ -189,77 +202,107 @@ class ASRHubServer:
         finally:
             sock.close()
     
-    def initialize_services(self):
-        """初始化所有服務"""
-        logger.info("🔧 正在初始化服務...")
+    def initialize_services(self) -> bool:
+        """並行載入並暖機所有服務
         
-        # 統一顯示所有服務的載入狀態
-        services_loaded = []
+        彼此獨立的服務由啟動協調器（src/core/startup.py）並行載入，載入後各執行一次假推論；
+        麥克風與 DeepFilterNet 延遲到第一次使用時才載入。
         
-        # 初始化 PyStoreX Store
-        from src.store.main_store import main_store
-        services_loaded.append("✅ PyStoreX Store")
+        Returns:
+            必要服務是否在 startup.time_budget 內全部就緒
+        """
+        logger.info("🔧 正在初始化服務...")
         
-        # 初始化音訊服務
+        # Provider Pool（Whisper 模型）最慢，最先開始
+        startup.register("asr", self._load_provider_pool, warm_up=self._warm_up_provider_pool,
+                         label="Provider Pool")
+        startup.register("converter", self._load_audio_converter, label="音訊轉換服務")
+        startup.register("vad", self._load_vad, warm_up=self._warm_up_vad, label="Silero VAD")
+        startup.register("wakeword", self._load_wakeword, warm_up=self._warm_up_wakeword,
+                         label="OpenWakeWord")
+        startup.register("recording", self._load_recording, label="錄音服務")
+        startup.register("timer", self._load_timer, label="計時器服務")
+        
+        # SessionEffects 匯入時會用到上述服務，等它們載入完成再建立 Store
+        startup.register("store", self._load_store, label="PyStoreX Store",
+                         depends_on=("converter", "vad", "wakeword", "recording", "timer"))
+        
+        # 可選的子系統：第一次使用時才載入
+        startup.defer("microphone", label="麥克風擷取", enabled=self._service_enabled('microphone'))
+        startup.defer("denoiser", label="DeepFilterNet", enabled=self._service_enabled('denoiser'))
+        
+        return startup.run()
+    
+    def _service_enabled(self, name: str) -> bool:
+        """services.<name>.enabled"""
+        return bool(getattr(getattr(self.config.services, name, None), 'enabled', False))
+    
+    def _load_lazy_service(self, service, name: str) -> bool:
+        """觸發 lazy_load_service 代理的載入
+        
+        Returns:
+            False 表示配置停用（DisabledService）
+        
+        Raises:
+            RuntimeError: 服務已啟用卻載入失敗（service_loader 同樣以 DisabledService 代替）
+        """
+        if service:
+            return True
+        if self._service_enabled(name):
+            raise RuntimeError("服務載入失敗，詳見日誌")
+        return False
+    
+    # === 啟動元件：載入返回 False 表示服務停用 ===
+    
+    @staticmethod
+    def _load_provider_pool() -> bool:
+        from src.provider.provider_manager import get_provider_manager
+        # Provider Pool 負責模型載入，等待模型載入完成
+        if not get_provider_manager().warm_up(wait_for_completion=True):
+            raise RuntimeError("Whisper 模型載入逾時")
+        return True
+    
+    @staticmethod
+    def _warm_up_provider_pool():
+        from src.provider.provider_manager import get_provider_manager
+        if not get_provider_manager().warm_up_inference():
+            raise RuntimeError("無法租用 provider")
+    
+    @staticmethod
+    def _load_audio_converter() -> bool:
         from src.service.audio_converter.service import audio_converter_service
-        services_loaded.append("✅ 音訊轉換服務")
-        
-        # 初始化 VAD 服務
+        return True
+    
+    def _load_vad(self) -> bool:
         from src.service.vad import silero_vad
-        if silero_vad.__class__.__name__ != 'DisabledService':
-            services_loaded.append("✅ Silero VAD")
-        
-        # 初始化 Wakeword 服務
+        return self._load_lazy_service(silero_vad, 'vad')
+    
+    @staticmethod
+    def _warm_up_vad():
+        from src.service.vad import silero_vad
+        silero_vad.warm_up()
+    
+    def _load_wakeword(self) -> bool:
         from src.service.wakeword import openwakeword
-        if openwakeword.__class__.__name__ != 'DisabledService':
-            services_loaded.append("✅ OpenWakeWord")
-        
-        # 初始化錄音服務
+        return self._load_lazy_service(openwakeword, 'wakeword')
+    
+    @staticmethod
+    def _warm_up_wakeword():
+        from src.service.wakeword import openwakeword
+        openwakeword.warm_up()
+    
+    def _load_recording(self) -> bool:
         from src.service.recording import recording
-        if recording.__class__.__name__ != 'DisabledService':
-            services_loaded.append("✅ 錄音服務")
-        
-        # 初始化麥克風服務
-        from src.service.microphone_capture import microphone_capture
-        if microphone_capture.__class__.__name__ != 'DisabledService':
-            # 確保服務在啟動時就被初始化（而不是延遲到停止時）
-            # 呼叫一個安全的方法來觸發實際載入
-            if hasattr(microphone_capture, 'is_capturing'):
-                microphone_capture.is_capturing()  # 這會觸發延遲載入
-            services_loaded.append("✅ 麥克風擷取")
-        
-        # 初始化計時器服務
+        return self._load_lazy_service(recording, 'recording')
+    
+    def _load_timer(self) -> bool:
         from src.service.timer import timer_service
-        if timer_service.__class__.__name__ != 'DisabledService':
-            services_loaded.append("✅ 計時器服務")
-        
-        # 初始化 Provider Pool（延遲載入模式）
-        from src.provider.provider_manager import get_provider_manager
-        provider_manager = get_provider_manager()
-        services_loaded.append("✅ Provider Pool")
-        
-        # 統一顯示所有已載入服務
-        # 使用 block 顯示已載入服務
-        logger.block("服務初始化完成", services_loaded)
+        return self._load_lazy_service(timer_service, 'timer')
     
-    async def initialize_and_warm_up_providers(self):
-        """初始化並 warm up provider pool"""
-        try:
-            logger.info("🔥 開始 Provider Pool warm up...")
-            
-            from src.provider.provider_manager import get_provider_manager
-            provider_manager = get_provider_manager()
-            
-            # Provider Pool 負責模型載入，支援等待模式
-            await self._run_in_thread(
-                lambda: provider_manager.warm_up(wait_for_completion=True)
-            )
-            
-            logger.success("✅ Provider Pool warm up 完成")
-            
-        except Exception as e:
-            logger.warning(f"⚠️ Provider warm up 失敗: {e}")
-            logger.info("   首次 ASR 請求會觸發模型載入")
+    @staticmethod
+    def _load_store() -> bool:
+        from src.store.main_store import main_store
+        return True
     
     async def _run_in_thread(self, func):
         """在執行緒中執行同步函數"""
@@ -286,6 +329,19 @@ class ASRHubServer:
         else:
             api_servers.append("⏭️  Redis Pub/Sub 已停用")
         
+        # Redis Streams (多節點水平擴展)
+        redis_streams = getattr(getattr(self.config.api, 'redis', None), 'streams', None)
+        if redis_streams and redis_streams.enabled:
+            try:
+                from src.api.redis.streams import initialize as init_redis_streams
+                if init_redis_streams():
+                    self.redis_streams_enabled = True
+                    api_servers.append(f"✅ Redis Streams ({self.config.api.redis.host}:{self.config.api.redis.port})")
+                else:
+                    api_servers.append("❌ Redis Streams 初始化失敗")
+            except Exception as e:
+                api_servers.append(f"❌ Redis Streams 初始化失敗: {e}")
+        
         # HTTP SSE
         if hasattr(self.config.api, 'http_sse') and self.config.api.http_sse.enabled:
             try:
@@ -323,12 +379,78 @@ class ASRHubServer:
         else:
             api_servers.append("⏭️  HTTP SSE 已停用")
         
-        # WebSocket (未來實作)
+        # WebSocket (二進位音訊串流)
         if hasattr(self.config.api, 'websocket') and self.config.api.websocket.enabled:
-            api_servers.append(f"⏸️  WebSocket 伺服器待實作 (port: {self.config.api.websocket.port})")
+            try:
+                import threading
+                import asyncio
+                
+                def run_websocket_server():
+                    """在獨立執行緒中運行 WebSocket 伺服器"""
+                    from src.api.websocket.server import websocket_server
+                    
+                    # 創建新的事件循環
+                    loop = asyncio.new_event_loop()
+                    asyncio.set_event_loop(loop)
+                    
+                    # 初始化並啟動伺服器
+                    loop.run_until_complete(websocket_server.initialize())
+                    loop.run_until_complete(websocket_server.start())
+                
+                websocket_thread = threading.Thread(
+                    target=run_websocket_server,
+                    daemon=True,
+                    name="WebSocketServer"
+                )
+                websocket_thread.start()
+                
+                # 等待伺服器啟動
+                import time
+                time.sleep(1)
+                
+                self.websocket_enabled = True
+                api_servers.append(f"✅ WebSocket 伺服器 (ws://{self.config.api.websocket.host}:{self.config.api.websocket.port})")
+            except Exception as e:
+                api_servers.append(f"❌ WebSocket 初始化失敗: {e}")
         else:
             api_servers.append("⏭️  WebSocket 已停用")
         
+        # gRPC (雙向串流)
+        if hasattr(self.config.api, 'grpc') and self.config.api.grpc.enabled:
+            try:
+                import threading
+                import asyncio
+                
+                def run_grpc_server():
+                    """在獨立執行緒中運行 gRPC 伺服器"""
+                    from src.api.grpc.server import grpc_server
+                    
+                    # 創建新的事件循環
+                    loop = asyncio.new_event_loop()
+                    asyncio.set_event_loop(loop)
+                    
+                    # 初始化並啟動伺服器
+                    loop.run_until_complete(grpc_server.initialize())
+                    loop.run_until_complete(grpc_server.start())
+                
+                grpc_thread = threading.Thread(
+                    target=run_grpc_server,
+                    daemon=True,
+                    name="GRPCServer"
+                )
+                grpc_thread.start()
+                
+                # 等待伺服器啟動
+                import time
+                time.sleep(1)
+                
+                self.grpc_enabled = True
+                api_servers.append(f"✅ gRPC 伺服器 ({self.config.api.grpc.host}:{self.config.api.grpc.port})")
+            except Exception as e:
+                api_servers.append(f"❌ gRPC 初始化失敗: {e}")
+        else:
+            api_servers.append("⏭️  gRPC 已停用")
+        
         # Socket.IO (未來實作)
         if hasattr(self.config.api, 'socketio') and self.config.api.socketio.enabled:
             api_servers.append(f"⏸️  Socket.IO 伺服器待實作 (port: {self.config.api.socketio.port})")
@@ -387,11 +509,8 @@ class ASRHubServer:
         # 檢查並清理被占用的 ports
         self.check_and_clean_ports()
         
-        # 初始化服務
-        self.initialize_services()
-        
-        # Provider Pool 負責模型預載
-        await self.initialize_and_warm_up_providers()
+        # 並行載入並暖機服務（超出時間預算時未完成的服務在背景繼續載入，/health/ready 回應 503）
+        await self._run_in_thread(self.initialize_services)
         
         # 初始化 API 伺服器
         self.initialize_api_servers()
@@ -404,6 +523,10 @@ class ASRHubServer:
             enabled_services.append(f"📡 Redis: {self.config.api.redis.host}:{self.config.api.redis.port}")
         if self.http_sse_enabled:
             enabled_services.append(f"🌐 HTTP SSE: http://{self.config.api.http_sse.host}:{self.config.api.http_sse.port}")
+        if self.websocket_enabled:
+            enabled_services.append(f"🔌 WebSocket: ws://{self.config.api.websocket.host}:{self.config.api.websocket.port}")
+        if self.grpc_enabled:
+            enabled_services.append(f"📶 gRPC: {self.config.api.grpc.host}:{self.config.api.grpc.port}")
         if self.webrtc_enabled:
             enabled_services.append(f"🎥 WebRTC: http://{self.config.api.webrtc.host}:{self.config.api.webrtc.port}")
 
@@ -424,12 +547,27 @@ class ASRHubServer:
         logger.info("🛑 正在停止 ASR Hub...")
         self.is_running = False
         
+        # 先停止 API 伺服器：不再接收新的音訊，Redis Streams 移除節點心跳讓其他節點立即接手
+        api_servers = [
+            (self.redis_streams_enabled, 'src.api.redis.streams', "Redis Streams"),
+            (self.redis_enabled, 'src.api.redis.server', "Redis Pub/Sub"),
+            (self.websocket_enabled, 'src.api.websocket.server', "WebSocket"),
+            (self.grpc_enabled, 'src.api.grpc.server', "gRPC"),
+        ]
+        for enabled, module_name, name in api_servers:
+            if not enabled:
+                continue
+            try:
+                importlib.import_module(module_name).stop()
+            except Exception as e:
+                logger.error(f"停止 {name} 伺服器時發生錯誤: {e}")
+        
         # 停止各個服務
         try:
-            # 停止麥克風擷取
-            from src.service.microphone_capture import microphone_capture
-            if hasattr(microphone_capture, 'stop_capture'):
-                microphone_capture.stop_capture()
+            # 停止麥克風擷取（延遲載入，沒有使用過就不匯入）
+            microphone_module = sys.modules.get('src.service.microphone_capture.microphone_capture')
+            if microphone_module is not None:
+                microphone_module.microphone_capture.stop_capture()
             
             # 停止 Provider Pool
             from src.provider.provider_manager import get_provider_manager
@@ -437,6 +575,8 @@ class ASRHubServer:
             if hasattr(provider_manager, 'shutdown'):
                 provider_manager.shutdown()
             
+            startup.shutdown()
+            
             logger.success("✅ ASR Hub 已安全停止")
         except Exception as e:
             logger.error(f"停止服務時發生錯誤: {e}")
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: src/api/grpc/proto/asr_hub.proto
+# Protobuf Python Version: 5.27.2
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    5,
+    27,
+    2,
+    '',
+    'src/api/grpc/proto/asr_hub.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n src/api/grpc/proto/asr_hub.proto\x12\tasrhub.v1\"\x93\x01\n\x19StreamingRecognizeRequest\x12,\n\x06\x63onfig\x18\x01 \x01(\x0b\x32\x1a.asrhub.v1.StreamingConfigH\x00\x12\x0f\n\x05\x61udio\x18\x02 \x01(\x0cH\x00\x12,\n\x07\x63ontrol\x18\x03 \x01(\x0b\x32\x19.asrhub.v1.ControlCommandH\x00\x42\t\n\x07request\"\x82\x01\n\x0fStreamingConfig\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x12\n\nrequest_id\x18\x02 \x01(\t\x12\x10\n\x08strategy\x18\x03 \x01(\t\x12\x13\n\x0bsample_rate\x18\x04 \x01(\x05\x12\x10\n\x08\x63hannels\x18\x05 \x01(\x05\x12\x0e\n\x06\x66ormat\x18\x06 \x01(\t\"\x94\x01\n\x0e\x43ontrolCommand\x12,\n\x04type\x18\x01 \x01(\x0e\x32\x1e.asrhub.v1.ControlCommand.Type\x12\x0e\n\x06source\x18\x02 \x01(\t\"D\n\x04Type\x12\x14\n\x10TYPE_UNSPECIFIED\x10\x00\x12\x11\n\rWAKE_ACTIVATE\x10\x01\x12\x13\n\x0fWAKE_DEACTIVATE\x10\x02\"\xd5\x03\n\x1aStreamingRecognizeResponse\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x11\n\ttimestamp\x18\x02 \x01(\x01\x12\x30\n\rsession_ready\x18\n \x01(\x0b\x32\x17.asrhub.v1.SessionReadyH\x00\x12$\n\x04wake\x18\x0b \x01(\x0b\x32\x14.asrhub.v1.WakeEventH\x00\x12\"\n\x03vad\x18\x0c \x01(\x0b\x32\x13.asrhub.v1.VadEventH\x00\x12/\n\x07partial\x18\r \x01(\x0b\x32\x1c.asrhub.v1.TranscriptPartialH\x00\x12+\n\x05\x66inal\x18\x0e \x01(\x0b\x32\x1a.asrhub.v1.TranscriptFinalH\x00\x12)\n\x04\x64one\x18\x0f \x01(\x0b\x32\x19.asrhub.v1.TranscribeDoneH\x00\x12.\n\x08\x66\x65\x65\x64\x62\x61\x63k\x18\x10 \x01(\x0b\x32\x1a.asrhub.v1.FeedbackCommandH\x00\x12/\n\x0c\x62\x61\x63kpressure\x18\x11 \x01(\x0b\x32\x17.asrhub.v1.BackpressureH\x00\x12!\n\x05\x65rror\x18\x12 \x01(\x0b\x32\x10.asrhub.v1.ErrorH\x00\x42\x07\n\x05\x65vent\"Y\n\x0cSessionReady\x12\x12\n\nrequest_id\x18\x01 \x01(\t\x12\x13\n\x0bsample_rate\x18\x02 \x01(\x05\x12\x10\n\x08\x63hannels\x18\x03 \x01(\x05\x12\x0e\n\x06\x66ormat\x18\x04 \x01(\t\".\n\tWakeEvent\x12\x11\n\tactivated\x18\x01 \x01(\x08\x12\x0e\n\x06source\x18\x02 \x01(\t\"\x1a\n\x08VadEvent\x12\x0e\n\x06speech\x18\x01 \x01(\x08\"G\n\x11TranscriptPartial\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x11\n\tcommitted\x18\x02 \x01(\t\x12\x11\n\ttentative\x18\x03 \x01(\t\"W\n\x0fTranscriptFinal\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x12\n\nstart_time\x18\x02 \x01(\x01\x12\x10\n\x08\x65nd_time\x18\x03 \x01(\x01\x12\x10\n\x08\x64uration\x18\x04 \x01(\x01\"B\n\x0eTranscribeDone\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x10\n\x08language\x18\x02 \x01(\t\x12\x10\n\x08\x64uration\x18\x03 \x01(\x01\"\"\n\x0f\x46\x65\x65\x64\x62\x61\x63kCommand\x12\x0f\n\x07\x63ommand\x18\x01 \x01(\t\"8\n\x0c\x42\x61\x63kpressure\x12\x13\n\x0bqueue_depth\x18\x01 \x01(\x05\x12\x13\n\x0bretry_after\x18\x02 \x01(\x01\"2\n\x05\x45rror\x12\x12\n\nerror_code\x18\x01 \x01(\t\x12\x15\n\rerror_message\x18\x02 \x01(\t2o\n\x06\x41SRHub\x12\x65\n\x12StreamingRecognize\x12$.asrhub.v1.StreamingRecognizeRequest\x1a%.asrhub.v1.StreamingRecognizeResponse(\x01\x30\x01\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'src.api.grpc.proto.asr_hub_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_STREAMINGRECOGNIZEREQUEST']._serialized_start=48
+  _globals['_STREAMINGRECOGNIZEREQUEST']._serialized_end=195
+  _globals['_STREAMINGCONFIG']._serialized_start=198
+  _globals['_STREAMINGCONFIG']._serialized_end=328
+  _globals['_CONTROLCOMMAND']._serialized_start=331
+  _globals['_CONTROLCOMMAND']._serialized_end=479
+  _globals['_CONTROLCOMMAND_TYPE']._serialized_start=411
+  _globals['_CONTROLCOMMAND_TYPE']._serialized_end=479
+  _globals['_STREAMINGRECOGNIZERESPONSE']._serialized_start=482
+  _globals['_STREAMINGRECOGNIZERESPONSE']._serialized_end=951
+  _globals['_SESSIONREADY']._serialized_start=953
+  _globals['_SESSIONREADY']._serialized_end=1042
+  _globals['_WAKEEVENT']._serialized_start=1044
+  _globals['_WAKEEVENT']._serialized_end=1090
+  _globals['_VADEVENT']._serialized_start=1092
+  _globals['_VADEVENT']._serialized_end=1118
+  _globals['_TRANSCRIPTPARTIAL']._serialized_start=1120
+  _globals['_TRANSCRIPTPARTIAL']._serialized_end=1191
+  _globals['_TRANSCRIPTFINAL']._serialized_start=1193
+  _globals['_TRANSCRIPTFINAL']._serialized_end=1280
+  _globals['_TRANSCRIBEDONE']._serialized_start=1282
+  _globals['_TRANSCRIBEDONE']._serialized_end=1348
+  _globals['_FEEDBACKCOMMAND']._serialized_start=1350
+  _globals['_FEEDBACKCOMMAND']._serialized_end=1384
+  _globals['_BACKPRESSURE']._serialized_start=1386
+  _globals['_BACKPRESSURE']._serialized_end=1442
+  _globals['_ERROR']._serialized_start=1444
+  _globals['_ERROR']._serialized_end=1494
+  _globals['_ASRHUB']._serialized_start=1496
+  _globals['_ASRHUB']._serialized_end=1607
+# @@protoc_insertion_point(module_scope)
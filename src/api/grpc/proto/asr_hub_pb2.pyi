@@ -0,0 +1,154 @@
+from google.protobuf.internal import enum_type_wrapper as _enum_type_wrapper
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Mapping as _Mapping, Optional as _Optional, Union as _Union
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class StreamingRecognizeRequest(_message.Message):
+    __slots__ = ("config", "audio", "control")
+    CONFIG_FIELD_NUMBER: _ClassVar[int]
+    AUDIO_FIELD_NUMBER: _ClassVar[int]
+    CONTROL_FIELD_NUMBER: _ClassVar[int]
+    config: StreamingConfig
+    audio: bytes
+    control: ControlCommand
+    def __init__(self, config: _Optional[_Union[StreamingConfig, _Mapping]] = ..., audio: _Optional[bytes] = ..., control: _Optional[_Union[ControlCommand, _Mapping]] = ...) -> None: ...
+
+class StreamingConfig(_message.Message):
+    __slots__ = ("session_id", "request_id", "strategy", "sample_rate", "channels", "format")
+    SESSION_ID_FIELD_NUMBER: _ClassVar[int]
+    REQUEST_ID_FIELD_NUMBER: _ClassVar[int]
+    STRATEGY_FIELD_NUMBER: _ClassVar[int]
+    SAMPLE_RATE_FIELD_NUMBER: _ClassVar[int]
+    CHANNELS_FIELD_NUMBER: _ClassVar[int]
+    FORMAT_FIELD_NUMBER: _ClassVar[int]
+    session_id: str
+    request_id: str
+    strategy: str
+    sample_rate: int
+    channels: int
+    format: str
+    def __init__(self, session_id: _Optional[str] = ..., request_id: _Optional[str] = ..., strategy: _Optional[str] = ..., sample_rate: _Optional[int] = ..., channels: _Optional[int] = ..., format: _Optional[str] = ...) -> None: ...
+
+class ControlCommand(_message.Message):
+    __slots__ = ("type", "source")
+    class Type(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+        __slots__ = ()
+        TYPE_UNSPECIFIED: _ClassVar[ControlCommand.Type]
+        WAKE_ACTIVATE: _ClassVar[ControlCommand.Type]
+        WAKE_DEACTIVATE: _ClassVar[ControlCommand.Type]
+    TYPE_UNSPECIFIED: ControlCommand.Type
+    WAKE_ACTIVATE: ControlCommand.Type
+    WAKE_DEACTIVATE: ControlCommand.Type
+    TYPE_FIELD_NUMBER: _ClassVar[int]
+    SOURCE_FIELD_NUMBER: _ClassVar[int]
+    type: ControlCommand.Type
+    source: str
+    def __init__(self, type: _Optional[_Union[ControlCommand.Type, str]] = ..., source: _Optional[str] = ...) -> None: ...
+
+class StreamingRecognizeResponse(_message.Message):
+    __slots__ = ("session_id", "timestamp", "session_ready", "wake", "vad", "partial", "final", "done", "feedback", "backpressure", "error")
+    SESSION_ID_FIELD_NUMBER: _ClassVar[int]
+    TIMESTAMP_FIELD_NUMBER: _ClassVar[int]
+    SESSION_READY_FIELD_NUMBER: _ClassVar[int]
+    WAKE_FIELD_NUMBER: _ClassVar[int]
+    VAD_FIELD_NUMBER: _ClassVar[int]
+    PARTIAL_FIELD_NUMBER: _ClassVar[int]
+    FINAL_FIELD_NUMBER: _ClassVar[int]
+    DONE_FIELD_NUMBER: _ClassVar[int]
+    FEEDBACK_FIELD_NUMBER: _ClassVar[int]
+    BACKPRESSURE_FIELD_NUMBER: _ClassVar[int]
+    ERROR_FIELD_NUMBER: _ClassVar[int]
+    session_id: str
+    timestamp: float
+    session_ready: SessionReady
+    wake: WakeEvent
+    vad: VadEvent
+    partial: TranscriptPartial
+    final: TranscriptFinal
+    done: TranscribeDone
+    feedback: FeedbackCommand
+    backpressure: Backpressure
+    error: Error
+    def __init__(self, session_id: _Optional[str] = ..., timestamp: _Optional[float] = ..., session_ready: _Optional[_Union[SessionReady, _Mapping]] = ..., wake: _Optional[_Union[WakeEvent, _Mapping]] = ..., vad: _Optional[_Union[VadEvent, _Mapping]] = ..., partial: _Optional[_Union[TranscriptPartial, _Mapping]] = ..., final: _Optional[_Union[TranscriptFinal, _Mapping]] = ..., done: _Optional[_Union[TranscribeDone, _Mapping]] = ..., feedback: _Optional[_Union[FeedbackCommand, _Mapping]] = ..., backpressure: _Optional[_Union[Backpressure, _Mapping]] = ..., error: _Optional[_Union[Error, _Mapping]] = ...) -> None: ...
+
+class SessionReady(_message.Message):
+    __slots__ = ("request_id", "sample_rate", "channels", "format")
+    REQUEST_ID_FIELD_NUMBER: _ClassVar[int]
+    SAMPLE_RATE_FIELD_NUMBER: _ClassVar[int]
+    CHANNELS_FIELD_NUMBER: _ClassVar[int]
+    FORMAT_FIELD_NUMBER: _ClassVar[int]
+    request_id: str
+    sample_rate: int
+    channels: int
+    format: str
+    def __init__(self, request_id: _Optional[str] = ..., sample_rate: _Optional[int] = ..., channels: _Optional[int] = ..., format: _Optional[str] = ...) -> None: ...
+
+class WakeEvent(_message.Message):
+    __slots__ = ("activated", "source")
+    ACTIVATED_FIELD_NUMBER: _ClassVar[int]
+    SOURCE_FIELD_NUMBER: _ClassVar[int]
+    activated: bool
+    source: str
+    def __init__(self, activated: bool = ..., source: _Optional[str] = ...) -> None: ...
+
+class VadEvent(_message.Message):
+    __slots__ = ("speech",)
+    SPEECH_FIELD_NUMBER: _ClassVar[int]
+    speech: bool
+    def __init__(self, speech: bool = ...) -> None: ...
+
+class TranscriptPartial(_message.Message):
+    __slots__ = ("text", "committed", "tentative")
+    TEXT_FIELD_NUMBER: _ClassVar[int]
+    COMMITTED_FIELD_NUMBER: _ClassVar[int]
+    TENTATIVE_FIELD_NUMBER: _ClassVar[int]
+    text: str
+    committed: str
+    tentative: str
+    def __init__(self, text: _Optional[str] = ..., committed: _Optional[str] = ..., tentative: _Optional[str] = ...) -> None: ...
+
+class TranscriptFinal(_message.Message):
+    __slots__ = ("text", "start_time", "end_time", "duration")
+    TEXT_FIELD_NUMBER: _ClassVar[int]
+    START_TIME_FIELD_NUMBER: _ClassVar[int]
+    END_TIME_FIELD_NUMBER: _ClassVar[int]
+    DURATION_FIELD_NUMBER: _ClassVar[int]
+    text: str
+    start_time: float
+    end_time: float
+    duration: float
+    def __init__(self, text: _Optional[str] = ..., start_time: _Optional[float] = ..., end_time: _Optional[float] = ..., duration: _Optional[float] = ...) -> None: ...
+
+class TranscribeDone(_message.Message):
+    __slots__ = ("text", "language", "duration")
+    TEXT_FIELD_NUMBER: _ClassVar[int]
+    LANGUAGE_FIELD_NUMBER: _ClassVar[int]
+    DURATION_FIELD_NUMBER: _ClassVar[int]
+    text: str
+    language: str
+    duration: float
+    def __init__(self, text: _Optional[str] = ..., language: _Optional[str] = ..., duration: _Optional[float] = ...) -> None: ...
+
+class FeedbackCommand(_message.Message):
+    __slots__ = ("command",)
+    COMMAND_FIELD_NUMBER: _ClassVar[int]
+    command: str
+    def __init__(self, command: _Optional[str] = ...) -> None: ...
+
+class Backpressure(_message.Message):
+    __slots__ = ("queue_depth", "retry_after")
+    QUEUE_DEPTH_FIELD_NUMBER: _ClassVar[int]
+    RETRY_AFTER_FIELD_NUMBER: _ClassVar[int]
+    queue_depth: int
+    retry_after: float
+    def __init__(self, queue_depth: _Optional[int] = ..., retry_after: _Optional[float] = ...) -> None: ...
+
+class Error(_message.Message):
+    __slots__ = ("error_code", "error_message")
+    ERROR_CODE_FIELD_NUMBER: _ClassVar[int]
+    ERROR_MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    error_code: str
+    error_message: str
+    def __init__(self, error_code: _Optional[str] = ..., error_message: _Optional[str] = ...) -> None: ...
@@ -0,0 +1,99 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from src.api.grpc.proto import asr_hub_pb2 as src_dot_api_dot_grpc_dot_proto_dot_asr__hub__pb2
+
+GRPC_GENERATED_VERSION = '1.66.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + f' but the generated code in src/api/grpc/proto/asr_hub_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class ASRHubStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.StreamingRecognize = channel.stream_stream(
+                '/asrhub.v1.ASRHub/StreamingRecognize',
+                request_serializer=src_dot_api_dot_grpc_dot_proto_dot_asr__hub__pb2.StreamingRecognizeRequest.SerializeToString,
+                response_deserializer=src_dot_api_dot_grpc_dot_proto_dot_asr__hub__pb2.StreamingRecognizeResponse.FromString,
+                _registered_method=True)
+
+
+class ASRHubServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def StreamingRecognize(self, request_iterator, context):
+        """第一個請求必須是 config，之後是 audio 或 control；
+        回應依序包含 session_ready 與 session 的喚醒、VAD、轉譯與回饋音事件。
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_ASRHubServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'StreamingRecognize': grpc.stream_stream_rpc_method_handler(
+                    servicer.StreamingRecognize,
+                    request_deserializer=src_dot_api_dot_grpc_dot_proto_dot_asr__hub__pb2.StreamingRecognizeRequest.FromString,
+                    response_serializer=src_dot_api_dot_grpc_dot_proto_dot_asr__hub__pb2.StreamingRecognizeResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'asrhub.v1.ASRHub', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('asrhub.v1.ASRHub', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class ASRHub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def StreamingRecognize(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/asrhub.v1.ASRHub/StreamingRecognize',
+            src_dot_api_dot_grpc_dot_proto_dot_asr__hub__pb2.StreamingRecognizeRequest.SerializeToString,
+            src_dot_api_dot_grpc_dot_proto_dot_asr__hub__pb2.StreamingRecognizeResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
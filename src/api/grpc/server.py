@@ -0,0 +1,462 @@
+"""
+gRPC 伺服器實現
+
+雙向串流 StreamingRecognize：音訊進、事件出（定義見 proto/asr_hub.proto）。
+一個 RPC 對應一個 session，經由 HTTP/2 多工，多個串流可以共用同一條連線。
+
+支援的流程與 HTTP SSE / Redis 相同，對應到相同的 SessionEffects action：
+1. config - create_session（或接續既有 session）+ start_listening
+2. audio - 送進 ingest worker pool（與 HTTP SSE 相同的資料平面）
+3. control - wake_activated / wake_deactivated
+
+session 的喚醒、VAD、串流轉譯、轉譯完成與回饋音事件從同一個串流推回。
+客戶端結束送出（half-close）後，伺服器最多再等待 drain_timeout 秒的轉譯結果（done）才結束 RPC，
+串流轉譯的 final 之後仍會等到 done 與回饋音停止事件。
+"""
+
+import asyncio
+import time
+from typing import Optional, Dict, Any, AsyncIterator
+
+import grpc
+import uuid6
+
+from src.api.grpc.proto import asr_hub_pb2 as pb
+from src.api.grpc.proto import asr_hub_pb2_grpc as pb_grpc
+
+from src.store.main_store import store
+from src.store.sessions.sessions_action import (
+    create_session,
+    delete_session,
+    start_listening,
+    wake_activated,
+    wake_deactivated,
+    vad_speech_detected,
+    vad_silence_detected,
+    transcribe_done,
+    transcribe_partial,
+    transcribe_final,
+    play_asr_feedback,
+)
+from src.store.sessions.sessions_selector import (
+    get_session_by_id,
+    get_all_sessions,
+    get_session_last_transcription,
+)
+from src.core.ingest_workers import ingest_workers
+from src.core.metrics import metrics
+from src.interface.exceptions import IngestBackpressureError, SessionManagementError
+from src.config.manager import ConfigManager
+from src.utils.logger import logger
+
+
+# 讀取端結束（客戶端 half-close 或讀取失敗）的標記
+_END_OF_INPUT = object()
+
+# 輸入結束後收到 done / error 時，再等待緊接著的事件（play_asr_feedback "stop"）的秒數
+_TRAILING_EVENT_GRACE = 0.5
+
+
+class _GRPCStream:
+    """一個 StreamingRecognize 呼叫（對應一個 session）"""
+
+    __slots__ = ('session_id', 'owns_session', 'outbound', 'loop', 'chunks', 'bytes', 'backpressure_events')
+
+    def __init__(self, session_id: str, owns_session: bool, loop: asyncio.AbstractEventLoop):
+        self.session_id = session_id
+        self.owns_session = owns_session    # session 由這個串流建立，結束時刪除
+        self.outbound: asyncio.Queue = asyncio.Queue()
+        self.loop = loop
+
+        # 統計
+        self.chunks = 0
+        self.bytes = 0
+        self.backpressure_events = 0
+
+    def send(self, response: pb.StreamingRecognizeResponse) -> None:
+        """從任意執行緒排入一個回應"""
+        self.loop.call_soon_threadsafe(self.outbound.put_nowait, response)
+
+
+class ASRHubServicer(pb_grpc.ASRHubServicer):
+    """StreamingRecognize 實作"""
+
+    def __init__(self, server: "GRPCServer"):
+        self.server = server
+
+    async def StreamingRecognize(
+        self,
+        request_iterator: AsyncIterator[pb.StreamingRecognizeRequest],
+        context: grpc.aio.ServicerContext
+    ) -> AsyncIterator[pb.StreamingRecognizeResponse]:
+        stream = await self.server._negotiate(request_iterator, context)
+        if stream is None:
+            return
+
+        session_id = stream.session_id
+        reader = asyncio.create_task(self.server._read_requests(stream, request_iterator))
+        drain_deadline: Optional[float] = None
+        finished = False
+
+        try:
+            while True:
+                if drain_deadline is None:
+                    item = await stream.outbound.get()
+                else:
+                    remaining = drain_deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(stream.outbound.get(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        break
+
+                if item is _END_OF_INPUT:
+                    timeout = _TRAILING_EVENT_GRACE if finished else self.server.drain_timeout
+                    drain_deadline = time.monotonic() + timeout
+                    continue
+
+                yield item
+
+                # 串流轉譯依序送出 final → done → feedback stop，final 之後還不能結束
+                event = item.WhichOneof("event")
+                if event in ("done", "error"):
+                    finished = True
+                if drain_deadline is None or not finished:
+                    continue
+                # 輸入已結束且轉譯已完成：送出回饋音停止後結束，最多再等 _TRAILING_EVENT_GRACE 秒
+                if event == "feedback" and item.feedback.command == "stop":
+                    break
+                drain_deadline = min(drain_deadline, time.monotonic() + _TRAILING_EVENT_GRACE)
+
+        finally:
+            reader.cancel()
+            self.server.streams.pop(session_id, None)
+            if stream.owns_session:
+                store.dispatch(delete_session(session_id))
+            logger.info(f"🔌 gRPC 串流結束 [{session_id}]: {stream.chunks} chunks, {stream.bytes} bytes")
+
+
+class GRPCServer:
+    """gRPC 伺服器"""
+
+    def __init__(self):
+        """初始化 gRPC 伺服器"""
+        self.config_manager = ConfigManager()
+        self.grpc_config = getattr(self.config_manager.api, 'grpc', None)
+
+        if not self.grpc_config or not self.grpc_config.enabled:
+            logger.info("gRPC 服務已停用")
+            return
+
+        self.host = getattr(self.grpc_config, 'host', '127.0.0.1')
+        self.port = int(getattr(self.grpc_config, 'port', 50051))
+        self.max_message_size = int(getattr(self.grpc_config, 'max_message_size', 4 * 1024 * 1024))
+        self.drain_timeout = float(getattr(self.grpc_config, 'drain_timeout', 10.0))
+
+        # 串流管理
+        self.streams: Dict[str, _GRPCStream] = {}  # session_id -> 串流
+
+        # Store 訂閱
+        self.store_subscription = None
+
+        # 系統狀態
+        self.server: Optional[grpc.aio.Server] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.is_running = False
+
+    # === 串流處理 ===
+
+    async def _negotiate(
+        self,
+        request_iterator: AsyncIterator[pb.StreamingRecognizeRequest],
+        context: grpc.aio.ServicerContext
+    ) -> Optional[_GRPCStream]:
+        """讀取第一個請求（config），建立（或接續）session 並設定音訊參數"""
+        try:
+            first = await request_iterator.__anext__()
+        except StopAsyncIteration:
+            return None
+
+        if first.WhichOneof("request") != "config":
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "first request must be config")
+
+        config = first.config
+        request_id = config.request_id or str(uuid6.uuid7())
+        sample_rate = config.sample_rate or 16000
+        channels = config.channels or 1
+        audio_format = config.format or "pcm_s16le"
+        owns_session = not config.session_id
+
+        if owns_session:
+            store.dispatch(create_session(strategy=config.strategy or "non_streaming", request_id=request_id))
+            session_id = self._find_session_by_request_id(request_id)
+        else:
+            session_id = config.session_id
+
+        if not session_id or not get_session_by_id(session_id)(store.state):
+            await context.abort(grpc.StatusCode.NOT_FOUND, f"Session {session_id} not found")
+
+        stream = _GRPCStream(session_id, owns_session, asyncio.get_running_loop())
+        self.streams[session_id] = stream
+        metrics.bind_session(session_id, "grpc")
+
+        # 只設定一次音訊參數，之後的 audio 都依此解讀
+        store.dispatch(start_listening(
+            session_id=session_id,
+            sample_rate=sample_rate,
+            channels=channels,
+            format=audio_format
+        ))
+
+        stream.send(self._response(session_id, session_ready=pb.SessionReady(
+            request_id=request_id,
+            sample_rate=sample_rate,
+            channels=channels,
+            format=audio_format
+        )))
+
+        logger.info(f"✅ gRPC 串流就緒 [{session_id}]: {sample_rate}Hz, {channels}ch, {audio_format}")
+        return stream
+
+    @staticmethod
+    def _find_session_by_request_id(request_id: str) -> Optional[str]:
+        """取得 reducer 為這個 request_id 建立的 session_id"""
+        for session_id, session in get_all_sessions(store.state).items():
+            if hasattr(session, 'get') and session.get('request_id') == request_id:
+                return session_id
+
+        # Fallback: 從 SessionEffects 獲取
+        from src.store.sessions.sessions_effect import SessionEffects
+        return SessionEffects.get_session_id_by_request_id(request_id)
+
+    async def _read_requests(
+        self,
+        stream: _GRPCStream,
+        request_iterator: AsyncIterator[pb.StreamingRecognizeRequest]
+    ) -> None:
+        """讀取 audio / control 請求，直到客戶端結束送出"""
+        session_id = stream.session_id
+        try:
+            async for request in request_iterator:
+                kind = request.WhichOneof("request")
+
+                if kind == "audio":
+                    if not await self._submit_audio(stream, request.audio):
+                        return
+
+                elif kind == "control":
+                    control = request.control
+                    if control.type == pb.ControlCommand.WAKE_ACTIVATE:
+                        store.dispatch(wake_activated(session_id=session_id, source=control.source or "ui"))
+                    elif control.type == pb.ControlCommand.WAKE_DEACTIVATE:
+                        store.dispatch(wake_deactivated(session_id=session_id, source=control.source or "ui"))
+
+                else:
+                    stream.send(self._error(session_id, "PROTOCOL_ERROR", f"Unexpected request: {kind}"))
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"gRPC 讀取失敗 [{session_id}]: {e}")
+        finally:
+            stream.outbound.put_nowait(_END_OF_INPUT)
+
+    async def _submit_audio(self, stream: _GRPCStream, audio_bytes: bytes) -> bool:
+        """把音訊送進 ingest worker pool；佇列已滿時暫停讀取（HTTP/2 流量控制讓客戶端降速）
+
+        Returns:
+            False 表示 session 已不存在
+        """
+        session_id = stream.session_id
+        notified = False
+        while True:
+            try:
+                ingest_workers.submit(session_id, audio_bytes)
+                break
+            except IngestBackpressureError as e:
+                if not notified:
+                    notified = True
+                    stream.backpressure_events += 1
+                    stream.send(self._response(session_id, backpressure=pb.Backpressure(
+                        queue_depth=e.queue_depth,
+                        retry_after=e.retry_after
+                    )))
+                await asyncio.sleep(e.retry_after)
+            except SessionManagementError as e:
+                stream.send(self._error(session_id, "SESSION_NOT_FOUND", str(e)))
+                return False
+
+        stream.chunks += 1
+        stream.bytes += len(audio_bytes)
+        return True
+
+    # === 回應 ===
+
+    @staticmethod
+    def _response(session_id: str, **event) -> pb.StreamingRecognizeResponse:
+        return pb.StreamingRecognizeResponse(session_id=session_id, timestamp=time.time(), **event)
+
+    def _error(self, session_id: str, error_code: str, error_message: str) -> pb.StreamingRecognizeResponse:
+        return self._response(session_id, error=pb.Error(error_code=error_code, error_message=error_message))
+
+    # === Store 事件 ===
+
+    def _setup_store_listeners(self):
+        """設定 Store 事件監聽器"""
+
+        def handle_store_action(action):
+            """處理 Store 的 action 事件（在 dispatch 的執行緒中執行）"""
+            # action 可能是 dict 或 Action 物件
+            if hasattr(action, "type"):
+                action_type = action.type
+                payload = action.payload if hasattr(action, "payload") else {}
+            else:
+                action_type = action.get("type", "") if isinstance(action, dict) else ""
+                payload = action.get("payload", {}) if isinstance(action, dict) else {}
+
+            if action_type not in self._event_builders:
+                return
+
+            # 只處理這個伺服器的串流
+            session_id = payload if isinstance(payload, str) else payload.get("session_id")
+            stream = self.streams.get(session_id) if session_id else None
+            if stream is None:
+                return
+
+            try:
+                response = self._event_builders[action_type](session_id, payload)
+                if response is not None:
+                    stream.send(response)
+                    if action_type == transcribe_done.type:
+                        metrics.observe_published(session_id)
+            except Exception as e:
+                logger.error(f"建立 gRPC 事件失敗 [{action_type}]: {e}")
+
+        self._event_builders = {
+            wake_activated.type: lambda sid, p: self._response(
+                sid, wake=pb.WakeEvent(activated=True, source=str(p.get("source") or ""))),
+            wake_deactivated.type: lambda sid, p: self._response(
+                sid, wake=pb.WakeEvent(activated=False, source=str(p.get("source") or ""))),
+            vad_speech_detected.type: lambda sid, p: self._response(sid, vad=pb.VadEvent(speech=True)),
+            vad_silence_detected.type: lambda sid, p: self._response(sid, vad=pb.VadEvent(speech=False)),
+            transcribe_partial.type: lambda sid, p: self._response(sid, partial=pb.TranscriptPartial(
+                text=p.get("text", ""), committed=p.get("committed", ""), tentative=p.get("tentative", ""))),
+            transcribe_final.type: self._transcribe_final_event,
+            transcribe_done.type: self._transcribe_done_event,
+            play_asr_feedback.type: lambda sid, p: self._response(
+                sid, feedback=pb.FeedbackCommand(command=str(p.get("command") or ""))),
+        }
+
+        # 訂閱 Store 的 action stream
+        self.store_subscription = store._action_subject.subscribe(handle_store_action)
+
+    def _transcribe_final_event(self, session_id: str, payload: Any) -> pb.StreamingRecognizeResponse:
+        result = payload.get("result")
+        segments = getattr(result, "segments", None) or []
+        return self._response(session_id, final=pb.TranscriptFinal(
+            text=payload.get("text", ""),
+            start_time=segments[0].start_time if segments else 0.0,
+            end_time=segments[-1].end_time if segments else 0.0,
+            duration=getattr(result, "duration", None) or 0.0
+        ))
+
+    def _transcribe_done_event(self, session_id: str, payload: Any) -> Optional[pb.StreamingRecognizeResponse]:
+        """從 transcribe_done payload（或 Store 中最後的轉譯結果）組出事件"""
+        result = payload.get("result") if hasattr(payload, "get") else None
+
+        if result:
+            text = (getattr(result, "full_text", "") or "").strip()
+            language = getattr(result, "language", None)
+            duration = getattr(result, "duration", None)
+        else:
+            last_transcription = get_session_last_transcription(session_id)(store.state)
+            if not last_transcription:
+                logger.warning(f"Session {session_id} 沒有轉譯結果")
+                return None
+            text = last_transcription.get("full_text", "")
+            language = last_transcription.get("language")
+            duration = last_transcription.get("duration")
+
+        return self._response(session_id, done=pb.TranscribeDone(
+            text=text or "",
+            language=language or "",
+            duration=duration or 0.0
+        ))
+
+    # === 生命週期 ===
+
+    async def initialize(self):
+        """初始化 gRPC 伺服器"""
+        if not self.grpc_config or not self.grpc_config.enabled:
+            return False
+
+        try:
+            # 設定 Store 監聽器
+            self._setup_store_listeners()
+
+            self.server = grpc.aio.server(options=[
+                ("grpc.max_receive_message_length", self.max_message_size),
+                ("grpc.max_send_message_length", self.max_message_size),
+            ])
+            pb_grpc.add_ASRHubServicer_to_server(ASRHubServicer(self), self.server)
+            self.server.add_insecure_port(f"{self.host}:{self.port}")
+
+            self.is_running = True
+            logger.info("✅ gRPC 伺服器已初始化")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ gRPC 初始化失敗: {e}")
+            return False
+
+    async def start(self):
+        """啟動 gRPC 伺服器"""
+        if not self.is_running:
+            await self.initialize()
+
+        if not self.is_running:
+            return
+
+        self.loop = asyncio.get_running_loop()
+        await self.server.start()
+
+        logger.info(f"🚀 gRPC 伺服器啟動於 {self.host}:{self.port}")
+
+        await self.server.wait_for_termination()
+
+    def stop(self):
+        """停止 gRPC 伺服器"""
+        if not self.is_running:
+            return
+
+        logger.info("🛑 正在停止 gRPC 伺服器...")
+        self.is_running = False
+
+        if self.server is not None and self.loop is not None:
+            asyncio.run_coroutine_threadsafe(self.server.stop(grace=1.0), self.loop)
+
+        # 清理 Store 訂閱
+        if self.store_subscription:
+            self.store_subscription.dispose()
+
+        logger.info("✅ gRPC 伺服器已停止")
+
+
+# 模組級單例
+grpc_server = GRPCServer()
+
+
+async def initialize():
+    """初始化 gRPC 伺服器（供 main.py 調用）"""
+    return await grpc_server.initialize()
+
+
+async def start():
+    """啟動 gRPC 伺服器（供 main.py 調用）"""
+    await grpc_server.start()
+
+
+def stop():
+    """停止 gRPC 伺服器（供 main.py 調用）"""
+    grpc_server.stop()
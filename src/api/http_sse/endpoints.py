@@ -25,6 +25,11 @@ class SSEEndpoints:
     
     # === SSE 事件串流端點 (GET) ===
     EVENTS_STREAM = f"{API_PREFIX}/sessions/{{session_id}}/events"     # GET - SSE 事件串流
+    
+    # === 監控 (GET) ===
+    STATS = f"{API_PREFIX}/stats"                                      # GET - 接收佇列與連線統計
+    HEALTH_READY = "/health/ready"                                     # GET - 啟動元件就緒狀態（未就緒回應 503）
+    METRICS = "/metrics"                                               # GET - 各階段延遲直方圖（Prometheus）
 
 
 class SSEEventTypes:
@@ -32,6 +37,8 @@ class SSEEventTypes:
     
     # === 主要輸出事件 (基於 OutputAction) ===
     TRANSCRIBE_DONE = OutputAction.TRANSCRIBE_DONE         # 轉譯完成
+    TRANSCRIBE_PARTIAL = OutputAction.TRANSCRIBE_PARTIAL   # 串流轉譯中間結果
+    TRANSCRIBE_FINAL = OutputAction.TRANSCRIBE_FINAL       # 串流轉譯最終結果
     PLAY_ASR_FEEDBACK = OutputAction.PLAY_ASR_FEEDBACK     # 播放 ASR 回饋音
     ERROR_REPORTED = OutputAction.ERROR_REPORTED           # 錯誤已回報
     
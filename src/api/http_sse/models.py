@@ -78,6 +78,7 @@ class AudioChunkResponse(BaseModel):
     chunk_id: Optional[str] = Field(default=None, description="音訊片段 ID")
     bytes_received: int = Field(..., description="接收的位元組數")
     status: str = Field(default="received", description="狀態")
+    queue_depth: int = Field(default=0, description="session 接收佇列中尚未處理的 chunk 數")
 
 
 class ErrorResponse(BaseModel):
@@ -108,6 +109,25 @@ class TranscribeDoneEvent(BaseModel):
     timestamp: str = Field(..., description="時間戳記")
 
 
+class TranscribePartialEvent(BaseModel):
+    """串流轉譯中間結果事件資料"""
+    session_id: str = Field(..., description="Session ID")
+    text: str = Field(..., description="已確認文字 + 暫定文字")
+    committed: str = Field(..., description="已確認文字（之後不會再改變）")
+    tentative: str = Field(..., description="暫定文字（下一次解碼可能修正）")
+    timestamp: str = Field(..., description="時間戳記")
+
+
+class TranscribeFinalEvent(BaseModel):
+    """串流轉譯最終結果事件資料"""
+    session_id: str = Field(..., description="Session ID")
+    text: str = Field(..., description="最終轉譯文字")
+    start_time: Optional[float] = Field(default=None, description="語音開始時間（秒，相對串流開始）")
+    end_time: Optional[float] = Field(default=None, description="語音結束時間（秒，相對串流開始）")
+    duration: Optional[float] = Field(default=None, description="串流音訊長度（秒）")
+    timestamp: str = Field(..., description="時間戳記")
+
+
 class PlayASRFeedbackEvent(BaseModel):
     """播放 ASR 回饋音事件資料"""
     session_id: str = Field(..., description="Session ID")
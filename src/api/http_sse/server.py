@@ -11,6 +11,7 @@ HTTP SSE 伺服器實現
 
 import asyncio
 import json
+import math
 import base64
 import uuid
 import time
@@ -21,7 +22,7 @@ from asyncio import Queue
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request, Response, status, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import ValidationError
 import uuid6
@@ -41,17 +42,29 @@ from src.api.http_sse.models import (
     ErrorResponse,
     SSEEvent,
     TranscribeDoneEvent,
+    TranscribePartialEvent,
+    TranscribeFinalEvent,
     PlayASRFeedbackEvent,
     HeartbeatEvent,
     ConnectionReadyEvent,
 )
 
 from src.store.main_store import store
+from src.core.audio_ingest import audio_ingest
+from src.core.ingest_workers import ingest_workers
+from src.core.metrics import metrics
+from src.core.post_pipeline import post_pipeline
+from src.core.speculative_asr import speculative_asr
+from src.core.startup import startup
+from src.interface.exceptions import IngestBackpressureError, SessionManagementError
 from src.store.sessions.sessions_action import (
     create_session,
     start_listening,
     receive_audio_chunk,
+    audio_chunks_ingested,
     transcribe_done,
+    transcribe_partial,
+    transcribe_final,
     wake_activated,
     wake_deactivated,
     play_asr_feedback,
@@ -187,6 +200,37 @@ class HTTPSSEServer:
         async def events_stream_endpoint(session_id: str, request: Request):
             """SSE 事件串流"""
             return await self._handle_events_stream(session_id, request)
+        
+        # === 監控 ===
+        @self.app.get(SSEEndpoints.STATS)
+        async def stats_endpoint():
+            """接收佇列深度與連線統計"""
+            return {
+                "uptime": time.time() - self.start_time,
+                "sse_connections": len(self.sse_connections),
+                "ingest_workers": ingest_workers.get_stats(),
+                "audio_ingest": audio_ingest.get_stats(),
+                "post_pipeline": post_pipeline.get_stats(),
+                "speculative_asr": speculative_asr.get_stats(),
+                "latency": metrics.get_stats(),
+            }
+        
+        @self.app.get(SSEEndpoints.METRICS)
+        async def metrics_endpoint():
+            """各階段延遲直方圖（Prometheus text format）"""
+            return Response(
+                content=metrics.render_prometheus(),
+                media_type="text/plain; version=0.0.4; charset=utf-8",
+            )
+        
+        @self.app.get(SSEEndpoints.HEALTH_READY)
+        async def health_ready_endpoint():
+            """各啟動元件的就緒狀態（必要元件未全部就緒時回應 503）"""
+            readiness = startup.get_readiness()
+            return JSONResponse(
+                content=readiness,
+                status_code=status.HTTP_200_OK if readiness["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
     
     async def _handle_create_session(self, request: CreateSessionRequest) -> CreateSessionResponse:
         """處理建立 Session 請求"""
@@ -241,6 +285,7 @@ class HTTPSSEServer:
             
             # 建立 SSE 事件佇列
             self.sse_connections[session_id] = Queue()
+            metrics.bind_session(session_id, "http_sse")
             
             logger.info(f"✅ Session 建立成功: {session_id} (策略: {request.strategy})")
             
@@ -316,61 +361,43 @@ class HTTPSSEServer:
         audio_bytes: bytes,
         chunk_id: Optional[str] = None
     ) -> AudioChunkResponse:
-        """處理二進位音訊片段 - 從 session 取得音訊參數"""
+        """處理二進位音訊片段 - 從 session 取得音訊參數
+        
+        音訊只在這裡入列，轉換與 store 事件由 ingest worker 在事件迴圈外處理，
+        避免上傳負載拖慢其他連線的 SSE 推送。session 處理落後時回應 429。
+        """
         try:
-            # 檢查 session 是否存在並取得音訊參數
-            session = get_session_by_id(session_id)(store.state)
-            if not session:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Session {session_id} not found"
-                )
-            
-            # 從 session 取得音訊參數（在 start_listening 時設定的）
-            # 使用 getattr 和 get 方法相容不同的資料結構
-            if hasattr(session, 'get'):
-                sample_rate = session.get('sample_rate', 16000)
-                channels = session.get('channels', 1)
-                audio_format = session.get('format', 'int16')
-            else:
-                sample_rate = getattr(session, 'sample_rate', 16000)
-                channels = getattr(session, 'channels', 1)
-                audio_format = getattr(session, 'format', 'int16')
+            queue_depth = ingest_workers.submit(session_id, audio_bytes)
             
-            # 如果需要轉換格式，使用 audio_converter 服務
-            if sample_rate != 16000 or channels != 1:
-                from src.service.audio_converter.scipy_converter import audio_converter
-                
-                # 轉換音訊格式
-                converted_audio = await self._run_in_thread(
-                    lambda: audio_converter.convert(
-                        audio_bytes,
-                        input_sample_rate=sample_rate,
-                        input_channels=channels,
-                        target_sample_rate=16000,
-                        target_channels=1,
-                        target_format="int16"
-                    )
-                )
-                audio_bytes = converted_audio
-                logger.debug(f"音訊已轉換: {sample_rate}Hz {channels}ch -> 16000Hz 1ch")
-            
-            # 直接分發到 Store，讓 SessionEffects 和 audio_queue_manager 處理
-            action = receive_audio_chunk(
-                session_id=session_id,
-                audio_data=audio_bytes
-            )
-            store.dispatch(action)
-            
-            logger.debug(f"📥 音訊片段 [{session_id}]: chunk={chunk_id or 'unnamed'}, size={len(audio_bytes)}")
+            logger.debug(f"📥 音訊片段 [{session_id}]: chunk={chunk_id or 'unnamed'}, size={len(audio_bytes)}, queue={queue_depth}")
             
             return AudioChunkResponse(
                 session_id=session_id,
                 chunk_id=chunk_id or f"chunk_{time.time()}",
                 bytes_received=len(audio_bytes),
-                status="received"
+                status="queued",
+                queue_depth=queue_depth
             )
             
+        except SessionManagementError as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=str(e)
+            )
+        except IngestBackpressureError as e:
+            logger.warning(f"⏳ 音訊接收佇列已滿 [{session_id}]: {e.queue_depth} chunks, retry_after={e.retry_after:.3f}s")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail={
+                    "error_code": "INGEST_QUEUE_FULL",
+                    "error_message": str(e),
+                    "session_id": session_id,
+                    "queue_depth": e.queue_depth,
+                    "retry_after": e.retry_after,
+                },
+                # Retry-After 標頭只接受整數秒；精確值在 detail.retry_after
+                headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+            )
         except HTTPException:
             raise
         except Exception as e:
@@ -590,11 +617,16 @@ class HTTPSSEServer:
                 payload = action.get("payload", {}) if isinstance(action, dict) else {}
             
             # 記錄所有收到的 action（調試用）
-            if action_type not in [receive_audio_chunk.type]:
+            if action_type not in [receive_audio_chunk.type, audio_chunks_ingested.type, transcribe_partial.type]:
                 logger.info(f"📡 [HTTP SSE] 處理 Store action: {action_type}")
             
             # 只有我們關心的事件才處理
-            if action_type in [transcribe_done.type, play_asr_feedback.type]:
+            if action_type in [
+                transcribe_done.type,
+                transcribe_partial.type,
+                transcribe_final.type,
+                play_asr_feedback.type,
+            ]:
                 # 安全地在事件循環中執行
                 self._schedule_async_task(action_type, payload)
         
@@ -617,6 +649,12 @@ class HTTPSSEServer:
             if action_type == transcribe_done.type:
                 asyncio.run_coroutine_threadsafe(self._handle_transcribe_done(payload), self.loop)
             
+            # 監聽串流轉譯事件
+            elif action_type == transcribe_partial.type:
+                asyncio.run_coroutine_threadsafe(self._handle_transcribe_partial(payload), self.loop)
+            elif action_type == transcribe_final.type:
+                asyncio.run_coroutine_threadsafe(self._handle_transcribe_final(payload), self.loop)
+            
             # 監聽 ASR 回饋音事件
             elif action_type == play_asr_feedback.type:
                 # 根據 command 判斷播放或停止
@@ -687,12 +725,59 @@ class HTTPSSEServer:
             )
             
             await self._send_sse_event(session_id, SSEEventTypes.TRANSCRIBE_DONE, event_data.model_dump())
+            metrics.observe_published(session_id)
             
             logger.info(f'📤 轉譯結果已推送 [session: {session_id}]: "{text[:100]}..."')
             
         except Exception as e:
             logger.error(f"處理轉譯完成事件失敗: {e}")
     
+    async def _handle_transcribe_partial(self, payload: Dict[str, Any]):
+        """處理串流轉譯中間結果事件"""
+        try:
+            session_id = payload.get("session_id")
+            if not session_id:
+                return
+            
+            event_data = TranscribePartialEvent(
+                session_id=session_id,
+                text=payload.get("text", ""),
+                committed=payload.get("committed", ""),
+                tentative=payload.get("tentative", ""),
+                timestamp=datetime.now().isoformat()
+            )
+            
+            await self._send_sse_event(session_id, SSEEventTypes.TRANSCRIBE_PARTIAL, event_data.model_dump())
+            
+        except Exception as e:
+            logger.error(f"處理串流轉譯中間結果失敗: {e}")
+    
+    async def _handle_transcribe_final(self, payload: Dict[str, Any]):
+        """處理串流轉譯最終結果事件"""
+        try:
+            session_id = payload.get("session_id")
+            if not session_id:
+                logger.warning("串流轉譯最終結果缺少 session_id")
+                return
+            
+            result = payload.get("result")
+            segments = getattr(result, "segments", None) or []
+            event_data = TranscribeFinalEvent(
+                session_id=session_id,
+                text=payload.get("text", ""),
+                start_time=segments[0].start_time if segments else None,
+                end_time=segments[-1].end_time if segments else None,
+                duration=getattr(result, "duration", None),
+                timestamp=datetime.now().isoformat()
+            )
+            
+            await self._send_sse_event(session_id, SSEEventTypes.TRANSCRIBE_FINAL, event_data.model_dump())
+            
+            logger.info(f'📤 串流轉譯最終結果已推送 [session: {session_id}]: "{event_data.text[:100]}..."')
+            
+        except Exception as e:
+            logger.error(f"處理串流轉譯最終結果失敗: {e}")
+    
     async def _handle_asr_feedback_play(self, payload: Dict[str, Any]):
         """處理 ASR 回饋音播放事件"""
         try:
@@ -824,6 +909,9 @@ class HTTPSSEServer:
         self.sse_connections.clear()
         self.sse_tasks.clear()
         
+        # 停止音訊接收 worker（尚未處理的 chunk 會被捨棄）
+        ingest_workers.shutdown()
+        
         # 清理 Store 訂閱
         if self.store_subscription:
             self.store_subscription.dispose()
@@ -37,6 +37,8 @@ class RedisChannels:
     # === 輸出頻道 (ASRHub -> 客戶端) ===
     # 主要輸出：transcribe_done, play_asr_feedback
     RESPONSE_TRANSCRIBE_DONE = "response:" + OutputAction.TRANSCRIBE_DONE
+    RESPONSE_TRANSCRIBE_PARTIAL = "response:" + OutputAction.TRANSCRIBE_PARTIAL  # 串流轉譯中間結果
+    RESPONSE_TRANSCRIBE_FINAL = "response:" + OutputAction.TRANSCRIBE_FINAL  # 串流轉譯最終結果
     RESPONSE_PLAY_ASR_FEEDBACK = "response:" + OutputAction.PLAY_ASR_FEEDBACK
     
     # 錯誤通知
@@ -59,4 +61,71 @@ channels = [
     RedisChannels.REQUEST_WAKE_ACTIVATE,       # request:wake_activate
     RedisChannels.REQUEST_WAKE_DEACTIVATE,     # request:wake_deactivate
     # RedisChannels.REQUEST_DELETE_SESSION,    # request:delete_session (可選)
-]
\ No newline at end of file
+]
+
+# === Redis Streams（api.redis.streams，多節點水平擴展） ===
+
+class RedisStreamTypes:
+    """Redis Streams 訊息的 type 欄位"""
+
+    # 輸入 (客戶端 -> ASRHub)
+    CREATE_SESSION = InputAction.CREATE_SESSION          # 送到共用的 requests 串流
+    START_LISTENING = InputAction.START_LISTENING        # 以下送到 session 的輸入串流
+    EMIT_AUDIO_CHUNK = InputAction.EMIT_AUDIO_CHUNK      # data 欄位為原始音訊 bytes（不經 base64）
+    WAKE_ACTIVATE = InputAction.WAKE_ACTIVATED
+    WAKE_DEACTIVATE = InputAction.WAKE_DEACTIVATED
+    DELETE_SESSION = InputAction.DELETE_SESSION
+
+    # 輸出 (ASRHub -> 客戶端)，data 欄位為 JSON（models.py 的回應模型）
+    SESSION_CREATED = "session_created"
+    LISTENING_STARTED = "listening_started"
+    WAKE_ACTIVATED = "wake_activated"
+    WAKE_DEACTIVATED = "wake_deactivated"
+    TRANSCRIBE_DONE = OutputAction.TRANSCRIBE_DONE
+    TRANSCRIBE_PARTIAL = OutputAction.TRANSCRIBE_PARTIAL
+    TRANSCRIBE_FINAL = OutputAction.TRANSCRIBE_FINAL
+    PLAY_ASR_FEEDBACK = OutputAction.PLAY_ASR_FEEDBACK
+    ERROR = "error"
+
+
+class RedisStreamKeys:
+    """Redis Streams 鍵名
+
+    - requests: 所有節點共用的 create_session 串流，由 consumer group 分配給其中一個節點
+    - session_in: session 的輸入串流，只由擁有該 session 的節點讀取（保證順序）
+    - session_out: session 的輸出串流（轉譯結果、回饋音、確認與錯誤）
+    - request_out: create_session 的回應串流（客戶端此時還不知道 session_id）
+    - session_meta: session 的擁有者與音訊配置（hash），節點失效時供接手節點重建 session
+    - node: 節點心跳（帶 TTL），過期表示節點已失效
+    """
+
+    # 串流訊息欄位
+    TYPE = "type"
+    DATA = "data"
+
+    def __init__(self, prefix: str = "asr_hub:"):
+        self.prefix = prefix
+
+    @property
+    def requests(self) -> str:
+        return f"{self.prefix}requests"
+
+    @property
+    def sessions(self) -> str:
+        """所有透過 Streams 建立的 session（set）"""
+        return f"{self.prefix}sessions"
+
+    def session_in(self, session_id: str) -> str:
+        return f"{self.prefix}session:{session_id}:in"
+
+    def session_out(self, session_id: str) -> str:
+        return f"{self.prefix}session:{session_id}:out"
+
+    def session_meta(self, session_id: str) -> str:
+        return f"{self.prefix}session:{session_id}"
+
+    def request_out(self, request_id: str) -> str:
+        return f"{self.prefix}request:{request_id}:out"
+
+    def node(self, consumer_name: str) -> str:
+        return f"{self.prefix}node:{consumer_name}"
@@ -85,6 +85,25 @@ class TranscribeDoneMessage(BaseModel):
     timestamp: Optional[str] = None
 
 
+class TranscribePartialMessage(BaseModel):
+    """串流轉譯中間結果訊息"""
+    session_id: str
+    text: str  # 已確認文字 + 暫定文字
+    committed: str  # 已確認文字（之後不會再改變）
+    tentative: str  # 暫定文字（下一次解碼可能修正）
+    timestamp: Optional[str] = None
+
+
+class TranscribeFinalMessage(BaseModel):
+    """串流轉譯最終結果訊息"""
+    session_id: str
+    text: str  # 最終轉譯文字
+    start_time: Optional[float] = None  # 語音開始時間（秒，相對串流開始）
+    end_time: Optional[float] = None  # 語音結束時間（秒，相對串流開始）
+    duration: Optional[float] = None  # 串流音訊長度（秒）
+    timestamp: Optional[str] = None
+
+
 class PlayASRFeedbackMessage(BaseModel):
     """播放 ASR 回饋音訊息"""
     session_id: str
@@ -36,16 +36,23 @@ from src.api.redis.models import (
     WakeDeactivatedMessage,
     # AudioReceivedMessage,
     TranscribeDoneMessage,
+    TranscribePartialMessage,
+    TranscribeFinalMessage,
     PlayASRFeedbackMessage,
     ErrorMessage,
 )
 
 from src.store.main_store import store
+from src.core.audio_ingest import audio_ingest
+from src.core.metrics import metrics
 from src.store.sessions.sessions_action import (
     create_session,
     start_listening,
     receive_audio_chunk,
+    audio_chunks_ingested,
     transcribe_done,
+    transcribe_partial,
+    transcribe_final,
     delete_session,
     wake_activated,
     play_asr_feedback,
@@ -225,6 +232,7 @@ class RedisServer:
                 session_id = SessionEffects.get_session_id_by_request_id(message.request_id)
             
             if session_id:
+                metrics.bind_session(session_id, "redis")
                 logger.info(f"📝 Store 建立了 session: {session_id} (request_id: {message.request_id})")
             else:
                 logger.error(f"❌ 無法從 Store 取得新建立的 session_id (request_id: {message.request_id})")
@@ -340,18 +348,11 @@ class RedisServer:
                     self._send_error(session_id, "AUDIO_DECODE_ERROR", str(e))
                     return
             
-            # 檢查 session 是否存在
-            session = get_session_by_id(session_id)(store.state)
-            if not session:
-                logger.error(f"❌ Session {session_id} 不存在，無法處理音訊")
+            # 直接送進音訊資料平面（不經過 store）；session 不存在或尚未開始監聽時返回 False
+            if not audio_ingest.ingest(session_id, audio_bytes):
+                logger.error(f"❌ Session {session_id} 不存在或尚未設定音訊配置，無法處理音訊")
                 self._send_error(session_id, "SESSION_NOT_FOUND", f"Session {session_id} not found")
                 return
-                
-            # 客戶端 emit 服務端 receive
-            action = receive_audio_chunk(
-                session_id=session_id, audio_data=audio_bytes
-            )
-            store.dispatch(action)
 
             # 可選：回應確認收到音訊（通常不需要，除非客戶端需要確認）
             # response = AudioReceivedMessage(
@@ -480,13 +481,19 @@ class RedisServer:
                 payload = action.get("payload", {}) if isinstance(action, dict) else {}
 
             # 記錄所有收到的 action（調試用）
-            if action_type not in [receive_audio_chunk.type]:
+            if action_type not in [receive_audio_chunk.type, audio_chunks_ingested.type, transcribe_partial.type]:
                 logger.info(f"📡 [Redis] 處理 Store action: {action_type}")
 
             # 監聽轉譯完成事件 - 使用正確的 action type 字串
             if action_type == transcribe_done.type:
                 self._handle_transcribe_done(payload)
 
+            # 監聽串流轉譯事件
+            elif action_type == transcribe_partial.type:
+                self._handle_transcribe_partial(payload)
+            elif action_type == transcribe_final.type:
+                self._handle_transcribe_final(payload)
+
             # 監聽 ASR 回饋音事件
             elif action_type == play_asr_feedback.type:
                 # 根據 command 判斷播放或停止
@@ -565,6 +572,7 @@ class RedisServer:
             )
 
             self.publisher.publisher(RedisChannels.RESPONSE_TRANSCRIBE_DONE, response.model_dump())
+            metrics.observe_published(session_id)
 
             logger.info(f'📤 轉譯結果已發布 [session: {session_id}]: "{text[:100]}..."')
 
@@ -572,6 +580,51 @@ class RedisServer:
             logger.error(f"處理轉譯完成事件失敗: {e}")
             self._send_error(session_id if 'session_id' in locals() else None, "TRANSCRIBE_DONE_ERROR", str(e))
 
+    def _handle_transcribe_partial(self, payload: Dict[str, Any]):
+        """處理串流轉譯中間結果，發布到 Redis"""
+        try:
+            session_id = payload.get("session_id")
+            if not session_id:
+                return
+
+            response = TranscribePartialMessage(
+                session_id=session_id,
+                text=payload.get("text", ""),
+                committed=payload.get("committed", ""),
+                tentative=payload.get("tentative", ""),
+                timestamp=datetime.now().isoformat(),
+            )
+            self.publisher.publisher(RedisChannels.RESPONSE_TRANSCRIBE_PARTIAL, response.model_dump())
+
+        except Exception as e:
+            logger.error(f"處理串流轉譯中間結果失敗: {e}")
+
+    def _handle_transcribe_final(self, payload: Dict[str, Any]):
+        """處理串流轉譯最終結果，發布到 Redis"""
+        try:
+            session_id = payload.get("session_id")
+            if not session_id:
+                logger.warning("串流轉譯最終結果缺少 session_id")
+                return
+
+            result = payload.get("result")
+            segments = getattr(result, "segments", None) or []
+            response = TranscribeFinalMessage(
+                session_id=session_id,
+                text=payload.get("text", ""),
+                start_time=segments[0].start_time if segments else None,
+                end_time=segments[-1].end_time if segments else None,
+                duration=getattr(result, "duration", None),
+                timestamp=datetime.now().isoformat(),
+            )
+            self.publisher.publisher(RedisChannels.RESPONSE_TRANSCRIBE_FINAL, response.model_dump())
+
+            logger.info(f'📤 串流轉譯最終結果已發布 [session: {session_id}]: "{response.text[:100]}..."')
+
+        except Exception as e:
+            logger.error(f"處理串流轉譯最終結果失敗: {e}")
+            self._send_error(session_id if 'session_id' in locals() else None, "TRANSCRIBE_FINAL_ERROR", str(e))
+
     def _handle_asr_feedback_play(self, payload: Dict[str, Any]):
         """處理 ASR 回饋音播放事件"""
         try:
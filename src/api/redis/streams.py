@@ -0,0 +1,625 @@
+"""
+Redis Streams 伺服器實現（多節點水平擴展）
+
+Pub/Sub 模式下每個 ASRHub 節點都會收到所有 session 的每個音訊 chunk，節點忙碌時訊息直接遺失，
+也無法分散負載。Streams 模式讓 N 個 ASRHub 節點共用一個 Redis：
+
+1. create_session 送到共用的 requests 串流，由 consumer group 分配給其中一個節點
+   （每個節點一次只取一個，閒置的節點輪流取得；達到 max_sessions 的節點暫停領取），
+   該節點成為 session 的擁有者（記錄在 session_meta hash）
+2. start_listening、音訊與喚醒控制送到 session 自己的輸入串流，只有擁有者讀取，順序不變；
+   音訊以二進位欄位 XADD（不經 base64），由客戶端以 MAXLEN 限制長度
+3. 轉譯結果、回饋音、確認與錯誤寫到 session 自己的輸出串流（MAXLEN 限制長度）
+4. 訊息處理完才 XACK；節點心跳過期時，其他節點以 XAUTOCLAIM 接手尚未確認的 create_session，
+   並以相同的 session_id 重建該節點擁有的 session，繼續處理輸入串流中尚未確認的訊息
+
+節點從自己的串流拉取訊息，處理不及時訊息留在 Redis 中，不會遺失。
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+
+import redis
+from pydantic import BaseModel, ValidationError
+
+from src.api.redis.channels import RedisStreamKeys, RedisStreamTypes
+from src.api.redis.models import (
+    CreateSessionMessage,
+    SessionCreatedMessage,
+    ListeningStartedMessage,
+    WakeActivatedMessage,
+    WakeDeactivatedMessage,
+    TranscribeDoneMessage,
+    TranscribePartialMessage,
+    TranscribeFinalMessage,
+    PlayASRFeedbackMessage,
+    ErrorMessage,
+)
+
+from src.store.main_store import store
+from src.core.audio_ingest import audio_ingest
+from src.core.metrics import metrics
+from src.store.sessions.sessions_action import (
+    create_session,
+    start_listening,
+    delete_session,
+    wake_activated,
+    wake_deactivated,
+    transcribe_done,
+    transcribe_partial,
+    transcribe_final,
+    play_asr_feedback,
+)
+from src.store.sessions.sessions_selector import (
+    get_session_by_id,
+    get_all_sessions,
+    get_session_last_transcription,
+)
+from src.config.manager import ConfigManager
+from src.utils.logger import logger
+
+
+# 只有 owner 仍是失效節點時才改為自己（避免兩個節點同時接手）
+_TAKEOVER_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'owner') == ARGV[1] then
+    redis.call('HSET', KEYS[1], 'owner', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+
+class RedisStreamsServer:
+    """Redis Streams 伺服器"""
+
+    def __init__(self):
+        """初始化 Redis Streams 伺服器"""
+        self.config_manager = ConfigManager()
+        self.redis_config = self.config_manager.api.redis
+        self.streams_config = getattr(self.redis_config, 'streams', None)
+
+        if not self.streams_config or not self.streams_config.enabled:
+            logger.info("Redis Streams 服務已停用")
+            return
+
+        self.keys = RedisStreamKeys(getattr(self.redis_config, 'channel_prefix', None) or "asr_hub:")
+        self.group = getattr(self.streams_config, 'consumer_group', None) or "asr_hub"
+        self.consumer = (
+            getattr(self.streams_config, 'consumer_name', None) or f"{socket.gethostname()}-{os.getpid()}"
+        )
+        self.response_maxlen = int(getattr(self.streams_config, 'response_maxlen', 1000))
+        self.block_ms = int(getattr(self.streams_config, 'block_ms', 100))
+        self.max_sessions = int(getattr(self.streams_config, 'max_sessions', 0))  # 0 表示不限制
+        self.batch_size = int(getattr(self.streams_config, 'batch_size', 64))
+        self.claim_idle_ms = int(getattr(self.streams_config, 'claim_idle_ms', 30000))
+        self.heartbeat_interval = float(getattr(self.streams_config, 'heartbeat_interval', 5.0))
+        self.node_ttl = int(getattr(self.streams_config, 'node_ttl', 15))
+        self.stream_ttl = int(getattr(self.streams_config, 'stream_ttl', 3600))
+
+        self.client: Optional[redis.Redis] = None
+        self._takeover = None
+
+        # 這個節點擁有的 session（讀取它們的輸入串流）
+        self.owned: Dict[str, str] = {}  # session_id -> 輸入串流鍵名
+        self._owned_lock = threading.Lock()
+
+        self.store_subscription = None
+        self._threads: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+        self.is_running = False
+
+    def initialize(self):
+        """連接 Redis、建立 consumer group 並啟動讀取執行緒"""
+        if not self.streams_config or not self.streams_config.enabled:
+            return False
+
+        try:
+            self.client = redis.Redis(
+                host=self.redis_config.host,
+                port=self.redis_config.port,
+                db=self.redis_config.db,
+                password=self.redis_config.password if self.redis_config.password else None,
+                decode_responses=False,  # 音訊欄位為二進位
+            )
+            self.client.ping()
+            self._takeover = self.client.register_script(_TAKEOVER_SCRIPT)
+            self._ensure_group(self.keys.requests)
+            self._heartbeat()
+
+            self._setup_store_listeners()
+
+            self._stop_event.clear()
+            self._threads = [
+                threading.Thread(target=self._run_requests, daemon=True, name="RedisStreamsRequests"),
+                threading.Thread(target=self._run_sessions, daemon=True, name="RedisStreamsSessions"),
+            ]
+            for thread in self._threads:
+                thread.start()
+
+            self.is_running = True
+            logger.info(
+                f"✅ Redis Streams 已連接到 {self.redis_config.host}:{self.redis_config.port} "
+                f"(group: {self.group}, consumer: {self.consumer})"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ Redis Streams 初始化失敗: {e}")
+            return False
+
+    # === 讀取迴圈 ===
+
+    def _run_requests(self):
+        """從共用的 requests 串流一次領取一個 create_session"""
+        while not self._stop_event.is_set():
+            try:
+                if self.max_sessions and len(self.owned) >= self.max_sessions:
+                    # 已滿載，讓其他節點領取
+                    self._stop_event.wait(self.block_ms / 1000)
+                    continue
+
+                entries = self.client.xreadgroup(
+                    self.group, self.consumer, {self.keys.requests: ">"}, count=1, block=self.block_ms
+                )
+                for _, messages in entries or []:
+                    self._process(self.keys.requests, messages)
+
+            except redis.ConnectionError as e:
+                logger.error(f"Redis Streams 連線錯誤: {e}")
+                self._stop_event.wait(1.0)
+            except Exception as e:
+                logger.error(f"Redis Streams 請求處理錯誤: {e}")
+
+    def _run_sessions(self):
+        """讀取自己擁有的 session 輸入串流，並定期執行維護"""
+        next_maintenance = 0.0
+
+        while not self._stop_event.is_set():
+            try:
+                now = time.monotonic()
+                if now >= next_maintenance:
+                    self._maintenance()
+                    next_maintenance = now + self.heartbeat_interval
+
+                with self._owned_lock:
+                    streams = {stream_key: ">" for stream_key in self.owned.values()}
+                if not streams:
+                    self._stop_event.wait(self.block_ms / 1000)
+                    continue
+
+                entries = self.client.xreadgroup(
+                    self.group, self.consumer, streams, count=self.batch_size, block=self.block_ms
+                )
+                for stream_key, messages in entries or []:
+                    self._process(stream_key.decode(), messages)
+
+            except redis.ConnectionError as e:
+                logger.error(f"Redis Streams 連線錯誤: {e}")
+                self._stop_event.wait(1.0)
+            except redis.ResponseError as e:
+                # 例如 session 輸入串流已被刪除（NOGROUP）
+                logger.warning(f"Redis Streams 讀取失敗: {e}")
+                self._prune_owned(check_streams=True)
+            except Exception as e:
+                logger.error(f"Redis Streams 處理錯誤: {e}")
+
+    def _process(self, stream_key: str, messages: List[Tuple[bytes, Dict[bytes, bytes]]]):
+        """處理一批訊息，處理完才 XACK"""
+        if stream_key == self.keys.requests:
+            session_id = None
+        else:
+            session_id = self._session_id_of(stream_key)
+            if session_id is None:
+                return
+
+        acked = []
+        for message_id, fields in messages:
+            if not fields:
+                # 已被 MAXLEN 修剪的待確認訊息
+                acked.append(message_id)
+                continue
+
+            message_type = fields.get(self.keys.TYPE.encode(), b"").decode()
+            data = fields.get(self.keys.DATA.encode(), b"")
+            try:
+                if session_id is None:
+                    self._handle_request(message_type, data)
+                else:
+                    self._handle_session_message(session_id, message_type, data)
+            except Exception as e:
+                logger.error(f"處理 Redis Streams 訊息失敗 [{stream_key} {message_type}]: {e}")
+                self._send_error(session_id, "MESSAGE_PROCESSING_ERROR", str(e))
+            acked.append(message_id)
+
+        if acked:
+            self.client.xack(stream_key, self.group, *acked)
+
+    def _session_id_of(self, stream_key: str) -> Optional[str]:
+        with self._owned_lock:
+            for session_id, key in self.owned.items():
+                if key == stream_key:
+                    return session_id
+        return None
+
+    # === 請求處理 ===
+
+    def _handle_request(self, message_type: str, data: bytes):
+        """處理共用 requests 串流的訊息"""
+        if message_type != RedisStreamTypes.CREATE_SESSION:
+            logger.warning(f"未知的 Redis Streams 請求: {message_type}")
+            return
+
+        try:
+            message = CreateSessionMessage(**json.loads(data))
+        except (ValueError, ValidationError) as e:
+            self._send_error(None, "VALIDATION_ERROR", str(e))
+            return
+
+        store.dispatch(create_session(strategy=message.strategy, request_id=message.request_id))
+        session_id = self._find_session_by_request_id(message.request_id)
+        if not session_id:
+            logger.error(f"❌ 無法從 Store 取得新建立的 session_id (request_id: {message.request_id})")
+            self._send_error(None, "SESSION_CREATION_FAILED", "Failed to get session_id from store")
+            return
+
+        self.client.hset(self.keys.session_meta(session_id), mapping={
+            "owner": self.consumer,
+            "request_id": message.request_id,
+            "strategy": message.strategy,
+        })
+        self.client.sadd(self.keys.sessions, session_id)
+        self._own(session_id)
+
+        # 輸入串流與 consumer group 建立後才回應，客戶端收到 session_id 即可開始送出
+        request_out = self.keys.request_out(message.request_id)
+        self._xadd(request_out, RedisStreamTypes.SESSION_CREATED, SessionCreatedMessage(
+            request_id=message.request_id,
+            session_id=session_id,
+            timestamp=datetime.now().isoformat()
+        ))
+        self.client.expire(request_out, self.stream_ttl)
+
+        logger.info(f"✅ Session 建立成功 [Streams: {session_id}] (策略: {message.strategy}, 節點: {self.consumer})")
+
+    def _handle_session_message(self, session_id: str, message_type: str, data: bytes):
+        """處理 session 輸入串流的訊息（依送出順序）"""
+        if message_type == RedisStreamTypes.EMIT_AUDIO_CHUNK:
+            # 直接送進音訊資料平面（不經過 store）
+            if not audio_ingest.ingest(session_id, data):
+                self._send_error(session_id, "SESSION_NOT_FOUND", f"Session {session_id} not ready")
+            return
+
+        payload = json.loads(data) if data else {}
+
+        if message_type == RedisStreamTypes.START_LISTENING:
+            sample_rate = int(payload.get("sample_rate", 16000))
+            channels = int(payload.get("channels", 1))
+            audio_format = payload.get("format", "int16")
+            store.dispatch(start_listening(
+                session_id=session_id, sample_rate=sample_rate, channels=channels, format=audio_format
+            ))
+            # 記錄音訊配置，接手節點重建 session 時使用
+            self.client.hset(self.keys.session_meta(session_id), mapping={
+                "sample_rate": sample_rate,
+                "channels": channels,
+                "format": audio_format,
+            })
+            self._xadd(self.keys.session_out(session_id), RedisStreamTypes.LISTENING_STARTED, ListeningStartedMessage(
+                session_id=session_id,
+                sample_rate=sample_rate,
+                channels=channels,
+                format=audio_format,
+                timestamp=datetime.now().isoformat()
+            ))
+            logger.info(f"✅ 開始監聽 [Streams: {session_id}]: {sample_rate}Hz, {channels}ch, {audio_format}")
+
+        elif message_type == RedisStreamTypes.WAKE_ACTIVATE:
+            source = payload.get("source", "ui")
+            store.dispatch(wake_activated(session_id=session_id, source=source))
+            self._xadd(self.keys.session_out(session_id), RedisStreamTypes.WAKE_ACTIVATED, WakeActivatedMessage(
+                session_id=session_id, source=source, timestamp=datetime.now().isoformat()
+            ))
+
+        elif message_type == RedisStreamTypes.WAKE_DEACTIVATE:
+            source = payload.get("source", "ui")
+            store.dispatch(wake_deactivated(session_id=session_id, source=source))
+            self._xadd(self.keys.session_out(session_id), RedisStreamTypes.WAKE_DEACTIVATED, WakeDeactivatedMessage(
+                session_id=session_id, source=source, timestamp=datetime.now().isoformat()
+            ))
+
+        elif message_type == RedisStreamTypes.DELETE_SESSION:
+            store.dispatch(delete_session(session_id))
+            self._release(session_id, delete_streams=True)
+            logger.info(f"✅ Session 已刪除 [Streams: {session_id}]")
+
+        else:
+            self._send_error(session_id, "UNKNOWN_MESSAGE", f"Unknown message type: {message_type}")
+
+    @staticmethod
+    def _find_session_by_request_id(request_id: str) -> Optional[str]:
+        """取得 reducer 為這個 request_id 建立的 session_id"""
+        for session_id, session in get_all_sessions(store.state).items():
+            if hasattr(session, 'get') and session.get('request_id') == request_id:
+                return session_id
+
+        # Fallback: 從 SessionEffects 獲取
+        from src.store.sessions.sessions_effect import SessionEffects
+        return SessionEffects.get_session_id_by_request_id(request_id)
+
+    # === Session 擁有權 ===
+
+    def _ensure_group(self, stream_key: str):
+        """建立 consumer group（已存在時略過）"""
+        try:
+            self.client.xgroup_create(stream_key, self.group, id="0", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def _own(self, session_id: str):
+        stream_key = self.keys.session_in(session_id)
+        self._ensure_group(stream_key)
+        with self._owned_lock:
+            self.owned[session_id] = stream_key
+        metrics.bind_session(session_id, "redis_streams")
+
+    def _release(self, session_id: str, delete_streams: bool = False):
+        """放棄 session 擁有權；session 結束時一併刪除輸入串流與 metadata"""
+        with self._owned_lock:
+            self.owned.pop(session_id, None)
+
+        if delete_streams:
+            pipe = self.client.pipeline()
+            pipe.delete(self.keys.session_in(session_id), self.keys.session_meta(session_id))
+            pipe.srem(self.keys.sessions, session_id)
+            # 輸出串流保留一段時間讓客戶端讀完
+            pipe.expire(self.keys.session_out(session_id), self.stream_ttl)
+            pipe.execute()
+
+    def _prune_owned(self, check_streams: bool = False):
+        """移除已不存在於 Store（例如逾時清理）或輸入串流已被刪除的 session"""
+        with self._owned_lock:
+            owned = list(self.owned.items())
+        for session_id, stream_key in owned:
+            if not get_session_by_id(session_id)(store.state):
+                self._release(session_id, delete_streams=True)
+                logger.info(f"🧹 Session 已不存在，釋放 Streams 擁有權 [{session_id}]")
+            elif check_streams and not self.client.exists(stream_key):
+                store.dispatch(delete_session(session_id))
+                self._release(session_id, delete_streams=True)
+                logger.info(f"🧹 輸入串流已被刪除，結束 session [{session_id}]")
+
+    # === 心跳與失效接手 ===
+
+    def _heartbeat(self):
+        self.client.set(self.keys.node(self.consumer), int(time.time()), ex=self.node_ttl)
+
+    def _maintenance(self):
+        """心跳、清理、接手失效節點的請求與 session"""
+        self._heartbeat()
+        self._prune_owned()
+
+        # 失效節點讀取但尚未確認的 create_session
+        _, messages, *_ = self.client.xautoclaim(
+            self.keys.requests, self.group, self.consumer,
+            min_idle_time=self.claim_idle_ms, start_id="0-0", count=self.batch_size
+        )
+        if messages:
+            logger.warning(f"♻️ 接手 {len(messages)} 個未確認的 create_session 請求")
+            self._process(self.keys.requests, messages)
+
+        # 心跳已過期的節點擁有的 session
+        for raw_session_id in self.client.smembers(self.keys.sessions):
+            session_id = raw_session_id.decode()
+            with self._owned_lock:
+                if session_id in self.owned:
+                    continue
+
+            meta = {k.decode(): v.decode() for k, v in self.client.hgetall(self.keys.session_meta(session_id)).items()}
+            owner = meta.get("owner")
+            if not owner:
+                self.client.srem(self.keys.sessions, session_id)
+                continue
+            if self.client.exists(self.keys.node(owner)):
+                continue
+
+            if self._takeover(keys=[self.keys.session_meta(session_id)], args=[owner, self.consumer]):
+                self._restore_session(session_id, owner, meta)
+
+    def _restore_session(self, session_id: str, previous_owner: str, meta: Dict[str, str]):
+        """以相同的 session_id 重建失效節點的 session，並處理其尚未確認的輸入"""
+        logger.warning(f"♻️ 接手 session {session_id}（原節點 {previous_owner} 已失效）")
+
+        store.dispatch(create_session(
+            strategy=meta.get("strategy", "non_streaming"),
+            request_id=meta.get("request_id"),
+            session_id=session_id
+        ))
+        if "sample_rate" in meta:
+            store.dispatch(start_listening(
+                session_id=session_id,
+                sample_rate=int(meta["sample_rate"]),
+                channels=int(meta.get("channels", 1)),
+                format=meta.get("format", "int16")
+            ))
+
+        self._own(session_id)
+
+        # 原節點已讀取但未確認的訊息（原節點已失效，不需等待 idle 時間）
+        stream_key = self.keys.session_in(session_id)
+        start_id = "0-0"
+        while True:
+            start_id, messages, *_ = self.client.xautoclaim(
+                stream_key, self.group, self.consumer, min_idle_time=0, start_id=start_id, count=self.batch_size
+            )
+            if messages:
+                self._process(stream_key, messages)
+            if not messages or start_id in (b"0-0", "0-0"):
+                break
+
+    # === Store 事件 ===
+
+    def _setup_store_listeners(self):
+        """設定 Store 事件監聽器"""
+
+        def handle_store_action(action):
+            """處理 Store 的 action 事件"""
+            # action 可能是 dict 或 Action 物件
+            if hasattr(action, "type"):
+                action_type = action.type
+                payload = action.payload if hasattr(action, "payload") else {}
+            else:
+                action_type = action.get("type", "") if isinstance(action, dict) else ""
+                payload = action.get("payload", {}) if isinstance(action, dict) else {}
+
+            if action_type not in (
+                transcribe_done.type,
+                transcribe_partial.type,
+                transcribe_final.type,
+                play_asr_feedback.type,
+            ):
+                return
+
+            # 只處理這個節點擁有的 session
+            session_id = payload if isinstance(payload, str) else payload.get("session_id")
+            with self._owned_lock:
+                if session_id not in self.owned:
+                    return
+
+            try:
+                self._publish_store_event(session_id, action_type, payload)
+            except Exception as e:
+                logger.error(f"發布 Redis Streams 事件失敗 [{action_type}]: {e}")
+
+        # 訂閱 Store 的 action stream
+        self.store_subscription = store._action_subject.subscribe(handle_store_action)
+
+    def _publish_store_event(self, session_id: str, action_type: str, payload: Any):
+        """把 Store 事件寫到 session 的輸出串流"""
+        timestamp = datetime.now().isoformat()
+        stream_key = self.keys.session_out(session_id)
+
+        if action_type == transcribe_done.type:
+            result = payload.get("result")
+            if result:
+                text = (getattr(result, "full_text", "") or "").strip()
+                language = getattr(result, "language", None)
+                duration = getattr(result, "duration", None)
+            else:
+                last_transcription = get_session_last_transcription(session_id)(store.state)
+                if not last_transcription:
+                    logger.warning(f"Session {session_id} 沒有轉譯結果")
+                    return
+                text = last_transcription.get("full_text", "")
+                language = last_transcription.get("language")
+                duration = last_transcription.get("duration")
+
+            if not text:
+                logger.warning(f"Session {session_id} 的轉譯結果為空")
+                return
+
+            self._xadd(stream_key, RedisStreamTypes.TRANSCRIBE_DONE, TranscribeDoneMessage(
+                session_id=session_id, text=text, language=language, duration=duration, timestamp=timestamp
+            ))
+            metrics.observe_published(session_id)
+            logger.info(f'📤 轉譯結果已發布 [Streams: {session_id}]: "{text[:100]}..."')
+
+        elif action_type == transcribe_partial.type:
+            self._xadd(stream_key, RedisStreamTypes.TRANSCRIBE_PARTIAL, TranscribePartialMessage(
+                session_id=session_id,
+                text=payload.get("text", ""),
+                committed=payload.get("committed", ""),
+                tentative=payload.get("tentative", ""),
+                timestamp=timestamp
+            ))
+
+        elif action_type == transcribe_final.type:
+            result = payload.get("result")
+            segments = getattr(result, "segments", None) or []
+            self._xadd(stream_key, RedisStreamTypes.TRANSCRIBE_FINAL, TranscribeFinalMessage(
+                session_id=session_id,
+                text=payload.get("text", ""),
+                start_time=segments[0].start_time if segments else None,
+                end_time=segments[-1].end_time if segments else None,
+                duration=getattr(result, "duration", None),
+                timestamp=timestamp
+            ))
+
+        else:
+            command = payload.get("command") if hasattr(payload, "get") else None
+            if command not in ("play", "stop"):
+                logger.warning(f"未知的 ASR 回饋音 command: {command}")
+                return
+            self._xadd(stream_key, RedisStreamTypes.PLAY_ASR_FEEDBACK, PlayASRFeedbackMessage(
+                session_id=session_id, command=command, timestamp=timestamp
+            ))
+
+    # === 訊息發送 ===
+
+    def _xadd(self, stream_key: str, message_type: str, message: BaseModel):
+        """寫入輸出串流（以 MAXLEN 限制長度）"""
+        self.client.xadd(
+            stream_key,
+            {self.keys.TYPE: message_type, self.keys.DATA: json.dumps(message.model_dump(), ensure_ascii=False)},
+            maxlen=self.response_maxlen,
+            approximate=True
+        )
+
+    def _send_error(self, session_id: Optional[str], error_code: str, error_message: str):
+        """發送錯誤訊息到 session 的輸出串流（沒有 session 時只記錄）"""
+        if session_id is None:
+            logger.error(f"❌ Redis Streams 請求錯誤: [{error_code}] {error_message}")
+            return
+        try:
+            self._xadd(self.keys.session_out(session_id), RedisStreamTypes.ERROR, ErrorMessage(
+                session_id=session_id, error_code=error_code, error_message=error_message
+            ))
+        except Exception as e:
+            logger.error(f"發送錯誤訊息失敗: {e}")
+
+    def stop(self):
+        """停止 Redis Streams 伺服器
+
+        擁有的 session 不刪除：移除心跳後，其他節點在下一次維護時接手。
+        """
+        if not self.is_running:
+            return
+
+        logger.info("🛑 正在停止 Redis Streams 伺服器...")
+        self.is_running = False
+        self._stop_event.set()
+
+        for thread in self._threads:
+            thread.join(timeout=self.block_ms / 1000 + 1.0)
+
+        # 清理 Store 訂閱
+        if self.store_subscription:
+            self.store_subscription.dispose()
+
+        if self.client is not None:
+            try:
+                self.client.delete(self.keys.node(self.consumer))
+                self.client.close()
+            except Exception:
+                pass
+
+        logger.info("✅ Redis Streams 伺服器已停止")
+
+
+# 模組級單例
+redis_streams_server = RedisStreamsServer()
+
+
+def initialize():
+    """初始化 Redis Streams 伺服器（供 main.py 調用）"""
+    return redis_streams_server.initialize()
+
+
+def stop():
+    """停止 Redis Streams 伺服器（供 main.py 調用）"""
+    redis_streams_server.stop()
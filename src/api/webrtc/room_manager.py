@@ -15,9 +15,13 @@ from livekit.api import AccessToken, VideoGrants, TokenVerifier
 import uuid6
 
 from src.store.main_store import store
+from src.core.audio_ingest import audio_ingest
+from src.core.metrics import metrics
+from src.interface.audio import AudioChunk
 from src.store.sessions.sessions_action import (
-    receive_audio_chunk,
     transcribe_done,
+    transcribe_partial,
+    transcribe_final,
     play_asr_feedback,
     start_listening,
     record_stopped,
@@ -223,14 +227,17 @@ class LiveKitRoomManager:
             async for event in audio_stream:
                 try:
                     # AudioFrameEvent → AudioFrame → bytes (16-bit PCM)
-                    audio_bytes = event.frame.data.tobytes()
+                    frame = event.frame
+                    audio_bytes = frame.data.tobytes()
                     
-                    # 分發到 Store（與 http_sse 相同的處理流程）
-                    action = receive_audio_chunk(
-                        session_id=session_id,
-                        audio_data=audio_bytes
-                    )
-                    store.dispatch(action)
+                    # 直接送進音訊資料平面（與 http_sse 相同的處理流程，不經過 store）
+                    # 以音訊幀本身的取樣率與聲道標記，已是 16kHz 單聲道時不會再轉換
+                    audio_ingest.ingest(session_id, AudioChunk(
+                        data=audio_bytes,
+                        sample_rate=frame.sample_rate,
+                        channels=frame.num_channels,
+                        format="pcm_s16le"
+                    ))
                     
                     logger.debug(f"📥 音訊幀 [{session_id}]: {len(audio_bytes)} bytes")
                     
@@ -559,10 +566,13 @@ class LiveKitRoomManager:
                 logger.debug(f"🔍 [WebRTC] 收到 action: {action_type}, payload 類型: {type(payload)}")
             
             # 只有我們關心的事件才處理
-            if action_type in [transcribe_done.type, play_asr_feedback.type]:
+            if action_type in [transcribe_done.type, play_asr_feedback.type, transcribe_final.type]:
                 logger.info(f"📡 [WebRTC] 處理 Store action: {action_type}")
                 # 安全地在事件循環中執行
                 self._schedule_async_task(action_type, payload)
+            elif action_type == transcribe_partial.type:
+                # 串流中間結果頻率高，不記錄 info 日誌
+                self._schedule_async_task(action_type, payload)
         
         # 訂閱 Store 的 action stream
         self.store_subscription = store._action_subject.subscribe(handle_store_action)
@@ -610,6 +620,13 @@ class LiveKitRoomManager:
                 # 設定超時避免永久等待
                 future.add_done_callback(lambda f: logger.debug(f"✅ 轉譯廣播完成") if not f.exception() else logger.error(f"❌ 轉譯廣播失敗: {f.exception()}"))
             
+            # 監聽串流轉譯事件
+            elif action_type in (transcribe_partial.type, transcribe_final.type):
+                future = asyncio.run_coroutine_threadsafe(
+                    self._broadcast_streaming_transcription(action_type, payload), self.loop
+                )
+                future.add_done_callback(lambda f: logger.error(f"❌ 串流轉譯廣播失敗: {f.exception()}") if f.exception() else None)
+            
             # 監聽 ASR 回饋音事件 (play_asr_feedback action)
             elif action_type == play_asr_feedback.type:
                 command = payload.get("command") if hasattr(payload, "get") else None
@@ -651,12 +668,52 @@ class LiveKitRoomManager:
                     reliable=True,
                     topic=DataChannelTopics.ASR_RESULT  # 使用 ASR 結果主題廣播
                 )
+                metrics.observe_published(session_id)
                 
                 logger.info(f"📤 轉譯結果已廣播 [session: {session_id}]: \"{message['text'][:50]}...\"")
                 
         except Exception as e:
             logger.error(f"廣播轉譯結果失敗: {e}")
     
+    async def _broadcast_streaming_transcription(self, action_type: str, payload: Dict[str, Any]):
+        """廣播串流轉譯的中間 / 最終結果給所有參與者"""
+        try:
+            session_id = payload.get("session_id")
+            if not session_id:
+                return
+            
+            if action_type == transcribe_partial.type:
+                message = {
+                    "type": DataChannelEvents.TRANSCRIBE_PARTIAL,
+                    "session_id": session_id,
+                    "text": payload.get("text", ""),
+                    "committed": payload.get("committed", ""),
+                    "tentative": payload.get("tentative", ""),
+                    "timestamp": datetime.now().isoformat()
+                }
+            else:
+                result = payload.get("result")
+                segments = getattr(result, "segments", None) or []
+                message = {
+                    "type": DataChannelEvents.TRANSCRIBE_FINAL,
+                    "session_id": session_id,
+                    "text": payload.get("text", ""),
+                    "start_time": segments[0].start_time if segments else None,
+                    "end_time": segments[-1].end_time if segments else None,
+                    "duration": getattr(result, "duration", None),
+                    "timestamp": datetime.now().isoformat()
+                }
+            
+            if self.room and self.room.local_participant:
+                await self.room.local_participant.publish_data(
+                    json.dumps(message).encode(),
+                    reliable=True,
+                    topic=DataChannelTopics.ASR_RESULT
+                )
+                
+        except Exception as e:
+            logger.error(f"廣播串流轉譯結果失敗: {e}")
+    
     async def _broadcast_asr_feedback_play(self, payload: Union[str, Dict[str, Any]]):
         """廣播 ASR 回饋音播放事件"""
         try:
@@ -871,6 +928,7 @@ class LiveKitRoomManager:
             "is_connected": False,
             "is_listening": False
         }
+        metrics.bind_session(session_id, "webrtc")
         logger.debug(f"➕ Session 已加入: {session_id}")
     
     def remove_session(self, session_id: str):
@@ -45,6 +45,8 @@ class DataChannelEvents:
     
     # === 基於 OutputAction 的事件 ===
     TRANSCRIBE_DONE = OutputAction.TRANSCRIBE_DONE         # 轉譯完成
+    TRANSCRIBE_PARTIAL = OutputAction.TRANSCRIBE_PARTIAL   # 串流轉譯中間結果
+    TRANSCRIBE_FINAL = OutputAction.TRANSCRIBE_FINAL       # 串流轉譯最終結果
     PLAY_ASR_FEEDBACK = OutputAction.PLAY_ASR_FEEDBACK     # 播放 ASR 回饋音
     ERROR_REPORTED = OutputAction.ERROR_REPORTED           # 錯誤已回報
     
@@ -0,0 +1,46 @@
+"""WebSocket API 端點與訊息類型定義"""
+
+from src.interface.action import InputAction, OutputAction
+
+
+class WSEndpoints:
+    """WebSocket 端點定義"""
+    
+    # === API 路徑前綴 ===
+    API_PREFIX = "/api/v1"
+    
+    # === 音訊串流 (WebSocket) ===
+    # 一條連線對應一個 session：第一個文字訊息協商 session 與音訊格式，之後的二進位訊息都是原始音訊
+    AUDIO_STREAM = f"{API_PREFIX}/ws/audio"                            # WS - 雙向音訊串流
+    
+    # === 監控 (GET) ===
+    STATS = f"{API_PREFIX}/ws/stats"                                   # GET - 連線與接收佇列統計
+    HEALTH_READY = "/health/ready"                                     # GET - 啟動元件就緒狀態（未就緒回應 503）
+
+
+class WSMessageTypes:
+    """WebSocket 文字訊息類型（JSON 的 type 欄位）- 基於 Action 定義保持協議一致性"""
+    
+    # === 客戶端 -> ASRHub ===
+    START = "start"                                        # 協商 session 與音訊格式（必須是第一個訊息）
+    WAKE_ACTIVATE = InputAction.WAKE_ACTIVATED             # 喚醒啟用
+    WAKE_DEACTIVATE = InputAction.WAKE_DEACTIVATED         # 喚醒停用
+    STOP = "stop"                                          # 結束串流（伺服器關閉連線）
+    
+    # === ASRHub -> 客戶端 ===
+    SESSION_READY = "session_ready"                        # 協商完成，可以開始送二進位音訊
+    TRANSCRIBE_DONE = OutputAction.TRANSCRIBE_DONE         # 轉譯完成
+    TRANSCRIBE_PARTIAL = OutputAction.TRANSCRIBE_PARTIAL   # 串流轉譯中間結果
+    TRANSCRIBE_FINAL = OutputAction.TRANSCRIBE_FINAL       # 串流轉譯最終結果
+    PLAY_ASR_FEEDBACK = OutputAction.PLAY_ASR_FEEDBACK     # 播放 ASR 回饋音
+    BACKPRESSURE = "backpressure"                          # 處理落後，伺服器暫停讀取 retry_after 秒
+    ERROR = OutputAction.ERROR_REPORTED                    # 錯誤
+
+
+class WSCloseCodes:
+    """WebSocket 關閉代碼（4000-4999 為應用程式自訂）"""
+    
+    NORMAL = 1000                  # 客戶端送出 stop
+    PROTOCOL_ERROR = 4400          # 第一個訊息不是合法的 start
+    SESSION_NOT_FOUND = 4404       # 指定的 session 不存在或已結束
+    INTERNAL_ERROR = 4500          # 伺服器錯誤
@@ -0,0 +1,52 @@
+"""WebSocket API 資料模型定義"""
+
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+# === 客戶端訊息 (文字訊息) ===
+
+class StartMessage(BaseModel):
+    """協商訊息 - 連線後的第一個訊息，建立（或接續）session 並設定音訊參數"""
+    type: str = Field(default="start", description="訊息類型")
+    session_id: Optional[str] = Field(default=None, description="既有的 Session ID（省略時建立新 session）")
+    request_id: Optional[str] = Field(default=None, description="客戶端請求 ID（可選）")
+    strategy: str = Field(default="non_streaming", description="ASR 策略: batch, non_streaming, streaming")
+    sample_rate: int = Field(default=16000, description="取樣率 (Hz)")
+    channels: int = Field(default=1, description="聲道數")
+    format: str = Field(default="pcm_s16le", description="音訊格式: pcm_s16le, pcm_f32le, opus…")
+
+
+class WakeMessage(BaseModel):
+    """喚醒啟用/停用訊息"""
+    type: str = Field(..., description="wake_activated 或 wake_deactivated")
+    source: str = Field(default="ui", description="來源: visual, ui, keyword, vad_silence_timeout")
+
+
+# === 伺服器訊息 (文字訊息) ===
+
+class SessionReadyEvent(BaseModel):
+    """協商完成事件"""
+    type: str = Field(default="session_ready", description="訊息類型")
+    session_id: str = Field(..., description="Session ID")
+    request_id: Optional[str] = Field(default=None, description="請求 ID")
+    sample_rate: int = Field(..., description="取樣率 (Hz)")
+    channels: int = Field(..., description="聲道數")
+    format: str = Field(..., description="音訊格式")
+    timestamp: str = Field(..., description="時間戳")
+
+
+class BackpressureEvent(BaseModel):
+    """背壓事件 - 伺服器暫停讀取音訊"""
+    type: str = Field(default="backpressure", description="訊息類型")
+    session_id: str = Field(..., description="Session ID")
+    queue_depth: int = Field(..., description="接收佇列中尚未處理的 chunk 數")
+    retry_after: float = Field(..., description="暫停秒數")
+
+
+class ErrorEvent(BaseModel):
+    """錯誤事件"""
+    type: str = Field(default="error_reported", description="訊息類型")
+    error_code: str = Field(..., description="錯誤代碼")
+    error_message: str = Field(..., description="錯誤訊息")
+    session_id: Optional[str] = Field(default=None, description="相關的 Session ID")
@@ -0,0 +1,572 @@
+"""
+WebSocket 伺服器實現
+
+以一條持久的二進位 WebSocket 連線傳送即時音訊，取代每個 chunk 一次 HTTP POST：
+
+1. 連線後客戶端送出 start 文字訊息，協商 session 與音訊格式（只做一次）
+2. 之後每個二進位訊息就是一段原始音訊（PCM 或串流編碼），不帶任何 metadata，
+   每個 chunk 的額外負擔只有 WebSocket frame header（2-14 bytes）
+3. transcribe_done、串流轉譯結果與 ASR 回饋音事件以 JSON 文字訊息從同一條連線推回
+
+音訊送進 ingest worker pool，不在事件迴圈中轉換；session 處理落後時伺服器暫停讀取，
+由 TCP 流量控制讓客戶端自然降速。
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+import uvicorn
+import uuid6
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+
+from src.api.websocket.endpoints import WSEndpoints, WSMessageTypes, WSCloseCodes
+from src.api.websocket.models import (
+    StartMessage,
+    WakeMessage,
+    SessionReadyEvent,
+    BackpressureEvent,
+    ErrorEvent,
+)
+
+from src.store.main_store import store
+from src.store.sessions.sessions_action import (
+    create_session,
+    delete_session,
+    start_listening,
+    wake_activated,
+    wake_deactivated,
+    transcribe_done,
+    transcribe_partial,
+    transcribe_final,
+    play_asr_feedback,
+)
+from src.store.sessions.sessions_selector import (
+    get_session_by_id,
+    get_all_sessions,
+    get_session_last_transcription,
+)
+from src.core.audio_ingest import audio_ingest
+from src.core.ingest_workers import ingest_workers
+from src.core.metrics import metrics
+from src.core.post_pipeline import post_pipeline
+from src.core.speculative_asr import speculative_asr
+from src.core.startup import startup
+from src.interface.exceptions import IngestBackpressureError, SessionManagementError
+from src.config.manager import ConfigManager
+from src.utils.logger import logger
+
+
+class _WSConnection:
+    """一條 WebSocket 連線（對應一個 session）"""
+
+    __slots__ = (
+        'websocket', 'session_id', 'owns_session', 'send_lock',
+        'connected_at', 'chunks', 'bytes', 'backpressure_events'
+    )
+
+    def __init__(self, websocket: WebSocket, session_id: str, owns_session: bool):
+        self.websocket = websocket
+        self.session_id = session_id
+        self.owns_session = owns_session    # session 由這條連線建立，斷線時刪除
+        self.send_lock = asyncio.Lock()     # 事件推送與背壓通知可能同時送出
+        self.connected_at = time.time()
+
+        # 統計
+        self.chunks = 0
+        self.bytes = 0
+        self.backpressure_events = 0
+
+
+class WebSocketServer:
+    """WebSocket 伺服器"""
+
+    def __init__(self):
+        """初始化 WebSocket 伺服器"""
+        self.config_manager = ConfigManager()
+        self.ws_config = self.config_manager.api.websocket
+
+        if not self.ws_config.enabled:
+            logger.info("WebSocket 服務已停用")
+            return
+
+        # FastAPI 應用程式
+        self.app = FastAPI(
+            title="ASR Hub WebSocket API",
+            version="1.0.0",
+            description="語音識別中介服務 WebSocket 二進位音訊串流 API"
+        )
+
+        # 連線管理
+        self.connections: Dict[str, _WSConnection] = {}  # session_id -> 連線
+
+        # Store 訂閱
+        self.store_subscription = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # 系統狀態
+        self.start_time = time.time()
+        self.is_running = False
+
+        # 設定路由
+        self._setup_routes()
+
+    def _setup_routes(self):
+        """設定 API 路由"""
+
+        @self.app.websocket(WSEndpoints.AUDIO_STREAM)
+        async def audio_stream_endpoint(websocket: WebSocket):
+            """雙向音訊串流"""
+            await self._handle_connection(websocket)
+
+        @self.app.get(WSEndpoints.STATS)
+        async def stats_endpoint():
+            """連線與接收佇列統計"""
+            return {
+                "uptime": time.time() - self.start_time,
+                "connections": {
+                    session_id: {
+                        "connected_seconds": time.time() - conn.connected_at,
+                        "chunks": conn.chunks,
+                        "bytes": conn.bytes,
+                        "backpressure_events": conn.backpressure_events,
+                    }
+                    for session_id, conn in self.connections.items()
+                },
+                "ingest_workers": ingest_workers.get_stats(),
+                "audio_ingest": audio_ingest.get_stats(),
+                "post_pipeline": post_pipeline.get_stats(),
+                "speculative_asr": speculative_asr.get_stats(),
+            }
+
+        @self.app.get(WSEndpoints.HEALTH_READY)
+        async def health_ready_endpoint():
+            """各啟動元件的就緒狀態（必要元件未全部就緒時回應 503）"""
+            readiness = startup.get_readiness()
+            return JSONResponse(
+                content=readiness,
+                status_code=status.HTTP_200_OK if readiness["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+    # === 連線處理 ===
+
+    async def _handle_connection(self, websocket: WebSocket):
+        """處理一條 WebSocket 連線：協商 → 接收音訊 → 清理"""
+        await websocket.accept()
+
+        connection = await self._negotiate(websocket)
+        if connection is None:
+            return
+
+        session_id = connection.session_id
+        self.connections[session_id] = connection
+
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+
+                audio_bytes = message.get("bytes")
+                if audio_bytes is not None:
+                    if not await self._submit_audio(connection, audio_bytes):
+                        break
+                    continue
+
+                text = message.get("text")
+                if text is not None and not await self._handle_control(connection, text):
+                    break
+
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            logger.error(f"WebSocket 連線錯誤 [{session_id}]: {e}")
+            await self._close(websocket, WSCloseCodes.INTERNAL_ERROR)
+        finally:
+            self.connections.pop(session_id, None)
+            if connection.owns_session:
+                store.dispatch(delete_session(session_id))
+            logger.info(
+                f"🔌 WebSocket 連線結束 [{session_id}]: {connection.chunks} chunks, {connection.bytes} bytes"
+            )
+
+    async def _negotiate(self, websocket: WebSocket) -> Optional[_WSConnection]:
+        """讀取 start 訊息，建立（或接續）session 並設定音訊參數"""
+        try:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return None
+
+            text = message.get("text")
+            if text is None:
+                raise ValueError("first message must be a start text message")
+            start = StartMessage(**json.loads(text))
+            if start.type != WSMessageTypes.START:
+                raise ValueError(f"first message must be '{WSMessageTypes.START}', got '{start.type}'")
+
+        except (ValueError, ValidationError) as e:
+            # json.JSONDecodeError 是 ValueError 的子類別
+            await self._send_error(websocket, "PROTOCOL_ERROR", str(e))
+            await self._close(websocket, WSCloseCodes.PROTOCOL_ERROR)
+            return None
+
+        request_id = start.request_id or str(uuid6.uuid7())
+        owns_session = start.session_id is None
+
+        if owns_session:
+            store.dispatch(create_session(strategy=start.strategy, request_id=request_id))
+            session_id = self._find_session_by_request_id(request_id)
+        else:
+            session_id = start.session_id
+
+        if not session_id or not get_session_by_id(session_id)(store.state):
+            await self._send_error(websocket, "SESSION_NOT_FOUND", f"Session {session_id} not found", session_id)
+            await self._close(websocket, WSCloseCodes.SESSION_NOT_FOUND)
+            return None
+        metrics.bind_session(session_id, "websocket")
+
+        # 只設定一次音訊參數，之後的二進位訊息都依此解讀
+        store.dispatch(start_listening(
+            session_id=session_id,
+            sample_rate=start.sample_rate,
+            channels=start.channels,
+            format=start.format
+        ))
+
+        connection = _WSConnection(websocket, session_id, owns_session)
+        await self._send_event(connection, SessionReadyEvent(
+            session_id=session_id,
+            request_id=request_id,
+            sample_rate=start.sample_rate,
+            channels=start.channels,
+            format=start.format,
+            timestamp=datetime.now().isoformat()
+        ).model_dump())
+
+        logger.info(
+            f"✅ WebSocket 串流就緒 [{session_id}]: {start.sample_rate}Hz, {start.channels}ch, {start.format}"
+        )
+        return connection
+
+    @staticmethod
+    def _find_session_by_request_id(request_id: str) -> Optional[str]:
+        """取得 reducer 為這個 request_id 建立的 session_id"""
+        for session_id, session in get_all_sessions(store.state).items():
+            if hasattr(session, 'get') and session.get('request_id') == request_id:
+                return session_id
+
+        # Fallback: 從 SessionEffects 獲取
+        from src.store.sessions.sessions_effect import SessionEffects
+        return SessionEffects.get_session_id_by_request_id(request_id)
+
+    async def _submit_audio(self, connection: _WSConnection, audio_bytes: bytes) -> bool:
+        """把一個二進位音訊訊息送進 ingest worker pool
+
+        佇列已滿時不丟棄音訊，而是暫停讀取這條連線（TCP 流量控制讓客戶端降速）。
+
+        Returns:
+            False 表示 session 已不存在，應關閉連線
+        """
+        session_id = connection.session_id
+        notified = False
+        while True:
+            try:
+                ingest_workers.submit(session_id, audio_bytes)
+                break
+            except IngestBackpressureError as e:
+                if not notified:
+                    notified = True
+                    connection.backpressure_events += 1
+                    await self._send_event(connection, BackpressureEvent(
+                        session_id=session_id,
+                        queue_depth=e.queue_depth,
+                        retry_after=e.retry_after
+                    ).model_dump())
+                await asyncio.sleep(e.retry_after)
+            except SessionManagementError as e:
+                await self._send_error(connection.websocket, "SESSION_NOT_FOUND", str(e), session_id)
+                await self._close(connection.websocket, WSCloseCodes.SESSION_NOT_FOUND)
+                return False
+
+        connection.chunks += 1
+        connection.bytes += len(audio_bytes)
+        return True
+
+    async def _handle_control(self, connection: _WSConnection, text: str) -> bool:
+        """處理協商後的文字控制訊息
+
+        Returns:
+            False 表示客戶端要求結束串流
+        """
+        session_id = connection.session_id
+        try:
+            message = json.loads(text)
+            message_type = message.get("type")
+
+            if message_type == WSMessageTypes.STOP:
+                await self._close(connection.websocket, WSCloseCodes.NORMAL)
+                return False
+
+            if message_type == WSMessageTypes.WAKE_ACTIVATE:
+                wake = WakeMessage(**message)
+                store.dispatch(wake_activated(session_id=session_id, source=wake.source))
+            elif message_type == WSMessageTypes.WAKE_DEACTIVATE:
+                wake = WakeMessage(**message)
+                store.dispatch(wake_deactivated(session_id=session_id, source=wake.source))
+            else:
+                await self._send_error(
+                    connection.websocket, "UNKNOWN_MESSAGE", f"Unknown message type: {message_type}", session_id
+                )
+
+        except (ValueError, ValidationError) as e:
+            await self._send_error(connection.websocket, "PROTOCOL_ERROR", str(e), session_id)
+
+        return True
+
+    # === 訊息發送 ===
+
+    async def _send_event(self, connection: _WSConnection, data: Dict[str, Any]):
+        """發送 JSON 文字訊息"""
+        try:
+            async with connection.send_lock:
+                await connection.websocket.send_text(json.dumps(data, ensure_ascii=False))
+        except Exception as e:
+            logger.debug(f"WebSocket 發送失敗 [{connection.session_id}]: {e}")
+
+    async def _send_error(
+        self,
+        websocket: WebSocket,
+        error_code: str,
+        error_message: str,
+        session_id: Optional[str] = None
+    ):
+        """發送錯誤訊息（協商階段尚未建立連線物件，直接使用 websocket）"""
+        connection = self.connections.get(session_id) if session_id else None
+        data = ErrorEvent(error_code=error_code, error_message=error_message, session_id=session_id).model_dump()
+        if connection is not None:
+            await self._send_event(connection, data)
+            return
+        try:
+            await websocket.send_text(json.dumps(data, ensure_ascii=False))
+        except Exception as e:
+            logger.debug(f"WebSocket 發送錯誤訊息失敗: {e}")
+
+    async def _close(self, websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass  # 連線可能已經關閉
+
+    # === Store 事件 ===
+
+    def _setup_store_listeners(self):
+        """設定 Store 事件監聽器"""
+
+        def handle_store_action(action):
+            """處理 Store 的 action 事件"""
+            # action 可能是 dict 或 Action 物件
+            if hasattr(action, "type"):
+                action_type = action.type
+                payload = action.payload if hasattr(action, "payload") else {}
+            else:
+                action_type = action.get("type", "") if isinstance(action, dict) else ""
+                payload = action.get("payload", {}) if isinstance(action, dict) else {}
+
+            if action_type not in (
+                transcribe_done.type,
+                transcribe_partial.type,
+                transcribe_final.type,
+                play_asr_feedback.type,
+            ):
+                return
+
+            # 只處理這個伺服器的連線
+            session_id = payload if isinstance(payload, str) else payload.get("session_id")
+            connection = self.connections.get(session_id) if session_id else None
+            if connection is None or self.loop is None:
+                return
+
+            asyncio.run_coroutine_threadsafe(
+                self._push_store_event(connection, action_type, payload), self.loop
+            )
+
+        # 訂閱 Store 的 action stream
+        self.store_subscription = store._action_subject.subscribe(handle_store_action)
+
+    async def _push_store_event(self, connection: _WSConnection, action_type: str, payload: Any):
+        """把 Store 事件轉成 WebSocket 文字訊息推回客戶端"""
+        try:
+            session_id = connection.session_id
+            timestamp = datetime.now().isoformat()
+
+            if action_type == transcribe_done.type:
+                data = self._transcribe_done_event(session_id, payload)
+                if data is None:
+                    return
+
+            elif action_type == transcribe_partial.type:
+                data = {
+                    "type": WSMessageTypes.TRANSCRIBE_PARTIAL,
+                    "session_id": session_id,
+                    "text": payload.get("text", ""),
+                    "committed": payload.get("committed", ""),
+                    "tentative": payload.get("tentative", ""),
+                }
+
+            elif action_type == transcribe_final.type:
+                result = payload.get("result")
+                segments = getattr(result, "segments", None) or []
+                data = {
+                    "type": WSMessageTypes.TRANSCRIBE_FINAL,
+                    "session_id": session_id,
+                    "text": payload.get("text", ""),
+                    "start_time": segments[0].start_time if segments else None,
+                    "end_time": segments[-1].end_time if segments else None,
+                    "duration": getattr(result, "duration", None),
+                }
+
+            else:
+                command = payload.get("command") if hasattr(payload, "get") else None
+                if command not in ("play", "stop"):
+                    logger.warning(f"未知的 ASR 回饋音 command: {command}")
+                    return
+                data = {
+                    "type": WSMessageTypes.PLAY_ASR_FEEDBACK,
+                    "session_id": session_id,
+                    "command": command,
+                }
+
+            data["timestamp"] = timestamp
+            await self._send_event(connection, data)
+
+            if action_type == transcribe_done.type:
+                metrics.observe_published(session_id)
+                logger.info(f'📤 轉譯結果已推送 [WebSocket: {session_id}]: "{data["text"][:100]}..."')
+
+        except Exception as e:
+            logger.error(f"推送 WebSocket 事件失敗 [{action_type}]: {e}")
+
+    @staticmethod
+    def _transcribe_done_event(session_id: str, payload: Any) -> Optional[Dict[str, Any]]:
+        """從 transcribe_done payload（或 Store 中最後的轉譯結果）組出事件"""
+        result = payload.get("result") if hasattr(payload, "get") else None
+
+        if result:
+            text = (getattr(result, "full_text", "") or "").strip()
+            language = getattr(result, "language", None)
+            duration = getattr(result, "duration", None)
+        else:
+            last_transcription = get_session_last_transcription(session_id)(store.state)
+            if not last_transcription:
+                logger.warning(f"Session {session_id} 沒有轉譯結果")
+                return None
+            text = last_transcription.get("full_text", "")
+            language = last_transcription.get("language")
+            duration = last_transcription.get("duration")
+
+        if not text:
+            logger.warning(f"Session {session_id} 的轉譯結果為空")
+            return None
+
+        return {
+            "type": WSMessageTypes.TRANSCRIBE_DONE,
+            "session_id": session_id,
+            "text": text,
+            "confidence": None,
+            "language": language,
+            "duration": duration,
+        }
+
+    # === 生命週期 ===
+
+    async def initialize(self):
+        """初始化 WebSocket 伺服器"""
+        if not self.ws_config.enabled:
+            return False
+
+        try:
+            # 設定 Store 監聽器
+            self._setup_store_listeners()
+
+            self.is_running = True
+            logger.info("✅ WebSocket 伺服器已初始化")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ WebSocket 初始化失敗: {e}")
+            return False
+
+    async def start(self):
+        """啟動 WebSocket 伺服器"""
+        if not self.is_running:
+            await self.initialize()
+
+        if not self.is_running:
+            return
+
+        # 儲存當前事件循環（Store 事件由其他執行緒排入）
+        self.loop = asyncio.get_running_loop()
+
+        # 設定 uvicorn 配置
+        config = uvicorn.Config(
+            app=self.app,
+            host=self.ws_config.host,
+            port=self.ws_config.port,
+            ws_max_size=int(getattr(self.ws_config, 'max_message_size', 10 * 1024 * 1024)),
+            ws_ping_interval=float(getattr(self.ws_config, 'ping_interval', 30)),
+            log_level="warning"  # 減少 uvicorn 的日誌輸出
+        )
+
+        # 建立伺服器
+        server = uvicorn.Server(config)
+
+        logger.info(
+            f"🚀 WebSocket 伺服器啟動於 ws://{self.ws_config.host}:{self.ws_config.port}{WSEndpoints.AUDIO_STREAM}"
+        )
+
+        # 啟動伺服器
+        await server.serve()
+
+    def stop(self):
+        """停止 WebSocket 伺服器"""
+        if not self.is_running:
+            return
+
+        logger.info("🛑 正在停止 WebSocket 伺服器...")
+        self.is_running = False
+
+        # 關閉所有連線（由各連線的 finally 清理 session）
+        if self.loop is not None:
+            for connection in list(self.connections.values()):
+                asyncio.run_coroutine_threadsafe(
+                    self._close(connection.websocket, WSCloseCodes.NORMAL), self.loop
+                )
+
+        # 清理 Store 訂閱
+        if self.store_subscription:
+            self.store_subscription.dispose()
+
+        logger.info("✅ WebSocket 伺服器已停止")
+
+
+# 模組級單例
+websocket_server = WebSocketServer()
+
+
+async def initialize():
+    """初始化 WebSocket 伺服器（供 main.py 調用）"""
+    return await websocket_server.initialize()
+
+
+async def start():
+    """啟動 WebSocket 伺服器（供 main.py 調用）"""
+    await websocket_server.start()
+
+
+def stop():
+    """停止 WebSocket 伺服器（供 main.py 調用）"""
+    websocket_server.stop()
@@ -0,0 +1,273 @@
+"""音訊資料平面（ingest fast path）
+
+API 層收到的音訊直接經過 converter 進入 audio_queue，不再經過 Redux store：
+- 每個 chunk 不再觸發 reducer（重建 immutable Map）與所有 action 訂閱者（SSE、Redis、WebRTC）
+- session 的音訊配置快取在本地，只在 start_listening / upload_started 時失效
+- 接收計數在本地累加，每 stats_flush_interval 秒以一個 audio_chunks_ingested action 回寫 store
+- 這裡是唯一的正規化階段：每個 chunk 以 AudioChunk 標記格式（未標記的依 session 音訊配置），
+  已是標準格式（16kHz 單聲道 int16）的直接推入，其他的只轉換一次
+
+只有控制事件（開始監聽、喚醒、錄音、轉譯…）仍經過 store。
+
+使用範例：
+    from src.core.audio_ingest import audio_ingest
+
+    if not audio_ingest.ingest(session_id, pcm_bytes):
+        ...  # session 不存在或尚未設定音訊配置
+
+    # 來源自帶格式時（例如 WebRTC 音訊幀）以 AudioChunk 標記，優先於 session 配置
+    audio_ingest.ingest(session_id, AudioChunk(data=frame_bytes, sample_rate=48000, channels=2))
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Union
+
+import numpy as np
+
+from src.core.audio_queue_manager import audio_queue
+from src.core.metrics import Stage, metrics
+from src.interface.audio import AudioChunk, CANONICAL_SAMPLE_RATE, CANONICAL_CHANNELS, CANONICAL_FORMAT
+from src.service.audio_converter import audio_converter
+from src.utils.logger import logger
+from src.utils.singleton import SingletonMixin
+from src.config.manager import ConfigManager
+
+
+class AudioIngest(SingletonMixin):
+    """音訊資料平面
+
+    SessionEffects 啟動時以 set_activator() 註冊「確保 session 正在監聽」的回呼，
+    每個 chunk 進來時呼叫（session 已在 processing 狀態時只是一次狀態檢查）。
+    """
+
+    def __init__(self):
+        if not hasattr(self, '_initialized'):
+            self._initialized = True
+
+            config = ConfigManager()
+            ingest_config = getattr(config.services, 'audio_ingest', None)
+            self.stats_flush_interval = getattr(ingest_config, 'stats_flush_interval', 1.0)
+
+            self._configs: Dict[str, Dict[str, Any]] = {}
+            self._pending_counts: Dict[str, int] = {}
+            self._activator: Optional[Callable[[str], None]] = None
+            self._lock = threading.Lock()
+
+            self._flush_thread: Optional[threading.Thread] = None
+            self._stop_event = threading.Event()
+
+            # 累計計數：多個 ingest worker 同時更新，一律在 _lock 內遞增與讀取
+            self.total_chunks = 0
+            self.total_rejected = 0
+            self.total_passthrough = 0
+            self.total_conversions = 0
+            self.total_stream_decodes = 0
+            self.total_conversion_errors = 0
+
+    # === 設定 ===
+
+    def set_activator(self, activator: Optional[Callable[[str], None]]) -> None:
+        """註冊每個 chunk 前呼叫的 session 啟動回呼（由 SessionEffects 提供）"""
+        self._activator = activator
+
+    def invalidate(self, session_id: str) -> None:
+        """session 的音訊配置已改變，下一個 chunk 重新從 store 讀取"""
+        with self._lock:
+            self._configs.pop(session_id, None)
+
+    def release_session(self, session_id: str) -> None:
+        """session 結束：清除配置快取與尚未回寫的計數（session 已從 store 移除）"""
+        with self._lock:
+            self._configs.pop(session_id, None)
+            self._pending_counts.pop(session_id, None)
+
+    def has_audio_config(self, session_id: str) -> bool:
+        """session 是否存在且已設定音訊配置（ingest 會接受它的音訊）"""
+        return bool(self._get_audio_config(session_id))
+
+    # === 資料 ===
+
+    def ingest(
+        self,
+        session_id: str,
+        audio_data: Union[bytes, bytearray, np.ndarray, AudioChunk],
+        track_stats: bool = True,
+        received_at: Optional[float] = None
+    ) -> bool:
+        """接收一個音訊 chunk：正規化為 16kHz 單聲道後推入 audio_queue
+
+        Args:
+            session_id: Session ID
+            audio_data: 依 session 音訊配置編碼的音訊，或已標記格式的 AudioChunk
+            track_stats: 是否計入 audio_chunks_received（經由 store 的舊路徑已由 reducer 計數）
+            received_at: API 收到 chunk 的時間（time.perf_counter()，預設為呼叫時）
+
+        Returns:
+            False 表示 session 不存在或尚未設定音訊配置
+        """
+        if received_at is None:
+            received_at = time.perf_counter()
+
+        audio_config = self._get_audio_config(session_id)
+        if not audio_config:
+            self._increment("total_rejected")
+            logger.error(
+                f"Session {session_id} has no audio configuration! "
+                "Audio config must be set when session is created or via START_LISTENING"
+            )
+            return False
+
+        activator = self._activator
+        if activator:
+            activator(session_id)
+
+        if isinstance(audio_data, AudioChunk):
+            chunk = audio_data
+        else:
+            chunk = AudioChunk(
+                data=audio_data,
+                sample_rate=audio_config.get("sample_rate") or CANONICAL_SAMPLE_RATE,
+                channels=audio_config.get("channels") or CANONICAL_CHANNELS,
+                format=audio_config.get("format") or CANONICAL_FORMAT,
+            )
+        self._normalize(session_id, chunk)
+        metrics.observe(Stage.INGEST, time.perf_counter() - received_at, session_id)
+
+        if track_stats:
+            self._count(session_id)
+        return True
+
+    # === 統計 ===
+
+    def flush_stats(self) -> None:
+        """把累積的接收計數回寫 store"""
+        with self._lock:
+            if not self._pending_counts:
+                return
+            counts = self._pending_counts
+            self._pending_counts = {}
+        self._dispatch_counts(counts)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """取得資料平面統計"""
+        with self._lock:
+            return {
+                "total_chunks": self.total_chunks,
+                "total_rejected": self.total_rejected,
+                "total_passthrough": self.total_passthrough,
+                "total_conversions": self.total_conversions,
+                "total_stream_decodes": self.total_stream_decodes,
+                "total_conversion_errors": self.total_conversion_errors,
+                "pending_stats": sum(self._pending_counts.values()),
+                "cached_configs": len(self._configs),
+                "stats_flush_interval": self.stats_flush_interval,
+            }
+
+    def shutdown(self) -> None:
+        """停止回寫執行緒並回寫剩餘計數"""
+        self._stop_event.set()
+        if self._flush_thread and self._flush_thread.is_alive():
+            self._flush_thread.join(timeout=self.stats_flush_interval + 1)
+        self._flush_thread = None
+        self.flush_stats()
+
+    # === 內部實作 ===
+
+    def _normalize(self, session_id: str, chunk: AudioChunk) -> None:
+        """唯一的正規化階段：標準格式直接推入，其他格式只轉換一次"""
+        if chunk.is_canonical:
+            self._increment("total_passthrough")
+            with metrics.timer(Stage.QUEUE_PUSH, session_id):
+                audio_queue.push(session_id, chunk.data)
+            return
+
+        if not isinstance(chunk.data, np.ndarray) and not audio_converter.is_raw_pcm(chunk.format):
+            # 壓縮格式交給 session 的常駐 FFmpeg worker，解碼後由 worker 推入 audio_queue
+            self._increment("total_stream_decodes")
+            if not audio_converter.feed_stream(
+                session_id,
+                chunk.data,
+                source_format=chunk.format,
+                source_sample_rate=chunk.sample_rate,
+                source_channels=chunk.channels,
+            ):
+                logger.warning(f"Dropped {chunk.format} chunk for session {session_id}")
+            return
+
+        # 帶 session_id 使用串流重新取樣器，濾波器狀態跨 chunk 延續
+        self._increment("total_conversions")
+        audio_data = chunk.data
+        try:
+            with metrics.timer(Stage.CONVERT, session_id):
+                audio_data = audio_converter.convert_audio(
+                    chunk.data,
+                    source_sample_rate=chunk.sample_rate,
+                    source_channels=chunk.channels,
+                    session_id=session_id,
+                    source_format=chunk.format,
+                )
+        except Exception as e:
+            self._increment("total_conversion_errors")
+            logger.error(f"Failed to convert audio sample rate: {e}")
+            logger.warning("Using original audio data - ASR may not work properly")
+
+        with metrics.timer(Stage.QUEUE_PUSH, session_id):
+            audio_queue.push(session_id, audio_data)
+
+    def _get_audio_config(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """取得 session 的音訊配置（快取，未命中時讀取 store 一次）"""
+        audio_config = self._configs.get(session_id)
+        if audio_config is not None:
+            return audio_config
+
+        from src.store.main_store import store
+        from src.store.sessions.sessions_selector import get_session_audio_config
+
+        audio_config = get_session_audio_config(session_id)(store.state)
+        if audio_config:
+            audio_config = dict(audio_config)
+            with self._lock:
+                self._configs[session_id] = audio_config
+        return audio_config
+
+    def _increment(self, counter: str) -> None:
+        """遞增一個累計計數（`+=` 不是原子操作，多個 ingest worker 同時遞增會遺失計數）"""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _count(self, session_id: str) -> None:
+        with self._lock:
+            self._pending_counts[session_id] = self._pending_counts.get(session_id, 0) + 1
+            self.total_chunks += 1
+            if self._flush_thread is None:
+                self._start_flush_thread()
+
+    def _start_flush_thread(self) -> None:
+        """啟動計數回寫執行緒（呼叫端需持有 _lock）"""
+        self._stop_event.clear()
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop,
+            name="audio-ingest-stats",
+            daemon=True
+        )
+        self._flush_thread.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop_event.wait(self.stats_flush_interval):
+            try:
+                self.flush_stats()
+            except Exception as e:
+                logger.error(f"Failed to flush audio ingest stats: {e}")
+
+    @staticmethod
+    def _dispatch_counts(counts: Dict[str, int]) -> None:
+        from src.store.main_store import store
+        from src.store.sessions.sessions_action import audio_chunks_ingested
+
+        for session_id, count in counts.items():
+            store.dispatch(audio_chunks_ingested(session_id, count))
+
+
+# 模組級單例實例
+audio_ingest: AudioIngest = AudioIngest()
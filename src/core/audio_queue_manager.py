@@ -1,16 +1,15 @@
 """音訊佇列管理器服務
 
 ASRHub 的簡單音訊佇列管理實作。
-使用記憶體內佇列。
+每個 session 使用預先配置的 int16 環形緩衝區，搭配平行的時間戳索引。
 遵循 KISS 原則 - 簡單、清楚、可維護。
 """
 
-import collections
+import bisect
 import threading
 import time
 from dataclasses import dataclass
-from typing import Dict, Deque, List, Optional, Tuple
-from threading import Lock, Event
+from typing import Callable, Dict, List, Optional, Tuple, Union
 import numpy as np
 
 from src.interface.audio_queue import IAudioQueueManager
@@ -23,21 +22,202 @@ from src.config.manager import ConfigManager
 @dataclass
 class TimestampedAudio:
     """帶時間戳的音頻片段"""
+    __slots__ = ('timestamp', 'audio', 'duration')
     timestamp: float  # Unix timestamp (高精度)
-    audio: AudioChunk  # 音頻數據
+    audio: np.ndarray  # 音頻數據（int16 環形緩衝區的零複製視圖）
     duration: float  # 這個 chunk 的持續時間（秒）
 
 
+class _SessionAudioRing:
+    """單一 session 的 int16 環形緩衝區與時間戳索引（非執行緒安全，由呼叫端持鎖）。
+
+    - 樣本位置使用絕對計數（只增不減），實體位置為 ``pos % capacity``
+    - 每個 chunk 在索引中記錄 (timestamp, 絕對起點, 樣本數)
+    - 讀取回傳 ring 的切片視圖；只有跨越緩衝區尾端的 chunk 才會複製
+    - 兩個邏輯起點：``history_head``（時間窗，供時間戳 API）與
+      ``pull_head``（破壞性 pull/size/clear 使用），實體資料保留到兩者中較早者
+    """
+
+    __slots__ = (
+        'sample_rate', '_buf', '_capacity', '_write_pos',
+        '_ts', '_starts', '_lengths', '_base',
+        'history_head', 'pull_head',
+    )
+
+    def __init__(self, capacity: int, sample_rate: int):
+        self.sample_rate = sample_rate
+        self._capacity = max(1, int(capacity))
+        self._buf = np.zeros(self._capacity, dtype=np.int16)
+        self._write_pos = 0  # 下一個樣本的絕對位置
+
+        # 平行索引（list 以支援 bisect）；_base 為 list[0] 對應的 chunk 序號
+        self._ts: List[float] = []
+        self._starts: List[int] = []
+        self._lengths: List[int] = []
+        self._base = 0
+
+        # chunk 序號（絕對）
+        self.history_head = 0
+        self.pull_head = 0
+
+    # ---------- 索引 ----------
+    @property
+    def tail(self) -> int:
+        """下一個 chunk 的序號。"""
+        return self._base + len(self._ts)
+
+    @property
+    def head(self) -> int:
+        """實體保留的第一個 chunk 序號。"""
+        return min(self.history_head, self.pull_head)
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        return self._ts[-1] if self._ts else None
+
+    def timestamp_at(self, seq: int) -> float:
+        return self._ts[seq - self._base]
+
+    def bisect_right(self, timestamp: float, lo: int) -> int:
+        """回傳第一個 timestamp > 指定值的 chunk 序號。"""
+        return bisect.bisect_right(self._ts, timestamp, lo - self._base) + self._base
+
+    def bisect_left(self, timestamp: float, lo: int) -> int:
+        """回傳第一個 timestamp >= 指定值的 chunk 序號。"""
+        return bisect.bisect_left(self._ts, timestamp, lo - self._base) + self._base
+
+    # ---------- 寫入 ----------
+    def append(self, samples: np.ndarray, timestamp: float) -> None:
+        n = len(samples)
+        live = self._write_pos - self._live_start()
+        if live + n > self._capacity:
+            self._grow(live + n)
+
+        self._write(self._write_pos, samples)
+        self._ts.append(timestamp)
+        self._starts.append(self._write_pos)
+        self._lengths.append(n)
+        self._write_pos += n
+
+    def _live_start(self) -> int:
+        head = self.head
+        if head >= self.tail:
+            return self._write_pos
+        return self._starts[head - self._base]
+
+    def _write(self, pos: int, samples: np.ndarray) -> None:
+        n = len(samples)
+        offset = pos % self._capacity
+        first = min(n, self._capacity - offset)
+        self._buf[offset:offset + first] = samples[:first]
+        if first < n:
+            self._buf[:n - first] = samples[first:]
+
+    def _read(self, pos: int, n: int) -> np.ndarray:
+        """讀取 n 個樣本（唯讀；多個讀者共用同一段樣本，需要修改時先 copy）"""
+        offset = pos % self._capacity
+        if offset + n <= self._capacity:
+            view = self._buf[offset:offset + n]  # 零複製視圖
+        else:
+            first = self._capacity - offset
+            view = np.concatenate((self._buf[offset:], self._buf[:n - first]))
+        view.setflags(write=False)
+        return view
+
+    def _grow(self, required: int) -> None:
+        """擴充容量（只在推入速度快於即時時發生，例如批次上傳）。"""
+        start = self._live_start()
+        live = self._read(start, self._write_pos - start).copy()
+
+        new_capacity = self._capacity
+        while new_capacity < required:
+            new_capacity *= 2
+        self._buf = np.zeros(new_capacity, dtype=np.int16)
+        self._capacity = new_capacity
+        self._write(start, live)
+        logger.debug(f"Audio ring grown to {new_capacity} samples")
+
+    # ---------- 讀取 ----------
+    def get(self, seq: int) -> TimestampedAudio:
+        i = seq - self._base
+        n = self._lengths[i]
+        return TimestampedAudio(
+            timestamp=self._ts[i],
+            audio=self._read(self._starts[i], n),
+            duration=n / self.sample_rate
+        )
+
+    def slice(self, start_seq: int, end_seq: int) -> List[TimestampedAudio]:
+        return [self.get(seq) for seq in range(start_seq, end_seq)]
+
+    # ---------- 淘汰 ----------
+    def expire_before(self, cutoff_time: float) -> None:
+        """時間窗淘汰：移動 history_head 到第一個 timestamp >= cutoff 的 chunk。"""
+        self.history_head = max(self.history_head, self.bisect_left(cutoff_time, self.history_head))
+        self._compact()
+
+    def limit_pending(self, max_chunks: Optional[int]) -> int:
+        """限制 pull 佇列的 chunk 數量，回傳被丟棄的數量。"""
+        if not max_chunks:
+            return 0
+        overflow = self.tail - self.pull_head - max_chunks
+        if overflow > 0:
+            self.pull_head += overflow
+            self._compact()
+            return overflow
+        return 0
+
+    def _compact(self) -> None:
+        """丟棄已不需要的索引項目（攤銷 O(1)）。"""
+        drop = self.head - self._base
+        if drop > 0 and (drop >= 1024 or drop * 2 >= len(self._ts)):
+            del self._ts[:drop]
+            del self._starts[:drop]
+            del self._lengths[:drop]
+            self._base += drop
+
+    @property
+    def buffered_samples(self) -> int:
+        return self._write_pos - self._live_start()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+
+def _to_int16_samples(chunk: Union[AudioChunk, np.ndarray, bytes, bytearray, memoryview]) -> np.ndarray:
+    """將推入的音訊統一為一維 int16 樣本（盡量零複製）。"""
+    data = chunk.data if isinstance(chunk, AudioChunk) else chunk
+
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        usable = len(data) - (len(data) % 2)
+        return np.frombuffer(data, dtype=np.int16, count=usable // 2)
+
+    audio = np.asarray(data)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    if audio.dtype == np.int16:
+        return audio
+    if np.issubdtype(audio.dtype, np.floating):
+        return (np.clip(audio, -1.0, 1.0) * 32767.0).astype(np.int16)
+    return audio.astype(np.int16)
+
+
 class AudioQueueManager(SingletonMixin, IAudioQueueManager):
     """基於 session 的簡單音訊佇列管理器。
     
     特性：
     - Thread-safe 佇列操作
     - 首次推入時自動建立佇列
+    - 每個 session 一個預先配置的 int16 環形緩衝區（只存一份資料）
+    - 時間戳查詢使用 bisect（O(log n)），讀取回傳零複製的 ndarray 視圖
     - 可選的最大佇列大小，自動移除最舊的片段
     - 使用 SingletonMixin 確保單例
     """
     
+    # audio_queue 內的音訊已統一為 16kHz 單聲道 int16
+    SAMPLE_RATE = 16000
+    
     def __init__(self, max_queue_size: Optional[int] = None):
         """初始化 AudioQueueManager。
         
@@ -56,48 +236,52 @@ class AudioQueueManager(SingletonMixin, IAudioQueueManager):
             self._ttl_seconds = queue_config.ttl_seconds
             self._cleanup_interval = queue_config.queue_cleanup_interval
             self._blocking_timeout = queue_config.blocking_timeout
-            self._blocking_sleep_interval = queue_config.blocking_sleep_interval
             
-            # 原有的佇列（保持向後相容）
-            self._queues: Dict[str, Deque[AudioChunk]] = {}
-            
-            # 新增：帶時間戳的佇列
-            self._timestamped_queues: Dict[str, Deque[TimestampedAudio]] = {}
+            # 每個 session 的環形緩衝區（音訊 + 時間戳索引）
+            self._rings: Dict[str, _SessionAudioRing] = {}
             
             # 每個 reader 的當前讀取位置（時間戳）
             self._reader_positions: Dict[str, Dict[str, float]] = {}
             
+            # 每個 reader 的游標（下一個要讀取的 chunk 序號；None 表示尚待依時間戳定位）
+            self._reader_cursors: Dict[str, Dict[str, Optional[int]]] = {}
+            
             # 每個 session 的開始時間
             self._session_start_times: Dict[str, float] = {}
             
             self._locks: Dict[str, threading.Lock] = {}
             
-            # 等待新數據的事件
-            self._new_data_events: Dict[str, Event] = {}
+            # 等待新數據的條件變數（與 session lock 共用同一把鎖）
+            self._conditions: Dict[str, threading.Condition] = {}
             
             # Global lock for queue registry operations
             self._registry_lock = threading.Lock()
             
+            # push 監聽者（例如 audio_scheduler），以 tuple 保存以便無鎖迭代
+            self._push_listeners: Tuple[Callable[[str], None], ...] = ()
+            
             # 配置參數
             self._max_history_duration = 30.0  # 最多保留 30 秒歷史
-            self._chunk_duration = 0.1  # 假設每個 chunk 是 100ms
+            self._ring_capacity = int(self._max_history_duration * self.SAMPLE_RATE)
             
-            logger.debug(f"音訊佇列管理器已初始化 - 支援時間戳記 "
+            logger.debug(f"音訊佇列管理器已初始化 - 環形緩衝區 "
                         f"(最大容量={self._max_queue_size}, 歷史記錄={self._max_history_duration}秒)")
     
     def _create_queue(self, session_id: str) -> None:
         """為 session 建立新佇列 (必須在 registry lock 內呼叫)。"""
-        self._queues[session_id] = collections.deque(maxlen=self._max_queue_size)
-        self._timestamped_queues[session_id] = collections.deque()
+        self._rings[session_id] = _SessionAudioRing(self._ring_capacity, self.SAMPLE_RATE)
         self._reader_positions[session_id] = {}
+        self._reader_cursors[session_id] = {}
         self._session_start_times[session_id] = time.time()
         self._locks[session_id] = threading.Lock()
-        self._new_data_events[session_id] = Event()
+        self._conditions[session_id] = threading.Condition(self._locks[session_id])
     
     def _ensure_queue(self, session_id: str) -> None:
         """確保 session 的佇列存在。"""
+        if session_id in self._rings:
+            return
         with self._registry_lock:
-            if session_id not in self._queues:
+            if session_id not in self._rings:
                 self._create_queue(session_id)
                 logger.debug(f"Created queue for session: {session_id}")
 
@@ -108,41 +292,51 @@ class AudioQueueManager(SingletonMixin, IAudioQueueManager):
             時間戳，失敗返回 -1
         """
         try:
-            if not chunk:
+            if chunk is None or (not isinstance(chunk, np.ndarray) and not chunk):
+                logger.warning(f"Empty chunk for session {session_id}")
+                return -1
+            
+            samples = _to_int16_samples(chunk)
+            if samples.size == 0:
                 logger.warning(f"Empty chunk for session {session_id}")
                 return -1
                 
-            current_time = time.time()
             self._ensure_queue(session_id)
             
             with self._locks[session_id]:
-                # 原有佇列（向後相容）
-                queue = self._queues[session_id]
-                if self._max_queue_size and len(queue) >= self._max_queue_size:
-                    logger.warning(
-                        f"Queue full for session {session_id}, dropping oldest chunk"
-                    )
-                    queue.popleft()
-                queue.append(chunk)
+                ring = self._rings[session_id]
                 
-                # 新增：時間戳佇列
-                timestamped = TimestampedAudio(
-                    timestamp=current_time,
-                    audio=chunk,
-                    duration=self._chunk_duration
-                )
-                ts_queue = self._timestamped_queues[session_id]
-                ts_queue.append(timestamped)
+                # 時間戳必須單調遞增，bisect 才能成立
+                current_time = time.time()
+                last_timestamp = ring.last_timestamp
+                if last_timestamp is not None and current_time <= last_timestamp:
+                    current_time = last_timestamp + 1e-6
                 
-                # 清理過期數據
+                # 先清理過期數據，騰出緩衝區空間
                 self._cleanup_old_audio(session_id)
                 
-                # 通知等待的 readers
-                self._new_data_events[session_id].set()
+                ring.append(samples, current_time)
+                
+                dropped = ring.limit_pending(self._max_queue_size)
+                if dropped:
+                    logger.warning(
+                        f"Queue full for session {session_id}, dropping oldest chunk"
+                    )
+                
+                # 喚醒等待此 session 的 readers（只有落後的 reader 會在等待）
+                self._conditions[session_id].notify_all()
                 
-                queue_size = len(queue)
-                logger.trace(f"Pushed chunk to {session_id} at {current_time:.3f} (size={queue_size})")
-                return current_time
+                logger.trace(f"Pushed chunk to {session_id} at {current_time:.3f} "
+                             f"(size={ring.tail - ring.pull_head})")
+            
+            # 在鎖外通知監聽者，避免監聽者回呼時與 session lock 互鎖
+            for listener in self._push_listeners:
+                try:
+                    listener(session_id)
+                except Exception as e:
+                    logger.error(f"Push listener error: {e}", session_id=session_id)
+            
+            return current_time
                 
         except Exception as e:
             logger.error(f"Failed to push chunk: {e}", session_id=session_id)
@@ -158,24 +352,16 @@ class AudioQueueManager(SingletonMixin, IAudioQueueManager):
             # 確保佇列存在
             self._ensure_queue(session_id)
             
-            if session_id not in self._queues:
-                logger.debug(f"No queue for session {session_id}")
-                return []
-            
             if count <= 0:
                 logger.warning(f"Invalid count {count} for session {session_id}")
                 return []
             
-            chunks: List[AudioChunk] = []
             with self._locks[session_id]:
-                queue = self._queues[session_id]
-                actual_count = min(count, len(queue))
-                
-                for _ in range(actual_count):
-                    chunks.append(queue.popleft())
+                chunks = self._pull_locked(self._rings[session_id], count)
                 
                 if chunks:
-                    logger.trace(f"Pulled {len(chunks)} chunks from {session_id} (remaining={len(queue)})")
+                    logger.trace(f"Pulled {len(chunks)} chunks from {session_id} "
+                                 f"(remaining={self._rings[session_id].tail - self._rings[session_id].pull_head})")
             
             return chunks
             
@@ -183,20 +369,39 @@ class AudioQueueManager(SingletonMixin, IAudioQueueManager):
             logger.error(f"Failed to pull chunks: {e}", session_id=session_id)
             return []
     
+    def _pull_locked(self, ring: _SessionAudioRing, count: int) -> List[AudioChunk]:
+        """破壞性拉取（必須持有 session lock）。"""
+        start = ring.pull_head
+        end = min(ring.tail, start + count)
+        chunks: List[AudioChunk] = [
+            AudioChunk(
+                data=item.audio,
+                sample_rate=self.SAMPLE_RATE,
+                channels=1,
+                timestamp=item.timestamp
+            )
+            for item in ring.slice(start, end)
+        ]
+        ring.pull_head = end
+        return chunks
+    
     def clear(self, session_id: str) -> bool:
         """清除 session 佇列中的所有片段。
         
+        只清除 pull() 可取得的片段；時間戳歷史仍保留給 pre-roll 與時間範圍查詢。
+        
         Returns:
             是否成功清除
         """
         try:
-            if session_id not in self._queues:
+            if session_id not in self._rings:
                 logger.debug(f"No queue to clear for session {session_id}")
                 return True  # 不存在也視為成功
             
             with self._locks[session_id]:
-                size = len(self._queues[session_id])
-                self._queues[session_id].clear()
+                ring = self._rings[session_id]
+                size = ring.tail - ring.pull_head
+                ring.pull_head = ring.tail
                 logger.debug(f"Cleared {size} chunks from {session_id}")
                 return True
                 
@@ -206,35 +411,34 @@ class AudioQueueManager(SingletonMixin, IAudioQueueManager):
     
     def size(self, session_id: str) -> int:
         """取得 session 佇列的當前大小。"""
-        if session_id not in self._queues:
+        if session_id not in self._rings:
             return 0
         
         with self._locks[session_id]:
-            return len(self._queues[session_id])
+            ring = self._rings[session_id]
+            return ring.tail - ring.pull_head
     
     def exists(self, session_id: str) -> bool:
         """檢查 session 是否存在佇列。"""
         with self._registry_lock:
-            return session_id in self._queues
+            return session_id in self._rings
     
     def remove(self, session_id: str) -> None:
         """移除整個 session 佇列。"""
         with self._registry_lock:
-            if session_id in self._queues:
+            if session_id in self._rings:
                 # Lock queue before removal to prevent concurrent access
                 with self._locks[session_id]:
-                    size = len(self._queues[session_id])
-                    del self._queues[session_id]
+                    ring = self._rings.pop(session_id)
+                    size = ring.tail - ring.pull_head
                     
                     # 清理時間戳相關資料
-                    if session_id in self._timestamped_queues:
-                        del self._timestamped_queues[session_id]
-                    if session_id in self._reader_positions:
-                        del self._reader_positions[session_id]
-                    if session_id in self._session_start_times:
-                        del self._session_start_times[session_id]
-                    if session_id in self._new_data_events:
-                        del self._new_data_events[session_id]
+                    self._reader_positions.pop(session_id, None)
+                    self._reader_cursors.pop(session_id, None)
+                    self._session_start_times.pop(session_id, None)
+                    
+                    # 喚醒仍在等待的 readers，讓它們發現 session 已移除
+                    self._conditions.pop(session_id).notify_all()
                 
                 del self._locks[session_id]
                 logger.info(f"Removed queue for {session_id} (had {size} chunks)")
@@ -242,13 +446,26 @@ class AudioQueueManager(SingletonMixin, IAudioQueueManager):
     def get_stats(self) -> Dict:
         """取得所有佇列的統計資訊。"""
         with self._registry_lock:
-            total_chunks = sum(len(q) for q in self._queues.values())
+            queue_sizes = {
+                sid: ring.tail - ring.pull_head for sid, ring in self._rings.items()
+            }
             return {
-                'total_queues': len(self._queues),
-                'total_chunks': total_chunks,
+                'total_queues': len(self._rings),
+                'total_chunks': sum(queue_sizes.values()),
                 'max_queue_size': self._max_queue_size,
-                'queue_sizes': {
-                    sid: len(q) for sid, q in self._queues.items()
+                'queue_sizes': queue_sizes,
+                'buffered_seconds': {
+                    sid: ring.buffered_samples / self.SAMPLE_RATE
+                    for sid, ring in self._rings.items()
+                },
+                'ring_bytes': sum(ring.capacity * 2 for ring in self._rings.values()),
+                'reader_lag': {
+                    sid: {
+                        reader_id: ring.tail - max(cursor, ring.history_head)
+                        for reader_id, cursor in self._reader_cursors.get(sid, {}).items()
+                        if cursor is not None
+                    }
+                    for sid, ring in self._rings.items()
                 }
             }
     
@@ -262,8 +479,6 @@ class AudioQueueManager(SingletonMixin, IAudioQueueManager):
         Returns:
             AudioChunk 或 None（超時或無資料）
         """
-        import time
-        
         try:
             if not session_id:
                 logger.warning("Empty session_id for pop_blocking")
@@ -276,16 +491,16 @@ class AudioQueueManager(SingletonMixin, IAudioQueueManager):
                 logger.warning(f"Invalid timeout {actual_timeout}")
                 return None
             
-            start_time = time.time()
-            
-            while time.time() - start_time < actual_timeout:
-                chunks = self.pull(session_id, count=1)
-                if chunks:
-                    return chunks[0]
-                time.sleep(self._blocking_sleep_interval)  # 避免 busy waiting
+            self._ensure_queue(session_id)
+            condition = self._conditions[session_id]
             
-            # 正常超時，不記錄錯誤
-            return None
+            with condition:
+                ring = self._rings[session_id]
+                # 等待推入通知，不再輪詢
+                if not condition.wait_for(lambda: ring.pull_head < ring.tail, actual_timeout):
+                    # 正常超時，不記錄錯誤
+                    return None
+                return self._pull_locked(ring, 1)[0]
             
         except Exception as e:
             logger.error(f"Failed in pop_blocking: {e}", session_id=session_id)
@@ -302,23 +517,65 @@ class AudioQueueManager(SingletonMixin, IAudioQueueManager):
         self._ensure_queue(session_id)
         
         with self._locks[session_id]:
-            if session_id not in self._reader_positions:
-                self._reader_positions[session_id] = {}
+            ring = self._rings[session_id]
             
             if start_timestamp is not None:
                 # 使用提供的起始時間戳
                 start_time = start_timestamp
                 logger.debug(f"Reader '{reader_id}' registered for session '{session_id}' starting from specified timestamp {start_time:.3f}")
-            elif session_id in self._timestamped_queues and len(self._timestamped_queues[session_id]) > 0:
+            elif ring.history_head < ring.tail:
                 # 從佇列中第一個音訊的時間戳開始
-                start_time = self._timestamped_queues[session_id][0].timestamp
+                start_time = ring.timestamp_at(ring.history_head)
                 logger.debug(f"Reader '{reader_id}' registered for session '{session_id}' starting from earliest audio at {start_time:.3f}")
             else:
                 # 佇列為空，從當前時間開始（稍微提前一點以確保不會錯過即將到來的音訊）
                 start_time = time.time() - 0.1  # 提前 100ms
                 logger.debug(f"Reader '{reader_id}' registered for session '{session_id}' at current time {start_time:.3f}")
             
-            self._reader_positions[session_id][reader_id] = start_time
+            self._set_reader_position(session_id, reader_id, start_time)
+    
+    def _set_reader_position(self, session_id: str, reader_id: str, timestamp: float) -> None:
+        """設定讀者的時間戳位置，游標在下次讀取時才以 bisect 定位。"""
+        self._reader_positions.setdefault(session_id, {})[reader_id] = timestamp
+        self._reader_cursors.setdefault(session_id, {})[reader_id] = None
+    
+    def _read_for_reader(
+        self,
+        session_id: str,
+        reader_id: str,
+        from_timestamp: Optional[float] = None,
+        max_chunks: Optional[int] = None
+    ) -> List[TimestampedAudio]:
+        """依讀者游標讀取新資料並推進游標（必須持有 session lock）。"""
+        ring = self._rings[session_id]
+        positions = self._reader_positions.setdefault(session_id, {})
+        cursors = self._reader_cursors.setdefault(session_id, {})
+        
+        if from_timestamp is not None:
+            # 明確指定時間戳：二分搜尋第一個 timestamp > from_timestamp 的 chunk
+            start = ring.bisect_right(from_timestamp, ring.history_head)
+        else:
+            start = cursors.get(reader_id)
+            if start is None:
+                # 使用上次讀取位置，新 reader 從當前時間開始
+                position = positions.setdefault(reader_id, time.time())
+                start = ring.bisect_right(position, ring.history_head)
+            # 游標落後於保留的歷史時，從最早的音訊開始
+            start = max(start, ring.history_head)
+        
+        end = ring.tail
+        if max_chunks:
+            end = min(end, start + max_chunks)
+        
+        result = ring.slice(start, end)
+        
+        # 更新讀取位置為最後讀取的項目
+        # 如果沒有讀取到新數據，保持原位置（尚未定位的游標維持以時間戳為準）
+        if result:
+            positions[reader_id] = result[-1].timestamp
+            cursors[reader_id] = end
+        
+        return result
     
     def pull_from_timestamp(
         self, 
@@ -336,51 +593,93 @@ class AudioQueueManager(SingletonMixin, IAudioQueueManager):
             max_chunks: 最多返回的 chunk 數量
             
         Returns:
-            List[TimestampedAudio]: 音頻片段列表
+            List[TimestampedAudio]: 音頻片段列表（audio 為環形緩衝區的視圖）
         """
-        if session_id not in self._timestamped_queues:
+        if session_id not in self._rings:
             return []
         
         with self._locks[session_id]:
-            queue = self._timestamped_queues[session_id]
-            
-            # 確定起始時間戳
-            if from_timestamp is None:
-                # 使用上次讀取位置
-                if reader_id in self._reader_positions.get(session_id, {}):
-                    from_timestamp = self._reader_positions[session_id][reader_id]
-                else:
-                    # 新 reader 從當前時間開始
-                    from_timestamp = time.time()
-                    if session_id not in self._reader_positions:
-                        self._reader_positions[session_id] = {}
-                    self._reader_positions[session_id][reader_id] = from_timestamp
-            
-            # 收集符合條件的音頻
-            result = []
-            last_timestamp = from_timestamp
-            
-            for idx, item in enumerate(queue):
-                if item.timestamp > from_timestamp:  # 使用 > 避免重複讀取
-                    result.append(TimestampedAudio(
-                        timestamp=item.timestamp,
-                        audio=item.audio,  # AudioChunk 本身就是不可變的
-                        duration=item.duration
-                    ))
-                    last_timestamp = item.timestamp
-                    
-                    if max_chunks and len(result) >= max_chunks:
-                        break
-            
-            # 更新讀取位置為最後讀取的項目時間戳
-            # 如果沒有讀取到新數據，保持原位置
-            if result:
-                if session_id not in self._reader_positions:
-                    self._reader_positions[session_id] = {}
-                self._reader_positions[session_id][reader_id] = last_timestamp
+            return self._read_for_reader(session_id, reader_id, from_timestamp, max_chunks)
+    
+    def pull_available(
+        self,
+        session_id: str,
+        reader_id: str,
+        timeout: Optional[float] = None,
+        max_chunks: Optional[int] = None
+    ) -> List[TimestampedAudio]:
+        """一次取出讀者游標之後的所有新音頻（非破壞性）。
+        
+        Args:
+            session_id: 會話 ID
+            reader_id: 讀者 ID
+            timeout: 沒有新資料時最多等待的秒數（None 或 0 表示不等待）
+            max_chunks: 最多返回的 chunk 數量（None 表示全部）
             
+        Returns:
+            List[TimestampedAudio]: 所有新的音頻片段（可能為空）
+        """
+        # 不建立佇列：remove() 之後才到的讀者不應重新建立 session 的環形緩衝區
+        condition = self._conditions.get(session_id)
+        if condition is None:
+            return []
+        
+        with condition:
+            if session_id not in self._rings:
+                return []
+            result = self._read_for_reader(session_id, reader_id, max_chunks=max_chunks)
+            if result or not timeout:
+                return result
+            
+            # 等待 push 的通知；push 只會喚醒此 session 的等待者
+            deadline = time.monotonic() + timeout
+            while not result:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                condition.wait(remaining)
+                if session_id not in self._rings:
+                    return []
+                result = self._read_for_reader(session_id, reader_id, max_chunks=max_chunks)
             return result
     
+    def reader_lag(self, session_id: str, reader_id: str) -> int:
+        """取得讀者尚未讀取的 chunk 數量。
+        
+        Returns:
+            落後的 chunk 數（session 或讀者不存在時為 0）
+        """
+        if session_id not in self._rings:
+            return 0
+        
+        with self._locks[session_id]:
+            ring = self._rings.get(session_id)
+            if ring is None:
+                return 0
+            cursor = self._reader_cursors.get(session_id, {}).get(reader_id)
+            if cursor is None:
+                position = self._reader_positions.get(session_id, {}).get(reader_id)
+                if position is None:
+                    return 0
+                cursor = ring.bisect_right(position, ring.history_head)
+            return ring.tail - max(cursor, ring.history_head)
+    
+    def add_push_listener(self, listener: Callable[[str], None]) -> None:
+        """註冊 push 監聽者，每次成功 push 後以 session_id 呼叫。
+        
+        監聽者在 push 的執行緒中執行，必須快速返回。
+        """
+        with self._registry_lock:
+            if listener not in self._push_listeners:
+                self._push_listeners = self._push_listeners + (listener,)
+    
+    def remove_push_listener(self, listener: Callable[[str], None]) -> None:
+        """移除 push 監聽者。"""
+        with self._registry_lock:
+            self._push_listeners = tuple(
+                l for l in self._push_listeners if l != listener
+            )
+    
     def pull_blocking_timestamp(
         self,
         session_id: str,
@@ -399,24 +698,22 @@ class AudioQueueManager(SingletonMixin, IAudioQueueManager):
         Returns:
             Optional[TimestampedAudio]: 音頻片段或 None（超時）
         """
-        if session_id not in self._new_data_events:
+        condition = self._conditions.get(session_id)
+        if condition is None:
             return None
         
-        event = self._new_data_events[session_id]
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            # 嘗試拉取數據
-            chunks = self.pull_from_timestamp(
-                session_id, reader_id, from_timestamp, max_chunks=1
-            )
-            
-            if chunks:
-                return chunks[0]
-            
-            # 等待新數據
-            event.wait(timeout=0.01)
-            event.clear()
+        deadline = time.monotonic() + timeout
+        with condition:
+            while session_id in self._rings:
+                chunks = self._read_for_reader(session_id, reader_id, from_timestamp, max_chunks=1)
+                if chunks:
+                    return chunks[0]
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                # 等待 push 通知（不再以 10ms 輪詢）
+                condition.wait(remaining)
         
         return None
     
@@ -436,23 +733,18 @@ class AudioQueueManager(SingletonMixin, IAudioQueueManager):
         Returns:
             List[TimestampedAudio]: 時間範圍內的音頻片段
         """
-        if session_id not in self._timestamped_queues:
+        if session_id not in self._rings:
             return []
         
         with self._locks[session_id]:
-            queue = self._timestamped_queues[session_id]
-            result = []
-            
-            for item in queue:
-                if item.timestamp >= start_timestamp:
-                    if end_timestamp is None or item.timestamp <= end_timestamp:
-                        result.append(TimestampedAudio(
-                            timestamp=item.timestamp,
-                            audio=item.audio,
-                            duration=item.duration
-                        ))
+            ring = self._rings[session_id]
+            start = ring.bisect_left(start_timestamp, ring.history_head)
+            if end_timestamp is None:
+                end = ring.tail
+            else:
+                end = ring.bisect_right(end_timestamp, start)
             
-            return result
+            return ring.slice(start, end)
     
     def reset_reader_position(
         self,
@@ -467,29 +759,26 @@ class AudioQueueManager(SingletonMixin, IAudioQueueManager):
             reader_id: 讀者 ID
             timestamp: 新的讀取位置（None 表示最新）
         """
-        if session_id not in self._reader_positions:
-            self._reader_positions[session_id] = {}
-        
         if timestamp is None:
             timestamp = time.time()
         
-        self._reader_positions[session_id][reader_id] = timestamp
+        lock = self._locks.get(session_id)
+        if lock is None:
+            self._set_reader_position(session_id, reader_id, timestamp)
+        else:
+            with lock:
+                self._set_reader_position(session_id, reader_id, timestamp)
         logger.debug(f"Reset reader '{reader_id}' position to {timestamp:.3f}")
     
     def _cleanup_old_audio(self, session_id: str):
-        """清理過期的音頻數據。"""
-        if session_id not in self._timestamped_queues:
+        """清理過期的音頻數據（必須持有 session lock）。"""
+        ring = self._rings.get(session_id)
+        if ring is None:
             return
-            
-        queue = self._timestamped_queues[session_id]
-        current_time = time.time()
-        cutoff_time = current_time - self._max_history_duration
         
-        # 移除過期數據
-        while queue and queue[0].timestamp < cutoff_time:
-            removed = queue.popleft()
-            logger.trace(f"Cleaned old audio at {removed.timestamp:.3f}")
+        cutoff_time = time.time() - self._max_history_duration
+        ring.expire_before(cutoff_time)
 
 
 # 模組級單例實例 (從 config.yaml 載入設定)
-audio_queue: AudioQueueManager = AudioQueueManager()
\ No newline at end of file
+audio_queue: AudioQueueManager = AudioQueueManager()
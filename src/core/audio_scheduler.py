@@ -0,0 +1,387 @@
+"""音訊推論排程器
+
+以固定數量的 worker 執行緒服務所有 session 的音訊讀者（VAD、喚醒詞…），
+取代「每個 session 一個監聽執行緒」的做法。
+
+運作方式：
+- 服務以 (session_id, reader_id) 註冊為音訊來源，並提供處理函數
+- audio_queue 每次 push 後通知排程器，有新資料的來源被放入就緒佇列
+- worker 依序（round-robin）取出來源，每輪最多處理 max_chunks_per_turn 個 chunk，
+  處理完仍有積壓的來源重新排到佇列尾端，避免單一 session 佔住 worker
+- 同一個來源同一時間只會被一個 worker 處理，來源內部狀態不需要額外加鎖
+
+使用範例：
+    from src.core.audio_scheduler import audio_scheduler
+
+    def process(items):
+        for item in items:
+            handle(item.audio)
+
+    audio_scheduler.register_source(session_id, "vad", process, on_stop=flush)
+    ...
+    audio_scheduler.unregister_source(session_id, "vad")
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from src.core.audio_queue_manager import audio_queue, TimestampedAudio
+from src.utils.logger import logger
+from src.utils.singleton import SingletonMixin
+from src.config.manager import ConfigManager
+
+
+SourceKey = Tuple[str, str]
+
+
+class _AudioSource:
+    """已註冊的音訊來源（排程狀態 + 統計）"""
+
+    __slots__ = (
+        'session_id', 'reader_id', 'process', 'on_stop',
+        'active', 'scheduled', 'running', 'dirty', 'worker_ident', 'stopped',
+        'ready_since', 'turns', 'chunks', 'samples', 'busy_time',
+        'wait_time', 'max_wait', 'deferred_turns', 'lag', 'max_lag', 'errors'
+    )
+
+    def __init__(
+        self,
+        session_id: str,
+        reader_id: str,
+        process: Callable[[List[TimestampedAudio]], None],
+        on_stop: Optional[Callable[[], None]]
+    ):
+        self.session_id = session_id
+        self.reader_id = reader_id
+        self.process = process
+        self.on_stop = on_stop
+
+        # 排程狀態（由排程器鎖保護）
+        self.active = True          # 尚未取消註冊
+        self.scheduled = False      # 已在就緒佇列中
+        self.running = False        # 正在被 worker 處理
+        self.dirty = False          # 處理期間收到新的 push 通知
+        self.worker_ident: Optional[int] = None
+        self.stopped = threading.Event()  # on_stop 已執行完畢
+        self.ready_since = 0.0
+
+        # 統計
+        self.turns = 0              # 被處理的輪數
+        self.chunks = 0             # 處理的 chunk 數
+        self.samples = 0            # 處理的樣本數
+        self.busy_time = 0.0        # 處理耗時（秒）
+        self.wait_time = 0.0        # 在就緒佇列中等待的總時間（秒）
+        self.max_wait = 0.0         # 最長等待時間（秒）
+        self.deferred_turns = 0     # 因達到每輪上限而延後處理的次數（背壓）
+        self.lag = 0                # 最近一輪結束時尚未處理的 chunk 數
+        self.max_lag = 0            # 觀察到的最大積壓
+        self.errors = 0             # 處理函數拋出的例外數
+
+    def to_stats(self) -> Dict:
+        turns = self.turns or 1
+        return {
+            'session_id': self.session_id,
+            'reader_id': self.reader_id,
+            'turns': self.turns,
+            'chunks': self.chunks,
+            'audio_seconds': self.samples / audio_queue.SAMPLE_RATE,
+            'busy_ms': self.busy_time * 1000,
+            'avg_wait_ms': self.wait_time / turns * 1000,
+            'max_wait_ms': self.max_wait * 1000,
+            'deferred_turns': self.deferred_turns,
+            'lag_chunks': self.lag,
+            'max_lag_chunks': self.max_lag,
+            'errors': self.errors
+        }
+
+
+class AudioScheduler(SingletonMixin):
+    """共用的音訊推論 worker pool
+
+    - 固定數量的 worker，與 session 數量無關
+    - 只有有新資料的來源會被排入就緒佇列，閒置 session 不佔用任何執行緒
+    - 每輪處理上限確保各 session 公平輪流
+    - 統計每個來源的等待時間、積壓與延後次數，作為背壓指標
+    """
+
+    def __init__(self):
+        if not hasattr(self, '_initialized'):
+            self._initialized = True
+
+            # 載入配置（舊的 config.yaml 可能沒有此區塊，使用預設值）
+            config = ConfigManager()
+            scheduler_config = getattr(config.services, 'audio_scheduler', None) \
+                if hasattr(config, 'services') else None
+            self._num_workers = max(1, int(getattr(scheduler_config, 'num_workers', 4)))
+            self._max_chunks_per_turn = max(1, int(getattr(scheduler_config, 'max_chunks_per_turn', 8)))
+
+            self._sources: Dict[SourceKey, _AudioSource] = {}
+            self._sources_by_session: Dict[str, Set[SourceKey]] = {}
+            self._ready: Deque[_AudioSource] = deque()
+
+            self._lock = threading.Lock()
+            self._condition = threading.Condition(self._lock)
+
+            self._workers: List[threading.Thread] = []
+            self._running = False
+            self._busy_workers = 0
+            self._max_ready_depth = 0
+
+            logger.debug(f"音訊排程器已初始化 - workers={self._num_workers}, "
+                        f"max_chunks_per_turn={self._max_chunks_per_turn}")
+
+    # ------------------------------------------------------------------ #
+    # 生命週期
+    # ------------------------------------------------------------------ #
+
+    def _ensure_started(self) -> None:
+        """第一次註冊來源時才啟動 worker（必須持有排程器鎖）"""
+        if self._running:
+            return
+
+        self._running = True
+        audio_queue.add_push_listener(self.notify)
+        for index in range(self._num_workers):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                daemon=True,
+                name=f"audio-scheduler-{index}"
+            )
+            self._workers.append(worker)
+            worker.start()
+        logger.info(f"音訊排程器已啟動 {self._num_workers} 個 worker")
+
+    def shutdown(self, timeout: float = 1.0) -> None:
+        """停止所有來源與 worker"""
+        with self._lock:
+            keys = list(self._sources.keys())
+        for session_id, reader_id in keys:
+            self.unregister_source(session_id, reader_id, timeout=timeout)
+
+        with self._condition:
+            if not self._running:
+                return
+            self._running = False
+            self._condition.notify_all()
+            workers, self._workers = self._workers, []
+
+        audio_queue.remove_push_listener(self.notify)
+        for worker in workers:
+            if worker is not threading.current_thread():
+                worker.join(timeout=timeout)
+        logger.info("音訊排程器已關閉")
+
+    # ------------------------------------------------------------------ #
+    # 來源註冊
+    # ------------------------------------------------------------------ #
+
+    def register_source(
+        self,
+        session_id: str,
+        reader_id: str,
+        process: Callable[[List[TimestampedAudio]], None],
+        on_stop: Optional[Callable[[], None]] = None
+    ) -> bool:
+        """註冊音訊來源
+
+        Args:
+            session_id: Session ID
+            reader_id: audio_queue 的讀者 ID（需事先 register_reader）
+            process: 處理新音訊的函數，在 worker 執行緒中以 TimestampedAudio 列表呼叫
+            on_stop: 取消註冊後執行一次的收尾函數（例如 flush 殘餘資料）
+
+        Returns:
+            是否成功註冊（同一來源已註冊時返回 False）
+        """
+        key = (session_id, reader_id)
+        with self._condition:
+            if key in self._sources:
+                logger.warning(f"音訊來源已註冊: {reader_id} [{session_id}]")
+                return False
+
+            self._ensure_started()
+            source = _AudioSource(session_id, reader_id, process, on_stop)
+            self._sources[key] = source
+            self._sources_by_session.setdefault(session_id, set()).add(key)
+
+            # 讀者可能從較早的時間戳開始讀取，立即排程一次以處理既有資料
+            self._schedule_locked(source)
+
+        logger.debug(f"註冊音訊來源: {reader_id} [{session_id}]")
+        return True
+
+    def unregister_source(
+        self,
+        session_id: str,
+        reader_id: str,
+        timeout: float = 1.0
+    ) -> bool:
+        """取消註冊音訊來源
+
+        正在處理中的來源會在本輪結束後才執行 on_stop；
+        從其他執行緒呼叫時最多等待 timeout 秒。
+        在來源自己的處理函數內呼叫（例如連續錯誤時自行停止）不會等待。
+
+        Returns:
+            是否成功取消註冊（False 表示來源不存在）
+        """
+        key = (session_id, reader_id)
+        with self._condition:
+            source = self._sources.pop(key, None)
+            if source is None:
+                return False
+
+            keys = self._sources_by_session.get(session_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._sources_by_session[session_id]
+
+            source.active = False
+            running = source.running
+            on_own_worker = running and source.worker_ident == threading.get_ident()
+
+        if not running:
+            self._finalize(source)
+        elif not on_own_worker:
+            if not source.stopped.wait(timeout):
+                logger.warning(f"音訊來源未能及時停止: {reader_id} [{session_id}]")
+
+        logger.debug(f"取消註冊音訊來源: {reader_id} [{session_id}]")
+        return True
+
+    def is_registered(self, session_id: str, reader_id: str) -> bool:
+        """檢查來源是否已註冊"""
+        with self._lock:
+            return (session_id, reader_id) in self._sources
+
+    # ------------------------------------------------------------------ #
+    # 排程
+    # ------------------------------------------------------------------ #
+
+    def notify(self, session_id: str) -> None:
+        """audio_queue push 監聽者：將該 session 的所有來源標記為就緒"""
+        if session_id not in self._sources_by_session:
+            return
+        with self._condition:
+            for key in self._sources_by_session.get(session_id, ()):
+                self._schedule_locked(self._sources[key])
+
+    def _schedule_locked(self, source: _AudioSource) -> None:
+        """將來源排入就緒佇列（必須持有排程器鎖）"""
+        if not source.active:
+            return
+        if source.running:
+            # 處理中，結束本輪後再重新排程
+            source.dirty = True
+            return
+        if source.scheduled:
+            return
+
+        source.scheduled = True
+        source.ready_since = time.monotonic()
+        self._ready.append(source)
+        if len(self._ready) > self._max_ready_depth:
+            self._max_ready_depth = len(self._ready)
+        self._condition.notify()
+
+    def _worker_loop(self) -> None:
+        """worker 主循環：輪流處理就緒的來源"""
+        while True:
+            with self._condition:
+                while self._running and not self._ready:
+                    self._condition.wait()
+                if not self._running:
+                    return
+
+                source = self._ready.popleft()
+                source.scheduled = False
+                if not source.active:
+                    continue
+
+                source.running = True
+                source.dirty = False
+                source.worker_ident = threading.get_ident()
+                self._busy_workers += 1
+
+                waited = time.monotonic() - source.ready_since
+                source.wait_time += waited
+                if waited > source.max_wait:
+                    source.max_wait = waited
+
+            started = time.perf_counter()
+            lag = 0
+            try:
+                items = audio_queue.pull_available(
+                    source.session_id,
+                    source.reader_id,
+                    max_chunks=self._max_chunks_per_turn
+                )
+                if items:
+                    source.chunks += len(items)
+                    source.samples += sum(len(item.audio) for item in items)
+                    source.process(items)
+                lag = audio_queue.reader_lag(source.session_id, source.reader_id)
+            except Exception as e:
+                source.errors += 1
+                logger.error(f"音訊來源處理錯誤 {source.reader_id} [{source.session_id}]: {e}")
+
+            elapsed = time.perf_counter() - started
+
+            with self._condition:
+                self._busy_workers -= 1
+                source.running = False
+                source.worker_ident = None
+                source.turns += 1
+                source.busy_time += elapsed
+                source.lag = lag
+                if lag > source.max_lag:
+                    source.max_lag = lag
+
+                finalize = not source.active
+                if not finalize and (lag > 0 or source.dirty):
+                    if lag > 0:
+                        source.deferred_turns += 1
+                    # 排到佇列尾端，讓其他 session 先處理
+                    self._schedule_locked(source)
+
+            if finalize:
+                self._finalize(source)
+
+    def _finalize(self, source: _AudioSource) -> None:
+        """執行來源的收尾函數（只執行一次）"""
+        if source.stopped.is_set():
+            return
+        try:
+            if source.on_stop:
+                source.on_stop()
+        except Exception as e:
+            logger.error(f"音訊來源收尾錯誤 {source.reader_id} [{source.session_id}]: {e}")
+        finally:
+            source.stopped.set()
+
+    # ------------------------------------------------------------------ #
+    # 統計
+    # ------------------------------------------------------------------ #
+
+    def get_stats(self) -> Dict:
+        """取得排程器統計（含每個來源的公平性與背壓指標）"""
+        with self._lock:
+            return {
+                'num_workers': self._num_workers,
+                'busy_workers': self._busy_workers,
+                'max_chunks_per_turn': self._max_chunks_per_turn,
+                'total_sources': len(self._sources),
+                'ready_queue_depth': len(self._ready),
+                'max_ready_queue_depth': self._max_ready_depth,
+                'sources': {
+                    f"{reader_id}:{session_id}": source.to_stats()
+                    for (session_id, reader_id), source in self._sources.items()
+                }
+            }
+
+
+# 模組級單例
+audio_scheduler: AudioScheduler = AudioScheduler()
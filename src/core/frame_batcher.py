@@ -0,0 +1,183 @@
+"""跨 session 的 frame 批次推論佇列
+
+收集多個 session 已就緒的 frame，合併成一次 `[N, samples]` 的推論
+（Silero VAD、OpenWakeWord 共用）。
+
+- 每個 session 在同一批次中最多一個 frame（session 狀態必須依序更新）
+- 第一個 frame 到達後最多等待 max_batch_latency 秒，或湊滿 max_batch_size 個 session 即執行
+- 同一 session 還有剩餘 frame 時排到尾端，下一批次立即處理
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional
+
+import numpy as np
+
+from src.utils.logger import logger
+
+
+class FrameBatcher:
+    """跨 session 的 frame 批次推論佇列
+
+    Args:
+        run_batch: 執行一個批次的函數，參數為 (session_ids, frames)
+        max_batch_size: 單一批次最多的 session 數
+        max_batch_latency: 第一個 frame 到達後最多等待的秒數
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[str], List[np.ndarray]], None],
+        max_batch_size: int = 32,
+        max_batch_latency: float = 0.01,
+        name: str = "frame-batcher"
+    ):
+        self._name = name
+        self._run_batch = run_batch
+        self._max_batch_size = max(1, int(max_batch_size))
+        self._max_batch_latency = max(0.0, float(max_batch_latency))
+
+        # session_id -> 待處理的 frames（依到達順序）
+        self._pending: "OrderedDict[str, Deque[np.ndarray]]" = OrderedDict()
+        self._oldest_pending: Optional[float] = None
+
+        self._condition = threading.Condition()
+        # 執行批次期間持有；remove_session 藉此等待進行中的批次結束
+        self._run_lock = threading.RLock()
+
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # 統計
+        self._batches = 0
+        self._frames = 0
+        self._max_batch = 0
+        self._run_time = 0.0
+
+    def _ensure_started(self) -> None:
+        """第一次提交時才啟動批次執行緒（必須持有 condition）"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._batch_loop,
+            daemon=True,
+            name=self._name
+        )
+        self._thread.start()
+
+    def submit(self, session_id: str, frames: List[np.ndarray]) -> None:
+        """提交 session 的 frames（不等待結果，結果由 run_batch 處理）"""
+        if not frames:
+            return
+        with self._condition:
+            self._ensure_started()
+            queue = self._pending.get(session_id)
+            if queue is None:
+                queue = self._pending[session_id] = deque()
+            queue.extend(frames)
+            if self._oldest_pending is None:
+                self._oldest_pending = time.monotonic()
+            self._condition.notify()
+
+    def remove_session(self, session_id: str) -> List[np.ndarray]:
+        """移除 session，並返回尚未推論的 frames
+
+        會等待進行中的批次結束，返回後該 session 不會再出現在任何批次中。
+        """
+        with self._run_lock:
+            with self._condition:
+                queue = self._pending.pop(session_id, None)
+                if not self._pending:
+                    self._oldest_pending = None
+        return list(queue) if queue else []
+
+    def pending_frames(self) -> int:
+        """尚未推論的 frame 總數"""
+        with self._condition:
+            return sum(len(queue) for queue in self._pending.values())
+
+    def _take_batch(self):
+        """取出一個批次：每個 session 最多一個 frame（必須持有 condition）"""
+        session_ids: List[str] = []
+        frames: List[np.ndarray] = []
+
+        for session_id in list(self._pending.keys())[:self._max_batch_size]:
+            queue = self._pending[session_id]
+            session_ids.append(session_id)
+            frames.append(queue.popleft())
+            if queue:
+                # 還有剩餘 frame，排到尾端讓其他 session 先進入下一批次
+                self._pending.move_to_end(session_id)
+            else:
+                del self._pending[session_id]
+
+        if not self._pending:
+            self._oldest_pending = None
+        return session_ids, frames
+
+    def _batch_loop(self) -> None:
+        """批次執行緒主循環"""
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._running:
+                    return
+
+                # 湊批次：等到 session 數量足夠或最早的 frame 已等待 max_batch_latency
+                deadline = self._oldest_pending + self._max_batch_latency
+                while self._running and len(self._pending) < self._max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+            with self._run_lock:
+                with self._condition:
+                    session_ids, frames = self._take_batch()
+                if not frames:
+                    continue
+
+                started = time.perf_counter()
+                try:
+                    self._run_batch(session_ids, frames)
+                except Exception as e:
+                    logger.error(f"{self._name} 批次推論錯誤 (batch={len(frames)}): {e}")
+                elapsed = time.perf_counter() - started
+
+            with self._condition:
+                self._batches += 1
+                self._frames += len(frames)
+                self._run_time += elapsed
+                if len(frames) > self._max_batch:
+                    self._max_batch = len(frames)
+
+    def shutdown(self, timeout: float = 1.0) -> None:
+        """停止批次執行緒並丟棄未處理的 frames"""
+        with self._condition:
+            self._running = False
+            self._pending.clear()
+            self._oldest_pending = None
+            self._condition.notify_all()
+            thread, self._thread = self._thread, None
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+    def get_stats(self) -> Dict:
+        """取得批次統計"""
+        with self._condition:
+            batches = self._batches or 1
+            return {
+                'batches': self._batches,
+                'frames': self._frames,
+                'avg_batch_size': self._frames / batches,
+                'max_batch_size_seen': self._max_batch,
+                'avg_batch_ms': self._run_time / batches * 1000,
+                'pending_sessions': len(self._pending),
+                'pending_frames': sum(len(queue) for queue in self._pending.values()),
+                'max_batch_size': self._max_batch_size,
+                'max_batch_latency_ms': self._max_batch_latency * 1000
+            }
@@ -1,22 +1,33 @@
-# from transitions.extensions import HierarchicalMachine as Machine
 """
-使用 transitions 定義多種 Session 狀態機 (FSM)
+定義多種 Session 狀態機 (FSM)
 並生成 Mermaid 語法的狀態圖
 
 python -m src.core.fsm_transitions
-"""
 
+每個策略的轉換在第一次使用時編譯成不可變的轉換表（TransitionTable），
+每個 session 的 SessionFSM 只保存目前狀態字串；觸發事件只是一次字典查詢。
+呼叫介面與 transitions 的 model 相同：
+- fsm.state
+- fsm.wake_activated() / fsm.trigger("wake_activated") / fsm.may_trigger("wake_activated")
+- fsm.is_processing(allow_substates=True) / fsm.is_processing_recording()
 
-from transitions.extensions.diagrams import HierarchicalGraphMachine as Machine
+transitions 的 HierarchicalGraphMachine 只在輸出狀態圖時使用（離線工具）。
+"""
 
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
 
 from src.config.manager import ConfigManager
 from src.interface.action import Action
+from src.interface.exceptions import StateError
 from src.interface.state import State
 from src.interface.strategy import Strategy, StrategyPlugin, make_transition
 
 config_manager = ConfigManager()
 
+# 階層狀態名稱的分隔符號（與 transitions 的 HierarchicalMachine 相同）
+STATE_SEPARATOR = "_"
+
 # Batch Plugin
 BatchPlugin = StrategyPlugin(
     name=Strategy.BATCH,
@@ -56,6 +67,10 @@ StreamingPlugin = StrategyPlugin(
     ],
 )
 
+PLUGINS: Dict[str, StrategyPlugin] = {
+    plugin.name: plugin for plugin in (BatchPlugin, NonStreamingPlugin, StreamingPlugin)
+}
+
 def set_specific_transitions(strategy_name: str):
     transitions = []
     if (
@@ -93,55 +108,248 @@ def set_specific_transitions(strategy_name: str):
                     make_transition(Action.REPLY_INTERRUPTED, f"{State.PROCESSING}_{State.BUSY}", f"{State.PROCESSING}_{State.ACTIVATED}"),
                 ]
     return transitions
-    
+
+
+def build_definition(strategy_plugin: StrategyPlugin) -> Tuple[list, list]:
+    """策略的狀態與轉換定義（轉換表與狀態圖共用）
+
+    Returns:
+        (states, transitions)，格式與 transitions library 相同
+    """
+    # 通用狀態
+    states = [
+        State.IDLE,
+        State.ERROR,
+        {"name": State.PROCESSING, "children": strategy_plugin.states},
+    ]
+
+    # 通用轉換
+    transitions = [
+        make_transition(Action.SESSION_EXPIRED, "*", State.IDLE),
+        make_transition(Action.RESET_SESSION, "*", State.IDLE),
+        make_transition(Action.ERROR_OCCURRED, "*", State.ERROR),
+    ] + strategy_plugin.transitions  # 插入策略專屬轉換
+
+    transitions += set_specific_transitions(strategy_plugin.name)
+    return states, transitions
+
+
+# === 編譯後的轉換表 ===
+class TransitionTable:
+    """一個策略編譯後的不可變轉換表
+
+    - states: 所有狀態的完整名稱（子狀態為 parent_child）
+    - 轉換以 (state, event) → dest 儲存，編譯時已套用階層規則：
+      子狀態沒有定義的事件由父狀態處理（與 HierarchicalMachine 相同）
+    - 只寫子狀態名稱（例如 uploading）時視為 processing 的子狀態
+    """
+
+    __slots__ = ('strategy', 'states', 'events', '_dest', '_triggers')
+
+    def __init__(self, strategy_plugin: StrategyPlugin):
+        states, transitions = build_definition(strategy_plugin)
+
+        names: List[str] = []
+        for state in states:
+            if isinstance(state, dict):
+                names.append(state["name"])
+                names.extend(f"{state['name']}{STATE_SEPARATOR}{child}" for child in state["children"])
+            else:
+                names.append(state)
+
+        self.strategy: str = strategy_plugin.name
+        self.states: Tuple[str, ...] = tuple(names)
+        self.events: FrozenSet[str] = frozenset(t["trigger"] for t in transitions)
+
+        # 各狀態自己定義的轉換（先定義的優先，與 transitions 相同）
+        own: Dict[Tuple[str, str], str] = {}
+        for transition in transitions:
+            sources = transition["source"]
+            if sources == "*":
+                sources = names
+            elif isinstance(sources, str):
+                sources = [sources]
+            dest = self._resolve(transition["dest"])
+            for source in sources:
+                own.setdefault((self._resolve(source), transition["trigger"]), dest)
+
+        # 套用階層：子狀態找不到時往父狀態找
+        dest_table: Dict[Tuple[str, str], str] = {}
+        triggers: Dict[str, Tuple[str, ...]] = {}
+        for state in names:
+            chain = self._ancestors(state)
+            valid = []
+            for event in sorted(self.events):
+                for candidate in chain:
+                    if (candidate, event) in own:
+                        dest_table[(state, event)] = own[(candidate, event)]
+                        valid.append(event)
+                        break
+            triggers[state] = tuple(valid)
+
+        self._dest: Mapping[Tuple[str, str], str] = MappingProxyType(dest_table)
+        self._triggers: Mapping[str, Tuple[str, ...]] = MappingProxyType(triggers)
+
+    def _resolve(self, state: str) -> str:
+        if state in self.states:
+            return state
+        nested = f"{State.PROCESSING}{STATE_SEPARATOR}{state}"
+        if nested in self.states:
+            return nested
+        raise ValueError(f"State '{state}' is not a registered state of strategy '{self.strategy}'")
+
+    def _ancestors(self, state: str) -> List[str]:
+        """state 本身與所有父狀態（由內而外）"""
+        chain = [state]
+        while STATE_SEPARATOR in state:
+            state = state.rsplit(STATE_SEPARATOR, 1)[0]
+            if state in self.states:
+                chain.append(state)
+        return chain
+
+    def dest(self, state: str, event: str) -> Optional[str]:
+        """state 觸發 event 後的狀態；不合法時返回 None"""
+        return self._dest.get((state, event))
+
+    def get_triggers(self, state: str) -> Tuple[str, ...]:
+        """state 可以觸發的事件"""
+        return self._triggers.get(state, ())
+
+
+_TABLES: Dict[str, TransitionTable] = {}
+_FSM_CLASSES: Dict[str, type] = {}
+
+
+def get_transition_table(strategy_plugin: StrategyPlugin) -> TransitionTable:
+    """取得策略的轉換表（每個策略只編譯一次）"""
+    table = _TABLES.get(strategy_plugin.name)
+    if table is None:
+        table = _TABLES.setdefault(strategy_plugin.name, TransitionTable(strategy_plugin))
+    return table
+
+
+def _make_trigger(event: str):
+    def trigger(self) -> bool:
+        return self.trigger(event)
+    trigger.__name__ = event
+    return trigger
+
+
+def _make_may_trigger(event: str):
+    def may_trigger(self) -> bool:
+        return self.may_trigger(event)
+    may_trigger.__name__ = f"may_{event}"
+    return may_trigger
+
+
+def _make_is_state(state: str):
+    prefix = state + STATE_SEPARATOR
+
+    def is_state(self, allow_substates: bool = False) -> bool:
+        return self.state == state or (allow_substates and self.state.startswith(prefix))
+    is_state.__name__ = f"is_{state}"
+    return is_state
+
+
+def _get_fsm_class(strategy_plugin: StrategyPlugin) -> type:
+    """每個策略一個 SessionFSM 子類別，事件與 is_<state> 方法定義在類別上（不綁定到每個實例）"""
+    cls = _FSM_CLASSES.get(strategy_plugin.name)
+    if cls is None:
+        table = get_transition_table(strategy_plugin)
+        namespace = {"__slots__": (), "strategy": table.strategy, "table": table}
+        for event in table.events:
+            namespace[event] = _make_trigger(event)
+            namespace[f"may_{event}"] = _make_may_trigger(event)
+        for state in table.states:
+            namespace[f"is_{state}"] = _make_is_state(state)
+        class_name = "SessionFSM_" + table.strategy
+        cls = _FSM_CLASSES.setdefault(strategy_plugin.name, type(class_name, (SessionFSM,), namespace))
+    return cls
 
 
 # === 基底 FSM ===
 class SessionFSM:
+    """Session 狀態機：只保存目前狀態，轉換查詢策略共用的轉換表
+
+    SessionFSM(plugin) 會返回該策略的子類別實例。
+    """
+
+    __slots__ = ('state',)
+
+    strategy: str
+    table: TransitionTable
+
+    def __new__(cls, strategy_plugin: StrategyPlugin):
+        if cls is SessionFSM:
+            cls = _get_fsm_class(strategy_plugin)
+        return super().__new__(cls)
+
     def __init__(self, strategy_plugin: StrategyPlugin):
-        self.strategy = strategy_plugin.name
-
-        # 通用狀態
-        states = [
-            State.IDLE,
-            State.ERROR,
-            {"name": State.PROCESSING, "children": strategy_plugin.states},
-        ]
-
-        # 通用轉換
-        transitions = [
-            make_transition(Action.SESSION_EXPIRED, "*", State.IDLE),
-            make_transition(Action.RESET_SESSION, "*", State.IDLE),
-            make_transition(Action.ERROR_OCCURRED, "*", State.ERROR),
-        ] + strategy_plugin.transitions  # 插入策略專屬轉換
-
-        transitions += set_specific_transitions(strategy_plugin.name)
-
-        # 初始化
-        # transitions library 會將 trigger 等方法注入到 model (self) 上
-        # 所以調用時應該用 fsm.trigger() 而不是 fsm.machine.trigger()
-        self.machine = Machine(
-            model=self,
-            states=states,
-            transitions=transitions,
-            initial=State.IDLE,
-            title=strategy_plugin.name,
-            graph_engine="mermaid",
-            show_conditions=True,
-            auto_transitions=False,
+        self.state: str = State.IDLE
+
+    def trigger(self, event: str) -> bool:
+        """觸發事件
+
+        Raises:
+            StateError: 目前狀態不能觸發這個事件
+        """
+        dest = self.table.dest(self.state, event)
+        if dest is None:
+            raise StateError(f"Can't trigger event {event} from state {self.state}!")
+        self.state = dest
+        return True
+
+    def may_trigger(self, event: str) -> bool:
+        """目前狀態是否可以觸發 event"""
+        return self.table.dest(self.state, event) is not None
+
+    def get_triggers(self, state: Optional[str] = None) -> Tuple[str, ...]:
+        """狀態（預設為目前狀態）可以觸發的事件"""
+        return self.table.get_triggers(self.state if state is None else state)
+
+    def __repr__(self) -> str:
+        return f"<SessionFSM {self.strategy} state={self.state}>"
+
+
+def build_graph_machine(strategy_plugin: StrategyPlugin):
+    """以 transitions 建立可輸出狀態圖的 HierarchicalGraphMachine（離線工具，需要 transitions）"""
+    from transitions.extensions.diagrams import HierarchicalGraphMachine as Machine
+
+    table = get_transition_table(strategy_plugin)
+    states, _ = build_definition(strategy_plugin)
+    # 使用編譯後的完整狀態名稱，狀態圖與實際轉換一致
+    transitions = [
+        make_transition(event, state, table.dest(state, event))
+        for state in table.states
+        for event in table.get_triggers(state)
+        if not any(
+            table.dest(parent, event) == table.dest(state, event)
+            for parent in table._ancestors(state)[1:]
         )
+    ]
+
+    class _Model:
+        pass
+
+    model = _Model()
+    return Machine(
+        model=model,
+        states=states,
+        transitions=transitions,
+        initial=State.IDLE,
+        title=strategy_plugin.name,
+        graph_engine="mermaid",
+        show_conditions=True,
+        auto_transitions=False,
+    )
 
 def _print_fsm_graph():
     """輸出 FSM 狀態圖 (Mermaid 語法)"""
-    batch_fsm = SessionFSM(BatchPlugin)
-    non_streaming_fsm = SessionFSM(NonStreamingPlugin)
-    streaming_fsm = SessionFSM(StreamingPlugin)
-
-    print(batch_fsm.machine.get_graph().draw(None))  # 直接輸出 Mermaid 語法
+    print(build_graph_machine(BatchPlugin).get_graph().draw(None))  # 直接輸出 Mermaid 語法
     print("\n", "= " * 30, "\n")
-    print(non_streaming_fsm.machine.get_graph().draw(None))  # 直接輸出 Mermaid 語法
+    print(build_graph_machine(NonStreamingPlugin).get_graph().draw(None))  # 直接輸出 Mermaid 語法
     print("\n", "= " * 30, "\n")
-    print(streaming_fsm.machine.get_graph().draw(None))  # 直接輸出 Mermaid 語法
+    print(build_graph_machine(StreamingPlugin).get_graph().draw(None))  # 直接輸出 Mermaid 語法
 
 if __name__ == "__main__":
-    _print_fsm_graph()
\ No newline at end of file
+    _print_fsm_graph()
@@ -0,0 +1,255 @@
+"""音訊接收 worker pool（含背壓）
+
+async 伺服器（HTTP SSE）收到的音訊不在事件迴圈中處理，而是放入每個 session 的有界佇列，
+由固定數量的 worker 執行緒呼叫 audio_ingest.ingest()（取樣率轉換、FSM 啟動、推入 audio_queue）。
+
+運作方式：
+- submit() 只做 session 檢查（快取命中時不讀取 store）與入列，事件迴圈不會被轉換或 store dispatch 阻塞
+- 每個 session 的佇列最多 max_pending_chunks 個 chunk，已滿時拋出 IngestBackpressureError，
+  附上依目前積壓與平均處理時間估計的 retry_after 秒數
+- worker 依序（round-robin）取出有積壓的 session，每輪最多處理 max_chunks_per_turn 個 chunk；
+  同一個 session 同一時間只會被一個 worker 處理，chunk 順序不變（串流重新取樣器狀態跨 chunk 延續）
+
+使用範例：
+    from src.core.ingest_workers import ingest_workers
+    from src.interface.exceptions import IngestBackpressureError, SessionManagementError
+
+    try:
+        depth = ingest_workers.submit(session_id, audio_bytes)
+    except IngestBackpressureError as e:
+        ...  # 回應 429，Retry-After: e.retry_after
+    except SessionManagementError:
+        ...  # 回應 404
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.core.audio_ingest import audio_ingest
+from src.interface.exceptions import IngestBackpressureError, SessionManagementError
+from src.utils.logger import logger
+from src.utils.singleton import SingletonMixin
+from src.config.manager import ConfigManager
+
+
+class _SessionQueue:
+    """單一 session 的待處理 chunk（排程狀態 + 統計）"""
+
+    __slots__ = (
+        'session_id', 'chunks', 'scheduled', 'running', 'active',
+        'submitted', 'processed', 'rejected', 'failed', 'max_depth', 'busy_time'
+    )
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.chunks: Deque[Tuple[float, Any]] = deque()  # (收到的時間, 音訊)
+
+        # 排程狀態（由 pool 鎖保護）
+        self.scheduled = False      # 已在就緒佇列中
+        self.running = False        # 正在被 worker 處理
+        self.active = True          # 尚未釋放
+
+        # 統計
+        self.submitted = 0          # 已接受的 chunk 數
+        self.processed = 0          # 已送進 audio_ingest 的 chunk 數
+        self.rejected = 0           # 因佇列已滿而拒絕的 chunk 數
+        self.failed = 0             # audio_ingest 拒絕或拋出例外的 chunk 數
+        self.max_depth = 0          # 觀察到的最大積壓
+        self.busy_time = 0.0        # 處理耗時（秒）
+
+    def avg_chunk_time(self) -> float:
+        return self.busy_time / self.processed if self.processed else 0.0
+
+
+class IngestWorkerPool(SingletonMixin):
+    """音訊接收 worker pool
+
+    worker 在第一次 submit() 時才啟動。
+    """
+
+    def __init__(self):
+        if not hasattr(self, '_initialized'):
+            self._initialized = True
+
+            config = ConfigManager()
+            ingest_config = getattr(config.services, 'audio_ingest', None)
+            self.num_workers = max(1, int(getattr(ingest_config, 'num_workers', 2)))
+            self.max_pending_chunks = max(1, int(getattr(ingest_config, 'max_pending_chunks', 50)))
+            self.max_chunks_per_turn = max(1, int(getattr(ingest_config, 'max_chunks_per_turn', 8)))
+            self.min_retry_after = float(getattr(ingest_config, 'min_retry_after', 0.1))
+
+            self._sessions: Dict[str, _SessionQueue] = {}
+            self._ready: Deque[_SessionQueue] = deque()
+            self._condition = threading.Condition()
+            self._workers: List[threading.Thread] = []
+            self._running = False
+
+            self.max_ready_depth = 0
+
+    # === 入列（事件迴圈中呼叫，不阻塞） ===
+
+    def submit(self, session_id: str, audio_data: Union[bytes, bytearray, np.ndarray]) -> int:
+        """把一個 chunk 放入 session 的接收佇列
+
+        Returns:
+            入列後的佇列深度
+
+        Raises:
+            SessionManagementError: session 不存在或尚未設定音訊配置
+            IngestBackpressureError: session 的佇列已滿
+        """
+        if not audio_ingest.has_audio_config(session_id):
+            raise SessionManagementError(f"Session {session_id} not found or audio config not set")
+
+        with self._condition:
+            if not self._running:
+                self._start_workers()
+
+            queue = self._sessions.get(session_id)
+            if queue is None:
+                queue = _SessionQueue(session_id)
+                self._sessions[session_id] = queue
+
+            depth = len(queue.chunks)
+            if depth >= self.max_pending_chunks:
+                queue.rejected += 1
+                raise IngestBackpressureError(
+                    f"Session {session_id} ingest queue is full ({depth} chunks pending)",
+                    retry_after=self._estimate_retry_after(queue),
+                    queue_depth=depth
+                )
+
+            # 連同收到的時間入列，ingest 延遲包含在佇列中等待的時間
+            queue.chunks.append((time.perf_counter(), audio_data))
+            queue.submitted += 1
+            depth += 1
+            queue.max_depth = max(queue.max_depth, depth)
+
+            if not queue.scheduled and not queue.running:
+                queue.scheduled = True
+                self._ready.append(queue)
+                self.max_ready_depth = max(self.max_ready_depth, len(self._ready))
+                self._condition.notify()
+
+        return depth
+
+    def get_queue_depth(self, session_id: str) -> int:
+        """取得 session 目前的積壓 chunk 數"""
+        with self._condition:
+            queue = self._sessions.get(session_id)
+            return len(queue.chunks) if queue else 0
+
+    def release_session(self, session_id: str) -> None:
+        """session 結束：捨棄尚未處理的 chunk"""
+        with self._condition:
+            queue = self._sessions.pop(session_id, None)
+            if queue:
+                queue.active = False
+                if queue.chunks:
+                    logger.debug(f"Discarded {len(queue.chunks)} pending chunks for session {session_id}")
+                queue.chunks.clear()
+
+    # === 統計 ===
+
+    def get_stats(self) -> Dict[str, Any]:
+        """取得 worker pool 統計（含每個 session 的佇列深度）"""
+        with self._condition:
+            sessions = {
+                sid: {
+                    "queue_depth": len(q.chunks),
+                    "max_queue_depth": q.max_depth,
+                    "submitted": q.submitted,
+                    "processed": q.processed,
+                    "rejected": q.rejected,
+                    "failed": q.failed,
+                    "avg_chunk_ms": q.avg_chunk_time() * 1000,
+                }
+                for sid, q in self._sessions.items()
+            }
+            return {
+                "num_workers": self.num_workers,
+                "running": self._running,
+                "max_pending_chunks": self.max_pending_chunks,
+                "ready_queue_depth": len(self._ready),
+                "max_ready_queue_depth": self.max_ready_depth,
+                "total_queue_depth": sum(s["queue_depth"] for s in sessions.values()),
+                "sessions": sessions,
+            }
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        """停止所有 worker（尚未處理的 chunk 會被捨棄）"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+            workers = self._workers
+            self._workers = []
+        for worker in workers:
+            worker.join(timeout=timeout)
+        with self._condition:
+            self._sessions.clear()
+            self._ready.clear()
+
+    # === 內部實作 ===
+
+    def _estimate_retry_after(self, queue: _SessionQueue) -> float:
+        """依目前積壓與平均處理時間估計清空佇列所需秒數（呼叫端需持有鎖）"""
+        backlog = len(queue.chunks) * queue.avg_chunk_time()
+        # 其他 session 共用 worker：就緒佇列越長，輪到這個 session 越晚
+        backlog *= max(1.0, len(self._ready) / self.num_workers)
+        return max(self.min_retry_after, backlog)
+
+    def _start_workers(self) -> None:
+        """啟動 worker 執行緒（呼叫端需持有鎖）"""
+        self._running = True
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"audio-ingest-{i}", daemon=True)
+            for i in range(self.num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        logger.debug(f"Ingest worker pool started with {self.num_workers} workers")
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and not self._ready:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                queue = self._ready.popleft()
+                queue.scheduled = False
+                queue.running = True
+                batch = [
+                    queue.chunks.popleft()
+                    for _ in range(min(self.max_chunks_per_turn, len(queue.chunks)))
+                ]
+
+            start = time.perf_counter()
+            failed = 0
+            for received_at, audio_data in batch:
+                try:
+                    if not audio_ingest.ingest(queue.session_id, audio_data, received_at=received_at):
+                        failed += 1
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"Ingest failed for session {queue.session_id}: {e}")
+            elapsed = time.perf_counter() - start
+
+            with self._condition:
+                queue.running = False
+                queue.processed += len(batch)
+                queue.failed += failed
+                queue.busy_time += elapsed
+                # 仍有積壓時排到就緒佇列尾端（round-robin）
+                if queue.active and queue.chunks and not queue.scheduled:
+                    queue.scheduled = True
+                    self._ready.append(queue)
+                    self._condition.notify()
+
+
+# 模組級單例實例
+ingest_workers: IngestWorkerPool = IngestWorkerPool()
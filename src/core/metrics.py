@@ -0,0 +1,348 @@
+"""管線延遲量測
+
+每個 chunk 與每段語音經過的階段都記錄一次耗時，依「階段 × 協定」保存在 HDR 式直方圖中：
+
+    ingest → convert → queue_push → wakeword → vad → silence_timeout
+           → enhance → lease_wait → decode → publish
+
+- 直方圖是固定大小的對數線性桶（每個 2 的冪次 16 個子桶，相對誤差 < 6.25%），
+  記錄只是一次索引計算與計數，可以在正式環境常駐
+- session 建立時由 API 層以 bind_session() 標記協定（http_sse、redis、websocket...），
+  之後各階段只需要 session_id
+- 跨執行緒的階段（轉譯完成 → 結果送出）以 mark() / observe_since() 量測
+- HTTP SSE 伺服器的 GET /metrics 以 Prometheus 文字格式輸出
+
+使用範例：
+    from src.core.metrics import Stage, metrics
+
+    metrics.bind_session(session_id, "http_sse")
+
+    with metrics.timer(Stage.DECODE, session_id):
+        result = provider.transcribe_audio(audio)
+
+    metrics.mark(session_id, "decoded")          # 轉譯完成（SessionEffects）
+    metrics.observe_published(session_id)        # 結果送出（API 層）
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.utils.singleton import SingletonMixin
+from src.config.manager import ConfigManager
+
+
+class Stage:
+    """管線階段"""
+    INGEST = "ingest"                    # API 收到 chunk → 推入 audio_queue（含 ingest worker 排隊）
+    CONVERT = "convert"                  # 取樣率 / 聲道轉換
+    QUEUE_PUSH = "queue_push"            # audio_queue.push
+    WAKEWORD = "wakeword"                # 喚醒詞推論（一個 frame 或一個批次）
+    VAD = "vad"                          # VAD 推論（一個 frame 或一個批次）
+    SILENCE_TIMEOUT = "silence_timeout"  # 靜音開始 → 靜音超時觸發（含 silence_threshold）
+    ENHANCE = "enhance"                  # 降噪 + 音訊增強
+    LEASE_WAIT = "lease_wait"            # 等待 provider pool 租用
+    DECODE = "decode"                    # Whisper 轉譯
+    SPECULATIVE_DECODE = "speculative_decode"  # 靜音開始時的推測轉譯（可能被丟棄，不計入 decode）
+    PUBLISH = "publish"                  # 轉譯完成 → 結果送出（SSE、Redis、WebSocket...）
+    UTTERANCE = "utterance"              # 語音結束（靜音開始）→ 結果送出
+
+
+# 未標記協定的 session（內部工作、warm up）
+UNKNOWN_PROTOCOL = "unknown"
+
+# 對數線性桶：值（微秒）< 2 * _SUB_BUCKETS 時每微秒一個桶，之後每個 2 的冪次 _SUB_BUCKETS 個桶
+_SUB_BUCKET_BITS = 4
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+_MAX_EXPONENT = 23  # 上限 2^28 微秒（約 268 秒），超過的值計入最後一個桶
+_BUCKET_COUNT = (_MAX_EXPONENT + 2) * _SUB_BUCKETS
+
+_DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+_DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _bucket_index(micros: int) -> int:
+    exponent = micros.bit_length() - _SUB_BUCKET_BITS - 1
+    if exponent <= 0:
+        return micros
+    if exponent > _MAX_EXPONENT:
+        return _BUCKET_COUNT - 1
+    return exponent * _SUB_BUCKETS + (micros >> exponent)
+
+
+def _bucket_upper(index: int) -> int:
+    """桶的上界（微秒，不含）"""
+    if index < 2 * _SUB_BUCKETS:
+        return index + 1
+    exponent = index // _SUB_BUCKETS - 1
+    return (index - exponent * _SUB_BUCKETS + 1) << exponent
+
+
+class LatencyHistogram:
+    """HDR 式延遲直方圖（秒）
+
+    固定 400 個計數桶，記錄與查詢都不配置記憶體；百分位數回傳桶的上界（不低估延遲）。
+    """
+
+    __slots__ = ('_counts', '_count', '_sum', '_max', '_lock')
+
+    def __init__(self):
+        self._counts = [0] * _BUCKET_COUNT
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        if seconds < 0:
+            seconds = 0.0
+        index = _bucket_index(int(seconds * 1e6))
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += seconds
+            if seconds > self._max:
+                self._max = seconds
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def total(self) -> float:
+        return self._sum
+
+    @property
+    def max(self) -> float:
+        return self._max
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self._count if self._count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """第 q 百分位數（q 為 0~1）"""
+        return self.percentiles((q,))[0]
+
+    def percentiles(self, qs: Sequence[float]) -> List[float]:
+        """一次計算多個百分位數（q 由小到大時只走訪一次）"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            max_value = self._max
+        if not total:
+            return [0.0] * len(qs)
+
+        targets = sorted((max(1, int(q * total + 0.999999)), i) for i, q in enumerate(qs))
+        results = [0.0] * len(qs)
+        seen = 0
+        target_index = 0
+        for index, count in enumerate(counts):
+            if not count:
+                continue
+            seen += count
+            while target_index < len(targets) and seen >= targets[target_index][0]:
+                results[targets[target_index][1]] = min(_bucket_upper(index) / 1e6, max_value)
+                target_index += 1
+            if target_index == len(targets):
+                break
+        return results
+
+    def cumulative(self, bounds: Sequence[float]) -> Tuple[List[int], int, float]:
+        """Prometheus 累計桶：每個上界（秒）以下的筆數
+
+        Returns:
+            (各上界的累計筆數, 總筆數, 總和)
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            total_sum = self._sum
+
+        result = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            limit = bound * 1e6
+            while index < _BUCKET_COUNT and _bucket_upper(index) <= limit:
+                seen += counts[index]
+                index += 1
+            result.append(seen)
+        return result, total, total_sum
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * _BUCKET_COUNT
+            self._count = 0
+            self._sum = 0.0
+            self._max = 0.0
+
+
+class MetricsRegistry(SingletonMixin):
+    """各階段 × 協定的延遲直方圖"""
+
+    def __init__(self):
+        if not hasattr(self, '_initialized'):
+            self._initialized = True
+
+            config = ConfigManager()
+            metrics_config = getattr(config, 'metrics', None)
+            self.enabled = bool(getattr(metrics_config, 'enabled', True))
+            self.buckets = tuple(sorted(getattr(metrics_config, 'buckets', None) or _DEFAULT_BUCKETS))
+            self.quantiles = tuple(getattr(metrics_config, 'quantiles', None) or _DEFAULT_QUANTILES)
+
+            self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+            self._protocols: Dict[str, str] = {}
+            self._marks: Dict[str, Dict[str, float]] = {}
+            self._lock = threading.Lock()
+
+    # === session ===
+
+    def bind_session(self, session_id: str, protocol: str) -> None:
+        """標記 session 的接收協定（session 建立時由 API 層呼叫）"""
+        if session_id:
+            self._protocols[session_id] = protocol
+
+    def release_session(self, session_id: str) -> None:
+        """session 結束：清除協定與尚未使用的時間點"""
+        self._protocols.pop(session_id, None)
+        self._marks.pop(session_id, None)
+
+    def protocol_of(self, session_id: Optional[str]) -> str:
+        if not session_id:
+            return UNKNOWN_PROTOCOL
+        protocol = self._protocols.get(session_id)
+        if protocol is None and ':' in session_id:
+            # 衍生的租用 ID（例如 "<session_id>:speculative"）
+            protocol = self._protocols.get(session_id.split(':', 1)[0])
+        return protocol or UNKNOWN_PROTOCOL
+
+    # === 記錄 ===
+
+    def observe(self, stage: str, seconds: float, session_id: Optional[str] = None,
+                protocol: Optional[str] = None) -> None:
+        """記錄一次階段耗時（秒）"""
+        if not self.enabled:
+            return
+        # 熱路徑：常見情況只有兩次 dict 查詢
+        protocol = protocol or self._protocols.get(session_id) or self.protocol_of(session_id)
+        histogram = self._histograms.get((stage, protocol)) or self.histogram(stage, protocol)
+        histogram.record(seconds)
+
+    def timer(self, stage: str, session_id: Optional[str] = None,
+              protocol: Optional[str] = None) -> "_StageTimer":
+        """量測 with 區塊的耗時（例外時也記錄）"""
+        return _StageTimer(self, stage, session_id, protocol)
+
+    def mark(self, session_id: str, name: str, timestamp: Optional[float] = None) -> None:
+        """記錄 session 的時間點（time.time()），供之後在其他執行緒以 observe_since() 量測"""
+        if not self.enabled or not session_id:
+            return
+        marks = self._marks.get(session_id)
+        if marks is None:
+            marks = self._marks.setdefault(session_id, {})
+        marks[name] = time.time() if timestamp is None else timestamp
+
+    def observe_since(self, stage: str, session_id: str, name: str, pop: bool = True) -> Optional[float]:
+        """記錄從 mark() 到現在的耗時
+
+        Returns:
+            耗時（秒）；沒有對應的時間點時返回 None
+        """
+        if not self.enabled:
+            return None
+        marks = self._marks.get(session_id)
+        if not marks:
+            return None
+        started = marks.pop(name, None) if pop else marks.get(name)
+        if started is None:
+            return None
+        elapsed = time.time() - started
+        self.observe(stage, elapsed, session_id)
+        return elapsed
+
+    def observe_published(self, session_id: str) -> None:
+        """轉譯結果已送出：記錄 publish（轉譯完成 → 送出）與 utterance（語音結束 → 送出）"""
+        self.observe_since(Stage.PUBLISH, session_id, "decoded")
+        self.observe_since(Stage.UTTERANCE, session_id, "speech_end")
+
+    def histogram(self, stage: str, protocol: str = UNKNOWN_PROTOCOL) -> LatencyHistogram:
+        key = (stage, protocol)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = LatencyHistogram()
+                    self._histograms[key] = histogram
+        return histogram
+
+    # === 輸出 ===
+
+    def get_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """{階段: {協定: {count, mean, p50, p90, p99, max}}}（毫秒）"""
+        stats: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (stage, protocol), histogram in sorted(self._histograms.items()):
+            entry = {"count": histogram.count, "mean_ms": round(histogram.mean * 1000, 3)}
+            for q, value in zip(self.quantiles, histogram.percentiles(self.quantiles)):
+                entry[f"p{q * 100:g}_ms"] = round(value * 1000, 3)
+            entry["max_ms"] = round(histogram.max * 1000, 3)
+            stats.setdefault(stage, {})[protocol] = entry
+        return stats
+
+    def render_prometheus(self) -> str:
+        """Prometheus 文字格式（text/plain; version=0.0.4）"""
+        with self._lock:
+            items = sorted(self._histograms.items())
+
+        lines = [
+            "# HELP asrhub_stage_latency_seconds 管線各階段延遲（秒）",
+            "# TYPE asrhub_stage_latency_seconds histogram",
+        ]
+        for (stage, protocol), histogram in items:
+            labels = f'stage="{stage}",protocol="{protocol}"'
+            cumulative, count, total = histogram.cumulative(self.buckets)
+            for bound, value in zip(self.buckets, cumulative):
+                lines.append(f'asrhub_stage_latency_seconds_bucket{{{labels},le="{bound:g}"}} {value}')
+            lines.append(f'asrhub_stage_latency_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"asrhub_stage_latency_seconds_sum{{{labels}}} {total:.6f}")
+            lines.append(f"asrhub_stage_latency_seconds_count{{{labels}}} {count}")
+
+        lines.append("# HELP asrhub_stage_latency_quantile_seconds 管線各階段延遲的百分位數（秒，自啟動起）")
+        lines.append("# TYPE asrhub_stage_latency_quantile_seconds gauge")
+        for (stage, protocol), histogram in items:
+            labels = f'stage="{stage}",protocol="{protocol}"'
+            for q, value in zip(self.quantiles, histogram.percentiles(self.quantiles)):
+                lines.append(f'asrhub_stage_latency_quantile_seconds{{{labels},quantile="{q:g}"}} {value:.6f}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """清除所有直方圖（測試用）"""
+        with self._lock:
+            self._histograms.clear()
+
+
+class _StageTimer:
+    """metrics.timer() 的 context manager（比 @contextmanager 產生器少一半的開銷）"""
+
+    __slots__ = ('_registry', '_stage', '_session_id', '_protocol', '_started')
+
+    def __init__(self, registry: MetricsRegistry, stage: str, session_id: Optional[str],
+                 protocol: Optional[str]):
+        self._registry = registry
+        self._stage = stage
+        self._session_id = session_id
+        self._protocol = protocol
+
+    def __enter__(self) -> "_StageTimer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._registry.observe(self._stage, time.perf_counter() - self._started,
+                               self._session_id, self._protocol)
+
+
+# 模組級單例實例
+metrics: MetricsRegistry = MetricsRegistry()
@@ -0,0 +1,258 @@
+"""語音結束後的分段處理管線
+
+靜音超時（timer 執行緒）與上傳完成只負責把工作交給管線，後處理依序經過三個階段：
+
+- collect: 停止錄音（等待 WAV 檔關閉）、從 audio_queue 收集這段語音
+- dsp: 降噪、音訊增強
+- asr: 轉譯並送出 transcribe_done
+
+每個階段有自己的執行緒池與上限：
+- workers: 同時執行的工作數
+- max_queue: 等待中的工作數上限（不含執行中）
+
+不同 session 的工作在各階段間重疊執行（A 在轉譯時 B 可以降噪）。
+階段間交接時，若下一階段已滿，目前階段的 worker 會等待，壓力逐級往上傳遞；
+只有進入管線的 submit() 不會等待：collect 階段已滿時直接回傳 False，
+避免一大批同時結束的語音在 timer 執行緒上堆積阻塞工作。
+
+使用範例：
+    from src.core.post_pipeline import post_pipeline
+
+    accepted = post_pipeline.submit(
+        session_id,
+        collect=lambda _: collect_audio(session_id),   # 回傳 None 表示結束這個工作
+        dsp=lambda audio: enhance(audio),
+        asr=lambda audio: transcribe(session_id, audio),
+        finalizer=lambda: cleanup(session_id),         # 工作結束（含失敗）後一定會執行
+    )
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils.logger import logger
+from src.utils.singleton import SingletonMixin
+from src.config.manager import ConfigManager
+
+
+# 階段順序
+STAGES = ("collect", "dsp", "asr")
+
+StageFunc = Callable[[Any], Any]
+
+
+class _Stage:
+    """一個處理階段：執行緒池 + 名額（執行中 + 等待中）+ 統計"""
+
+    def __init__(self, name: str, workers: int, max_queue: int):
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"post-{name}")
+        self.slots = threading.BoundedSemaphore(workers + max_queue)
+        self.lock = threading.Lock()
+
+        # 統計
+        self.pending = 0            # 已進入階段（等待 + 執行中）
+        self.active = 0             # 執行中
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0           # submit() 時名額已滿
+        self.max_depth = 0          # 觀察到的最大等待數
+        self.busy_time = 0.0        # 執行耗時（秒）
+        self.wait_time = 0.0        # 等待 worker 的時間（秒）
+
+    def acquire(self, blocking: bool) -> bool:
+        if not self.slots.acquire(blocking=blocking):
+            with self.lock:
+                self.rejected += 1
+            return False
+        with self.lock:
+            self.pending += 1
+            self.max_depth = max(self.max_depth, self.pending - self.active)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            done = self.completed + self.failed
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self.pending - self.active,
+                "active": self.active,
+                "max_queue_depth": self.max_depth,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_run_ms": self.busy_time / done * 1000 if done else 0.0,
+                "avg_wait_ms": self.wait_time / done * 1000 if done else 0.0,
+            }
+
+
+class PostProcessingPipeline(SingletonMixin):
+    """語音結束後的分段處理管線
+
+    執行緒池在第一次 submit() 時才建立。
+    """
+
+    def __init__(self):
+        if not hasattr(self, '_initialized'):
+            self._initialized = True
+
+            config = ConfigManager()
+            pipeline_config = getattr(config.services, 'post_pipeline', None)
+            # ASR 階段預設沿用 Session Effects 原本的執行緒池大小
+            default_asr_workers = getattr(
+                getattr(getattr(config, 'providers', None), 'pool', None), 'thread_pool_max_workers', 5
+            )
+            self._limits: Dict[str, Tuple[int, int]] = {}
+            max_queue = max(0, int(getattr(pipeline_config, 'max_queue', 32)))
+            for name, default_workers in (("collect", 2), ("dsp", 2), ("asr", default_asr_workers)):
+                workers = int(getattr(pipeline_config, f'{name}_workers', default_workers) or default_workers)
+                self._limits[name] = (max(1, workers), max_queue)
+
+            self._stages: Dict[str, _Stage] = {}
+            self._lock = threading.Lock()
+
+    # === 提交 ===
+
+    def submit(
+        self,
+        session_id: str,
+        collect: StageFunc,
+        dsp: StageFunc,
+        asr: StageFunc,
+        finalizer: Optional[Callable[[], None]] = None,
+    ) -> bool:
+        """提交一個語音的後處理工作（不阻塞）
+
+        每個階段函數接收上一階段的回傳值（collect 接收 None）；回傳 None 表示結束這個工作，
+        之後的階段不再執行。階段函數拋出例外時工作同樣結束。
+
+        Returns:
+            False 表示 collect 階段已滿，工作未被接受（finalizer 不會執行）
+        """
+        stages = self._get_stages()
+        if not stages["collect"].acquire(blocking=False):
+            logger.warning(f"Post-processing pipeline is full, rejected utterance for session {session_id}")
+            return False
+
+        job = _Job(session_id, [collect, dsp, asr], finalizer)
+        self._schedule(stages, job, 0, None)
+        return True
+
+    # === 統計 ===
+
+    def get_stats(self) -> Dict[str, Any]:
+        """各階段的並行數、佇列深度與耗時統計"""
+        with self._lock:
+            stages = dict(self._stages)
+        return {
+            name: stages[name].get_stats() if name in stages else {
+                "workers": self._limits[name][0],
+                "max_queue": self._limits[name][1],
+                "queue_depth": 0,
+                "active": 0,
+            }
+            for name in STAGES
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """關閉所有階段的執行緒池"""
+        with self._lock:
+            stages = list(self._stages.values())
+            self._stages = {}
+        for stage in stages:
+            stage.executor.shutdown(wait=wait)
+
+    # === 內部實作 ===
+
+    def _get_stages(self) -> Dict[str, _Stage]:
+        with self._lock:
+            if not self._stages:
+                self._stages = {
+                    name: _Stage(name, *self._limits[name])
+                    for name in STAGES
+                }
+                logger.debug(
+                    "Post-processing pipeline started: " +
+                    ", ".join(f"{name}={self._limits[name][0]}" for name in STAGES)
+                )
+            return self._stages
+
+    def _schedule(self, stages: Dict[str, _Stage], job: "_Job", index: int, value: Any) -> None:
+        """把工作交給第 index 個階段（呼叫端已取得該階段的名額）"""
+        stage = stages[STAGES[index]]
+        submitted_at = time.perf_counter()
+        try:
+            stage.executor.submit(self._run_stage, stages, job, index, value, submitted_at)
+        except RuntimeError as e:
+            # 執行緒池已關閉
+            stage.slots.release()
+            with stage.lock:
+                stage.pending -= 1
+                stage.failed += 1
+            logger.error(f"Post-processing stage {stage.name} unavailable for session {job.session_id}: {e}")
+            job.finish()
+
+    def _run_stage(
+        self, stages: Dict[str, _Stage], job: "_Job", index: int, value: Any, submitted_at: float
+    ) -> None:
+        stage = stages[STAGES[index]]
+        start = time.perf_counter()
+        with stage.lock:
+            stage.active += 1
+            stage.wait_time += start - submitted_at
+
+        failed = False
+        try:
+            result = job.steps[index](value)
+        except Exception as e:
+            failed = True
+            result = None
+            logger.error(f"Post-processing stage {stage.name} failed for session {job.session_id}: {e}")
+
+        # 先取得下一階段的名額再釋放這一階段的名額（下一階段已滿時在此等待）
+        has_next = result is not None and index + 1 < len(STAGES)
+        if has_next:
+            stages[STAGES[index + 1]].acquire(blocking=True)
+
+        with stage.lock:
+            stage.active -= 1
+            stage.pending -= 1
+            stage.busy_time += time.perf_counter() - start
+            if failed:
+                stage.failed += 1
+            else:
+                stage.completed += 1
+        stage.slots.release()
+
+        if has_next:
+            self._schedule(stages, job, index + 1, result)
+        else:
+            job.finish()
+
+
+class _Job:
+    """一個語音的後處理工作"""
+
+    __slots__ = ('session_id', 'steps', 'finalizer')
+
+    def __init__(self, session_id: str, steps: List[StageFunc], finalizer: Optional[Callable[[], None]]):
+        self.session_id = session_id
+        self.steps = steps
+        self.finalizer = finalizer
+
+    def finish(self) -> None:
+        if self.finalizer is None:
+            return
+        try:
+            self.finalizer()
+        except Exception as e:
+            logger.error(f"Post-processing finalizer failed for session {self.session_id}: {e}")
+
+
+# 模組級單例實例
+post_pipeline: PostProcessingPipeline = PostProcessingPipeline()
@@ -0,0 +1,253 @@
+"""靜音開始時的推測轉譯
+
+非串流 session 在 VAD 偵測到靜音後要等滿 services.vad.silence_threshold 秒，靜音超時才開始
+收集音訊與轉譯，使用者感受到的延遲是「靜音閾值 + 轉譯時間」。
+
+啟用後（services.vad.speculative.enabled）：
+- 靜音開始時把目前為止的錄音交給推測 worker 先轉譯
+- 靜音期間恢復說話時取消推測：尚未開始的工作直接取消，已在執行的結果丟棄（計入浪費的運算時間）
+- 靜音超時時取回推測工作並等待結果（通常已完成），轉譯與靜音等待重疊，延遲約減少一個靜音閾值
+- 推測失敗或沒有推測工作時，照原本的流程轉譯
+
+靜音超時前沒有恢復說話，代表靜音開始之後的音訊都是靜音，推測轉譯的內容與最終內容相同。
+推測 worker 全忙時不排隊（推測不應該延後真正的轉譯），直接略過這次推測。
+
+使用範例：
+    from src.core.speculative_asr import speculative_asr
+
+    # 靜音開始
+    speculative_asr.start(session_id, audio, transcribe)
+    # 恢復說話
+    speculative_asr.cancel(session_id)
+    # 靜音超時
+    speculation = speculative_asr.claim(session_id)
+    result = speculative_asr.result(speculation) if speculation else None
+"""
+
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from src.interface.asr_provider import TranscriptionResult
+from src.utils.logger import logger
+from src.utils.singleton import SingletonMixin
+from src.config.manager import ConfigManager
+
+
+class Speculation:
+    """一次推測轉譯"""
+
+    __slots__ = ('session_id', 'audio_seconds', 'future', 'submitted_at', 'started_at', 'finished_at', 'claimed_at')
+
+    def __init__(self, session_id: str, audio_seconds: float):
+        self.session_id = session_id
+        self.audio_seconds = audio_seconds
+        self.future: Optional[Future] = None
+        self.submitted_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.claimed_at: Optional[float] = None
+
+    @property
+    def run_time(self) -> float:
+        """實際執行的秒數（尚未開始為 0）"""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+
+class SpeculativeTranscriber(SingletonMixin):
+    """靜音開始時的推測轉譯
+
+    執行緒池在第一次 start() 時才建立。
+    """
+
+    def __init__(self):
+        if not hasattr(self, '_initialized'):
+            self._initialized = True
+
+            config = ConfigManager()
+            vad_config = getattr(config.services, 'vad', None)
+            speculative_config = getattr(vad_config, 'speculative', None)
+
+            self.enabled = bool(getattr(speculative_config, 'enabled', False))
+            self._min_audio = float(getattr(speculative_config, 'min_audio', 0.3) or 0.0)
+            self._max_workers = max(1, int(getattr(speculative_config, 'max_workers', 2) or 1))
+            self._result_timeout = float(getattr(speculative_config, 'result_timeout', 30.0) or 30.0)
+
+            self._speculations: Dict[str, Speculation] = {}
+            self._slots = threading.BoundedSemaphore(self._max_workers)
+            self._executor: Optional[ThreadPoolExecutor] = None
+            self._lock = threading.Lock()
+
+            # 統計
+            self._started = 0           # 已提交的推測
+            self._skipped = 0           # worker 全忙或音訊太短而略過
+            self._hits = 0              # 靜音超時時使用了推測結果
+            self._fallbacks = 0         # 靜音超時時推測失敗，改走原本流程
+            self._cancelled = 0         # 恢復說話時尚未開始執行，直接取消
+            self._discarded = 0         # 已開始執行但結果被丟棄
+            self._wasted_time = 0.0     # 被丟棄的推測耗費的運算秒數
+            self._saved_time = 0.0      # 靜音超時前已完成的轉譯秒數（節省的延遲）
+
+    # === 推測 ===
+
+    def start(
+        self,
+        session_id: str,
+        audio: np.ndarray,
+        transcribe: Callable[[np.ndarray], Optional[TranscriptionResult]],
+        sample_rate: int = 16000,
+    ) -> bool:
+        """靜音開始時提交推測轉譯（不阻塞）
+
+        同一個 session 之前的推測會先被取消。
+
+        Args:
+            session_id: Session ID
+            audio: 目前為止的錄音（16kHz 單聲道）
+            transcribe: 轉譯函數，在推測 worker 中執行
+            sample_rate: audio 的取樣率
+
+        Returns:
+            False 表示未啟用、音訊太短或 worker 全忙，這次不推測
+        """
+        if not self.enabled:
+            return False
+
+        self.cancel(session_id)
+
+        audio_seconds = len(audio) / sample_rate if sample_rate else 0.0
+        if audio_seconds < self._min_audio or not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._skipped += 1
+            logger.debug(f"Speculative transcription skipped for session {session_id} ({audio_seconds:.2f}s)")
+            return False
+
+        speculation = Speculation(session_id, audio_seconds)
+        speculation.future = self._get_executor().submit(self._run, speculation, audio, transcribe)
+        speculation.future.add_done_callback(lambda _: self._slots.release())
+        with self._lock:
+            self._speculations[session_id] = speculation
+            self._started += 1
+
+        logger.debug(f"🔮 Speculative transcription started for session {session_id} ({audio_seconds:.2f}s)")
+        return True
+
+    def cancel(self, session_id: str) -> None:
+        """放棄 session 目前的推測（恢復說話、session 重置或刪除）"""
+        with self._lock:
+            speculation = self._speculations.pop(session_id, None)
+        if speculation is not None:
+            self.discard(speculation)
+
+    def discard(self, speculation: Speculation) -> None:
+        """放棄 claim() 取回但不使用的推測"""
+        session_id = speculation.session_id
+        if speculation.future.cancel():
+            with self._lock:
+                self._cancelled += 1
+            logger.debug(f"Speculative transcription cancelled for session {session_id}")
+            return
+
+        # 已在執行：結果丟棄，執行結束後計入浪費的運算時間
+        def account(_):
+            with self._lock:
+                self._discarded += 1
+                self._wasted_time += speculation.run_time
+
+        speculation.future.add_done_callback(account)
+        logger.debug(f"Speculative transcription discarded for session {session_id}")
+
+    def claim(self, session_id: str) -> Optional[Speculation]:
+        """靜音超時時取回 session 的推測（之後不會再被 cancel() 取消）"""
+        with self._lock:
+            speculation = self._speculations.pop(session_id, None)
+        if speculation is not None:
+            speculation.claimed_at = time.perf_counter()
+        return speculation
+
+    def result(self, speculation: Speculation) -> Optional[TranscriptionResult]:
+        """等待 claim() 取回的推測結果
+
+        Returns:
+            推測失敗、逾時或沒有結果時返回 None，呼叫端應改走原本的轉譯流程
+        """
+        try:
+            result = speculation.future.result(timeout=self._result_timeout)
+        except (CancelledError, Exception) as e:
+            result = None
+            logger.warning(f"Speculative transcription failed for session {speculation.session_id}: {e}")
+
+        with self._lock:
+            if result is None:
+                self._fallbacks += 1
+            else:
+                self._hits += 1
+                # 靜音超時前已經執行的部分就是節省的延遲
+                claimed_at = speculation.claimed_at or time.perf_counter()
+                if speculation.started_at is not None:
+                    self._saved_time += max(
+                        0.0, min(speculation.finished_at, claimed_at) - speculation.started_at
+                    )
+        return result
+
+    # === 統計 ===
+
+    def get_stats(self) -> Dict[str, Any]:
+        """推測命中率與浪費的運算時間"""
+        with self._lock:
+            resolved = self._hits + self._fallbacks + self._cancelled + self._discarded
+            return {
+                "enabled": self.enabled,
+                "in_flight": len(self._speculations),
+                "started": self._started,
+                "skipped": self._skipped,
+                "hits": self._hits,
+                "fallbacks": self._fallbacks,
+                "cancelled": self._cancelled,
+                "discarded": self._discarded,
+                "hit_rate": self._hits / resolved if resolved else 0.0,
+                "wasted_compute_seconds": round(self._wasted_time, 3),
+                "saved_seconds": round(self._saved_time, 3),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """取消所有推測並關閉執行緒池"""
+        with self._lock:
+            session_ids = list(self._speculations)
+        for session_id in session_ids:
+            self.cancel(session_id)
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+
+    # === 內部實作 ===
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="speculative-asr"
+                )
+            return self._executor
+
+    def _run(
+        self,
+        speculation: Speculation,
+        audio: np.ndarray,
+        transcribe: Callable[[np.ndarray], Optional[TranscriptionResult]],
+    ) -> Optional[TranscriptionResult]:
+        speculation.started_at = time.perf_counter()
+        try:
+            return transcribe(audio)
+        finally:
+            speculation.finished_at = time.perf_counter()
+
+
+# 模組級單例實例
+speculative_asr: SpeculativeTranscriber = SpeculativeTranscriber()
@@ -0,0 +1,414 @@
+"""啟動協調器
+
+過去 ASRHubServer.initialize_services 依序匯入並初始化 Store、音訊轉換、Silero VAD、
+OpenWakeWord、錄音、麥克風、計時器與 Provider Pool，Whisper 暖機又排在之後；
+torch、onnxruntime、openwakeword 等重量級匯入全部串行在啟動的關鍵路徑上。
+
+啟動協調器：
+- 以執行緒池並行載入彼此獨立的元件，depends_on 指定的元件結束（含失敗）後才開始
+- 載入後執行暖機（warm_up，一次假推論），第一個真正的請求不必承擔冷啟動
+- 可選的子系統（DeepFilterNet、麥克風）標記為 deferred，第一次使用時才載入（track()）
+- 記錄每個元件的狀態與時間軸，提供 /health/ready 的就緒狀態並輸出啟動時間軸
+- startup.time_budget 秒內未完成時不再等待：API 照常啟動，未完成的元件在背景繼續載入，
+  /health/ready 在全部必要元件就緒前回應 503
+
+元件狀態：
+    pending → loading → warming → ready
+                      ↘ failed / disabled（服務停用）
+    deferred → loading → ready / failed（第一次使用時）
+
+使用範例：
+    from src.core.startup import startup
+
+    startup.register("vad", load_vad, warm_up=silero_vad.warm_up, label="Silero VAD")
+    startup.register("store", load_store, depends_on=("vad",))
+    startup.defer("microphone", label="麥克風擷取")
+    startup.run()
+
+    with startup.track("microphone"):
+        ...  # 第一次使用時載入
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src.utils.logger import logger
+from src.utils.singleton import SingletonMixin
+from src.config.manager import ConfigManager
+
+
+# 元件狀態
+PENDING = "pending"         # 等待載入（或等待依賴的元件）
+LOADING = "loading"         # 載入中
+WARMING = "warming"         # 暖機中（假推論）
+READY = "ready"             # 已就緒
+FAILED = "failed"           # 載入或暖機失敗
+DISABLED = "disabled"       # 服務停用（load 返回 False）
+DEFERRED = "deferred"       # 第一次使用時才載入
+
+# 時間軸長條的寬度（字元）
+_BAR_WIDTH = 30
+
+
+class StartupComponent:
+    """一個啟動元件的狀態與時間"""
+
+    __slots__ = (
+        'name', 'label', 'load', 'warm_up', 'depends_on', 'required',
+        'status', 'error', 'started_at', 'loaded_at', 'finished_at', 'done',
+    )
+
+    def __init__(
+        self,
+        name: str,
+        label: str,
+        load: Optional[Callable[[], Any]] = None,
+        warm_up: Optional[Callable[[], Any]] = None,
+        depends_on: Iterable[str] = (),
+        required: bool = True,
+        status: str = PENDING,
+    ):
+        self.name = name
+        self.label = label
+        self.load = load
+        self.warm_up = warm_up
+        self.depends_on = tuple(depends_on)
+        self.required = required
+        self.status = status
+        self.error: Optional[str] = None
+        # 相對於協調器建立時間的秒數
+        self.started_at: Optional[float] = None
+        self.loaded_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.done = threading.Event()
+
+    @property
+    def load_seconds(self) -> Optional[float]:
+        if self.started_at is None or self.loaded_at is None:
+            return None
+        return self.loaded_at - self.started_at
+
+    @property
+    def warm_up_seconds(self) -> Optional[float]:
+        if self.loaded_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.loaded_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        def rounded(value):
+            return round(value, 3) if value is not None else None
+
+        return {
+            "label": self.label,
+            "status": self.status,
+            "required": self.required,
+            "depends_on": list(self.depends_on),
+            "started_at": rounded(self.started_at),
+            "finished_at": rounded(self.finished_at),
+            "load_seconds": rounded(self.load_seconds),
+            "warm_up_seconds": rounded(self.warm_up_seconds),
+            "error": self.error,
+        }
+
+
+class StartupOrchestrator(SingletonMixin):
+    """並行載入、暖機並追蹤啟動元件
+
+    時間都以協調器建立的時間（通常是 main.py 匯入時）為原點，時間軸涵蓋整個啟動流程。
+    """
+
+    def __init__(self):
+        if not hasattr(self, '_initialized'):
+            self._initialized = True
+
+            config = ConfigManager()
+            startup_config = getattr(config, 'startup', None)
+
+            self._max_workers = int(getattr(startup_config, 'max_workers', 0) or 0)
+            self._time_budget = float(getattr(startup_config, 'time_budget', 0) or 0.0)
+            self._warm_up = bool(getattr(startup_config, 'warm_up', True))
+            self._timeline_file = getattr(startup_config, 'timeline_file', None) or None
+
+            self._origin = time.perf_counter()
+            self._components: Dict[str, StartupComponent] = {}
+            self._lock = threading.Lock()
+            self._executor: Optional[ThreadPoolExecutor] = None
+            self._started = False           # run() 已開始
+            self._finished_at: Optional[float] = None
+            self._over_budget = False
+            self._reported = False
+
+    # === 註冊 ===
+
+    def register(
+        self,
+        name: str,
+        load: Callable[[], Any],
+        warm_up: Optional[Callable[[], Any]] = None,
+        label: Optional[str] = None,
+        depends_on: Iterable[str] = (),
+        required: bool = True,
+    ) -> None:
+        """註冊一個在 run() 時載入的元件
+
+        Args:
+            name: 元件名稱（/health/ready 的 key）
+            load: 載入函數；返回 False 表示服務停用，拋出例外表示失敗
+            warm_up: 暖機函數（假推論），startup.warm_up 關閉時略過
+            label: 顯示名稱
+            depends_on: 必須先結束的元件（需先註冊）
+            required: 是否為就緒的必要條件
+
+        Raises:
+            ValueError: 名稱重複或依賴的元件尚未註冊
+        """
+        depends_on = tuple(depends_on)
+        with self._lock:
+            if name in self._components:
+                raise ValueError(f"啟動元件重複註冊: {name}")
+            missing = [dep for dep in depends_on if dep not in self._components]
+            if missing:
+                raise ValueError(f"啟動元件 {name} 依賴尚未註冊的元件: {', '.join(missing)}")
+            self._components[name] = StartupComponent(
+                name, label or name, load, warm_up, depends_on, required
+            )
+
+    def defer(self, name: str, label: Optional[str] = None, enabled: bool = True) -> None:
+        """註冊一個第一次使用時才載入的元件（不影響就緒狀態）
+
+        Args:
+            enabled: False 表示服務停用，直接標記為 disabled
+        """
+        with self._lock:
+            if name not in self._components:
+                component = StartupComponent(
+                    name, label or name, required=False,
+                    status=DEFERRED if enabled else DISABLED,
+                )
+                if not enabled:
+                    component.done.set()
+                self._components[name] = component
+
+    @contextmanager
+    def track(self, name: str, label: Optional[str] = None):
+        """記錄延遲載入元件的載入時間（未註冊的名稱自動加入，不影響就緒狀態）
+
+        使用範例：
+            with startup.track("denoiser"):
+                from src.service.denoise.deepfilternet_denoiser import deepfilternet_denoiser
+        """
+        with self._lock:
+            component = self._components.get(name)
+            if component is None:
+                component = StartupComponent(name, label or name, required=False)
+                self._components[name] = component
+            component.status = LOADING
+            component.error = None
+            component.done.clear()
+            component.started_at = self._now()
+        try:
+            yield component
+        except BaseException as e:
+            self._finish(component, FAILED, str(e) or type(e).__name__)
+            raise
+        else:
+            self._finish(component, READY)
+
+    # === 執行 ===
+
+    def run(self) -> bool:
+        """並行載入所有已註冊的元件，最多等待 startup.time_budget 秒
+
+        Returns:
+            必要元件是否全部就緒；超出時間預算時返回 False，未完成的元件繼續在背景載入
+        """
+        with self._lock:
+            if self._started:
+                raise RuntimeError("啟動協調器已執行過")
+            self._started = True
+            pending = [c for c in self._components.values() if c.status == PENDING]
+            workers = self._max_workers or len(pending)
+            if pending:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, min(workers, len(pending))), thread_name_prefix="startup"
+                )
+
+        logger.info(
+            f"🚀 並行載入 {len(pending)} 個元件"
+            + (f"（時間預算 {self._time_budget:g}s）" if self._time_budget else "")
+        )
+
+        # 依註冊順序提交：依賴的元件一定更早被執行緒池取出，等待依賴時不會佔滿所有 worker
+        for component in pending:
+            self._executor.submit(self._run_component, component)
+
+        budget = self._time_budget or None
+        deadline = time.perf_counter() + budget if budget else None
+        for component in pending:
+            timeout = max(0.0, deadline - time.perf_counter()) if deadline else None
+            if not component.done.wait(timeout):
+                break
+
+        with self._lock:
+            finished = all(c.done.is_set() for c in pending)
+            if not finished:
+                self._over_budget = True
+        if finished:
+            self._report()
+        else:
+            loading = [c.label for c in pending if not c.done.is_set()]
+            logger.warning(
+                f"⚠️ 啟動超出時間預算 ({self._time_budget:g}s)，"
+                f"以下元件在背景繼續載入: {', '.join(loading)}"
+            )
+        return self.is_ready()
+
+    # === 狀態 ===
+
+    def is_ready(self) -> bool:
+        """run() 已執行且必要元件全部就緒（停用的服務不影響）"""
+        with self._lock:
+            if not self._started:
+                return False
+            return all(
+                c.status in (READY, DISABLED)
+                for c in self._components.values() if c.required
+            )
+
+    def get_readiness(self) -> Dict[str, Any]:
+        """/health/ready 回應內容：整體與每個元件的就緒狀態"""
+        ready = self.is_ready()
+        with self._lock:
+            finished_at = self._finished_at
+            return {
+                "ready": ready,
+                "uptime": round(self._now(), 3),
+                "startup_seconds": round(finished_at, 3) if finished_at is not None else None,
+                "time_budget": self._time_budget or None,
+                "over_budget": self._over_budget,
+                "components": {
+                    name: component.to_dict()
+                    for name, component in self._components.items()
+                },
+            }
+
+    def get_timeline(self) -> List[str]:
+        """啟動時間軸（每個元件一行，長條為載入 + 暖機的區間）"""
+        with self._lock:
+            components = list(self._components.values())
+            total = self._finished_at if self._finished_at is not None else self._now()
+
+        scale = _BAR_WIDTH / total if total > 0 else 0.0
+        name_width = max((len(c.name) for c in components), default=0)
+        lines = []
+        for component in components:
+            if component.started_at is None:
+                lines.append(f"{component.name:<{name_width}}  {' ' * _BAR_WIDTH}  {component.status}")
+                continue
+
+            end = component.finished_at if component.finished_at is not None else total
+            begin_col = min(_BAR_WIDTH - 1, int(component.started_at * scale))
+            end_col = max(begin_col + 1, min(_BAR_WIDTH, int(round(end * scale))))
+            bar = " " * begin_col + "█" * (end_col - begin_col) + " " * (_BAR_WIDTH - end_col)
+
+            detail = f"{component.started_at:6.2f}s → {end:6.2f}s"
+            if component.warm_up_seconds is not None and component.warm_up_seconds >= 0.005:
+                detail += f"（載入 {component.load_seconds:.2f}s + 暖機 {component.warm_up_seconds:.2f}s）"
+            line = f"{component.name:<{name_width}}  {bar}  {detail}  {component.status}"
+            if component.error:
+                line += f": {component.error}"
+            lines.append(line)
+
+        summary = f"總計 {total:.2f}s"
+        if self._time_budget:
+            summary += f"（時間預算 {self._time_budget:g}s{'，已超出' if total > self._time_budget else ''}）"
+        lines.append(summary)
+        return lines
+
+    def shutdown(self, wait: bool = False) -> None:
+        """關閉載入用的執行緒池"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+
+    # === 內部實作 ===
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def _run_component(self, component: StartupComponent) -> None:
+        # 依賴只決定先後順序：依賴的元件失敗時照常載入，由元件自己的載入結果決定狀態
+        for dep in component.depends_on:
+            self._components[dep].done.wait()
+
+        component.started_at = self._now()
+        component.status = LOADING
+        try:
+            loaded = component.load()
+        except Exception as e:
+            logger.error(f"❌ {component.label} 載入失敗: {e}")
+            self._finish(component, FAILED, str(e) or type(e).__name__)
+            return
+        component.loaded_at = self._now()
+
+        if loaded is False:
+            self._finish(component, DISABLED)
+            return
+
+        if component.warm_up and self._warm_up:
+            component.status = WARMING
+            try:
+                component.warm_up()
+            except Exception as e:
+                logger.error(f"❌ {component.label} 暖機失敗: {e}")
+                self._finish(component, FAILED, f"暖機失敗: {e}")
+                return
+        self._finish(component, READY)
+
+    def _finish(self, component: StartupComponent, status: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            now = self._now()
+            component.status = status
+            component.error = error
+            if component.loaded_at is None and status != FAILED:
+                component.loaded_at = now
+            component.finished_at = now
+            component.done.set()
+
+            all_done = self._started and all(
+                c.done.is_set() for c in self._components.values() if c.status != DEFERRED
+            )
+            report_late = all_done and self._over_budget and not self._reported
+
+        if report_late:
+            # 超出時間預算後在背景完成：補上完整的時間軸
+            self._report()
+
+    def _report(self) -> None:
+        """輸出啟動時間軸並寫入 startup.timeline_file"""
+        with self._lock:
+            if self._reported:
+                return
+            self._reported = True
+            self._finished_at = max(
+                (c.finished_at for c in self._components.values() if c.finished_at is not None),
+                default=self._now(),
+            )
+
+        logger.block("啟動時間軸", self.get_timeline())
+
+        if self._timeline_file:
+            try:
+                with open(self._timeline_file, "w", encoding="utf-8") as f:
+                    json.dump(self.get_readiness(), f, ensure_ascii=False, indent=2)
+            except OSError as e:
+                logger.warning(f"無法寫入啟動時間軸 {self._timeline_file}: {e}")
+
+
+# 模組級單例實例
+startup: StartupOrchestrator = StartupOrchestrator()
@@ -23,6 +23,8 @@ class Action:
     """收到音訊分塊 (必選參數: session_id, audio_data)"""
     CLEAR_AUDIO_BUFFER = "clear_audio_buffer" 
     """清除音訊緩衝區 (必選參數: session_id)"""
+    AUDIO_CHUNKS_INGESTED = "audio_chunks_ingested"
+    """資料平面累積的接收計數 (必選參數: session_id, count)"""
 
     # Upload / batch
     UPLOAD_STARTED = "upload_started"
@@ -67,6 +69,10 @@ class Action:
     """開始串流 ASR (必選參數: session_id)"""
     ASR_STREAM_STOPPED = "asr_stream_stopped"
     """停止串流 ASR (必選參數: session_id)"""
+    TRANSCRIBE_PARTIAL = "transcribe_partial"
+    """串流轉譯的中間結果 (必選參數: session_id, text, committed, tentative)"""
+    TRANSCRIBE_FINAL = "transcribe_final"
+    """串流轉譯的最終結果 (必選參數: session_id, text)"""
 
     # LLM
     LLM_REPLY_STARTED = "llm_reply_started"
@@ -150,6 +156,8 @@ class InternalAction(Action):
     """收到音訊分塊 (必選參數: session_id, audio_data)"""
     CLEAR_AUDIO_BUFFER = Action.CLEAR_AUDIO_BUFFER
     """清除音訊緩衝區 (必選參數: session_id)"""
+    AUDIO_CHUNKS_INGESTED = Action.AUDIO_CHUNKS_INGESTED
+    """資料平面累積的接收計數 (必選參數: session_id, count)"""
     WAKE_ACTIVATED = Action.WAKE_ACTIVATED 
     """喚醒啟用 (必選參數: session_id, source) 透過 openWakeWord或者關鍵字喚醒"""
     WAKE_DEACTIVATED = Action.WAKE_DEACTIVATED
@@ -172,6 +180,10 @@ class InternalAction(Action):
     """開始串流 ASR (必選參數: session_id)"""
     ASR_STREAM_STOPPED = Action.ASR_STREAM_STOPPED
     """停止串流 ASR (必選參數: session_id)"""
+    TRANSCRIBE_PARTIAL = Action.TRANSCRIBE_PARTIAL
+    """串流轉譯的中間結果 (必選參數: session_id, text, committed, tentative)"""
+    TRANSCRIBE_FINAL = Action.TRANSCRIBE_FINAL
+    """串流轉譯的最終結果 (必選參數: session_id, text)"""
     LLM_REPLY_TIMEOUT = Action.LLM_REPLY_TIMEOUT
     """回覆超時 (必選參數: session_id)"""
     TTS_PLAYBACK_TIMEOUT = Action.TTS_PLAYBACK_TIMEOUT
@@ -189,5 +201,9 @@ class OutputAction(Action):
     """播放 ASR 回饋音 (必選參數: session_id, command)"""
     TRANSCRIBE_DONE = Action.TRANSCRIBE_DONE
     """完成轉譯 (必選參數: session_id)"""
+    TRANSCRIBE_PARTIAL = Action.TRANSCRIBE_PARTIAL
+    """串流轉譯的中間結果 (必選參數: session_id, text, committed, tentative)"""
+    TRANSCRIBE_FINAL = Action.TRANSCRIBE_FINAL
+    """串流轉譯的最終結果 (必選參數: session_id, text)"""
     ERROR_REPORTED = Action.ERROR_REPORTED
     """錯誤已回報 (必選參數: session_id)"""
@@ -9,6 +9,16 @@ import numpy as np
 import time
 
 
+# audio_queue 與所有下游服務使用的標準格式
+CANONICAL_SAMPLE_RATE = 16000
+CANONICAL_CHANNELS = 1
+CANONICAL_FORMAT = "pcm_s16le"
+
+# 與 pcm_s16le 相同的格式名稱
+S16_FORMATS = {"pcm_s16le", "pcm", "s16le", "int16"}
+F32_FORMATS = {"pcm_f32le", "f32le", "float32"}
+
+
 @dataclass
 class AudioChunk:
     """音訊片段資料結構。
@@ -19,12 +29,14 @@ class AudioChunk:
         channels: 聲道數
         timestamp: 時間戳記
         metadata: 額外的中繼資料
+        format: bytes 資料的編碼格式（pcm_s16le / pcm_f32le / opus…）
     """
     data: Union[np.ndarray, bytes]
     sample_rate: int = 16000
     channels: int = 1
     timestamp: Optional[float] = None
     metadata: Optional[dict] = None
+    format: str = CANONICAL_FORMAT
     
     def __post_init__(self):
         """初始化後處理。"""
@@ -34,6 +46,15 @@ class AudioChunk:
         if self.metadata is None:
             self.metadata = {}
     
+    @property
+    def is_canonical(self) -> bool:
+        """是否已是標準格式（16kHz 單聲道 int16），下游可直接使用不需轉換。"""
+        if self.sample_rate != CANONICAL_SAMPLE_RATE or self.channels != CANONICAL_CHANNELS:
+            return False
+        if isinstance(self.data, np.ndarray):
+            return self.data.dtype == np.int16 and self.data.ndim == 1
+        return (self.format or CANONICAL_FORMAT).lower() in S16_FORMATS
+    
     @property
     def duration(self) -> float:
         """計算音訊時長（秒）。"""
@@ -62,8 +83,15 @@ class AudioChunk:
                            如果為 False，轉換為 float32 [-1, 1] (預設行為)
         """
         if isinstance(self.data, np.ndarray):
+            # audio_queue 的 int16 視圖與 bytes 相同處理：預設歸一化到 [-1, 1]
+            if self.data.dtype == np.int16 and not preserve_dtype:
+                return self.data.astype(np.float32) / 32768.0
             return self.data
         elif isinstance(self.data, bytes):
+            if (self.format or "").lower() in F32_FORMATS:
+                audio = np.frombuffer(self.data, dtype=np.float32)
+                return audio.reshape(-1, self.channels) if self.channels > 1 else audio
+            
             # 假設 16-bit PCM
             audio = np.frombuffer(self.data, dtype=np.int16)
             if self.channels == 2:
@@ -135,6 +135,24 @@ class BufferConfig:
             sample_rate=sample_rate
         )
 
+    @classmethod
+    def for_streaming_asr(cls, sample_rate: Optional[int] = None,
+                          step_ms: Optional[int] = None) -> 'BufferConfig':
+        """串流 ASR 配置（每累積 step_ms 新音訊觸發一次增量解碼）"""
+        config = _get_config_manager()
+        buffer_cfg = config.services.buffer_manager
+        streaming_cfg = getattr(buffer_cfg, 'streaming_asr_buffer', None)
+
+        # 使用配置值或覆蓋參數
+        step_ms = step_ms or getattr(streaming_cfg, 'step_ms', 500)
+        sample_rate = sample_rate or buffer_cfg.default_sample_rate
+
+        return cls(
+            mode=getattr(streaming_cfg, 'mode', "fixed"),
+            frame_size=int(sample_rate * step_ms / 1000),  # 樣本數
+            sample_rate=sample_rate
+        )
+
 
 class IBufferManager(ABC):
     """Buffer 管理器介面
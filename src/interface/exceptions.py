@@ -125,6 +125,15 @@ class ConversionError(ServiceError):
     pass
 
 
+class IngestBackpressureError(QueueOperationError):
+    """音訊接收佇列已滿（session 處理落後），呼叫端應在 retry_after 秒後重試"""
+
+    def __init__(self, message: str, retry_after: float = 0.0, queue_depth: int = 0):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.queue_depth = queue_depth
+
+
 # Wakeword Service Exceptions
 class WakewordError(ServiceError):
     """喚醒詞服務基礎錯誤"""
@@ -44,6 +44,9 @@ class VADConfig:
     speech_pad_ms: int = 30  # 語音前後填充（毫秒）
     return_seconds: bool = False  # 是否返回秒數
     max_speech_duration: float = 60.0  # 最大語音持續時間（秒）
+    batch_enabled: bool = True  # 監聽模式是否跨 session 批次推論
+    max_batch_size: int = 32  # 單一批次最多的 session 數
+    max_batch_latency: float = 0.01  # 湊批次的最長等待時間（秒）
 
 
 class IVADService(ABC):
@@ -51,6 +51,9 @@ class WakewordConfig:
     max_buffer_size: int = 100           # 最大緩衝區大小
     continuous_detection: bool = True     # 連續檢測模式
     use_gpu: bool = False                 # 是否使用 GPU
+    batch_enabled: bool = True            # 監聽模式是否跨 session 批次推論
+    max_batch_size: int = 32              # 單一批次最多的 session 數
+    max_batch_latency: float = 0.01       # 湊批次的最長等待時間（秒）
     # OpenWakeWord 特定配置
     hf_repo_id: Optional[str] = None     # HuggingFace repo ID
     hf_filename: Optional[str] = None    # HuggingFace 檔名
@@ -0,0 +1,246 @@
+"""跨 session 的 ASR 批次排程器
+
+多個 session 幾乎同時結束錄音時，各自租用 provider 並各自執行一次 `model.transcribe`，
+成本與 session 數成線性。排程器在 ProviderPoolManager 之前收集短時間內到達的語音，
+以一次批次推論（每段一個 30 秒 mel 視窗）完成後再把結果交回各 session。
+
+- 收集規則沿用 FrameBatcher：湊滿 max_batch_size 個 session 或最早的語音等待
+  max_batch_latency 秒即執行
+- 每個批次租用一個 provider，最多 provider_pool.max_size 個批次同時執行（每個模型副本一個）；
+  provider 沒有 transcribe_batch 時逐段轉譯
+- 批次中的每段語音計入各自 session 的 provider 配額，超過配額的語音直接以錯誤結束
+- 呼叫端以 transcribe() 同步等待自己的結果，後續流程（transcribe_done 等）不變
+"""
+
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.config.manager import ConfigManager
+from src.core.frame_batcher import FrameBatcher
+from src.interface.asr_provider import TranscriptionResult
+from src.interface.exceptions import ServiceExecutionError
+from src.utils.logger import logger
+
+
+# 批次租用 provider 時使用的 ID 前綴（每個進行中的批次為 "__asr_batch__:<序號>"，
+# 不佔用任何真實 session 的配額；各段語音的配額由 reserve_quota() 另外計算）
+BATCH_LEASE_ID = "__asr_batch__"
+
+
+class _PendingTranscription:
+    """等待批次轉譯的一段語音"""
+
+    __slots__ = ('audio', 'future')
+
+    def __init__(self, audio: np.ndarray):
+        self.audio = audio
+        self.future: Future = Future()
+
+
+class TranscriptionBatchScheduler:
+    """跨 session 的 ASR 批次排程器
+
+    使用範例:
+        scheduler = get_batch_scheduler()
+        if scheduler.enabled:
+            result = scheduler.transcribe(session_id, audio)
+    """
+
+    def __init__(self):
+        config = ConfigManager()
+        pool_config = config.provider_pool
+        batching = getattr(pool_config, 'batching', None)
+
+        self.enabled = bool(getattr(batching, 'enabled', False))
+        self._max_batch_size = int(getattr(batching, 'max_batch_size', 8) or 8)
+        self._max_batch_latency = float(getattr(batching, 'max_batch_latency', 0.05) or 0.0)
+        self._lease_timeout = float(getattr(pool_config, 'lease_timeout', 10.0) or 10.0)
+        self._result_timeout = float(getattr(batching, 'result_timeout', 120.0) or 120.0)
+        # 同時執行的批次數上限：每個 provider（模型副本）一個批次
+        self._max_concurrent = max(1, int(getattr(pool_config, 'max_size', 1) or 1))
+
+        self._batcher = FrameBatcher(
+            self._run_batch,
+            max_batch_size=self._max_batch_size,
+            max_batch_latency=self._max_batch_latency,
+            name="asr-batcher"
+        )
+        self._pending: Set[_PendingTranscription] = set()
+        self._lock = threading.Lock()
+
+        # 批次執行緒只負責湊批次，轉譯在執行緒池中進行
+        self._slots = threading.BoundedSemaphore(self._max_concurrent)
+        self._executor = ThreadPoolExecutor(max_workers=self._max_concurrent, thread_name_prefix="asr-batch")
+        self._batch_ids = itertools.count()
+        self._in_flight = 0
+        self._max_in_flight = 0
+
+        logger.debug(
+            f"ASR 批次排程器初始化: enabled={self.enabled}, "
+            f"max_batch_size={self._max_batch_size}, "
+            f"max_batch_latency={self._max_batch_latency * 1000:.0f}ms, "
+            f"max_concurrent={self._max_concurrent}"
+        )
+
+    def submit(self, session_id: str, audio: np.ndarray) -> Future:
+        """提交一段語音，返回之後會得到 TranscriptionResult 的 Future"""
+        item = _PendingTranscription(audio)
+        with self._lock:
+            self._pending.add(item)
+        item.future.add_done_callback(lambda _: self._discard(item))
+        self._batcher.submit(session_id, [item])
+        return item.future
+
+    def transcribe(
+        self,
+        session_id: str,
+        audio: np.ndarray,
+        timeout: Optional[float] = None
+    ) -> TranscriptionResult:
+        """提交並等待結果
+
+        Args:
+            session_id: Session ID
+            audio: 16kHz 音訊
+            timeout: 最長等待秒數（None 使用設定的 result_timeout）
+
+        Raises:
+            ServiceExecutionError: 轉譯失敗或等待逾時
+        """
+        timeout = self._result_timeout if timeout is None else timeout
+        future = self.submit(session_id, audio)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError as e:
+            future.cancel()
+            raise ServiceExecutionError(f"批次轉譯等待逾時 ({timeout}s)") from e
+
+    def _discard(self, item: _PendingTranscription) -> None:
+        with self._lock:
+            self._pending.discard(item)
+
+    def _run_batch(self, session_ids: List[str], items: List[_PendingTranscription]) -> None:
+        """把一個批次交給執行緒池（在批次執行緒中執行）"""
+        active = [
+            (session_id, item)
+            for session_id, item in zip(session_ids, items)
+            if item.future.set_running_or_notify_cancel()
+        ]
+        if not active:
+            return
+
+        # 所有 provider 都在轉譯時在此等待，期間到達的語音累積成下一個較大的批次
+        self._slots.acquire()
+        with self._lock:
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+        try:
+            self._executor.submit(self._execute_batch, next(self._batch_ids), active)
+        except RuntimeError as e:  # 執行緒池已關閉
+            self._batch_done()
+            for _, item in active:
+                item.future.set_exception(ServiceExecutionError(f"ASR 批次排程器已關閉: {e}"))
+
+    def _batch_done(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _execute_batch(self, batch_id: int, active: List[Tuple[str, _PendingTranscription]]) -> None:
+        """扣除各 session 的配額後執行批次（在執行緒池中執行）"""
+        from src.provider.provider_manager import get_provider_manager
+
+        try:
+            pool = get_provider_manager()
+            charged = []
+            for session_id, item in active:
+                if pool.reserve_quota(session_id):
+                    charged.append((session_id, item))
+                else:
+                    item.future.set_exception(
+                        ServiceExecutionError(f"Session {session_id} 達到 provider 配額上限")
+                    )
+            if not charged:
+                return
+
+            try:
+                self._transcribe_batch(pool, f"{BATCH_LEASE_ID}:{batch_id}", charged)
+            finally:
+                for session_id, _ in charged:
+                    pool.release_quota(session_id)
+        except Exception as e:
+            logger.error(f"批次轉譯錯誤 (batch={len(active)}): {e}")
+            for _, item in active:
+                if not item.future.done():
+                    item.future.set_exception(e)
+        finally:
+            self._batch_done()
+
+    def _transcribe_batch(self, pool, lease_id: str, active: List[Tuple[str, _PendingTranscription]]) -> None:
+        """以一個 provider 轉譯整個批次"""
+        with pool.lease_context(lease_id, timeout=self._lease_timeout) as (provider, error):
+            if not provider:
+                error = ServiceExecutionError(f"無法租用 ASR provider: {error}")
+                for _, item in active:
+                    item.future.set_exception(error)
+                return
+
+            try:
+                if hasattr(provider, 'transcribe_batch'):
+                    results = provider.transcribe_batch(
+                        [item.audio for _, item in active],
+                        [session_id for session_id, _ in active]
+                    )
+                else:
+                    results = [
+                        provider.transcribe_audio(item.audio, session_id=session_id)
+                        for session_id, item in active
+                    ]
+                pool.mark_success(provider)
+            except Exception as e:
+                logger.error(f"批次轉譯錯誤 (batch={len(active)}): {e}")
+                pool.mark_failure(provider, str(e))
+                for _, item in active:
+                    item.future.set_exception(e)
+                return
+
+        for (_, item), result in zip(active, results):
+            item.future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """取得批次統計"""
+        stats = self._batcher.get_stats()
+        stats['enabled'] = self.enabled
+        with self._lock:
+            stats['in_flight'] = self._in_flight
+            stats['max_in_flight'] = self._max_in_flight
+        stats['max_concurrent'] = self._max_concurrent
+        return stats
+
+    def shutdown(self) -> None:
+        """停止排程器，尚未完成的請求以錯誤結束"""
+        self._batcher.shutdown()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        for item in pending:
+            if not item.future.done():
+                item.future.set_exception(ServiceExecutionError("ASR 批次排程器已關閉"))
+
+
+_batch_scheduler = None
+_batch_scheduler_lock = threading.Lock()
+
+
+def get_batch_scheduler() -> TranscriptionBatchScheduler:
+    """獲取 ASR 批次排程器單例（執行緒安全）"""
+    global _batch_scheduler
+    if _batch_scheduler is None:
+        with _batch_scheduler_lock:
+            if _batch_scheduler is None:
+                _batch_scheduler = TranscriptionBatchScheduler()
+    return _batch_scheduler
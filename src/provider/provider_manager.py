@@ -5,6 +5,7 @@
 2. 老化機制 - 防止飢餓
 3. 配額管理 - 防止單一 session 壟斷資源
 4. 健康檢查 - 自動移除不健康的 provider
+5. 模型副本 - 每個 provider 綁定一個 slot（對應一個模型副本），max_size 即並行解碼數
 
 設計原則：
 - KISS: 從簡單開始，逐步增加功能
@@ -27,6 +28,7 @@ from src.interface.provider_pool_interfaces import (
     ProviderHealth
 )
 from src.config.manager import ConfigManager
+from src.core.metrics import LatencyHistogram, Stage, metrics
 from src.utils.id_provider import new_id
 from src.utils.logger import logger
 
@@ -99,6 +101,9 @@ class ProviderPoolManager:
         # Provider 健康資訊
         self._health: Dict[int, ProviderHealth] = {}
         
+        # Provider 所在的 slot（0 ~ max_size-1，決定綁定的模型副本）
+        self._slots: Dict[int, int] = {}
+        
         # 從配置載入參數
         self._aging_enabled = self.config.aging_prevention
         self._aging_factor = self.config.aging_factor
@@ -112,8 +117,9 @@ class ProviderPoolManager:
             'total_releases': 0,
             'total_timeouts': 0,
             'total_errors': 0,
-            'queue_wait_times': [],  # 最近100次等待時間
         }
+        self._wait_histogram = LatencyHistogram()   # 租用等待時間
+        self._hold_histogram = LatencyHistogram()   # 租用到歸還的使用時間
         
         # 延遲載入標記
         self._pool_initialized = False
@@ -166,6 +172,14 @@ class ProviderPoolManager:
         provider_id = id(provider)
         self._all_providers[provider_id] = provider
         
+        # 分配最小的空閒 slot，綁定對應的模型副本
+        used_slots = set(self._slots.values())
+        slot = next(i for i in range(len(used_slots) + 1) if i not in used_slots)
+        self._slots[provider_id] = slot
+        if hasattr(provider, 'bind_replica'):
+            replica = provider.bind_replica(slot)
+            logger.debug(f"Provider slot #{slot} 綁定模型副本 #{replica}")
+        
         # 初始化健康資訊
         self._health[provider_id] = ProviderHealth(
             consecutive_failures=0,
@@ -323,6 +337,26 @@ class ProviderPoolManager:
         logger.info("   首次 ASR 請求會觸發模型載入")
         return False
     
+    def warm_up_inference(self, seconds: float = 1.0, session_id: str = "__warmup__") -> bool:
+        """以一段靜音執行一次轉譯
+        
+        模型載入後第一次推論還要配置記憶體、初始化 CUDA kernel 等，啟動時先跑一次，
+        第一個真正的請求就不必承擔冷啟動。
+        
+        Returns:
+            是否成功完成轉譯
+        """
+        import numpy as np
+        
+        audio = np.zeros(int(16000 * seconds), dtype=np.float32)
+        with self.lease_context(session_id, timeout=self.config.lease_timeout) as (provider, error):
+            if not provider:
+                logger.warning(f"⚠️ 暖機推論無法租用 provider: {error}")
+                return False
+            provider.transcribe_audio(audio, session_id=session_id)
+        logger.debug("✅ 暖機推論完成")
+        return True
+    
     def lease(self, session_id: str, 
               timeout: float = 5.0) -> Tuple[Optional[IASRProvider], Optional[PoolError]]:
         """租借一個 provider（含優先佇列）
@@ -337,6 +371,7 @@ class ProviderPoolManager:
         
         # 延遲載入：確保 pool 已初始化
         self._ensure_pool_initialized()
+        started = time.perf_counter()
         
         # Phase 2: 含優先佇列實作
         with self._lock:
@@ -349,6 +384,7 @@ class ProviderPoolManager:
             # 嘗試立即獲取可用 provider
             provider = self._try_get_available(session_id)
             if provider:
+                self._record_wait_time(session_id, time.perf_counter() - started)
                 return provider, None
             
             # 如果可以創建新 provider，立即創建
@@ -356,6 +392,7 @@ class ProviderPoolManager:
                 try:
                     provider = self._create_provider()
                     self._assign_to_session(provider, session_id)
+                    self._record_wait_time(session_id, time.perf_counter() - started)
                     return provider, None
                 except Exception as e:
                     logger.error(f"❌ 創建 provider 失敗: {e}")
@@ -380,6 +417,7 @@ class ProviderPoolManager:
         # 檢查結果
         with self._lock:
             if request.result:
+                self._record_wait_time(session_id, time.perf_counter() - started)
                 return request.result, None
             elif request.error:
                 return None, request.error
@@ -524,12 +562,12 @@ class ProviderPoolManager:
             
             # 更新統計
             self._stats['total_releases'] += 1
-            wait_time = time.time() - lease_info.lease_time
-            self._record_wait_time(wait_time)
+            hold_time = time.time() - lease_info.lease_time
+            self._hold_histogram.record(hold_time)
             
             logger.debug(
                 f"♻️ 歸還 provider from session {session_id} "
-                f"(使用時間: {wait_time:.2f}秒)"
+                f"(使用時間: {hold_time:.2f}秒)"
             )
             
             # 檢查健康狀態
@@ -539,6 +577,7 @@ class ProviderPoolManager:
                 provider.shutdown()
                 del self._all_providers[provider_id]
                 del self._health[provider_id]
+                self._slots.pop(provider_id, None)
                 return
             
             # 檢查是否需要保留此 provider
@@ -550,6 +589,7 @@ class ProviderPoolManager:
                     provider.shutdown()
                     del self._all_providers[provider_id]
                     del self._health[provider_id]
+                    self._slots.pop(provider_id, None)
                     logger.info(f"🗑️ 關閉多餘的 provider, pool 大小: {len(self._all_providers)}")
                     return
             
@@ -569,13 +609,10 @@ class ProviderPoolManager:
             self._available.append(provider)
             logger.debug(f"📥 Provider 歸還到可用池 (可用數: {len(self._available)})")
     
-    def _record_wait_time(self, wait_time: float):
-        """記錄等待時間（用於監控）"""
-        wait_times = self._stats['queue_wait_times']
-        wait_times.append(wait_time)
-        # 只保留最近 100 次
-        if len(wait_times) > 100:
-            wait_times.pop(0)
+    def _record_wait_time(self, session_id: str, wait_time: float):
+        """記錄租用等待時間（pool 統計與 /metrics 的 lease_wait 階段）"""
+        self._wait_histogram.record(wait_time)
+        metrics.observe(Stage.LEASE_WAIT, wait_time, session_id)
     
     @contextmanager
     def lease_context(self, session_id: str, timeout: float = 5.0):
@@ -595,6 +632,28 @@ class ProviderPoolManager:
             if provider:
                 self.release(provider)
     
+    def reserve_quota(self, session_id: str) -> bool:
+        """扣除 session 的一個配額但不租用 provider（批次轉譯中的每段語音）
+        
+        Returns:
+            是否成功（已達 per_session_quota 時返回 False）
+        """
+        with self._lock:
+            current_count = self._session_quotas.get(session_id, 0)
+            if current_count >= self.config.per_session_quota:
+                logger.warning(f"⚠️ Session {session_id} 達到配額上限 ({current_count}/{self.config.per_session_quota})")
+                return False
+            self._session_quotas[session_id] = current_count + 1
+            return True
+    
+    def release_quota(self, session_id: str):
+        """歸還 reserve_quota() 扣除的配額"""
+        with self._lock:
+            if session_id in self._session_quotas:
+                self._session_quotas[session_id] -= 1
+                if self._session_quotas[session_id] <= 0:
+                    del self._session_quotas[session_id]
+    
     def release_all(self, session_id: str):
         """釋放某個 session 的所有 provider"""
         with self._lock:
@@ -612,10 +671,6 @@ class ProviderPoolManager:
     def get_stats(self) -> Dict[str, Any]:
         """獲取統計資訊（增強版）"""
         with self._lock:
-            # 計算平均等待時間
-            wait_times = self._stats['queue_wait_times']
-            avg_wait = sum(wait_times) / len(wait_times) if wait_times else 0
-            
             # 健康 provider 數量
             healthy_count = sum(1 for h in self._health.values() if h.is_healthy)
             unhealthy_count = sum(1 for h in self._health.values() if not h.is_healthy)
@@ -635,9 +690,12 @@ class ProviderPoolManager:
                     "total_releases": self._stats['total_releases'],
                     "total_timeouts": self._stats['total_timeouts'],
                     "total_errors": self._stats['total_errors'],
-                    "avg_wait_time": avg_wait
+                    "avg_wait_time": self._wait_histogram.mean,
+                    "p99_wait_time": self._wait_histogram.percentile(0.99),
+                    "avg_lease_time": self._hold_histogram.mean,
                 },
                 "quotas": dict(self._session_quotas),
+                "replicas": self._get_replica_stats(),
                 "config": {
                     "min_size": self.config.min_size,
                     "max_size": self.config.max_size,
@@ -646,6 +704,25 @@ class ProviderPoolManager:
                 }
             }
     
+    def _get_replica_stats(self) -> List[Dict[str, Any]]:
+        """每個 slot 的模型副本使用率（需要持有鎖）"""
+        replicas = []
+        for provider_id, slot in sorted(self._slots.items(), key=lambda item: item[1]):
+            provider = self._all_providers.get(provider_id)
+            lease = self._leased.get(provider_id)
+            entry = {
+                "slot": slot,
+                "leased": lease is not None,
+                "session_id": lease.session_id if lease else None
+            }
+            if provider is not None and hasattr(provider, 'get_replica_stats'):
+                try:
+                    entry.update(provider.get_replica_stats())
+                except Exception as e:
+                    logger.debug(f"取得副本統計失敗 (slot #{slot}): {e}")
+            replicas.append(entry)
+        return replicas
+    
     # === Phase 4: 健康檢查 (MVP) ===
     
     def mark_success(self, provider: IASRProvider):
@@ -740,6 +817,7 @@ class ProviderPoolManager:
             self._waiting_queue.clear()
             self._session_quotas.clear()
             self._health.clear()
+            self._slots.clear()
             
         logger.info("✅ ProviderPoolManager 已關閉")
 
@@ -1,21 +1,16 @@
-"""Whisper ASR Provider Module"""
+"""Whisper ASR Provider Module
 
-# 優先導入 FasterWhisperProvider
-try:
-    from .faster_whisper_provider import FasterWhisperProvider, faster_whisper_provider
-    __all__ = ['FasterWhisperProvider', 'faster_whisper_provider']
-except ImportError:
-    pass
+Provider 在第一次存取時才匯入（provider_manager 依配置只載入需要的那一個），
+FasterWhisperProvider 需要 faster-whisper，WhisperProvider 需要 openai-whisper（torch）。
+"""
 
-# 嘗試導入原始 WhisperProvider（需要 openai-whisper）
-try:
-    from .whisper_provider import WhisperProvider, whisper_provider
-    if '__all__' not in locals():
-        __all__ = []
-    __all__.extend(['WhisperProvider', 'whisper_provider'])
-except ImportError:
-    pass
+from src.utils.lazy_import import lazy_exports
 
-# 如果都沒有成功導入，至少保持 __all__ 存在
-if '__all__' not in locals():
-    __all__ = []
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'FasterWhisperProvider': '.faster_whisper_provider',
+    'faster_whisper_provider': '.faster_whisper_provider',
+    'WhisperProvider': '.whisper_provider',
+    'whisper_provider': '.whisper_provider',
+})
+
+__all__ = ['FasterWhisperProvider', 'faster_whisper_provider', 'WhisperProvider', 'whisper_provider']
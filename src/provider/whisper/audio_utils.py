@@ -0,0 +1,50 @@
+"""Whisper 記憶體音訊輸入工具
+
+faster-whisper 與 openai-whisper 都接受 16kHz 單聲道 float32 (-1.0 ~ 1.0) 的 numpy array，
+直接傳入可省去寫入/讀取暫存 WAV 與 ffmpeg 解碼。
+"""
+
+from typing import Union
+
+import numpy as np
+
+from src.interface.exceptions import ServiceExecutionError
+
+
+WHISPER_SAMPLE_RATE = 16000
+
+
+def to_whisper_input(audio_data: Union[np.ndarray, bytes]) -> np.ndarray:
+    """將音訊轉為 Whisper 模型可直接使用的 float32 單聲道陣列
+
+    Args:
+        audio_data: 16kHz 音訊（int16 bytes、int16 ndarray 或 float32 ndarray）
+
+    Returns:
+        連續記憶體的 float32 一維陣列 (-1.0 ~ 1.0)
+
+    Raises:
+        ServiceExecutionError: 音訊格式不支援或為空
+    """
+    if isinstance(audio_data, (bytes, bytearray, memoryview)):
+        audio_data = np.frombuffer(audio_data, dtype=np.int16)
+
+    if not isinstance(audio_data, np.ndarray):
+        raise ServiceExecutionError(f"不支援的音訊型別: {type(audio_data)}")
+
+    if audio_data.dtype == np.int16:
+        audio_data = audio_data.astype(np.float32) / 32768.0
+    elif audio_data.dtype != np.float32:
+        audio_data = audio_data.astype(np.float32)
+
+    if audio_data.ndim == 2:
+        # (samples, channels) 或 (channels, samples) → 平均為單聲道
+        channel_axis = 1 if audio_data.shape[0] >= audio_data.shape[1] else 0
+        audio_data = audio_data.mean(axis=channel_axis, dtype=np.float32)
+    elif audio_data.ndim != 1:
+        raise ServiceExecutionError(f"不支援的音訊維度: {audio_data.shape}")
+
+    if audio_data.size == 0:
+        raise ServiceExecutionError("音訊資料為空")
+
+    return np.ascontiguousarray(audio_data)
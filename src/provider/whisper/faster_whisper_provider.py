@@ -1,15 +1,17 @@
-"""Faster-Whisper ASR Provider - MVP 檔案轉譯版本
+"""Faster-Whisper ASR Provider - MVP 整段轉譯版本
 
 核心職責：
 1. 載入 Faster-Whisper 模型
-2. 轉譯檔案路徑的音訊
+2. 轉譯檔案路徑或記憶體中的音訊（16kHz numpy array，不經過暫存檔）
 3. 返回標準化的轉譯結果
 
-遵守 MVP & KISS 原則，只支援檔案路徑轉譯。
+遵守 MVP & KISS 原則，只支援整段轉譯；串流轉譯由 streaming_asr 服務以
+transcribe_words() 反覆解碼實作。
 """
 
 import threading
-from typing import Optional, Dict, Any, List, Callable
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Callable, Tuple
 from pathlib import Path
 import numpy as np
 import time
@@ -27,6 +29,7 @@ from src.interface.exceptions import (
     ServiceExecutionError 
 )
 from src.config.manager import ConfigManager
+from src.provider.whisper.audio_utils import to_whisper_input, WHISPER_SAMPLE_RATE
 
 
 def _resolve_compute_type(device: str, compute_type: str) -> str:
@@ -51,10 +54,13 @@ def _resolve_compute_type(device: str, compute_type: str) -> str:
 class FasterWhisperProvider(IASRProvider):
     """簡化版 Faster-Whisper ASR 提供者
     
-    只支援檔案路徑轉譯，移除所有串流和 session 管理複雜性。
+    支援檔案路徑與 numpy array 轉譯，移除所有串流和 session 管理複雜性。
     支援單例和非單例模式：
     - 單例模式：FasterWhisperProvider() 或 FasterWhisperProvider.get_singleton()
     - 非單例模式：FasterWhisperProvider(singleton=False) - 用於 provider pool
+    
+    Provider pool 會以 bind_replica() 把每個實例綁定到一個模型副本，
+    不同副本的解碼可並行，同一副本依序執行。
     """
     
     _singleton_instance = None
@@ -87,8 +93,10 @@ class FasterWhisperProvider(IASRProvider):
             self._initialized = False
             self._model = None
             self._config = None
-            self._transcribe_lock = threading.Lock()  # 確保執行緒安全
+            self._transcribe_lock = threading.Lock()  # 非共享模型時確保執行緒安全
             self._use_shared_model = True  # 使用共享模型
+            self._replica = 0  # 綁定的模型副本編號
+            self._replica_count = 1
             
             # 載入配置（但不載入模型）
             self._load_config()
@@ -118,6 +126,12 @@ class FasterWhisperProvider(IASRProvider):
                     beam_size=5,
                     temperature=0.0
                 )
+                
+                # 模型副本數（0 表示與 provider_pool.max_size 相同）
+                replicas = getattr(whisper_config, 'model_replicas', 0) or 0
+                if replicas <= 0 and hasattr(config_manager, 'provider_pool'):
+                    replicas = config_manager.provider_pool.max_size
+                self._replica_count = max(1, int(replicas or 1))
         except Exception as e:
             logger.warning(f"載入配置失敗，使用預設值: {e}")
             self._config = ASRConfig(
@@ -126,29 +140,67 @@ class FasterWhisperProvider(IASRProvider):
                 compute_type="int8"
             )
     
-    def _get_model(self):
-        """獲取模型（使用共享的 model_loader）"""
+    def bind_replica(self, slot: int) -> int:
+        """綁定到 pool slot 對應的模型副本，並在背景預載該副本
+        
+        Args:
+            slot: Provider pool 的 slot 編號
+            
+        Returns:
+            綁定的副本編號（slot 超過副本數時循環共用）
+        """
+        self._replica = slot % self._replica_count
+        
+        if self._use_shared_model and self._replica > 0:
+            from src.provider.whisper.model_loader import model_loader
+            try:
+                model_loader.preload_model_async(
+                    model_type="faster-whisper",
+                    model_name=self._config.model_name,
+                    device=self._config.device,
+                    compute_type=self._config.compute_type,
+                    replica=self._replica
+                )
+            except Exception as e:
+                logger.warning(f"預載模型副本 #{self._replica} 失敗: {e}")
+        
+        return self._replica
+    
+    def get_replica_stats(self) -> Dict[str, Any]:
+        """取得綁定副本的使用統計"""
+        from src.provider.whisper.model_loader import model_loader
+        
+        model_key = model_loader._get_model_key(
+            "faster-whisper",
+            self._config.model_name,
+            self._config.device,
+            self._config.compute_type,
+            self._replica
+        )
+        usage = model_loader.get_replica_stats(model_key).get(model_key, {})
+        return {"replica": self._replica, "model_key": model_key, **usage}
+    
+    @contextmanager
+    def _acquire_model(self):
+        """取得模型並獨佔使用（共享模型時以副本為單位序列化）"""
         if self._use_shared_model:
-            # 使用共享模型
+            # 使用共享模型的指定副本
             from src.provider.whisper.model_loader import model_loader
             
-            model, status = model_loader.get_model(
+            with model_loader.use_model(
                 model_type="faster-whisper",
                 model_name=self._config.model_name,
                 device=self._config.device,
                 compute_type=self._config.compute_type,
-                wait=True  # 等待模型載入
-            )
-            
-            if status != "ready" or model is None:
-                raise ServiceInitializationError(f"無法載入共享模型: status={status}")
-            
-            return model
+                replica=self._replica
+            ) as model:
+                yield model
         else:
             # 舊的載入方式（為了相容性保留）
             if self._model is None:
                 self._load_model()
-            return self._model
+            with self._transcribe_lock:
+                yield self._model
     
     def _load_model(self) -> None:
         """載入 Faster-Whisper 模型（舊方法，為相容性保留）"""
@@ -186,17 +238,36 @@ class FasterWhisperProvider(IASRProvider):
         if not Path(file_path).exists():
             raise ServiceExecutionError(f"檔案不存在: {file_path}")
         
-        # 獲取模型（延遲載入或共享模型）
-        model = self._get_model()
+        return self._transcribe(
+            file_path,
+            session_id=f"file_{Path(file_path).stem}",
+            source=file_path,
+            metadata={"file_path": file_path}
+        )
+    
+    def _transcribe(
+        self,
+        audio: Any,
+        session_id: str,
+        source: str,
+        metadata: Dict[str, Any]
+    ) -> TranscriptionResult:
+        """執行轉譯
         
+        Args:
+            audio: 檔案路徑或 16kHz float32 numpy array
+            session_id: 結果的 session ID
+            source: 日誌用的來源描述
+            metadata: 額外放入結果的資訊
+        """
         start_time = time.time()
         
         try:
-            # 使用 lock 確保執行緒安全
-            with self._transcribe_lock:
+            # 獨佔綁定的模型副本（延遲載入或共享模型）
+            with self._acquire_model() as model:
                 # 執行轉譯
                 segments_gen, info = model.transcribe(
-                    file_path,
+                    audio,
                     language=self._config.language,
                     task="transcribe",
                     beam_size=self._config.beam_size,
@@ -228,26 +299,209 @@ class FasterWhisperProvider(IASRProvider):
             processing_time = time.time() - start_time
             
             result = TranscriptionResult(
-                session_id=f"file_{Path(file_path).stem}",
+                session_id=session_id,
                 segments=segments,
                 full_text=full_text.strip(),
                 language=info.language if info else self._config.language,
                 duration=info.duration if info else None,
                 processing_time=processing_time,
                 metadata={
-                    "file_path": file_path,
+                    **metadata,
                     "model": self._config.model_name,
                     "device": self._config.device
                 }
             )
             
-            logger.info(f"轉譯完成: {file_path} ({processing_time:.2f}秒)")
+            logger.info(f"轉譯完成: {source} ({processing_time:.2f}秒)")
             return result
             
+        except ServiceInitializationError:
+            raise
         except Exception as e:
             logger.error(f"轉譯失敗: {e}")
             raise ServiceExecutionError(f"轉譯失敗: {e}") from e
     
+    def transcribe_batch(
+        self,
+        audios: List[np.ndarray],
+        session_ids: Optional[List[str]] = None
+    ) -> List[TranscriptionResult]:
+        """批次轉譯多段短音訊（一次 encoder / decoder 推論）
+        
+        每段音訊補零成一個 30 秒 mel 視窗後堆疊成 [N, n_mels, 3000]，
+        encoder 與 beam search decoder 各只執行一次。超過 30 秒的音訊改用一般轉譯。
+        
+        Args:
+            audios: 16kHz 音訊列表（float32 / int16 ndarray 或 int16 bytes）
+            session_ids: 對應的 Session ID（可選）
+            
+        Returns:
+            與輸入順序相同的轉譯結果
+        """
+        if not self._initialized:
+            raise ServiceInitializationError("服務未初始化")
+        
+        session_ids = session_ids or [f"batch_{i}" for i in range(len(audios))]
+        arrays = [to_whisper_input(audio) for audio in audios]
+        results: List[Optional[TranscriptionResult]] = [None] * len(arrays)
+        
+        max_samples = WHISPER_SAMPLE_RATE * 30
+        short_rows = [i for i, audio in enumerate(arrays) if len(audio) <= max_samples]
+        long_rows = [i for i, audio in enumerate(arrays) if len(audio) > max_samples]
+        
+        if short_rows:
+            start_time = time.time()
+            try:
+                with self._acquire_model() as model:
+                    outputs = self._generate_batch(model, [arrays[i] for i in short_rows])
+            except ServiceInitializationError:
+                raise
+            except Exception as e:
+                logger.error(f"批次轉譯失敗: {e}")
+                raise ServiceExecutionError(f"批次轉譯失敗: {e}") from e
+            processing_time = time.time() - start_time
+            
+            for row, (text, language, avg_logprob) in zip(short_rows, outputs):
+                duration = len(arrays[row]) / WHISPER_SAMPLE_RATE
+                segments = [TranscriptionSegment(
+                    text=text,
+                    start_time=0.0,
+                    end_time=duration,
+                    confidence=avg_logprob
+                )] if text else []
+                results[row] = TranscriptionResult(
+                    session_id=session_ids[row],
+                    segments=segments,
+                    full_text=text.strip(),
+                    language=language,
+                    duration=duration,
+                    processing_time=processing_time,
+                    metadata={
+                        "samples": len(arrays[row]),
+                        "sample_rate": WHISPER_SAMPLE_RATE,
+                        "batch_size": len(short_rows),
+                        "model": self._config.model_name,
+                        "device": self._config.device
+                    }
+                )
+            logger.info(f"批次轉譯完成: {len(short_rows)} 段 ({processing_time:.2f}秒)")
+        
+        for row in long_rows:
+            results[row] = self.transcribe_audio(arrays[row], session_id=session_ids[row])
+        
+        return results
+    
+    def _generate_batch(self, model, arrays: List[np.ndarray]) -> List[tuple]:
+        """以 faster-whisper 的底層 API 批次執行 encoder / decoder
+        
+        Returns:
+            每段的 (文字, 語言, 平均 log 機率)
+        """
+        from faster_whisper.audio import pad_or_trim
+        from faster_whisper.tokenizer import Tokenizer
+        from faster_whisper.transcribe import get_suppressed_tokens
+        
+        # [N, n_mels, 3000]：每段各自一個 30 秒視窗
+        features = np.stack([
+            pad_or_trim(model.feature_extractor(audio)[..., :-1])
+            for audio in arrays
+        ])
+        encoder_output = model.encode(features)
+        
+        multilingual = model.model.is_multilingual
+        language = self._config.language if multilingual else "en"
+        languages = [language] * len(arrays)
+        if multilingual and not language:
+            # 未指定語言時逐段偵測
+            languages = [
+                segment_langs[0][0][2:-2]
+                for segment_langs in model.model.detect_language(encoder_output)
+            ]
+        
+        tokenizers = {}
+        prompts = []
+        for lang in languages:
+            if lang not in tokenizers:
+                tokenizers[lang] = Tokenizer(
+                    model.hf_tokenizer, multilingual, task="transcribe", language=lang
+                )
+            prompts.append(model.get_prompt(tokenizers[lang], previous_tokens=[], without_timestamps=True))
+        tokenizer = tokenizers[languages[0]]
+        
+        generated = model.model.generate(
+            encoder_output,
+            prompts,
+            beam_size=self._config.beam_size,
+            patience=self._config.patience,
+            length_penalty=self._config.length_penalty,
+            max_length=model.max_length,
+            suppress_blank=self._config.suppress_blank,
+            suppress_tokens=get_suppressed_tokens(tokenizer, [-1]),
+            return_scores=True,
+            return_no_speech_prob=True,
+            sampling_temperature=self._config.temperature
+        )
+        
+        outputs = []
+        for lang, result in zip(languages, generated):
+            tokens = result.sequences_ids[0]
+            avg_logprob = result.scores[0] * (len(tokens) ** self._config.length_penalty) / (len(tokens) + 1)
+            # 與 faster-whisper 預設相同：判定為無語音時不輸出文字
+            if result.no_speech_prob > 0.6 and avg_logprob < -1.0:
+                text = ""
+            else:
+                text = tokenizers[lang].decode(tokens)
+            outputs.append((text, lang, avg_logprob))
+        return outputs
+    
+    def transcribe_words(
+        self,
+        audio_data: np.ndarray,
+        initial_prompt: Optional[str] = None
+    ) -> List[Tuple[float, float, str]]:
+        """轉譯並返回詞級時間戳（供串流轉譯的增量解碼使用）
+        
+        串流解碼每次只處理尚未確認的短音訊，因此關閉內建 VAD 與
+        condition_on_previous_text，改以 initial_prompt 帶入已確認的文字。
+        
+        Args:
+            audio_data: 16kHz 音訊（float32、int16 ndarray 或 int16 bytes）
+            initial_prompt: 提示文字（已確認的前文）
+            
+        Returns:
+            [(開始秒數, 結束秒數, 詞)]，時間相對於 audio_data 開頭
+        """
+        if not self._initialized:
+            raise ServiceInitializationError("服務未初始化")
+        
+        audio = to_whisper_input(audio_data)
+        try:
+            with self._acquire_model() as model:
+                segments_gen, _ = model.transcribe(
+                    audio,
+                    language=self._config.language,
+                    task="transcribe",
+                    beam_size=self._config.beam_size,
+                    temperature=self._config.temperature,
+                    initial_prompt=initial_prompt,
+                    word_timestamps=True,
+                    condition_on_previous_text=False,
+                    vad_filter=False
+                )
+                words = []
+                for segment in segments_gen:
+                    # 幾乎確定沒有語音的片段不輸出，避免靜音時產生幻覺文字
+                    if getattr(segment, 'no_speech_prob', 0.0) > 0.9:
+                        continue
+                    for word in segment.words or []:
+                        words.append((word.start, word.end, word.word))
+            return words
+        except ServiceInitializationError:
+            raise
+        except Exception as e:
+            logger.error(f"詞級轉譯失敗: {e}")
+            raise ServiceExecutionError(f"詞級轉譯失敗: {e}") from e
+    
     # ========== IASRProvider 介面實作（最小化）==========
     
     def initialize(self, config: Optional[ASRConfig] = None) -> bool:
@@ -263,15 +517,30 @@ class FasterWhisperProvider(IASRProvider):
         audio_data: np.ndarray,
         session_id: Optional[str] = None
     ) -> TranscriptionResult:
-        """轉譯音訊數據
+        """轉譯記憶體中的音訊數據（不寫入暫存檔）
         
-        注意：MVP 版本改為接受檔案路徑字串
+        Args:
+            audio_data: 16kHz 音訊（float32 -1.0 ~ 1.0、int16 ndarray 或 int16 bytes）；
+                        傳入字串時視為檔案路徑（向後相容）
+            session_id: Session ID（可選）
+            
+        Returns:
+            轉譯結果
         """
-        # MVP 簡化：假設 audio_data 是檔案路徑字串
-        if isinstance(audio_data, str):
-            return self.transcribe_file(audio_data)
-        else:
-            raise NotImplementedError("MVP 版本只支援檔案路徑轉譯")
+        if isinstance(audio_data, (str, Path)):
+            return self.transcribe_file(str(audio_data))
+        
+        if not self._initialized:
+            raise ServiceInitializationError("服務未初始化")
+        
+        audio = to_whisper_input(audio_data)
+        duration = len(audio) / WHISPER_SAMPLE_RATE
+        return self._transcribe(
+            audio,
+            session_id=session_id or "memory",
+            source=f"記憶體音訊 {duration:.2f}秒",
+            metadata={"samples": len(audio), "sample_rate": WHISPER_SAMPLE_RATE}
+        )
     
     def start_transcription(
         self, 
@@ -279,7 +548,7 @@ class FasterWhisperProvider(IASRProvider):
         callback: Optional[Callable[[TranscriptionResult], None]] = None
     ) -> bool:
         """開始轉譯（不支援串流）"""
-        raise NotImplementedError("MVP 版本不支援串流轉譯，請使用 transcribe_file()")
+        raise NotImplementedError("Provider 不直接支援串流轉譯，請使用 streaming_asr 服務")
     
     def stop_transcription(self, session_id: str) -> bool:
         """停止轉譯（不支援）"""
@@ -4,6 +4,7 @@
 2. 提供共享模型實例 
 3. 背景載入和狀態管理
 4. 支援多種 Whisper 實現
+5. 模型副本（replica）：每個副本同時只執行一個解碼，並記錄使用率
 
 設計原則：
 - 單例模式：確保全域只有一個載入器
@@ -14,11 +15,27 @@
 
 import threading
 import time
-from typing import Dict, Optional, Tuple, Any, Union
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple, Any, Union, Iterator
 from concurrent.futures import ThreadPoolExecutor, Future
 
 from src.utils.logger import logger
 from src.interface.exceptions import ServiceInitializationError
+from src.config.manager import ConfigManager
+
+
+class _ReplicaUsage:
+    """單一模型副本的使用統計"""
+    
+    __slots__ = ('lock', 'created_at', 'decodes', 'busy_seconds', 'busy_since', 'waiting')
+    
+    def __init__(self):
+        self.lock = threading.Lock()   # 同一副本同時只跑一個解碼
+        self.created_at = time.time()
+        self.decodes = 0
+        self.busy_seconds = 0.0
+        self.busy_since: Optional[float] = None
+        self.waiting = 0
 
 
 class ModelLoader:
@@ -50,24 +67,32 @@ class ModelLoader:
             # 背景載入任務
             self._loading_futures: Dict[str, Future] = {}
             
+            # 副本使用統計（key 與 _loaded_models 相同）
+            self._usage: Dict[str, _ReplicaUsage] = {}
+            self._usage_lock = threading.Lock()
+            
             # 執行緒池
             self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ModelLoader")
             
             logger.debug("ModelLoader 初始化完成")
     
-    def _get_model_key(self, model_type: str, model_name: str, device: str, compute_type: str) -> str:
-        """生成模型的唯一鍵值"""
-        return f"{model_type}:{model_name}:{device}:{compute_type}"
+    def _get_model_key(self, model_type: str, model_name: str, device: str, compute_type: str,
+                       replica: int = 0) -> str:
+        """生成模型的唯一鍵值（副本 0 沿用原本的鍵值）"""
+        key = f"{model_type}:{model_name}:{device}:{compute_type}"
+        return f"{key}#{replica}" if replica else key
     
     def get_status(self) -> Dict[str, Any]:
         """取得載入狀態"""
         return {
             'loaded_models': list(self._loaded_models.keys()),
             'loading_status': self._loading_status.copy(),
-            'loading_futures_count': len(self._loading_futures)
+            'loading_futures_count': len(self._loading_futures),
+            'replicas': self.get_replica_stats()
         }
     
-    def preload_model_async(self, model_type: str, model_name: str, device: str, compute_type: str) -> Future:
+    def preload_model_async(self, model_type: str, model_name: str, device: str, compute_type: str,
+                            replica: int = 0) -> Future:
         """背景預載模型（非阻塞）
         
         Args:
@@ -75,11 +100,12 @@ class ModelLoader:
             model_name: 模型名稱 (e.g., "base", "small", "turbo")
             device: 設備 ("cpu", "cuda")
             compute_type: 計算類型 ("int8", "float16", "float32")
+            replica: 副本編號（每個編號是獨立載入的模型實例）
             
         Returns:
             Future 物件，可用於檢查載入狀態
         """
-        model_key = self._get_model_key(model_type, model_name, device, compute_type)
+        model_key = self._get_model_key(model_type, model_name, device, compute_type, replica)
         
         # 如果已經載入或正在載入，返回現有的 Future
         if model_key in self._loaded_models:
@@ -101,19 +127,24 @@ class ModelLoader:
         self._loading_status[model_key] = "loading"
         
         # 提交背景載入任務
-        future = self._executor.submit(self._load_model_sync, model_type, model_name, device, compute_type)
+        future = self._executor.submit(
+            self._load_model_sync, model_type, model_name, device, compute_type, replica
+        )
         self._loading_futures[model_key] = future
         
         logger.info(f"🚀 背景載入任務已提交: {model_key}")
         
         return future
     
-    def _load_model_sync(self, model_type: str, model_name: str, device: str, compute_type: str) -> Any:
+    def _load_model_sync(self, model_type: str, model_name: str, device: str, compute_type: str,
+                         replica: int = 0) -> Any:
         """同步載入模型（在背景執行緒中執行）"""
-        model_key = self._get_model_key(model_type, model_name, device, compute_type)
+        model_key = self._get_model_key(model_type, model_name, device, compute_type, replica)
         
         try:
-            with self._loading_locks[model_key]:
+            with self._usage_lock:
+                loading_lock = self._loading_locks.setdefault(model_key, threading.Lock())
+            with loading_lock:
                 # 雙重檢查
                 if model_key in self._loaded_models:
                     return self._loaded_models[model_key]
@@ -131,6 +162,8 @@ class ModelLoader:
                 load_time = time.time() - start_time
                 
                 # 儲存模型
+                with self._usage_lock:
+                    self._usage[model_key] = _ReplicaUsage()
                 self._loaded_models[model_key] = model
                 self._loading_status[model_key] = "ready"
                 
@@ -158,14 +191,24 @@ class ModelLoader:
                 "faster-whisper 未安裝。請執行: pip install faster-whisper"
             ) from e
         
-        logger.info(f"載入 FasterWhisper 模型: {model_name} on {device} with {compute_type}")
+        # 每個副本的執行緒設定
+        cpu_threads, num_workers = 4, 1
+        try:
+            whisper_config = ConfigManager().providers.whisper
+            cpu_threads = getattr(whisper_config, 'cpu_threads', None) or cpu_threads
+            num_workers = getattr(whisper_config, 'num_workers', None) or num_workers
+        except Exception:
+            pass
+        
+        logger.info(f"載入 FasterWhisper 模型: {model_name} on {device} with {compute_type} "
+                    f"(cpu_threads={cpu_threads}, num_workers={num_workers})")
         
         model = WhisperModel(
             model_name,
             device=device,
             compute_type=compute_type,
-            cpu_threads=4,
-            num_workers=1
+            cpu_threads=cpu_threads,
+            num_workers=num_workers
         )
         
         return model
@@ -184,7 +227,8 @@ class ModelLoader:
         model = whisper.load_model(model_name, device=device)
         return model
     
-    def get_model(self, model_type: str, model_name: str, device: str, compute_type: str, wait: bool = True) -> Tuple[Optional[Any], str]:
+    def get_model(self, model_type: str, model_name: str, device: str, compute_type: str, wait: bool = True,
+                  replica: int = 0) -> Tuple[Optional[Any], str]:
         """取得模型實例
         
         Args:
@@ -193,11 +237,12 @@ class ModelLoader:
             device: 設備
             compute_type: 計算類型
             wait: 是否等待載入完成
+            replica: 副本編號
             
         Returns:
             (模型實例, 狀態) - 狀態可能是 "ready", "loading", "error"
         """
-        model_key = self._get_model_key(model_type, model_name, device, compute_type)
+        model_key = self._get_model_key(model_type, model_name, device, compute_type, replica)
         
         # 如果已載入，直接返回
         if model_key in self._loaded_models:
@@ -225,21 +270,88 @@ class ModelLoader:
         # 如果沒有任何載入記錄，開始同步載入（阻塞）
         if wait:
             try:
-                model = self._load_model_sync(model_type, model_name, device, compute_type)
+                model = self._load_model_sync(model_type, model_name, device, compute_type, replica)
                 return model, "ready"
             except Exception:
                 return None, "error"
         else:
             # 開始背景載入
-            self.preload_model_async(model_type, model_name, device, compute_type)
+            self.preload_model_async(model_type, model_name, device, compute_type, replica)
             return None, "loading"
     
-    def is_model_ready(self, model_type: str, model_name: str, device: str, compute_type: str) -> bool:
+    @contextmanager
+    def use_model(self, model_type: str, model_name: str, device: str, compute_type: str,
+                  replica: int = 0) -> Iterator[Any]:
+        """獨佔使用一個模型副本並記錄使用時間
+        
+        同一副本的解碼依序執行，不同副本可並行。
+        
+        使用範例:
+            with model_loader.use_model("faster-whisper", "base", "cpu", "int8", replica=1) as model:
+                segments, info = model.transcribe(audio)
+        
+        Raises:
+            ServiceInitializationError: 模型無法載入
+        """
+        model, status = self.get_model(model_type, model_name, device, compute_type, wait=True, replica=replica)
+        model_key = self._get_model_key(model_type, model_name, device, compute_type, replica)
+        if status != "ready" or model is None:
+            raise ServiceInitializationError(f"無法載入共享模型 {model_key}: status={status}")
+        
+        with self._usage_lock:
+            usage = self._usage.setdefault(model_key, _ReplicaUsage())
+            usage.waiting += 1
+        
+        with usage.lock:
+            start = time.time()
+            with self._usage_lock:
+                usage.waiting -= 1
+                usage.busy_since = start
+            try:
+                yield model
+            finally:
+                with self._usage_lock:
+                    usage.busy_seconds += time.time() - start
+                    usage.busy_since = None
+                    usage.decodes += 1
+    
+    def get_replica_stats(self, model_key: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """取得模型副本的使用統計
+        
+        Args:
+            model_key: 只回傳指定副本（None 表示全部）
+            
+        Returns:
+            {model_key: {decodes, busy_seconds, utilization, in_use, waiting}}
+            utilization 為載入後處於解碼中的時間比例
+        """
+        now = time.time()
+        stats = {}
+        with self._usage_lock:
+            for key, usage in self._usage.items():
+                if model_key is not None and key != model_key:
+                    continue
+                busy = usage.busy_seconds
+                if usage.busy_since is not None:
+                    busy += now - usage.busy_since
+                elapsed = max(now - usage.created_at, 1e-9)
+                stats[key] = {
+                    "decodes": usage.decodes,
+                    "busy_seconds": round(busy, 3),
+                    "utilization": round(min(busy / elapsed, 1.0), 4),
+                    "in_use": usage.busy_since is not None,
+                    "waiting": usage.waiting
+                }
+        return stats
+    
+    def is_model_ready(self, model_type: str, model_name: str, device: str, compute_type: str,
+                       replica: int = 0) -> bool:
         """檢查模型是否已載入完成"""
-        model_key = self._get_model_key(model_type, model_name, device, compute_type)
+        model_key = self._get_model_key(model_type, model_name, device, compute_type, replica)
         return model_key in self._loaded_models
     
-    def wait_for_model(self, model_type: str, model_name: str, device: str, compute_type: str, timeout: float = 60.0) -> bool:
+    def wait_for_model(self, model_type: str, model_name: str, device: str, compute_type: str, timeout: float = 60.0,
+                       replica: int = 0) -> bool:
         """等待模型載入完成
         
         Args:
@@ -248,11 +360,12 @@ class ModelLoader:
             device: 設備
             compute_type: 計算類型
             timeout: 超時時間（秒）
+            replica: 副本編號
             
         Returns:
             True 如果載入成功，False 如果超時或失敗
         """
-        model_key = self._get_model_key(model_type, model_name, device, compute_type)
+        model_key = self._get_model_key(model_type, model_name, device, compute_type, replica)
         
         # 如果已載入，立即返回
         if model_key in self._loaded_models:
@@ -1,15 +1,16 @@
-"""OpenAI Whisper ASR Provider - MVP 檔案轉譯版本
+"""OpenAI Whisper ASR Provider - MVP 整段轉譯版本
 
 核心職責：
 1. 載入 OpenAI Whisper 模型
-2. 轉譯檔案路徑的音訊
+2. 轉譯檔案路徑或記憶體中的音訊（16kHz numpy array，不經過暫存檔）
 3. 返回標準化的轉譯結果
 
-遵守 MVP & KISS 原則，只支援檔案路徑轉譯。
+遵守 MVP & KISS 原則，只支援整段轉譯；串流轉譯由 streaming_asr 服務以
+transcribe_words() 反覆解碼實作。
 """
 
 import threading
-from typing import Optional, Dict, Any, List, Callable
+from typing import Optional, Dict, Any, List, Callable, Tuple
 from pathlib import Path
 import numpy as np
 import time
@@ -27,12 +28,13 @@ from src.interface.exceptions import (
     ServiceExecutionError 
 )
 from src.config.manager import ConfigManager
+from src.provider.whisper.audio_utils import to_whisper_input, WHISPER_SAMPLE_RATE
 
 
 class WhisperProvider(IASRProvider):
     """簡化版 OpenAI Whisper ASR 提供者
     
-    只支援檔案路徑轉譯，移除所有串流和 session 管理複雜性。
+    支援檔案路徑與 numpy array 轉譯，移除所有串流和 session 管理複雜性。
     支援單例和非單例模式：
     - 單例模式：WhisperProvider() 或 WhisperProvider.get_singleton()
     - 非單例模式：WhisperProvider(singleton=False) - 用於 provider pool
@@ -137,8 +139,6 @@ class WhisperProvider(IASRProvider):
         if not Path(file_path).exists():
             raise ServiceExecutionError(f"檔案不存在: {file_path}")
         
-        start_time = time.time()
-        
         # 記錄接收到的檔案資訊
         file_size = Path(file_path).stat().st_size
         logger.info(f"🎯 [ASR_RECEIVED] Whisper transcribing file:")
@@ -147,12 +147,36 @@ class WhisperProvider(IASRProvider):
         logger.info(f"   - Language: {self._config.language}")
         logger.info(f"   - Model: {self._config.model_name}")
         
+        return self._transcribe(
+            file_path,
+            session_id=f"file_{Path(file_path).stem}",
+            source=file_path,
+            metadata={"file_path": file_path}
+        )
+    
+    def _transcribe(
+        self,
+        audio: Any,
+        session_id: str,
+        source: str,
+        metadata: Dict[str, Any]
+    ) -> TranscriptionResult:
+        """執行轉譯
+        
+        Args:
+            audio: 檔案路徑或 16kHz float32 numpy array
+            session_id: 結果的 session ID
+            source: 日誌用的來源描述
+            metadata: 額外放入結果的資訊
+        """
+        start_time = time.time()
+        
         try:
             # 使用 lock 確保執行緒安全
             with self._transcribe_lock:
                 # 執行轉譯
                 result = self._model.transcribe(
-                    file_path,
+                    audio,
                     language=self._config.language,
                     task="transcribe",
                     temperature=self._config.temperature,
@@ -180,26 +204,67 @@ class WhisperProvider(IASRProvider):
             duration = segments[-1].end_time if segments else 0.0
             
             result = TranscriptionResult(
-                session_id=f"file_{Path(file_path).stem}",
+                session_id=session_id,
                 segments=segments,
                 full_text=full_text,
                 language=result.get("language", self._config.language),
                 duration=duration,
                 processing_time=processing_time,
                 metadata={
-                    "file_path": file_path,
+                    **metadata,
                     "model": self._config.model_name,
                     "device": self._config.device
                 }
             )
             
-            logger.info(f"轉譯完成: {file_path} ({processing_time:.2f}秒)")
+            logger.info(f"轉譯完成: {source} ({processing_time:.2f}秒)")
             return result
             
         except Exception as e:
             logger.error(f"轉譯失敗: {e}")
             raise ServiceExecutionError(f"轉譯失敗: {e}") from e
     
+    def transcribe_words(
+        self,
+        audio_data: np.ndarray,
+        initial_prompt: Optional[str] = None
+    ) -> List[Tuple[float, float, str]]:
+        """轉譯並返回詞級時間戳（供串流轉譯的增量解碼使用）
+        
+        Args:
+            audio_data: 16kHz 音訊（float32、int16 ndarray 或 int16 bytes）
+            initial_prompt: 提示文字（已確認的前文）
+            
+        Returns:
+            [(開始秒數, 結束秒數, 詞)]，時間相對於 audio_data 開頭
+        """
+        if not self._initialized or not self._model:
+            raise ServiceInitializationError("服務未初始化")
+        
+        audio = to_whisper_input(audio_data)
+        try:
+            with self._transcribe_lock:
+                result = self._model.transcribe(
+                    audio,
+                    language=self._config.language,
+                    task="transcribe",
+                    temperature=self._config.temperature,
+                    initial_prompt=initial_prompt,
+                    word_timestamps=True,
+                    condition_on_previous_text=False,
+                    verbose=None
+                )
+            words = []
+            for segment in result.get("segments", []):
+                if segment.get("no_speech_prob", 0.0) > 0.9:
+                    continue
+                for word in segment.get("words", []):
+                    words.append((word["start"], word["end"], word["word"]))
+            return words
+        except Exception as e:
+            logger.error(f"詞級轉譯失敗: {e}")
+            raise ServiceExecutionError(f"詞級轉譯失敗: {e}") from e
+    
     # ========== IASRProvider 介面實作（最小化）==========
     
     def initialize(self, config: Optional[ASRConfig] = None) -> bool:
@@ -215,15 +280,31 @@ class WhisperProvider(IASRProvider):
         audio_data: np.ndarray,
         session_id: Optional[str] = None
     ) -> TranscriptionResult:
-        """轉譯音訊數據
+        """轉譯記憶體中的音訊數據（不寫入暫存檔）
         
-        注意：MVP 版本改為接受檔案路徑字串
+        Args:
+            audio_data: 16kHz 音訊（float32 -1.0 ~ 1.0、int16 ndarray 或 int16 bytes）；
+                        傳入字串時視為檔案路徑（向後相容）
+            session_id: Session ID（可選）
+            
+        Returns:
+            轉譯結果
         """
-        # MVP 簡化：假設 audio_data 是檔案路徑字串
-        if isinstance(audio_data, str):
-            return self.transcribe_file(audio_data)
-        else:
-            raise NotImplementedError("MVP 版本只支援檔案路徑轉譯")
+        if isinstance(audio_data, (str, Path)):
+            return self.transcribe_file(str(audio_data))
+        
+        if not self._initialized or not self._model:
+            raise ServiceInitializationError("服務未初始化")
+        
+        audio = to_whisper_input(audio_data)
+        duration = len(audio) / WHISPER_SAMPLE_RATE
+        logger.info(f"🎯 [ASR_RECEIVED] Whisper transcribing {duration:.2f}s in-memory audio")
+        return self._transcribe(
+            audio,
+            session_id=session_id or "memory",
+            source=f"記憶體音訊 {duration:.2f}秒",
+            metadata={"samples": len(audio), "sample_rate": WHISPER_SAMPLE_RATE}
+        )
     
     def start_transcription(
         self, 
@@ -231,7 +312,7 @@ class WhisperProvider(IASRProvider):
         callback: Optional[Callable[[TranscriptionResult], None]] = None
     ) -> bool:
         """開始轉譯（不支援串流）"""
-        raise NotImplementedError("MVP 版本不支援串流轉譯，請使用 transcribe_file()")
+        raise NotImplementedError("Provider 不直接支援串流轉譯，請使用 streaming_asr 服務")
     
     def stop_transcription(self, session_id: str) -> bool:
         """停止轉譯（不支援）"""
@@ -188,11 +188,11 @@ class FFmpegConverter(SingletonMixin):
             logger.error("FFmpeg 不可用")
             return None
         
-        if not chunk.data:
+        if chunk.data is None or len(chunk.data) == 0:
             return chunk
         
-        # 準備輸入格式參數 - 預設為 PCM
-        input_format = 's16le'  # 預設為 16-bit PCM
+        # 準備輸入格式參數 - 依 chunk 標記的格式，預設為 16-bit PCM
+        input_format = self._get_ffmpeg_format(chunk.format or 'pcm_s16le')
         
         # 建構 FFmpeg 命令 (使用管道)
         cmd = [
@@ -216,14 +216,15 @@ class FFmpegConverter(SingletonMixin):
             )
             
             # 送入資料並取得結果
-            stdout, stderr = process.communicate(input=chunk.data, timeout=self.timeout)
+            stdout, stderr = process.communicate(input=chunk.to_bytes(), timeout=self.timeout)
             
             if process.returncode == 0:
                 return AudioChunk(
                     data=stdout,
                     timestamp=chunk.timestamp,
                     sample_rate=target_sample_rate,
-                    channels=target_channels
+                    channels=target_channels,
+                    format=target_format
                 )
             else:
                 logger.error(f"FFmpeg 管道錯誤: {stderr.decode('utf-8', errors='ignore')}")
@@ -244,20 +245,26 @@ class FFmpegConverter(SingletonMixin):
         sample_rate: int = 16000,
         channels: int = 1,
         input_sample_rate: Optional[int] = None,
-        input_channels: Optional[int] = None
+        input_channels: Optional[int] = None,
+        low_latency: bool = False
     ) -> Optional[subprocess.Popen]:
         """建立 FFmpeg 串流轉換處理程序。
         
+        Args:
+            low_latency: 關閉輸入緩衝並逐封包輸出（即時串流使用）
+        
         Returns:
             FFmpeg process 用於串流處理
         """
         if not self.is_available():
             return None
         
-        cmd = [
-            self.ffmpeg_path,
-            '-f', self._get_ffmpeg_format(input_format),
-        ]
+        cmd = [self.ffmpeg_path]
+        
+        if low_latency:
+            cmd.extend(['-hide_banner', '-loglevel', 'error', '-fflags', 'nobuffer'])
+        
+        cmd.extend(['-f', self._get_ffmpeg_format(input_format)])
         
         # 加入輸入參數
         if input_sample_rate:
@@ -270,9 +277,13 @@ class FFmpegConverter(SingletonMixin):
             '-f', self._get_ffmpeg_format(output_format),
             '-ar', str(sample_rate),
             '-ac', str(channels),
-            'pipe:1'                                      # 輸出到 stdout
         ])
         
+        if low_latency:
+            cmd.extend(['-flush_packets', '1'])
+        
+        cmd.append('pipe:1')                              # 輸出到 stdout
+        
         try:
             process = subprocess.Popen(
                 cmd,
@@ -357,11 +368,15 @@ class FFmpegConverter(SingletonMixin):
         format_map = {
             'pcm_s16le': 's16le',
             'pcm_f32le': 'f32le',
+            'pcm_s24le': 's24le',
             'pcm': 's16le',
+            'int16': 's16le',
+            'float32': 'f32le',
             'wav': 'wav',
             'mp3': 'mp3',
             'flac': 'flac',
             'ogg': 'ogg',
+            'opus': 'ogg',                # 瀏覽器的 opus 串流封裝在 ogg 中
             'aac': 'aac',
             'm4a': 'mp4',
             'wma': 'asf',
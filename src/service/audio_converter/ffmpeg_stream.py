@@ -0,0 +1,556 @@
+"""FFmpeg 串流解碼 worker
+
+壓縮或非常見格式（webm/ogg/opus、pcm_s24le 等）的即時串流，每個 session 一個常駐的
+FFmpeg 程序，避免每個 chunk 都啟動一次 ffmpeg（數十毫秒）。
+
+- stdin 由寫入執行緒負責，呼叫端只把資料放進有上限的佇列（非阻塞，滿了丟棄）
+- stdout 由讀取執行緒讀出 16kHz 單聲道 int16，直接推入 audio_queue
+- 程序異常結束時自動重啟（有次數上限）；webm/ogg 重啟時先寫入保存的容器標頭，
+  其他帶檔頭的格式（wav/flac/m4a/wma）無法從串流中段重新開始，直接標記失敗
+- 同時運作的 worker 數量有上限，session 刪除時停止
+"""
+
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Any
+
+from src.core.audio_queue_manager import audio_queue
+from src.utils.logger import logger
+from src.utils.singleton import SingletonMixin
+from src.config.manager import ConfigManager
+from .ffmpeg_converter import ffmpeg_converter
+
+
+# 容器格式由 FFmpeg 自行探測取樣率/聲道，不傳入 -ar/-ac
+CONTAINER_FORMATS = {'webm', 'ogg', 'opus', 'mp3', 'aac', 'm4a', 'flac', 'wav', 'wma'}
+
+# 解碼需要串流開頭標頭的容器：保存標頭，重啟時先寫入新的程序
+HEADER_FORMATS = {'webm', 'ogg', 'opus'}
+
+# 其他帶檔頭的格式無法從串流中段重新開始，程序異常結束時直接標記失敗
+UNRESTARTABLE_FORMATS = {'wav', 'flac', 'm4a', 'wma'}
+
+# 標頭超過此大小仍找不到結尾時放棄保存（重啟時標記失敗）
+MAX_HEADER_BYTES = 64 * 1024
+
+# WebM（Matroska）Cluster 元素 ID：第一個 Cluster 之前是 EBML 標頭、Segment 資訊與 Tracks
+WEBM_CLUSTER_ID = b'\x1f\x43\xb6\x75'
+
+# 輸出固定為 audio_queue 的格式
+OUTPUT_SAMPLE_RATE = 16000
+OUTPUT_CHANNELS = 1
+
+
+def find_header_end(input_format: str, data: bytes) -> Optional[int]:
+    """找出串流開頭容器標頭的結尾位置
+
+    - webm：第一個 Cluster 元素之前
+    - ogg/opus：開頭 granule position 為 0 的頁面（OpusHead、OpusTags 或 Vorbis 標頭）
+
+    Returns:
+        標頭的位元組數；資料還不夠判斷時返回 None
+
+    Raises:
+        ValueError: 資料不是預期的容器格式
+    """
+    if input_format.lower() == 'webm':
+        end = data.find(WEBM_CLUSTER_ID)
+        return end if end >= 0 else None
+
+    pos = 0
+    while pos + 27 <= len(data):
+        if data[pos:pos + 4] != b'OggS':
+            raise ValueError(f"offset {pos} 不是 Ogg 頁面")
+        segments = data[pos + 26]
+        if pos + 27 + segments > len(data):
+            return None
+        if int.from_bytes(data[pos + 6:pos + 14], 'little') != 0:
+            return pos
+        pos += 27 + segments + sum(data[pos + 27:pos + 27 + segments])
+    return None
+
+
+class FFmpegStreamWorker:
+    """單一 session 的常駐 FFmpeg 解碼程序"""
+
+    def __init__(
+        self,
+        session_id: str,
+        input_format: str,
+        input_sample_rate: Optional[int] = None,
+        input_channels: Optional[int] = None,
+        on_audio: Optional[Callable[[str, bytes], Any]] = None,
+        max_restarts: int = 3,
+        queue_size: int = 100,
+        read_size: int = 4096
+    ):
+        self.session_id = session_id
+        self.input_format = input_format
+        self.input_sample_rate = input_sample_rate
+        self.input_channels = input_channels
+        self.on_audio = on_audio or audio_queue.push
+        self.max_restarts = max_restarts
+        self.read_size = read_size
+
+        self._input: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+        self._writer: Optional[threading.Thread] = None
+        self._stderr_tail: deque = deque(maxlen=20)
+
+        # 容器標頭：擷取中為 bytearray，完成後存入 _header（無法擷取時兩者皆為 None）
+        fmt = input_format.lower()
+        self._header_buffer: Optional[bytearray] = bytearray() if fmt in HEADER_FORMATS else None
+        self._header: Optional[bytes] = None
+
+        self.failed = False
+        self.restarts = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.dropped_chunks = 0
+        self.started_at = time.time()
+
+    # === 生命週期 ===
+
+    def start(self) -> bool:
+        """啟動 FFmpeg 程序與讀寫執行緒"""
+        with self._lock:
+            if not self._spawn():
+                return False
+
+        self._writer = threading.Thread(
+            target=self._write_loop,
+            name=f"ffmpeg-writer-{self.session_id}",
+            daemon=True
+        )
+        self._writer.start()
+        return True
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """停止 worker：關閉 stdin 讓 FFmpeg 輸出剩餘音訊後結束"""
+        self._stop_event.set()
+        try:
+            self._input.put_nowait(None)
+        except queue.Full:
+            pass
+
+        if self._writer and self._writer.is_alive():
+            self._writer.join(timeout=timeout)
+
+        with self._lock:
+            process = self._process
+        if process:
+            self._close_stdin(process)
+            try:
+                process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+    def is_alive(self) -> bool:
+        """FFmpeg 程序是否仍在運作"""
+        process = self._process
+        return process is not None and process.poll() is None
+
+    def matches(self, input_format: str, input_sample_rate: Optional[int],
+                input_channels: Optional[int]) -> bool:
+        """輸入參數是否與此 worker 相同"""
+        return (
+            self.input_format == input_format
+            and self.input_sample_rate == input_sample_rate
+            and self.input_channels == input_channels
+        )
+
+    # === 資料 ===
+
+    def write(self, data: bytes) -> bool:
+        """非阻塞寫入一個 chunk
+
+        Returns:
+            True 已排入佇列；False 表示 worker 已停止/失敗或佇列已滿（chunk 被丟棄）
+        """
+        if self.failed or self._stop_event.is_set():
+            return False
+
+        try:
+            self._input.put_nowait(bytes(data))
+        except queue.Full:
+            self.dropped_chunks += 1
+            if self.dropped_chunks == 1 or self.dropped_chunks % 50 == 0:
+                logger.warning(
+                    f"FFmpeg worker {self.session_id} 輸入佇列已滿，已丟棄 {self.dropped_chunks} 個 chunk"
+                )
+            return False
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """取得 worker 統計"""
+        return {
+            "input_format": self.input_format,
+            "alive": self.is_alive(),
+            "failed": self.failed,
+            "restarts": self.restarts,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "dropped_chunks": self.dropped_chunks,
+            "pending_chunks": self._input.qsize(),
+            "uptime": time.time() - self.started_at,
+        }
+
+    # === 內部實作 ===
+
+    def _spawn(self, header: bytes = b"") -> bool:
+        """啟動 FFmpeg 程序（呼叫端需持有 _lock）
+
+        Args:
+            header: 在程序對寫入執行緒可見之前先寫入 stdin 的容器標頭（重啟時使用）
+        """
+        is_container = self.input_format.lower() in CONTAINER_FORMATS
+        process = ffmpeg_converter.convert_stream(
+            input_format=self.input_format,
+            output_format='pcm_s16le',
+            sample_rate=OUTPUT_SAMPLE_RATE,
+            channels=OUTPUT_CHANNELS,
+            input_sample_rate=None if is_container else self.input_sample_rate,
+            input_channels=None if is_container else self.input_channels,
+            low_latency=True
+        )
+        if process is None:
+            return False
+
+        if header:
+            try:
+                process.stdin.write(header)
+                process.stdin.flush()
+            except (BrokenPipeError, OSError, ValueError):
+                self._close_stdin(process)
+                if process.poll() is None:
+                    process.kill()
+                return False
+
+        self._process = process
+        threading.Thread(
+            target=self._read_loop,
+            args=(process,),
+            name=f"ffmpeg-reader-{self.session_id}",
+            daemon=True
+        ).start()
+        threading.Thread(
+            target=self._drain_stderr,
+            args=(process,),
+            name=f"ffmpeg-stderr-{self.session_id}",
+            daemon=True
+        ).start()
+        return True
+
+    def _restart(self, dead_process: subprocess.Popen) -> bool:
+        """FFmpeg 異常結束後重啟
+
+        Returns:
+            是否有可用的程序
+        """
+        with self._lock:
+            if self._stop_event.is_set():
+                return False
+            if self._process is not dead_process:
+                # 其他執行緒已經重啟過
+                return self._process is not None
+
+            returncode = dead_process.poll()
+            stderr = " | ".join(self._stderr_tail)
+            reason = self._unrestartable_reason()
+            if reason:
+                self.failed = True
+                self._process = None
+                logger.error(
+                    f"FFmpeg worker {self.session_id} 異常結束 (returncode={returncode})，"
+                    f"{reason}，停止串流: {stderr}"
+                )
+                return False
+
+            if self.restarts >= self.max_restarts:
+                self.failed = True
+                self._process = None
+                logger.error(
+                    f"FFmpeg worker {self.session_id} 已重啟 {self.restarts} 次仍失敗 "
+                    f"(returncode={returncode}): {stderr}"
+                )
+                return False
+
+            self.restarts += 1
+            logger.warning(
+                f"FFmpeg worker {self.session_id} 異常結束 (returncode={returncode})，"
+                f"重啟 {self.restarts}/{self.max_restarts}: {stderr}"
+            )
+            self._close_stdin(dead_process)
+            if dead_process.poll() is None:
+                dead_process.kill()
+            self._stderr_tail.clear()
+
+            if not self._spawn(self._header or b""):
+                self.failed = True
+                self._process = None
+                return False
+            return True
+
+    def _unrestartable_reason(self) -> Optional[str]:
+        """無法從串流中段重新開始的原因（可以重啟時返回 None）"""
+        fmt = self.input_format.lower()
+        if fmt in UNRESTARTABLE_FORMATS:
+            return f"{fmt} 無法從串流中段重新開始"
+        if fmt in HEADER_FORMATS and self._header is None:
+            return f"{fmt} 容器標頭未保存，無法重新開始"
+        return None
+
+    def _capture_header(self, data: bytes):
+        """保存串流開頭的容器標頭（寫入執行緒呼叫）"""
+        buffer = self._header_buffer
+        buffer.extend(data)
+        try:
+            end = find_header_end(self.input_format, buffer)
+        except ValueError as e:
+            logger.warning(f"FFmpeg worker {self.session_id} 無法解析 {self.input_format} 標頭: {e}")
+            self._header_buffer = None
+            return
+
+        if end is not None:
+            self._header = bytes(buffer[:end])
+            self._header_buffer = None
+        elif len(buffer) > MAX_HEADER_BYTES:
+            logger.warning(
+                f"FFmpeg worker {self.session_id} 的 {self.input_format} 標頭超過 {MAX_HEADER_BYTES} bytes，不保存"
+            )
+            self._header_buffer = None
+
+    def _write_loop(self):
+        """寫入執行緒：把佇列中的 chunk 寫進 FFmpeg stdin"""
+        while True:
+            try:
+                data = self._input.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop_event.is_set() or self.failed:
+                    break
+                continue
+
+            if data is None or self.failed:
+                break
+
+            if self._header_buffer is not None:
+                self._capture_header(data)
+
+            process = self._process
+            if process is None:
+                break
+
+            try:
+                process.stdin.write(data)
+                process.stdin.flush()
+                self.bytes_in += len(data)
+            except (BrokenPipeError, OSError, ValueError):
+                # 程序已結束，這個 chunk 遺失；重啟後繼續寫入後續資料
+                if self._stop_event.is_set() or not self._restart(process):
+                    break
+
+    def _read_loop(self, process: subprocess.Popen):
+        """讀取執行緒：把解碼後的 int16 推入 audio_queue"""
+        stdout = process.stdout
+        remainder = b""
+        try:
+            while True:
+                data = stdout.read1(self.read_size)
+                if not data:
+                    break
+
+                if remainder:
+                    data = remainder + data
+                # 保持 int16 樣本對齊
+                usable = len(data) - (len(data) % 2)
+                remainder = data[usable:]
+                if usable:
+                    self.bytes_out += usable
+                    self.on_audio(self.session_id, data[:usable])
+        except (OSError, ValueError):
+            pass
+        except Exception as e:
+            logger.error(f"FFmpeg worker {self.session_id} 推送音訊失敗: {e}")
+
+        if self._stop_event.is_set():
+            return
+
+        # 非預期的 EOF：等程序結束後重啟
+        try:
+            process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            pass
+        self._restart(process)
+
+    def _drain_stderr(self, process: subprocess.Popen):
+        """持續讀取 stderr，避免管道塞滿阻塞 FFmpeg，保留最後幾行供錯誤訊息使用"""
+        try:
+            for line in process.stderr:
+                text = line.decode('utf-8', errors='ignore').strip()
+                if text:
+                    self._stderr_tail.append(text)
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _close_stdin(process: subprocess.Popen):
+        try:
+            if process.stdin and not process.stdin.closed:
+                process.stdin.close()
+        except (BrokenPipeError, OSError, ValueError):
+            pass
+
+
+class FFmpegStreamManager(SingletonMixin):
+    """管理每個 session 的 FFmpeg 串流 worker
+
+    使用方式：
+        ffmpeg_stream_manager.feed(session_id, chunk_bytes, "webm")
+        ...
+        ffmpeg_stream_manager.stop_worker(session_id)  # session 刪除時
+    """
+
+    def __init__(self):
+        if not hasattr(self, '_initialized'):
+            self._initialized = True
+
+            config = ConfigManager()
+            stream_config = getattr(config.services.audio_converter.ffmpeg, 'stream', None)
+            self.max_workers = getattr(stream_config, 'max_workers', 16)
+            self.max_restarts = getattr(stream_config, 'max_restarts', 3)
+            self.queue_size = getattr(stream_config, 'queue_size', 100)
+            self.read_size = getattr(stream_config, 'read_size', 4096)
+
+            self._workers: Dict[str, FFmpegStreamWorker] = {}
+            self._lock = threading.Lock()
+            self._rejected = 0
+
+            logger.debug(
+                f"FFmpegStreamManager: max_workers={self.max_workers}, "
+                f"max_restarts={self.max_restarts}, queue_size={self.queue_size}"
+            )
+
+    def feed(
+        self,
+        session_id: str,
+        data: bytes,
+        input_format: str,
+        input_sample_rate: Optional[int] = None,
+        input_channels: Optional[int] = None
+    ) -> bool:
+        """把一個 chunk 送進 session 的 FFmpeg worker（需要時啟動）
+
+        Returns:
+            True 已排入；False 表示無法處理（FFmpeg 不可用、worker 數量已達上限、
+            worker 已失敗或輸入佇列已滿）
+        """
+        worker = self._get_or_start(session_id, input_format, input_sample_rate, input_channels)
+        if worker is None:
+            return False
+        return worker.write(data)
+
+    def stop_worker(self, session_id: str) -> None:
+        """停止並移除 session 的 worker"""
+        with self._lock:
+            worker = self._workers.pop(session_id, None)
+        if worker:
+            worker.stop()
+            logger.debug(f"FFmpeg worker {session_id} 已停止: {worker.get_stats()}")
+
+    def has_worker(self, session_id: str) -> bool:
+        """session 是否有 worker"""
+        with self._lock:
+            return session_id in self._workers
+
+    def get_stats(self) -> Dict[str, Any]:
+        """取得所有 worker 的統計"""
+        with self._lock:
+            workers = dict(self._workers)
+        return {
+            "active_workers": len(workers),
+            "max_workers": self.max_workers,
+            "rejected": self._rejected,
+            "workers": {sid: worker.get_stats() for sid, worker in workers.items()},
+        }
+
+    def shutdown(self) -> None:
+        """停止所有 worker"""
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for worker in workers:
+            worker.stop()
+
+    def _get_or_start(
+        self,
+        session_id: str,
+        input_format: str,
+        input_sample_rate: Optional[int],
+        input_channels: Optional[int]
+    ) -> Optional[FFmpegStreamWorker]:
+        """取得 session 的 worker，輸入參數改變時重建
+
+        worker 先在鎖內放入對照表佔位，FFmpeg 程序在鎖外啟動（spawn 需要數十毫秒），
+        不會阻塞其他 session 的 feed()；同一 session 的後續 chunk 先排入佔位 worker 的輸入佇列。
+        """
+        stale = None
+        with self._lock:
+            worker = self._workers.get(session_id)
+            if worker is not None and worker.matches(input_format, input_sample_rate, input_channels):
+                # 失敗的 worker 保留到 session 刪除，避免反覆重啟
+                return None if worker.failed else worker
+
+            if worker is not None:
+                stale = self._workers.pop(session_id)
+
+            if len(self._workers) >= self.max_workers:
+                self._rejected += 1
+                logger.warning(
+                    f"FFmpeg worker 數量已達上限 ({self.max_workers})，拒絕 session {session_id}"
+                )
+                worker = None
+            else:
+                worker = FFmpegStreamWorker(
+                    session_id,
+                    input_format,
+                    input_sample_rate,
+                    input_channels,
+                    max_restarts=self.max_restarts,
+                    queue_size=self.queue_size,
+                    read_size=self.read_size
+                )
+                self._workers[session_id] = worker
+
+        if stale:
+            stale.stop()
+        if worker is None:
+            return None
+
+        started = worker.start()
+        if not started:
+            worker.failed = True
+        with self._lock:
+            current = self._workers.get(session_id) is worker
+            if current and not started:
+                self._workers.pop(session_id)
+
+        if not started:
+            logger.error(f"無法啟動 FFmpeg worker: {session_id}")
+            return None
+        if not current:
+            # 啟動期間 session 已被刪除或被新的 worker 取代
+            worker.stop()
+            return None
+
+        logger.info(f"FFmpeg worker 已啟動: {session_id} ({input_format})")
+        return worker
+
+
+# 模組級單例實例
+ffmpeg_stream_manager: FFmpegStreamManager = FFmpegStreamManager()
@@ -5,23 +5,22 @@
 """
 
 import numpy as np
-from typing import List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
+from functools import lru_cache
+from math import gcd
 import io
+import threading
 import wave
 import struct
 
-try:
-    from scipy import signal
-    SCIPY_AVAILABLE = True
-except ImportError:
-    SCIPY_AVAILABLE = False
-    
-try:
-    import cupy as cp
-    from cupyx.scipy import signal as cp_signal
-    GPU_AVAILABLE = True
-except ImportError:
-    GPU_AVAILABLE = False
+from src.utils.lazy_import import is_available, lazy_import
+
+# scipy 在第一次重新取樣時才匯入（16kHz 單聲道的輸入不需要）
+signal = lazy_import("scipy.signal")
+SCIPY_AVAILABLE = is_available("scipy")
+
+# cupy 只在 services.audio_converter.scipy.use_gpu 啟用時才匯入（匯入時會初始化 CUDA）
+cp = lazy_import("cupy")
 
 from src.interface.audio_converter import IAudioConverter
 from src.interface.audio import AudioChunk
@@ -32,6 +31,164 @@ from src.interface.exceptions import ServiceError, ConversionError
 from src.config.manager import ConfigManager
 
 
+def _gpu_available() -> bool:
+    """匯入 cupy 並確認可用（未安裝或沒有 CUDA 時返回 False）"""
+    if not is_available("cupy"):
+        return False
+    try:
+        cp.cuda.runtime.getDeviceCount()
+        return True
+    except Exception as e:
+        logger.warning(f"CuPy 無法使用，改用 CPU: {e}")
+        return False
+
+
+@lru_cache(maxsize=16)
+def _polyphase_filter_bank(up: int, down: int) -> Tuple[np.ndarray, int]:
+    """設計與 resample_poly 相同的抗鋸齒 FIR（Kaiser, beta=5）並拆成 polyphase 濾波器組
+    
+    依 (up, down) 快取，同一組取樣率的所有 session 共用。
+    
+    Returns:
+        (濾波器組 [up, taps]，每列已反轉為時間遞增順序, 濾波器延遲 half_len)
+    """
+    max_rate = max(up, down)
+    if max_rate == 1:
+        # 取樣率相同（只混聲道）：單位脈衝
+        bank = np.ones((1, 1), dtype=np.float32)
+        bank.setflags(write=False)
+        return bank, 0
+    
+    half_len = 10 * max_rate
+    h = signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=('kaiser', 5.0)) * up
+    
+    taps = -(-len(h) // up)
+    padded = np.zeros(up * taps)
+    padded[:len(h)] = h
+    # bank[p, j] = h[p + j * up]
+    bank = padded.reshape(taps, up).T[:, ::-1]
+    bank = np.ascontiguousarray(bank, dtype=np.float32)
+    bank.setflags(write=False)
+    return bank, half_len
+
+
+class StreamingResampler:
+    """有狀態的串流重新取樣器（每個 session 一個）
+    
+    - 濾波器組依取樣率比例快取，不會每個 chunk 重新設計
+    - 保留前一個 chunk 尾端的輸入樣本作為濾波器歷史，chunk 邊界沒有邊緣失真；
+      逐 chunk 輸出接起來與整段 resample_poly 的結果相同
+    - 多聲道交錯音訊在同一次處理中混成單聲道
+    """
+    
+    MAX_CACHED_PLANS = 8
+    
+    def __init__(self, source_rate: int, target_rate: int, channels: int = 1):
+        if not SCIPY_AVAILABLE:
+            raise ConversionError("StreamingResampler requires scipy")
+        
+        divisor = gcd(target_rate, source_rate)
+        self.source_rate = source_rate
+        self.target_rate = target_rate
+        self.channels = max(1, channels)
+        self.up = target_rate // divisor
+        self.down = source_rate // divisor
+        
+        self._bank, self._delay = _polyphase_filter_bank(self.up, self.down)
+        self._taps = self._bank.shape[1]
+        # 輸出位置的相位 / 視窗偏移只取決於 (已輸出數 % up, 輸出數)，
+        # 固定長度的 chunk 會重複使用同一組索引與權重
+        self._plans: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = {}
+        self.reset()
+    
+    def reset(self) -> None:
+        """清除濾波器歷史（例如音訊串流中斷後重新開始）"""
+        self._history = np.zeros(self._taps - 1, dtype=np.float32)
+        self._consumed = 0  # 已輸入的單聲道樣本數
+        self._produced = 0  # 已輸出的樣本數
+    
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """重新取樣一個 chunk
+        
+        Args:
+            audio: float32（-1~1）或 int16 樣本，多聲道為交錯格式
+            
+        Returns:
+            目標取樣率的單聲道 float32 樣本
+        """
+        mono = self._downmix(audio)
+        buffer = np.concatenate((self._history, mono))
+        self._consumed += len(mono)
+        
+        resampled = self._emit(buffer, self._consumed)
+        if self._taps > 1:
+            self._history = buffer[len(buffer) - (self._taps - 1):]
+        return resampled
+    
+    def flush(self) -> np.ndarray:
+        """串流結束：輸出濾波器延遲內剩餘的樣本並重置狀態"""
+        total = -(-self._consumed * self.up // self.down)
+        pad = self._delay // self.up + 2
+        buffer = np.concatenate((self._history, np.zeros(pad, dtype=np.float32)))
+        
+        remaining = total - self._produced
+        resampled = self._emit(buffer, self._consumed + pad)[:max(0, remaining)]
+        self.reset()
+        return resampled
+    
+    def _downmix(self, audio: np.ndarray) -> np.ndarray:
+        """轉成單聲道 float32"""
+        audio = np.asarray(audio)
+        if audio.dtype == np.int16:
+            audio = audio.astype(np.float32) / 32768.0
+        elif audio.dtype != np.float32:
+            audio = audio.astype(np.float32)
+        
+        if audio.ndim > 1:
+            return audio.mean(axis=1, dtype=np.float32)
+        if self.channels > 1:
+            # 交錯樣本以步進切片相加，比 reshape + mean 少一次暫存
+            usable = len(audio) - (len(audio) % self.channels)
+            mono = audio[0:usable:self.channels].copy()
+            for channel in range(1, self.channels):
+                mono += audio[channel:usable:self.channels]
+            mono *= 1.0 / self.channels
+            return mono
+        return audio
+    
+    def _emit(self, buffer: np.ndarray, available: int) -> np.ndarray:
+        """計算輸入已足夠的輸出樣本
+        
+        輸出 m 對應上取樣序列位置 n = m * down + delay，
+        使用輸入 x[n // up - taps + 1 .. n // up] 與第 n % up 組濾波器。
+        """
+        end = (available * self.up - 1 - self._delay) // self.down + 1
+        if end <= self._produced:
+            return np.empty(0, dtype=np.float32)
+        
+        offsets, weights = self._plan(self._produced, end - self._produced)
+        first_input = (self._produced * self.down + self._delay) // self.up
+        # buffer[0] 對應全域輸入索引 available - len(buffer)
+        first_row = first_input - (available - len(buffer)) - (self._taps - 1)
+        
+        windows = np.lib.stride_tricks.sliding_window_view(buffer, self._taps)[offsets + first_row]
+        self._produced = end
+        return np.einsum('ij,ij->i', windows, weights)
+    
+    def _plan(self, start: int, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """取得 count 個輸出的視窗偏移（相對第一個輸出）與對應的濾波器權重"""
+        key = (start % self.up, count)
+        plan = self._plans.get(key)
+        if plan is None:
+            n = np.arange(key[0], key[0] + count, dtype=np.int64) * self.down + self._delay
+            last_input, phase = np.divmod(n, self.up)
+            plan = (last_input - last_input[0], self._bank[phase])
+            if len(self._plans) >= self.MAX_CACHED_PLANS:
+                self._plans.clear()
+            self._plans[key] = plan
+        return plan
+
+
 class ScipyConverter(SingletonMixin, IAudioConverter):
     """音訊格式轉換器。
     
@@ -54,7 +211,7 @@ class ScipyConverter(SingletonMixin, IAudioConverter):
             self.defaults_config = config.services.audio_converter.defaults
             
             # 根據配置決定是否使用 GPU
-            self.use_gpu = self.scipy_config.use_gpu and GPU_AVAILABLE
+            self.use_gpu = bool(self.scipy_config.use_gpu) and _gpu_available()
             self.use_scipy = SCIPY_AVAILABLE
             self.batch_size = self.scipy_config.batch_size
             self.quality = self.scipy_config.quality
@@ -68,8 +225,12 @@ class ScipyConverter(SingletonMixin, IAudioConverter):
             else:
                 backends.append("NumPy (fallback)")
                 
+            # 每個 session 的串流重新取樣器
+            self._stream_resamplers: Dict[str, StreamingResampler] = {}
+            self._stream_lock = threading.Lock()
+            
             # 簡化日誌輸出
-            backend_info = "GPU (CuPy)" if GPU_AVAILABLE and self.scipy_config.use_gpu else "CPU"
+            backend_info = "GPU (CuPy)" if self.use_gpu else "CPU"
             logger.debug(f"ScipyConverter: {backend_info}, quality={self.quality}")
     
     def convert_for_session(
@@ -110,6 +271,56 @@ class ScipyConverter(SingletonMixin, IAudioConverter):
         
         return converted
     
+    def convert_stream(
+        self,
+        session_id: str,
+        audio: np.ndarray,
+        source_rate: int,
+        source_channels: int = 1,
+        target_rate: int = 16000
+    ) -> np.ndarray:
+        """使用 session 的串流重新取樣器轉換連續音訊片段。
+        
+        Args:
+            session_id: Session ID
+            audio: float32 或 int16 樣本（多聲道為交錯格式）
+            source_rate: 來源取樣率
+            source_channels: 來源聲道數（混成單聲道）
+            target_rate: 目標取樣率
+            
+        Returns:
+            目標取樣率的單聲道 float32 樣本
+        """
+        resampler = self.get_stream_resampler(session_id, source_rate, source_channels, target_rate)
+        return resampler.process(audio)
+    
+    def get_stream_resampler(
+        self,
+        session_id: str,
+        source_rate: int,
+        source_channels: int = 1,
+        target_rate: int = 16000
+    ) -> StreamingResampler:
+        """取得 session 的串流重新取樣器，音訊參數改變時重新建立。"""
+        with self._stream_lock:
+            resampler = self._stream_resamplers.get(session_id)
+            if (resampler is None or
+                    resampler.source_rate != source_rate or
+                    resampler.target_rate != target_rate or
+                    resampler.channels != max(1, source_channels)):
+                resampler = StreamingResampler(source_rate, target_rate, source_channels)
+                self._stream_resamplers[session_id] = resampler
+                logger.debug(
+                    f"Streaming resampler for session {session_id}: "
+                    f"{source_rate}Hz x{source_channels} -> {target_rate}Hz"
+                )
+            return resampler
+    
+    def release_stream_resampler(self, session_id: str) -> None:
+        """釋放 session 的串流重新取樣器。"""
+        with self._stream_lock:
+            self._stream_resamplers.pop(session_id, None)
+    
     def convert_chunk(
         self,
         chunk: AudioChunk,
@@ -143,7 +354,8 @@ class ScipyConverter(SingletonMixin, IAudioConverter):
             sample_rate=target_sample_rate,
             channels=target_channels,
             timestamp=chunk.timestamp,
-            metadata={'format': target_format}
+            metadata={'format': target_format},
+            format=target_format
         )
     
     def convert_batch(
@@ -265,7 +477,8 @@ class ScipyConverter(SingletonMixin, IAudioConverter):
                     timestamp=chunk.timestamp,
                     sample_rate=target_sample_rate,
                     channels=target_channels,
-                    metadata={'format': target_format}
+                    metadata={'format': target_format},
+                    format=target_format
                 ))
         
         return converted_chunks
@@ -351,13 +564,15 @@ class ScipyConverter(SingletonMixin, IAudioConverter):
         """解碼音訊資料為 numpy array。"""
         # 如果已經是 numpy array 直接返回
         if isinstance(chunk.data, np.ndarray):
+            if chunk.data.dtype == np.int16:
+                return chunk.to_numpy()  # audio_queue 的 int16 視圖，歸一化到 [-1, 1]
             return chunk.data.astype(np.float32) if chunk.data.dtype != np.float32 else chunk.data
         
         if chunk.data is None or (isinstance(chunk.data, (np.ndarray, bytes)) and len(chunk.data) == 0):
             return np.array([], dtype=np.float32)
         
-        # 從 metadata 取得格式
-        current_format = chunk.metadata.get('format', 'pcm_s16le') if chunk.metadata else 'pcm_s16le'
+        # 從 metadata 取得格式（舊呼叫端），否則使用 chunk 標記的格式
+        current_format = (chunk.metadata or {}).get('format') or chunk.format or 'pcm_s16le'
         
         # PCM S16 LE
         if current_format in ['pcm_s16le', 'pcm', 's16le']:
@@ -482,7 +697,6 @@ class ScipyConverter(SingletonMixin, IAudioConverter):
         # 這個方法使用 polyphase filtering，品質很好
         
         # 計算最大公約數簡化比例
-        from math import gcd
         divisor = gcd(target_rate, source_rate)
         up = target_rate // divisor
         down = source_rate // divisor
@@ -10,11 +10,18 @@
 from typing import Optional, Union
 from pathlib import Path
 
+import numpy as np
+
 from src.interface.audio import AudioChunk
+from src.interface.exceptions import ConversionError
 from src.utils.logger import logger
 from src.config.manager import ConfigManager
 
 
+# 可直接解碼的原始 PCM 格式；其他格式（webm/ogg/opus/pcm_s24le 等）交給 FFmpeg 串流 worker
+RAW_PCM_FORMATS = {'pcm_s16le', 'pcm', 's16le', 'int16', 'pcm_f32le', 'f32le', 'float32'}
+
+
 class AudioConverterService:
     """統一的音訊轉換服務 (Stateless)。
     
@@ -31,6 +38,7 @@ class AudioConverterService:
         
         self.scipy_converter = None
         self.ffmpeg_converter = None
+        self.ffmpeg_stream_manager = None
         
         # 根據配置載入 SciPy 轉換器
         if self.converter_config.scipy.enabled:
@@ -47,6 +55,8 @@ class AudioConverterService:
                 from .ffmpeg_converter import ffmpeg_converter
                 if ffmpeg_converter.is_available():
                     self.ffmpeg_converter = ffmpeg_converter
+                    from .ffmpeg_stream import ffmpeg_stream_manager
+                    self.ffmpeg_stream_manager = ffmpeg_stream_manager
                     logger.debug("音訊轉換器 (FFmpeg) 已載入")
                 else:
                     logger.warning("FFmpeg 未安裝，部分功能可能受限")
@@ -114,6 +124,95 @@ class AudioConverterService:
         logger.error("No converter available for chunk conversion")
         return None
     
+    def convert_audio(
+        self,
+        audio_data: Union[bytes, np.ndarray],
+        source_sample_rate: int,
+        source_channels: int = 1,
+        target_sample_rate: Optional[int] = None,
+        session_id: Optional[str] = None,
+        source_format: str = 'pcm_s16le'
+    ) -> Union[bytes, np.ndarray]:
+        """轉換原始音訊的取樣率並混成單聲道。
+        
+        提供 session_id 時使用該 session 的串流重新取樣器（濾波器狀態跨 chunk 延續），
+        即時串流的連續 chunk 應該都帶 session_id。
+        
+        Args:
+            audio_data: pcm bytes 或 numpy 樣本（多聲道為交錯格式）
+            source_sample_rate: 來源取樣率
+            source_channels: 來源聲道數
+            target_sample_rate: 目標取樣率 (None = 使用配置預設值)
+            session_id: Session ID（串流模式）
+            source_format: bytes 輸入的格式 (pcm_s16le / pcm_f32le)
+            
+        Returns:
+            bytes 輸入回傳 pcm_s16le bytes，numpy 輸入回傳 float32 ndarray
+        """
+        if not self.scipy_converter:
+            raise ConversionError("ScipyConverter not available for raw audio conversion")
+        
+        target_sample_rate = target_sample_rate or self.converter_config.defaults.target_sample_rate
+        source_channels = source_channels or 1
+        
+        # 解碼成 numpy 樣本
+        if isinstance(audio_data, np.ndarray):
+            audio = audio_data
+        elif source_format in ['pcm_f32le', 'f32le', 'float32']:
+            audio = np.frombuffer(audio_data, dtype=np.float32)
+        else:
+            usable = len(audio_data) - (len(audio_data) % 2)
+            audio = np.frombuffer(audio_data, dtype=np.int16, count=usable // 2)
+        
+        if session_id and self.scipy_converter.use_scipy:
+            converted = self.scipy_converter.convert_stream(
+                session_id, audio, source_sample_rate, source_channels, target_sample_rate
+            )
+        else:
+            if audio.dtype == np.int16:
+                audio = audio.astype(np.float32) / 32768.0
+            converted = self.scipy_converter._convert_channels(audio, source_channels, 1)
+            converted = self.scipy_converter._resample(converted, source_sample_rate, target_sample_rate)
+        
+        if isinstance(audio_data, np.ndarray):
+            return converted.astype(np.float32, copy=False)
+        return self.scipy_converter._encode_audio(converted, 'pcm_s16le')
+    
+    @staticmethod
+    def is_raw_pcm(audio_format: Optional[str]) -> bool:
+        """是否為可直接解碼的原始 PCM 格式（None 視為 pcm_s16le）。"""
+        return not audio_format or audio_format.lower() in RAW_PCM_FORMATS
+    
+    def feed_stream(
+        self,
+        session_id: str,
+        audio_data: bytes,
+        source_format: str,
+        source_sample_rate: Optional[int] = None,
+        source_channels: Optional[int] = None
+    ) -> bool:
+        """把壓縮/非 PCM 格式的串流 chunk 送進 session 的常駐 FFmpeg worker。
+        
+        解碼後的 16kHz 單聲道 int16 由 worker 直接推入 audio_queue，
+        不經過呼叫端。
+        
+        Returns:
+            True 已排入；False 表示無法處理（FFmpeg 不可用、worker 已達上限或佇列已滿）
+        """
+        if not self.ffmpeg_stream_manager:
+            logger.error(f"FFmpeg not available for {source_format} stream")
+            return False
+        return self.ffmpeg_stream_manager.feed(
+            session_id, audio_data, source_format, source_sample_rate, source_channels
+        )
+    
+    def release_session(self, session_id: str) -> None:
+        """釋放 session 的串流轉換狀態（重新取樣器、FFmpeg worker）。"""
+        if self.scipy_converter:
+            self.scipy_converter.release_stream_resampler(session_id)
+        if self.ffmpeg_stream_manager:
+            self.ffmpeg_stream_manager.stop_worker(session_id)
+    
     def convert_file(
         self,
         input_path: Union[str, Path],
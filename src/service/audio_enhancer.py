@@ -1,13 +1,110 @@
 """
 音訊增強服務 - Phase 3 完整版本
 包含智慧處理系統和進階工具
+
+濾波與包絡計算都是向量化實作（IIR 使用 scipy.signal.lfilter，滑動 RMS 使用累積和），
+傳入 EnhancerState 時各步驟會跨呼叫保留濾波器狀態，可用於 100ms chunk 的串流處理。
 """
 import numpy as np
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from src.utils.logger import logger
 from src.config.manager import ConfigManager
 from src.utils.singleton import SingletonMixin
 
+from src.utils.lazy_import import is_available, lazy_import
+
+# scipy 在第一次濾波時才匯入
+signal = lazy_import("scipy.signal")
+SCIPY_AVAILABLE = is_available("scipy")
+
+
+# 串流模式的滑動 RMS 視窗（整段處理時依音訊長度縮小）
+COMPRESSOR_WINDOW = 512
+GATE_WINDOW = 1024
+
+
+class EnhancerState:
+    """串流處理狀態（每個音訊串流一個實例）
+
+    把同一個實例傳給各處理步驟的 state 參數，連續 chunk 的高通濾波與噪音門平滑
+    會與整段處理的結果一致；滑動 RMS 在串流模式改用只看過去樣本的因果視窗。
+    """
+
+    __slots__ = ('highpass_zi', 'compressor_history', 'gate_history', 'gate_zi')
+
+    def __init__(self):
+        self.highpass_zi: Optional[float] = None
+        self.compressor_history: Optional[np.ndarray] = None
+        self.gate_history: Optional[np.ndarray] = None
+        self.gate_zi: Optional[float] = None
+
+    def reset(self) -> None:
+        """清除所有狀態（例如新的語音段落開始）"""
+        self.__init__()
+
+
+def _first_order_iir(b0: float, b1: float, a1: float,
+                     x: np.ndarray, zi: float) -> Tuple[np.ndarray, float]:
+    """一階 IIR：y[n] = b0*x[n] + b1*x[n-1] - a1*y[n-1]（轉置直接 II 型）
+
+    Returns:
+        (float32 輸出, 結束時的濾波器狀態)
+    """
+    if x.size == 0:
+        return x.astype(np.float32, copy=False), zi
+    if SCIPY_AVAILABLE:
+        y, zf = signal.lfilter([b0, b1], [1.0, a1], x, zi=[zi])
+        return y.astype(np.float32, copy=False), float(zf[0])
+
+    # 沒有 scipy 時逐樣本計算（結果相同）
+    y = np.empty(x.shape, dtype=np.float32)
+    z = zi
+    for i, value in enumerate(x):
+        out = b0 * value + z
+        z = b1 * value - a1 * out
+        y[i] = out
+    return y, float(z)
+
+
+def _sliding_rms(audio: np.ndarray, window_size: int,
+                 history: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """以累積和計算滑動 RMS 包絡（O(n)）
+
+    Args:
+        audio: 輸入音訊
+        window_size: 視窗樣本數
+        history: None 時使用置中視窗 [i - w/2, i + w/2)；
+                 否則為串流模式，使用含本樣本的前 window_size 個樣本，
+                 history 是上一個 chunk 尾端的平方值
+
+    Returns:
+        (包絡, 下一個 chunk 使用的 history；置中模式為 None)
+    """
+    n = audio.shape[0]
+    squared = np.square(audio, dtype=np.float64)
+
+    if history is None:
+        half = window_size // 2
+        index = np.arange(n)
+        start = np.maximum(index - half, 0)
+        end = np.minimum(index + half, n)
+        sums = np.concatenate(([0.0], np.cumsum(squared)))
+        count = end - start
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = (sums[end] - sums[start]) / count
+        # 視窗為空時（音訊極短）退回逐樣本振幅
+        mean = np.where(count > 0, mean, squared)
+        return np.sqrt(np.maximum(mean, 0.0)).astype(np.float32), None
+
+    squared = np.concatenate((history, squared))
+    offset = history.shape[0]
+    sums = np.concatenate(([0.0], np.cumsum(squared)))
+    end = np.arange(offset + 1, offset + n + 1)
+    start = np.maximum(end - window_size, 0)
+    mean = (sums[end] - sums[start]) / (end - start)
+    next_history = squared[-(window_size - 1):] if window_size > 1 else squared[:0]
+    return np.sqrt(np.maximum(mean, 0.0)).astype(np.float32), next_history.copy()
+
 
 class AudioEnhancer(SingletonMixin):
     """音訊增強工具箱 - 提供完整的音訊處理功能
@@ -87,28 +184,36 @@ class AudioEnhancer(SingletonMixin):
             return audio - mean_value
         return audio
     
-    def apply_highpass_simple(self, audio: np.ndarray, alpha: Optional[float] = None) -> np.ndarray:
+    def apply_highpass_simple(self,
+                              audio: np.ndarray,
+                              alpha: Optional[float] = None,
+                              state: Optional[EnhancerState] = None) -> np.ndarray:
         """簡單高通濾波器 - 使用一階差分
         
-        這是最簡單的實作，不依賴 scipy
+        y[n] = alpha * (y[n-1] + x[n] - x[n-1])，以 IIR 係數 b=[a, -a]、a=[1, -a] 向量化計算
         
         Args:
             audio: 輸入音訊
             alpha: 濾波係數 (0.9-0.99, 越大截止頻率越低)，None 則使用配置值
+            state: 串流狀態，傳入時延續上一個 chunk 的濾波器狀態
             
         Returns:
             濾波後音訊
         """
         if alpha is None:
             alpha = self.highpass_alpha
-            
-        # 簡單的一階高通濾波器
-        filtered = np.zeros_like(audio)
-        filtered[0] = audio[0]
+        if audio.size == 0:
+            return audio
         
-        for i in range(1, len(audio)):
-            filtered[i] = alpha * (filtered[i-1] + audio[i] - audio[i-1])
+        if state is not None and state.highpass_zi is not None:
+            filtered, zf = _first_order_iir(alpha, -alpha, -alpha, audio, state.highpass_zi)
+        else:
+            # 第一個樣本直接輸出 (y[0] = x[0])，等價於從零狀態濾波其餘樣本
+            rest, zf = _first_order_iir(alpha, -alpha, -alpha, audio[1:], 0.0)
+            filtered = np.concatenate((audio[:1].astype(np.float32), rest))
         
+        if state is not None:
+            state.highpass_zi = zf
         return filtered
     
     def apply_gain(self, audio: np.ndarray, gain_db: float) -> np.ndarray:
@@ -291,7 +396,8 @@ class AudioEnhancer(SingletonMixin):
                          threshold: float = -20,
                          ratio: float = 2.5,
                          attack_ms: float = 5,
-                         release_ms: float = 50) -> np.ndarray:
+                         release_ms: float = 50,
+                         state: Optional[EnhancerState] = None) -> np.ndarray:
         """動態範圍壓縮
         
         簡化實作，適合即時處理
@@ -302,21 +408,25 @@ class AudioEnhancer(SingletonMixin):
             ratio: 壓縮比 (例如 2.5:1)
             attack_ms: 起音時間 (毫秒)，目前未實作
             release_ms: 釋放時間 (毫秒)，目前未實作
+            state: 串流狀態，傳入時滑動 RMS 延續上一個 chunk 的樣本
             
         Returns:
             壓縮後音訊
         """
+        if audio.size == 0:
+            return audio
+        
         # 轉換閾值到線性值
         threshold_linear = 10 ** (threshold / 20.0)
         
         # 計算音訊包絡 (簡化版，使用滑動RMS)
-        window_size = min(512, len(audio) // 4)
-        envelope = np.zeros_like(audio)
-        
-        for i in range(len(audio)):
-            start = max(0, i - window_size // 2)
-            end = min(len(audio), i + window_size // 2)
-            envelope[i] = np.sqrt(np.mean(audio[start:end] ** 2))
+        if state is not None:
+            history = state.compressor_history
+            if history is None:
+                history = np.empty(0, dtype=np.float64)
+            envelope, state.compressor_history = _sliding_rms(audio, COMPRESSOR_WINDOW, history)
+        else:
+            envelope, _ = _sliding_rms(audio, min(COMPRESSOR_WINDOW, len(audio) // 4))
         
         # 計算增益縮減
         gain_reduction = np.ones_like(audio)
@@ -366,24 +476,31 @@ class AudioEnhancer(SingletonMixin):
         
         return limited
     
-    def apply_gate(self, audio: np.ndarray, threshold: float = -40) -> np.ndarray:
+    def apply_gate(self,
+                   audio: np.ndarray,
+                   threshold: float = -40,
+                   state: Optional[EnhancerState] = None) -> np.ndarray:
         """噪音門 - 低於閾值時衰減
         
         Args:
             audio: 輸入音訊
             threshold: 門檻值 (dBFS)
+            state: 串流狀態，傳入時延續滑動 RMS 與增益平滑
             
         Returns:
             處理後音訊
         """
-        # 計算滑動 RMS
-        window_size = min(1024, len(audio) // 8)
-        rms_envelope = np.zeros_like(audio)
+        if audio.size == 0:
+            return audio
         
-        for i in range(len(audio)):
-            start = max(0, i - window_size // 2)
-            end = min(len(audio), i + window_size // 2)
-            rms_envelope[i] = np.sqrt(np.mean(audio[start:end] ** 2))
+        # 計算滑動 RMS
+        if state is not None:
+            history = state.gate_history
+            if history is None:
+                history = np.empty(0, dtype=np.float64)
+            rms_envelope, state.gate_history = _sliding_rms(audio, GATE_WINDOW, history)
+        else:
+            rms_envelope, _ = _sliding_rms(audio, min(GATE_WINDOW, len(audio) // 8))
         
         # 轉換閾值到線性值
         threshold_linear = 10 ** (threshold / 20.0)
@@ -395,10 +512,15 @@ class AudioEnhancer(SingletonMixin):
             0.1   # 關門 (衰減而非完全靜音)
         )
         
-        # 平滑增益變化
-        smoothed_gain = np.copy(gate_gain)
-        for i in range(1, len(smoothed_gain)):
-            smoothed_gain[i] = 0.9 * smoothed_gain[i-1] + 0.1 * gate_gain[i]
+        # 平滑增益變化：s[n] = 0.9 * s[n-1] + 0.1 * g[n]
+        if state is not None and state.gate_zi is not None:
+            smoothed_gain, zf = _first_order_iir(0.1, 0.0, -0.9, gate_gain, state.gate_zi)
+        else:
+            # s[0] = g[0]，對應的濾波器狀態為 0.9 * g[0]
+            rest, zf = _first_order_iir(0.1, 0.0, -0.9, gate_gain[1:], 0.9 * gate_gain[0])
+            smoothed_gain = np.concatenate((gate_gain[:1].astype(np.float32), rest))
+        if state is not None:
+            state.gate_zi = zf
         
         gated_samples = np.sum(gate_gain < 0.5)
         if gated_samples > 0:
@@ -536,8 +658,10 @@ class AudioEnhancer(SingletonMixin):
         dc_offset = np.mean(audio)
         
         # 簡易 SNR 估計（使用靜音段估計噪聲）
-        sorted_rms = np.sort(np.abs(audio))
-        noise_floor = np.mean(sorted_rms[:len(sorted_rms)//10])  # 最小 10% 作為噪聲
+        magnitude = np.abs(audio)
+        quietest = len(magnitude) // 10
+        # 只需要最小的 10%，partition 比完整排序快
+        noise_floor = np.mean(np.partition(magnitude, quietest)[:quietest]) if quietest else np.nan
         snr_db = 20 * np.log10((rms + 1e-10) / (noise_floor + 1e-10))
         
         # 檢測削波
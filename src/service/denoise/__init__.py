@@ -9,8 +9,8 @@ from src.service.service_loader import lazy_load_service
 denoiser = lazy_load_service(
     service_path='src.service.denoise.deepfilternet_denoiser',
     class_name='DeepFilterNetDenoiser',
-    instance_name='denoiser',
-    config_path='services.denoise'
+    instance_name='deepfilternet_denoiser',
+    config_path='services.denoiser'
 )
 
 __all__ = ['denoiser']
\ No newline at end of file
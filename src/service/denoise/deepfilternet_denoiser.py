@@ -17,20 +17,20 @@ from threading import Lock
 import warnings
 
 from src.config.manager import ConfigManager
+from src.utils.lazy_import import is_available, lazy_import
 from src.utils.logger import logger
 from src.utils.singleton import SingletonMixin
 
-# 讓 torch 變為可選依賴
-try:
-    import torch
-    HAS_TORCH = True
-except ImportError:
-    HAS_TORCH = False
+# 讓 torch 變為可選依賴，模型初始化時才匯入
+HAS_TORCH = is_available("torch")
+if not HAS_TORCH:
     logger.warning("PyTorch not installed. DeepFilterNet will not be available.")
 
 # 用於類型提示
 if TYPE_CHECKING:
     import torch
+else:
+    torch = lazy_import("torch")
 
 
 class DeepFilterNetDenoiser(SingletonMixin):
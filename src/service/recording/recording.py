@@ -165,11 +165,13 @@ class Recording(SingletonMixin, IRecordingService):
             logger.info(f"已開始為 session {session_id} 錄音，檔案: {filepath}")
             return True
     
-    def stop_recording(self, session_id: str) -> Optional[Dict[str, Any]]:
+    def stop_recording(self, session_id: str, wait: bool = True) -> Optional[Dict[str, Any]]:
         """停止錄音。
         
         Args:
             session_id: Session ID
+            wait: 是否等待錄音執行緒寫完並關閉檔案（並以結束時間重新命名）；
+                  False 時只送出停止信號，由錄音執行緒自行關閉檔案
             
         Returns:
             錄音資訊或 None（如果未在錄音中）
@@ -190,6 +192,21 @@ class Recording(SingletonMixin, IRecordingService):
             # 先取得錄音資訊（避免 UnboundLocalError）
             info = self._recording_info.get(session_id, {})
             
+            if not wait:
+                # 錄音執行緒持有自己的 info 參照，移除登記不影響它寫完並關閉檔案
+                self._recording_threads.pop(session_id, None)
+                self._recording_sessions.discard(session_id)
+                self._recording_info.pop(session_id, None)
+                return {
+                    'session_id': session_id,
+                    'filepath': str(info.get('filepath', '')),
+                    'start_time': info.get('start_time'),
+                    'end_time': datetime.now(),
+                    'chunks_written': info.get('chunks_written', 0),
+                    'bytes_written': info.get('bytes_written', 0),
+                    'metadata': info.get('metadata', {})
+                }
+            
             # 等待執行緒結束（增加超時時間並檢查檔案狀態）
             if session_id in self._recording_threads:
                 thread = self._recording_threads[session_id]
@@ -427,22 +444,17 @@ class Recording(SingletonMixin, IRecordingService):
             chunks_buffer = []
             
             while not stop_event.is_set():
-                # 從佇列取得音訊片段（使用非破壞性讀取）
+                # 從佇列取得所有新音訊片段（非破壞性批次讀取，等待 push 通知）
                 try:
-                    timestamped_audio = audio_queue.pull_blocking_timestamp(
+                    new_audio = audio_queue.pull_available(
                         session_id,
                         reader_id="recording",
                         timeout=self._recording_config.wait_timeout
                     )
                     
-                    if timestamped_audio is not None:
-                        audio_chunk = timestamped_audio.audio
-                    else:
-                        audio_chunk = None
-                    
-                    if audio_chunk is not None:
+                    if new_audio:
                         # 加入緩衝區
-                        chunks_buffer.append(audio_chunk)
+                        chunks_buffer.extend(item.audio for item in new_audio)
                         
                         # 批次寫入檔案
                         if len(chunks_buffer) >= self._recording_config.batch_size:
@@ -497,7 +509,7 @@ class Recording(SingletonMixin, IRecordingService):
         try:
             for chunk in chunks:
                 # 如果需要，將片段轉換為 bytes
-                if hasattr(chunk, 'data'):
+                if hasattr(chunk, 'data') and not isinstance(chunk, np.ndarray):
                     data = chunk.data
                 else:
                     data = chunk
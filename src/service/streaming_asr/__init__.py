@@ -0,0 +1,16 @@
+"""Streaming ASR Service Module - 條件式載入
+
+只在服務啟用時才載入 StreamingASR。
+"""
+
+from src.service.service_loader import lazy_load_service
+
+# 使用延遲載入 - 只在第一次使用時檢查配置並載入
+streaming_asr = lazy_load_service(
+    service_path='src.service.streaming_asr.streaming_asr',
+    class_name='StreamingASR',
+    instance_name='streaming_asr',
+    config_path='services.streaming_asr'
+)
+
+__all__ = ['streaming_asr']
@@ -0,0 +1,110 @@
+"""LocalAgreement 假設緩衝區
+
+串流轉譯會對同一段尚未確認的音訊反覆解碼，每次得到的詞序列可能不同。
+LocalAgreement-2 策略：連續兩次解碼結果的共同前綴才視為確認（committed），
+確認後的文字不再改變；其餘部分為暫定（tentative）文字，只作為即時顯示。
+
+詞以 (開始秒數, 結束秒數, 文字) 表示，時間皆為相對於串流開始的絕對秒數。
+"""
+
+from typing import List, Tuple
+
+
+Word = Tuple[float, float, str]
+
+# 新假設與已確認詞的重疊檢查最多比對的 n-gram 長度
+MAX_OVERLAP_NGRAM = 5
+
+
+def _normalize(text: str) -> str:
+    """比對用的詞正規化（忽略前後空白）"""
+    return text.strip()
+
+
+def words_to_text(words: List[Word]) -> str:
+    """把詞序列接回文字（Whisper 的詞本身已帶有需要的空白）"""
+    return "".join(word for _, _, word in words).strip()
+
+
+def _is_cjk(char: str) -> bool:
+    return (
+        '\u2e80' <= char <= '\u9fff'      # CJK 部首、標點、假名、漢字
+        or '\uac00' <= char <= '\ud7af'   # 韓文
+        or '\uff00' <= char <= '\uffef'   # 全形字元
+    )
+
+
+def join_text(head: str, tail: str) -> str:
+    """接回兩段已去除前後空白的文字（已確認 + 暫定）
+
+    英文等以空白分詞的語言在兩段之間補一個空白，中日韓文字與標點直接相連。
+    """
+    if not head or not tail:
+        return head or tail
+    if _is_cjk(head[-1]) or _is_cjk(tail[0]) or not tail[0].isalnum():
+        return head + tail
+    return f"{head} {tail}"
+
+
+class HypothesisBuffer:
+    """以 LocalAgreement-2 決定確認前綴的假設緩衝區"""
+
+    def __init__(self):
+        self.committed_in_buffer: List[Word] = []  # 已確認且仍在音訊視窗內的詞
+        self.buffer: List[Word] = []               # 上一次解碼的未確認詞
+        self.new: List[Word] = []                  # 本次解碼的未確認詞
+        self.last_committed_time = 0.0
+
+    def insert(self, words: List[Word], offset: float) -> None:
+        """加入新一次解碼的結果
+
+        Args:
+            words: 相對於音訊視窗開頭的詞序列
+            offset: 音訊視窗開頭的絕對秒數
+        """
+        shifted = [(start + offset, end + offset, text) for start, end, text in words]
+        # 已確認時間點之前的詞屬於已確認的音訊，忽略
+        self.new = [word for word in shifted if word[0] > self.last_committed_time - 0.1]
+
+        if not self.new or not self.committed_in_buffer:
+            return
+
+        # 視窗開頭附近的詞可能重複了已確認的尾巴（提示文字或邊界重疊），移除最長的重疊 n-gram
+        if abs(self.new[0][0] - self.last_committed_time) < 1.0:
+            limit = min(len(self.committed_in_buffer), len(self.new), MAX_OVERLAP_NGRAM)
+            for n in range(limit, 0, -1):
+                committed_tail = [_normalize(w[2]) for w in self.committed_in_buffer[-n:]]
+                new_head = [_normalize(w[2]) for w in self.new[:n]]
+                if committed_tail == new_head:
+                    del self.new[:n]
+                    break
+
+    def flush(self) -> List[Word]:
+        """確認本次與上一次解碼的共同前綴
+
+        Returns:
+            本次新確認的詞
+        """
+        committed: List[Word] = []
+        while self.new and self.buffer:
+            word = self.new[0]
+            if _normalize(word[2]) != _normalize(self.buffer[0][2]):
+                break
+            committed.append(word)
+            self.last_committed_time = word[1]
+            self.buffer.pop(0)
+            self.new.pop(0)
+
+        self.buffer = self.new
+        self.new = []
+        self.committed_in_buffer.extend(committed)
+        return committed
+
+    def pop_committed(self, time: float) -> None:
+        """音訊視窗裁切到 time 之後，移除已不在視窗內的已確認詞"""
+        while self.committed_in_buffer and self.committed_in_buffer[0][1] <= time:
+            self.committed_in_buffer.pop(0)
+
+    def complete(self) -> List[Word]:
+        """目前尚未確認的詞（暫定文字）"""
+        return list(self.buffer)
@@ -0,0 +1,431 @@
+"""串流轉譯服務實作
+
+STREAMING 策略下，喚醒後即從 audio_queue 讀取音訊並持續增量解碼，
+不必等到靜音超時才整段轉譯。
+
+- 每個 session 以 BufferManager（fixed 模式）切出 step_ms 的新音訊，每一步觸發一次解碼
+- 解碼範圍為尚未確認的音訊視窗，以 LocalAgreement-2 確認連續兩次解碼的共同前綴
+- 每個 session 同時最多一個解碼；解碼期間到達的音訊併入下一次解碼
+- 未確認音訊超過 buffer_trimming_seconds 時裁切到最後一個確認的詞；一直沒有確認的詞（噪音、音樂、
+  語言不符）時，超過 2 倍仍丟棄最舊的音訊，視窗長度有上限
+- 每次解碼後以 on_partial 回報（已確認文字, 暫定文字）；stop_stream 返回最終結果
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.config.manager import ConfigManager
+from src.core.audio_scheduler import audio_scheduler
+from src.core.buffer_manager import BufferManager
+from src.interface.asr_provider import TranscriptionResult, TranscriptionSegment
+from src.interface.buffer import BufferConfig
+from src.interface.exceptions import ServiceExecutionError
+from src.service.streaming_asr.hypothesis import HypothesisBuffer, Word, words_to_text
+from src.utils.logger import logger
+from src.utils.singleton import SingletonMixin
+
+
+READER_ID = "streaming_asr"
+SAMPLE_RATE = 16000
+MAX_CONSECUTIVE_ERRORS = 10  # 連續解碼失敗達到此次數後暫停增量解碼（stop_stream 仍會嘗試最後一次）
+
+
+class _StreamSession:
+    """單一 session 的串流解碼狀態"""
+
+    def __init__(self, session_id: str, on_partial: Optional[Callable], buffer: BufferManager):
+        self.session_id = session_id
+        self.on_partial = on_partial
+        self.buffer = buffer
+        self.audio = np.empty(0, dtype=np.float32)  # 尚未裁切的音訊視窗
+        self.offset = 0.0                            # 視窗開頭的秒數（相對串流開始）
+        self.hypothesis = HypothesisBuffer()
+        self.committed: List[Word] = []
+        self.lock = threading.Lock()
+        self.decoding: Optional[Future] = None
+        self.dirty = False                           # 上次解碼後是否有新音訊
+        self.active = True
+        self.error_count = 0
+        self.decode_count = 0
+        self.started_at = time.time()
+        self.first_text_at: Optional[float] = None
+        self.last_partial = ("", "")
+
+
+class StreamingASR(SingletonMixin):
+    """串流轉譯服務
+
+    使用範例:
+        def on_partial(session_id, committed, tentative):
+            print(f"{committed}[{tentative}]")
+
+        streaming_asr.start_stream("user_123", on_partial=on_partial)
+        ...
+        result = streaming_asr.stop_stream("user_123")
+        print(result.full_text)
+    """
+
+    def __init__(self):
+        if not hasattr(self, '_initialized'):
+            self._initialized = True
+
+            config = ConfigManager()
+            streaming_config = getattr(config.services, 'streaming_asr', None)
+            self._max_workers = int(getattr(streaming_config, 'max_workers', 4) or 4)
+            self._trimming_seconds = float(getattr(streaming_config, 'buffer_trimming_seconds', 15) or 15)
+            self._prompt_max_chars = int(getattr(streaming_config, 'prompt_max_chars', 200) or 0)
+            self._final_timeout = float(getattr(streaming_config, 'final_timeout', 30.0) or 30.0)
+
+            pool_config = getattr(config, 'provider_pool', None)
+            self._lease_timeout = float(getattr(pool_config, 'lease_timeout', 10.0) or 10.0)
+
+            self._sessions: Dict[str, _StreamSession] = {}
+            self._sessions_lock = threading.Lock()
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="streaming-asr"
+            )
+
+            # 統計
+            self._stats_lock = threading.Lock()
+            self._total_decodes = 0
+            self._total_decode_time = 0.0
+            self._first_text_latencies: List[float] = []
+
+            logger.debug(
+                f"串流轉譯服務已初始化: max_workers={self._max_workers}, "
+                f"buffer_trimming={self._trimming_seconds}s"
+            )
+
+    # ------------------------------------------------------------------ #
+    # 公開介面
+    # ------------------------------------------------------------------ #
+
+    def start_stream(
+        self,
+        session_id: str,
+        on_partial: Optional[Callable[[str, str, str], None]] = None,
+        start_timestamp: Optional[float] = None
+    ) -> bool:
+        """開始串流轉譯
+
+        Args:
+            session_id: Session ID
+            on_partial: 每次解碼後呼叫 (session_id, 已確認文字, 暫定文字)，在解碼執行緒中執行
+            start_timestamp: 從 audio_queue 的指定時間戳開始讀取（例如喚醒前的預錄時間）
+
+        Returns:
+            是否成功開始（已在串流中時返回 True）
+        """
+        if not session_id:
+            raise ServiceExecutionError("Session ID 不能為空")
+
+        with self._sessions_lock:
+            if session_id in self._sessions:
+                logger.warning(f"Session {session_id} 已在串流轉譯中")
+                return True
+            session = _StreamSession(
+                session_id,
+                on_partial,
+                BufferManager(BufferConfig.for_streaming_asr(sample_rate=SAMPLE_RATE))
+            )
+            self._sessions[session_id] = session
+
+        from src.core.audio_queue_manager import audio_queue
+        audio_queue.register_reader(session_id, READER_ID, start_timestamp)
+
+        audio_scheduler.register_source(
+            session_id,
+            READER_ID,
+            lambda items: self._process_audio(session, items),
+            on_stop=lambda: self._finish_source(session)
+        )
+        logger.info(f"開始串流轉譯 session: {session_id}")
+        return True
+
+    def stop_stream(self, session_id: str, finalize: bool = True) -> Optional[TranscriptionResult]:
+        """停止串流轉譯，解碼剩餘音訊並返回最終結果
+
+        Args:
+            session_id: Session ID
+            finalize: False 時直接丟棄（session 刪除或重置），不等待解碼也不返回結果
+
+        Returns:
+            最終轉譯結果（session 不存在或 finalize=False 時返回 None）
+        """
+        with self._sessions_lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                logger.warning(f"Session {session_id} 不在串流轉譯中")
+                return None
+
+        with session.lock:
+            session.active = False
+
+        # 取消排程；on_stop 會把 BufferManager 中不足一步的殘餘音訊併入視窗
+        audio_scheduler.unregister_source(session_id, READER_ID, timeout=1.0)
+
+        if not finalize:
+            with self._sessions_lock:
+                if self._sessions.get(session_id) is session:
+                    del self._sessions[session_id]
+            logger.info(f"丟棄串流轉譯 session: {session_id}")
+            return None
+
+        deadline = time.time() + self._final_timeout
+        while True:
+            with session.lock:
+                future = session.decoding
+            if future is None:
+                break
+            try:
+                future.result(timeout=max(0.0, deadline - time.time()))
+            except FutureTimeoutError:
+                logger.warning(f"等待串流解碼逾時 [{session_id}]")
+                break
+            except Exception:
+                pass  # 錯誤已在解碼中記錄
+            with session.lock:
+                if session.decoding is future:
+                    session.decoding = None
+
+        # 最後一次解碼涵蓋所有音訊，剩餘的暫定文字直接視為確認
+        with session.lock:
+            needs_decode = session.dirty or not session.decode_count
+        if needs_decode and session.audio.size:
+            try:
+                self._decode(session)
+            except Exception as e:
+                logger.error(f"串流最終解碼錯誤 [{session_id}]: {e}")
+
+        with session.lock:
+            words = session.committed + session.hypothesis.complete()
+
+        with self._sessions_lock:
+            if self._sessions.get(session_id) is session:
+                del self._sessions[session_id]
+
+        return self._build_result(session, words)
+
+    def is_streaming(self, session_id: str) -> bool:
+        """檢查 session 是否在串流轉譯中"""
+        with self._sessions_lock:
+            return session_id in self._sessions
+
+    def get_stats(self) -> Dict[str, Any]:
+        """取得串流轉譯統計"""
+        with self._sessions_lock:
+            active = len(self._sessions)
+        with self._stats_lock:
+            latencies = list(self._first_text_latencies)
+            decodes = self._total_decodes
+            decode_time = self._total_decode_time
+        return {
+            "active_sessions": active,
+            "total_decodes": decodes,
+            "avg_decode_time": decode_time / decodes if decodes else 0.0,
+            "avg_time_to_first_text": sum(latencies) / len(latencies) if latencies else None,
+        }
+
+    def shutdown(self) -> None:
+        """停止所有串流並關閉解碼執行緒"""
+        with self._sessions_lock:
+            session_ids = list(self._sessions)
+        for session_id in session_ids:
+            try:
+                self.stop_stream(session_id, finalize=False)
+            except Exception as e:
+                logger.error(f"停止串流轉譯錯誤 [{session_id}]: {e}")
+        self._executor.shutdown(wait=False)
+        logger.info("串流轉譯服務已關閉")
+
+    # ------------------------------------------------------------------ #
+    # 音訊接收（audio_scheduler worker）
+    # ------------------------------------------------------------------ #
+
+    def _process_audio(self, session: _StreamSession, items: list) -> None:
+        """把新音訊推入 BufferManager，每湊滿一步就排程一次解碼"""
+        for timestamped_audio in items:
+            audio_chunk = timestamped_audio.audio
+            if isinstance(audio_chunk, np.ndarray):
+                # audio_queue 回傳 int16 環形緩衝區視圖
+                data_bytes = audio_chunk.astype(np.int16, copy=False).tobytes()
+            elif hasattr(audio_chunk, 'data'):
+                data_bytes = audio_chunk.data
+            else:
+                data_bytes = audio_chunk
+            session.buffer.push(data_bytes)
+
+        steps = session.buffer.pop_all()
+        if steps:
+            self._append_audio(session, b"".join(steps))
+            self._schedule_decode(session)
+
+    def _finish_source(self, session: _StreamSession) -> None:
+        """取消排程後的收尾：殘餘音訊併入視窗，由 stop_stream 的最後一次解碼處理"""
+        tail = session.buffer.flush()
+        if tail:
+            self._append_audio(session, tail)
+
+    def _append_audio(self, session: _StreamSession, data: bytes) -> None:
+        samples = np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768.0
+        with session.lock:
+            session.audio = np.concatenate((session.audio, samples))
+            session.dirty = True
+
+    # ------------------------------------------------------------------ #
+    # 增量解碼
+    # ------------------------------------------------------------------ #
+
+    def _schedule_decode(self, session: _StreamSession) -> None:
+        """排程解碼（已有解碼進行中時，新音訊會在該次結束後併入下一次）"""
+        with session.lock:
+            if not session.active or session.decoding is not None or not session.dirty:
+                return
+            if session.error_count >= MAX_CONSECUTIVE_ERRORS:
+                return
+            session.decoding = self._executor.submit(self._run_decode, session)
+
+    def _run_decode(self, session: _StreamSession) -> None:
+        """解碼執行緒：解碼一次，期間有新音訊時接著排程下一次"""
+        try:
+            self._decode(session)
+            session.error_count = 0
+        except Exception as e:
+            session.error_count += 1
+            logger.error(f"串流解碼錯誤 [{session.session_id}] ({session.error_count}): {e}")
+            if session.error_count >= MAX_CONSECUTIVE_ERRORS:
+                logger.error(f"連續錯誤次數達到上限 [{session.session_id}]，暫停增量解碼")
+        finally:
+            with session.lock:
+                session.decoding = None
+        self._schedule_decode(session)
+
+    def _decode(self, session: _StreamSession) -> None:
+        """對目前的未確認音訊視窗解碼一次並更新假設"""
+        with session.lock:
+            audio = session.audio
+            offset = session.offset
+            prompt = self._build_prompt(session)
+            session.dirty = False
+        if audio.size == 0:
+            return
+
+        start = time.time()
+        words = self._transcribe_words(session.session_id, audio, prompt)
+        elapsed = time.time() - start
+
+        with session.lock:
+            session.hypothesis.insert(words, offset)
+            session.committed.extend(session.hypothesis.flush())
+            self._trim(session)
+            session.decode_count += 1
+            committed_text = words_to_text(session.committed)
+            tentative_text = words_to_text(session.hypothesis.complete())
+            changed = (committed_text, tentative_text) != session.last_partial
+            session.last_partial = (committed_text, tentative_text)
+            first_text = session.first_text_at is None and bool(committed_text or tentative_text)
+            if first_text:
+                session.first_text_at = time.time()
+
+        with self._stats_lock:
+            self._total_decodes += 1
+            self._total_decode_time += elapsed
+            if first_text:
+                latency = session.first_text_at - session.started_at
+                self._first_text_latencies.append(latency)
+                del self._first_text_latencies[:-100]
+                logger.info(f"⚡ 串流首段文字 [{session.session_id}]: {latency * 1000:.0f}ms")
+
+        logger.debug(
+            f"串流解碼 [{session.session_id}]: window={audio.size / SAMPLE_RATE:.2f}s, "
+            f"{elapsed * 1000:.0f}ms, committed={len(session.committed)}"
+        )
+
+        if changed and session.on_partial and session.active:
+            try:
+                session.on_partial(session.session_id, committed_text, tentative_text)
+            except Exception as e:
+                logger.error(f"串流 partial 回調錯誤 [{session.session_id}]: {e}")
+
+    def _transcribe_words(self, session_id: str, audio: np.ndarray, prompt: Optional[str]) -> List[Word]:
+        """租用 provider 執行詞級轉譯"""
+        from src.provider.provider_manager import get_provider_manager
+
+        pool = get_provider_manager()
+        with pool.lease_context(session_id, timeout=self._lease_timeout) as (provider, error):
+            if not provider:
+                raise ServiceExecutionError(f"無法租用 ASR provider: {error}")
+            if not hasattr(provider, 'transcribe_words'):
+                raise ServiceExecutionError(f"{type(provider).__name__} 不支援詞級時間戳轉譯")
+            try:
+                words = provider.transcribe_words(audio, initial_prompt=prompt)
+                pool.mark_success(provider)
+                return words
+            except Exception as e:
+                pool.mark_failure(provider, str(e))
+                raise
+
+    def _build_prompt(self, session: _StreamSession) -> Optional[str]:
+        """以已裁切出視窗的確認文字尾端作為提示（呼叫端持有 session.lock）"""
+        if not self._prompt_max_chars:
+            return None
+        outside = len(session.committed) - len(session.hypothesis.committed_in_buffer)
+        prompt = words_to_text(session.committed[:outside])[-self._prompt_max_chars:]
+        return prompt or None
+
+    def _trim(self, session: _StreamSession) -> None:
+        """視窗過長時裁切到最後一個確認的詞（呼叫端持有 session.lock）"""
+        if session.audio.size / SAMPLE_RATE <= self._trimming_seconds:
+            return
+        if session.committed:
+            cut_time = session.committed[-1][1]
+            cut = int((cut_time - session.offset) * SAMPLE_RATE)
+            if cut > 0:
+                self._cut(session, cut)
+
+        # 硬上限：沒有可裁切的確認詞時丟棄最舊的音訊，只保留 buffer_trimming_seconds
+        if session.audio.size / SAMPLE_RATE > 2 * self._trimming_seconds:
+            self._cut(session, session.audio.size - int(self._trimming_seconds * SAMPLE_RATE))
+
+    @staticmethod
+    def _cut(session: _StreamSession, samples: int) -> None:
+        """丟棄視窗開頭的 samples 個樣本（呼叫端持有 session.lock）"""
+        cut_time = session.offset + samples / SAMPLE_RATE
+        session.audio = session.audio[samples:]
+        session.offset = cut_time
+        session.hypothesis.pop_committed(cut_time)
+
+    def _build_result(self, session: _StreamSession, words: List[Word]) -> TranscriptionResult:
+        text = words_to_text(words)
+        segments = []
+        if words:
+            segments.append(TranscriptionSegment(
+                text=text,
+                start_time=words[0][0],
+                end_time=words[-1][1]
+            ))
+        duration = session.offset + session.audio.size / SAMPLE_RATE
+        time_to_first_text = (
+            session.first_text_at - session.started_at if session.first_text_at else None
+        )
+        return TranscriptionResult(
+            session_id=session.session_id,
+            segments=segments,
+            full_text=text,
+            duration=duration,
+            processing_time=time.time() - session.started_at,
+            metadata={
+                "streaming": True,
+                "decodes": session.decode_count,
+                "time_to_first_text": time_to_first_text,
+            }
+        )
+
+
+# 模組級單例實例
+streaming_asr: StreamingASR = StreamingASR()
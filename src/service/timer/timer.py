@@ -13,6 +13,7 @@ from src.config.manager import ConfigManager
 from src.utils.logger import logger
 from src.utils.singleton import SingletonMixin
 from src.interface.timer import TimerInfo, TimerStatus
+from src.service.timer.timing_wheel import get_timing_wheel
 from src.interface.exceptions import (
     TimerError,
     TimerSessionError,
@@ -125,27 +126,19 @@ class Timer(SingletonMixin):
                 logger.warning(f"Session {session_id} 已有計時器")
                 return True
 
-        # 建立計時器執行緒
-        timer_thread = threading.Timer(
-            countdown_duration,
-            self._on_countdown_complete,
-            args=(session_id, callback)
-        )
-        timer_thread.daemon = True
-        
-        # 註冊 session
+        # 註冊 session 並放入共用時間輪（不建立執行緒）
         with self._session_lock:
             self._sessions[session_id] = {
                 "active": True,
-                "thread": timer_thread,
+                "handle": get_timing_wheel().schedule(
+                    countdown_duration, self._on_countdown_complete, session_id, callback
+                ),
                 "callback": callback,
                 "duration": countdown_duration,
                 "remaining": countdown_duration,
                 "started_at": time.time()
             }
         
-        # 啟動計時器
-        timer_thread.start()
         logger.info(f"開始倒數 [{session_id}]: {countdown_duration} 秒")
         
         return True
@@ -204,29 +197,21 @@ class Timer(SingletonMixin):
             session_data = self._sessions[session_id]
             
             # 停止現有計時器
-            if session_data["active"] and session_data["thread"]:
-                session_data["thread"].cancel()
+            if session_data["active"] and session_data["handle"]:
+                session_data["handle"].cancel()
             
             # 決定新的倒數時間
             new_duration = duration if duration is not None else session_data["duration"]
             
-            # 建立新的計時器
-            timer_thread = threading.Timer(
-                new_duration,
-                self._on_countdown_complete,
-                args=(session_id, session_data["callback"])
-            )
-            timer_thread.daemon = True
-            
-            # 更新 session 資料
+            # 更新 session 資料並重新放入時間輪
             session_data["active"] = True
-            session_data["thread"] = timer_thread
+            session_data["handle"] = get_timing_wheel().schedule(
+                new_duration, self._on_countdown_complete, session_id, session_data["callback"]
+            )
             session_data["duration"] = new_duration
             session_data["remaining"] = new_duration
             session_data["started_at"] = time.time()
         
-        # 啟動新計時器
-        timer_thread.start()
         logger.info(f"重置倒數 [{session_id}]: {new_duration} 秒")
         
         return True
@@ -266,9 +251,9 @@ class Timer(SingletonMixin):
         
         session_data = self._sessions[session_id]
         
-        # 取消計時器執行緒
-        if session_data["active"] and session_data["thread"]:
-            session_data["thread"].cancel()
+        # 從時間輪取消計時器
+        if session_data["active"] and session_data["handle"]:
+            session_data["handle"].cancel()
             session_data["active"] = False
             
             # 計算剩餘時間
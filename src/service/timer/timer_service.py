@@ -2,22 +2,26 @@
 Timer Service for managing countdown timers
 
 管理靜音超時倒數計時器的無狀態服務。
+所有倒數共用一個時間輪排程執行緒（見 timing_wheel.py），開始、重置與停止都是 O(1)，
+不會為每個倒數建立執行緒。
 """
 
 import threading
-from typing import Dict, Optional, Callable
+from typing import Any, Dict, Optional, Callable
 from dataclasses import dataclass
 from src.utils.logger import logger
 from src.config.manager import ConfigManager
+from src.service.timer.timing_wheel import TimerHandle, get_timing_wheel
 
 
 @dataclass
 class TimerState:
     """計時器狀態"""
-    timer: Optional[threading.Timer]
+    timer: Optional[TimerHandle]
     duration: float
     callback: Optional[Callable]
     is_active: bool = False
+    remaining: float = 0.0      # 暫停或到期時的剩餘秒數
 
 
 class TimerService:
@@ -49,6 +53,8 @@ class TimerService:
             
             # 初始化計時器存儲
             self._timers: Dict[str, TimerState] = {}
+            self._lock = threading.RLock()
+            self._wheel = get_timing_wheel()
             
             # 載入配置參數（不使用 getattr，直接從 yaml 獲取）
             self._max_timers_per_session = self.timer_config.max_timers_per_session
@@ -81,39 +87,45 @@ class TimerService:
             logger.debug("Timer 服務未啟用，跳過倒數計時")
             return False
         
-        # 檢查計時器數量限制
-        if len(self._timers) >= self._max_total_timers:
-            logger.warning(f"計時器數量已達上限 {self._max_total_timers}")
-            return False
-        
         # 檢查持續時間範圍
         if duration < self._min_duration or duration > self._max_duration:
             logger.warning(f"計時器持續時間 {duration} 超出範圍 [{self._min_duration}, {self._max_duration}]")
             return False
         
-        # 先停止舊的計時器
-        self.stop_timer(session_id)
-        
-        def timeout_handler():
-            """超時處理"""
-            if session_id in self._timers:
-                self._timers[session_id].is_active = False
-            callback(session_id)
-            logger.debug(f"Timer expired for session {session_id}")
-        
-        # 創建新計時器
-        timer = threading.Timer(duration, timeout_handler)
-        self._timers[session_id] = TimerState(
-            timer=timer,
-            duration=duration,
-            callback=callback,
-            is_active=True
-        )
-        
-        timer.start()
+        with self._lock:
+            # 先停止舊的計時器
+            self.stop_timer(session_id)
+            
+            # 檢查計時器數量限制
+            if len(self._timers) >= self._max_total_timers:
+                logger.warning(f"計時器數量已達上限 {self._max_total_timers}")
+                return False
+            
+            state = TimerState(
+                timer=None,
+                duration=duration,
+                callback=callback,
+                is_active=True
+            )
+            self._timers[session_id] = state
+            
+            # 放入時間輪（O(1)，不建立執行緒）
+            state.timer = self._wheel.schedule(duration, self._on_timeout, session_id, state)
+        
         logger.debug(f"Started {duration}s countdown for session {session_id}")
         return True
     
+    def _on_timeout(self, session_id: str, state: TimerState):
+        """超時處理（在時間輪的 callback 執行緒中執行）"""
+        with self._lock:
+            # 計時器已被停止或重新開始
+            if self._timers.get(session_id) is not state or not state.is_active:
+                return
+            state.is_active = False
+            state.remaining = 0.0
+        state.callback(session_id)
+        logger.debug(f"Timer expired for session {session_id}")
+    
     def reset_timer(self, session_id: str) -> bool:
         """重置計時器（重新開始倒數）
         
@@ -127,25 +139,22 @@ class TimerService:
         if not self.timer_config.enabled:
             return False
         
-        if session_id not in self._timers:
-            logger.warning(f"No timer found for session {session_id}")
-            return False
-        
-        timer_state = self._timers[session_id]
-        if not timer_state.is_active:
-            logger.warning(f"Timer for session {session_id} is not active")
-            return False
-        
-        # 停止舊計時器
-        if timer_state.timer:
-            timer_state.timer.cancel()
-        
-        # 啟動新計時器
-        return self.start_countdown(
-            session_id, 
-            timer_state.duration, 
-            timer_state.callback
-        )
+        with self._lock:
+            if session_id not in self._timers:
+                logger.warning(f"No timer found for session {session_id}")
+                return False
+            
+            timer_state = self._timers[session_id]
+            if not timer_state.is_active:
+                logger.warning(f"Timer for session {session_id} is not active")
+                return False
+            
+            # 停止舊計時器並啟動新計時器
+            return self.start_countdown(
+                session_id, 
+                timer_state.duration, 
+                timer_state.callback
+            )
     
     def pause_timer(self, session_id: str) -> bool:
         """暫停計時器
@@ -160,16 +169,18 @@ class TimerService:
         if not self.timer_config.enabled:
             return False
         
-        if session_id not in self._timers:
+        with self._lock:
+            if session_id not in self._timers:
+                return False
+            
+            timer_state = self._timers[session_id]
+            if timer_state.timer and timer_state.is_active:
+                timer_state.remaining = timer_state.timer.remaining()
+                timer_state.timer.cancel()
+                timer_state.is_active = False
+                logger.debug(f"Paused timer for session {session_id}")
+                return True
             return False
-        
-        timer_state = self._timers[session_id]
-        if timer_state.timer and timer_state.is_active:
-            timer_state.timer.cancel()
-            timer_state.is_active = False
-            logger.debug(f"Paused timer for session {session_id}")
-            return True
-        return False
     
     def resume_timer(self, session_id: str) -> bool:
         """恢復計時器
@@ -184,17 +195,21 @@ class TimerService:
         if not self.timer_config.enabled:
             return False
         
-        if session_id not in self._timers:
+        with self._lock:
+            if session_id not in self._timers:
+                return False
+            
+            timer_state = self._timers[session_id]
+            if not timer_state.is_active and timer_state.callback:
+                # 從暫停當下的剩餘秒數繼續倒數；duration 保留給 reset_timer
+                remaining = timer_state.remaining if timer_state.remaining > 0 else timer_state.duration
+                timer_state.is_active = True
+                timer_state.timer = self._wheel.schedule(
+                    remaining, self._on_timeout, session_id, timer_state
+                )
+                logger.debug(f"Resumed timer for session {session_id} ({remaining:.2f}s left)")
+                return True
             return False
-        
-        timer_state = self._timers[session_id]
-        if not timer_state.is_active and timer_state.callback:
-            return self.start_countdown(
-                session_id,
-                timer_state.duration,
-                timer_state.callback
-            )
-        return False
     
     def stop_timer(self, session_id: str) -> bool:
         """停止並移除計時器
@@ -209,14 +224,15 @@ class TimerService:
         if not self.timer_config.enabled:
             return False
         
-        if session_id not in self._timers:
-            return False
-        
-        timer_state = self._timers[session_id]
-        if timer_state.timer:
-            timer_state.timer.cancel()
+        with self._lock:
+            timer_state = self._timers.pop(session_id, None)
+            if timer_state is None:
+                return False
+            
+            timer_state.is_active = False
+            if timer_state.timer:
+                timer_state.timer.cancel()
         
-        del self._timers[session_id]
         logger.debug(f"Stopped timer for session {session_id}")
         return True
     
@@ -233,9 +249,41 @@ class TimerService:
         if not self.timer_config.enabled:
             return False
         
-        if session_id not in self._timers:
-            return False
-        return self._timers[session_id].is_active
+        timer_state = self._timers.get(session_id)
+        return timer_state is not None and timer_state.is_active
+    
+    def get_remaining_time(self, session_id: str) -> Optional[float]:
+        """取得剩餘時間
+        
+        Args:
+            session_id: Session ID
+            
+        Returns:
+            剩餘秒數（暫停時為暫停當下的剩餘秒數，到期為 0），沒有計時器返回 None
+        """
+        # 檢查服務是否啟用
+        if not self.timer_config.enabled:
+            return None
+        
+        with self._lock:
+            timer_state = self._timers.get(session_id)
+            if timer_state is None:
+                return None
+            if timer_state.is_active and timer_state.timer:
+                return timer_state.timer.remaining()
+            return timer_state.remaining
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """計時器數量與時間輪統計"""
+        with self._lock:
+            active = sum(1 for state in self._timers.values() if state.is_active)
+            total = len(self._timers)
+        return {
+            "timers": total,
+            "active": active,
+            "max_total_timers": self._max_total_timers,
+            "wheel": self._wheel.get_stats(),
+        }
     
     def cleanup(self):
         """清理所有計時器"""
@@ -243,7 +291,9 @@ class TimerService:
         if not self.timer_config.enabled:
             return
         
-        for session_id in list(self._timers.keys()):
+        with self._lock:
+            session_ids = list(self._timers.keys())
+        for session_id in session_ids:
             self.stop_timer(session_id)
         logger.info("All timers cleaned up")
 
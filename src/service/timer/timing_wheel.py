@@ -0,0 +1,328 @@
+"""階層式時間輪（Hierarchical Timing Wheel）
+
+所有倒數計時共用一個排程執行緒，取代每個倒數各自建立一個 threading.Timer（OS 執行緒）。
+VAD 在語音與靜音之間切換時會不斷停止、重新開始靜音計時器，數百個 session 同時切換時
+不再持續建立與結束執行緒。
+
+結構：
+- 每一層有 slots 個槽，第 0 層每個槽代表一個 tick（services.timer.precision 秒），
+  第 n 層每個槽代表 slots^n 個 tick；預設 256 槽 × 3 層、tick 0.01 秒可涵蓋約 46 小時
+- 排程（schedule）與取消（cancel）都是 O(1)：依到期 tick 與目前 tick 的差距放入對應層的槽
+- 排程執行緒每經過一個 tick 處理第 0 層的一個槽；第 0 層轉完一圈時把上一層的槽「降級」
+  重新放入較低的層
+- 排程執行緒只睡到下一個有計時器的 tick（沒有計時器時不喚醒）
+- 到期的 callback 交給有界的執行緒池執行，callback 變慢不會延遲其他計時器
+
+使用範例：
+    from src.service.timer.timing_wheel import get_timing_wheel
+
+    handle = get_timing_wheel().schedule(1.2, on_timeout, session_id)
+    handle.cancel()
+"""
+
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from src.utils.logger import logger
+from src.config.manager import ConfigManager
+
+
+# TimerHandle 狀態
+_PENDING = 0        # 在時間輪中等待
+_FIRED = 1          # 已到期，callback 已交給執行緒池
+_CANCELLED = 2      # 已取消
+
+
+class TimerHandle:
+    """一個排程中的計時器"""
+
+    __slots__ = ('deadline', 'callback', 'args', 'expire_tick', '_state', '_slot', '_wheel', '__weakref__')
+
+    def __init__(self, wheel: "TimingWheel", deadline: float, callback: Callable, args: Tuple[Any, ...]):
+        self.deadline = deadline            # time.monotonic() 的到期時間
+        self.callback = callback
+        self.args = args
+        self.expire_tick = 0
+        self._state = _PENDING
+        self._slot: Optional[Set["TimerHandle"]] = None
+        self._wheel = wheel
+
+    def cancel(self) -> bool:
+        """取消計時器
+
+        Returns:
+            True 表示 callback 不會被執行（包含已到期但尚未開始執行的情況）
+        """
+        return self._wheel.cancel(self)
+
+    def remaining(self) -> float:
+        """剩餘秒數（已到期或已取消為 0）"""
+        if self._state != _PENDING:
+            return 0.0
+        return max(0.0, self.deadline - time.monotonic())
+
+    @property
+    def active(self) -> bool:
+        return self._state == _PENDING
+
+    def _fire(self) -> None:
+        # 到期後、執行前被取消時不執行
+        if self._state == _CANCELLED:
+            return
+        try:
+            self.callback(*self.args)
+        except Exception as e:
+            logger.error(f"計時器 callback 執行錯誤: {e}")
+
+
+class TimingWheel:
+    """階層式時間輪
+
+    Args:
+        tick: 每個 tick 的秒數（計時精度）
+        slots: 每一層的槽數
+        levels: 層數
+        callback_workers: 執行到期 callback 的執行緒數
+        name: 排程執行緒名稱
+    """
+
+    def __init__(
+        self,
+        tick: float = 0.01,
+        slots: int = 256,
+        levels: int = 3,
+        callback_workers: int = 4,
+        name: str = "timing-wheel",
+    ):
+        self.tick = max(0.001, float(tick))
+        self.slots = max(2, int(slots))
+        self.levels = max(1, int(levels))
+        self.callback_workers = max(1, int(callback_workers))
+        self.name = name
+
+        self._wheels: List[List[Set[TimerHandle]]] = [
+            [set() for _ in range(self.slots)] for _ in range(self.levels)
+        ]
+        self._origin = time.monotonic()
+        self._current_tick = 0          # 已處理到的 tick
+        self._wake_tick: Optional[int] = None   # 排程執行緒預計醒來的 tick（None 表示無限期等待）
+        self._count = 0
+
+        self._cond = threading.Condition(threading.Lock())
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._running = False
+
+        # 統計
+        self._scheduled = 0
+        self._cancelled = 0
+        self._fired = 0
+        self._late_total = 0.0
+        self._late_max = 0.0
+
+    # === 排程 ===
+
+    def schedule(self, delay: float, callback: Callable, *args: Any) -> TimerHandle:
+        """delay 秒後以 callback(*args) 呼叫（在 callback 執行緒池中執行）"""
+        deadline = time.monotonic() + max(0.0, delay)
+        handle = TimerHandle(self, deadline, callback, args)
+        with self._cond:
+            self._ensure_started()
+            if self._count == 0:
+                # 閒置時排程執行緒不會推進 _current_tick；先跳到目前的 tick，
+                # 否則排程執行緒會在持有鎖的情況下逐一處理閒置期間的每個 tick
+                self._current_tick = max(self._current_tick, self._now_tick())
+            handle.expire_tick = math.ceil((deadline - self._origin) / self.tick)
+            self._insert(handle, self._current_tick + 1)
+            self._count += 1
+            self._scheduled += 1
+            # 比排程執行緒預計醒來的時間更早到期時喚醒它
+            if self._wake_tick is None or handle.expire_tick < self._wake_tick:
+                self._cond.notify()
+        return handle
+
+    def cancel(self, handle: TimerHandle) -> bool:
+        """取消計時器（O(1)）"""
+        with self._cond:
+            if handle._state == _CANCELLED:
+                return False
+            if handle._state == _PENDING:
+                handle._slot.discard(handle)
+                handle._slot = None
+                self._count -= 1
+            handle._state = _CANCELLED
+            self._cancelled += 1
+            return True
+
+    def __len__(self) -> int:
+        with self._cond:
+            return self._count
+
+    # === 統計 ===
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "pending": self._count,
+                "scheduled": self._scheduled,
+                "cancelled": self._cancelled,
+                "fired": self._fired,
+                "avg_late_ms": self._late_total / self._fired * 1000 if self._fired else 0.0,
+                "max_late_ms": self._late_max * 1000,
+                "tick_ms": self.tick * 1000,
+                "callback_workers": self.callback_workers,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """停止排程執行緒並取消所有計時器"""
+        with self._cond:
+            self._running = False
+            for wheel in self._wheels:
+                for slot in wheel:
+                    for handle in slot:
+                        handle._state = _CANCELLED
+                        handle._slot = None
+                    slot.clear()
+            self._count = 0
+            self._cond.notify_all()
+            thread, self._thread = self._thread, None
+            executor, self._executor = self._executor, None
+        if thread and wait and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+        if executor:
+            executor.shutdown(wait=wait)
+
+    # === 內部實作 ===
+
+    def _ensure_started(self) -> None:
+        """第一次排程時啟動排程執行緒（需持有鎖）"""
+        if self._running:
+            return
+        self._running = True
+        self._origin = time.monotonic()
+        self._current_tick = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.callback_workers, thread_name_prefix=f"{self.name}-cb"
+        )
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def _now_tick(self) -> int:
+        return int((time.monotonic() - self._origin) / self.tick)
+
+    def _insert(self, handle: TimerHandle, min_tick: int) -> None:
+        """依到期 tick 放入對應層的槽（需持有鎖）
+
+        min_tick 之前的 tick 已經處理過，已到期的計時器放在 min_tick 的槽。
+        """
+        expire_tick = max(handle.expire_tick, min_tick)
+        delta = expire_tick - self._current_tick
+        span = self.slots
+        level = 0
+        while delta >= span and level < self.levels - 1:
+            span *= self.slots
+            level += 1
+        if level == self.levels - 1:
+            # 超過時間輪範圍：先放在最上層最遠的槽，降級時重新計算
+            expire_tick = min(expire_tick, self._current_tick + span - 1)
+        index = (expire_tick // (self.slots ** level)) % self.slots
+        slot = self._wheels[level][index]
+        slot.add(handle)
+        handle._slot = slot
+
+    def _advance(self, target_tick: int) -> List[TimerHandle]:
+        """處理到 target_tick 為止的所有 tick，返回到期的計時器（需持有鎖）"""
+        due: List[TimerHandle] = []
+        while self._current_tick < target_tick:
+            if self._count == 0:
+                # 沒有計時器時直接跳到目前的 tick
+                self._current_tick = target_tick
+                break
+            tick = self._current_tick + 1
+            self._current_tick = tick
+
+            # 由上往下降級：第 n 層的槽在 tick 是 slots^n 的倍數時展開
+            for level in range(self.levels - 1, 0, -1):
+                span = self.slots ** level
+                if tick % span == 0:
+                    slot = self._wheels[level][(tick // span) % self.slots]
+                    if slot:
+                        handles = list(slot)
+                        slot.clear()
+                        for handle in handles:
+                            self._insert(handle, tick)
+
+            slot = self._wheels[0][tick % self.slots]
+            if slot:
+                for handle in slot:
+                    handle._state = _FIRED
+                    handle._slot = None
+                due.extend(slot)
+                self._count -= len(slot)
+                slot.clear()
+        return due
+
+    def _next_wake_tick(self) -> Optional[int]:
+        """下一個需要處理的 tick：第 0 層下一個非空的槽或下一次降級（需持有鎖）"""
+        if self._count == 0:
+            return None
+        boundary = (self._current_tick // self.slots + 1) * self.slots
+        for tick in range(self._current_tick + 1, boundary):
+            if self._wheels[0][tick % self.slots]:
+                return tick
+        return boundary
+
+    def _run(self) -> None:
+        logger.debug(f"TimingWheel 排程執行緒啟動 (tick={self.tick * 1000:.0f}ms, slots={self.slots}, levels={self.levels})")
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                due = self._advance(self._now_tick())
+                if not due:
+                    self._wake_tick = self._next_wake_tick()
+                    if self._wake_tick is None:
+                        self._cond.wait()
+                    else:
+                        timeout = self._origin + self._wake_tick * self.tick - time.monotonic()
+                        if timeout > 0:
+                            self._cond.wait(timeout)
+                    self._wake_tick = None
+                    continue
+                executor = self._executor
+                now = time.monotonic()
+                for handle in due:
+                    late = max(0.0, now - handle.deadline)
+                    self._late_total += late
+                    self._late_max = max(self._late_max, late)
+                self._fired += len(due)
+
+            for handle in due:
+                try:
+                    executor.submit(handle._fire)
+                except RuntimeError:
+                    # 執行緒池已關閉
+                    return
+
+
+# 共用時間輪（TimerService 與 Timer 使用）
+_timing_wheel: Optional[TimingWheel] = None
+_timing_wheel_lock = threading.Lock()
+
+
+def get_timing_wheel() -> TimingWheel:
+    """獲取共用時間輪單例（執行緒安全，依 services.timer 配置建立）"""
+    global _timing_wheel
+    if _timing_wheel is None:
+        with _timing_wheel_lock:
+            if _timing_wheel is None:
+                timer_config = getattr(ConfigManager().services, 'timer', None)
+                _timing_wheel = TimingWheel(
+                    tick=float(getattr(timer_config, 'precision', 0.01) or 0.01),
+                    slots=int(getattr(timer_config, 'wheel_slots', 256) or 256),
+                    callback_workers=int(getattr(timer_config, 'callback_workers', 4) or 4),
+                )
+    return _timing_wheel
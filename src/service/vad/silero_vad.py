@@ -10,7 +10,6 @@ import threading
 from typing import Optional, Dict, Any, Callable
 from pathlib import Path
 import numpy as np
-import onnxruntime as ort
 
 from src.interface.vad import IVADService, VADConfig, VADState, VADResult
 from src.utils.logger import logger
@@ -24,7 +23,14 @@ from src.interface.exceptions import (
 )
 from src.config.manager import ConfigManager
 from src.core.buffer_manager import BufferManager
+from src.core.audio_scheduler import audio_scheduler
+from src.core.frame_batcher import FrameBatcher
+from src.core.metrics import Stage, metrics
 from src.interface.buffer import BufferConfig
+from src.utils.lazy_import import lazy_import
+
+# onnxruntime 在第一次載入模型時才匯入
+ort = lazy_import("onnxruntime")
 
 # Get configuration from ConfigManager
 config_manager = ConfigManager()
@@ -36,7 +42,7 @@ class SileroVAD(SingletonMixin, IVADService):
     核心功能：
     - 載入 ONNX 模型進行推論
     - 處理音訊判斷是否為語音
-    - 為每個 session 提供獨立的監聽執行緒
+    - 透過共用的 audio_scheduler 處理各 session 的音訊（不再每個 session 一個執行緒）
     - Session-based callback 機制
     """
     
@@ -57,15 +63,21 @@ class SileroVAD(SingletonMixin, IVADService):
             # BufferManager 管理（每個 session 一個）
             self._buffer_managers: Dict[str, BufferManager] = {}
             
-            # 停止旗標（每個 session 一個）
-            self._stop_flags: Dict[str, bool] = {}
-            
             # 回調函數管理（每個 session 的回調）
             self._callbacks: Dict[str, Dict[str, Callable]] = {}
             
             # LSTM 隱藏狀態管理（每個 session 一組）
             self._hidden_states: Dict[str, tuple] = {}
             
+            # 模型輸入簽名（載入模型時快取，避免每次推論重新查詢 get_inputs）
+            self._audio_input: Optional[str] = None
+            self._sr_input: Optional[str] = None
+            self._state_inputs: list = []  # [(name, hidden_size)]
+            self._sr_array = np.array([16000], dtype=np.int64)
+            
+            # 跨 session 批次推論（監聽模式使用）
+            self._batcher: Optional[FrameBatcher] = None
+            
             # logger.debug("SileroVAD 初始化")
             
             # 服務已經通過 service_loader 檢查了 enabled
@@ -100,7 +112,11 @@ class SileroVAD(SingletonMixin, IVADService):
                         sample_rate=cfg.sample_rate,
                         chunk_size=cfg.chunk_size,
                         use_gpu=cfg.use_gpu,
-                        model_path=cfg.model_path
+                        model_path=cfg.model_path,
+                        # 批次推論設定（舊的 config.yaml 可能沒有，使用預設值）
+                        batch_enabled=getattr(cfg, 'batch_enabled', True),
+                        max_batch_size=getattr(cfg, 'max_batch_size', 32),
+                        max_batch_latency=getattr(cfg, 'max_batch_latency', 0.01)
                     )
             return None  # 不返回預設配置
         except Exception as e:
@@ -142,6 +158,7 @@ class SileroVAD(SingletonMixin, IVADService):
                 str(model_path),
                 providers=providers
             )
+            self._cache_model_signature()
             
             logger.debug(f"VAD 模型載入: {model_path}")
             
@@ -171,6 +188,34 @@ class SileroVAD(SingletonMixin, IVADService):
             logger.error(f"模型下載失敗: {e}")
             raise VADModelError(f"無法下載 Silero VAD 模型: {e}") from e
     
+    def _cache_model_signature(self):
+        """快取模型的輸入名稱與隱藏狀態大小
+        
+        支援的輸入格式：
+        - input, sr, h, c（LSTM 隱藏狀態分開）
+        - input, state, sr（單一狀態張量）
+        - input, sr（無狀態的舊版模型）
+        """
+        inputs = self._model.get_inputs()
+        names = [inp.name for inp in inputs]
+        
+        self._audio_input = names[0]
+        if 'sr' in names:
+            self._sr_input = 'sr'
+        elif len(names) == 2:
+            self._sr_input = names[1]
+        else:
+            self._sr_input = None
+        
+        # 其餘輸入視為隱藏狀態，形狀為 (2, batch, hidden_size)
+        self._state_inputs = []
+        for inp in inputs:
+            if inp.name in (self._audio_input, self._sr_input):
+                continue
+            shape = inp.shape or []
+            hidden_size = shape[-1] if shape and isinstance(shape[-1], int) else 64
+            self._state_inputs.append((inp.name, hidden_size))
+    
     def _get_hidden_states(self, session_id: str) -> tuple:
         """取得或初始化 session 的 LSTM 隱藏狀態
         
@@ -178,18 +223,71 @@ class SileroVAD(SingletonMixin, IVADService):
             session_id: Session ID
             
         Returns:
-            (h, c) 隱藏狀態元組
+            隱藏狀態元組（依模型輸入順序，例如 (h, c)）
         """
         if session_id not in self._hidden_states:
-            # 初始化隱藏狀態為零
-            # Silero VAD 使用 64 維的隱藏狀態
-            batch_size = 1
-            hidden_size = 64
-            h = np.zeros((2, batch_size, hidden_size), dtype=np.float32)
-            c = np.zeros((2, batch_size, hidden_size), dtype=np.float32)
-            self._hidden_states[session_id] = (h, c)
+            # 初始化隱藏狀態為零（batch_size = 1）
+            self._hidden_states[session_id] = tuple(
+                np.zeros((2, 1, hidden_size), dtype=np.float32)
+                for _, hidden_size in self._state_inputs
+            )
         return self._hidden_states[session_id]
     
+    def _prepare_audio(self, audio_data: np.ndarray) -> np.ndarray:
+        """驗證並轉換音訊為 [-1, 1] 的 float32
+        
+        Raises:
+            VADAudioError: 音訊格式錯誤
+        """
+        if not isinstance(audio_data, np.ndarray):
+            raise VADAudioError(f"音訊資料型別錯誤: {type(audio_data)}")
+        
+        if audio_data.size == 0:
+            raise VADAudioError("音訊資料為空")
+        
+        try:
+            if audio_data.dtype != np.float32:
+                audio_data = audio_data.astype(np.float32)
+            
+            # 正規化到 [-1, 1]
+            if np.abs(audio_data).max() > 1.0:
+                audio_data = audio_data / 32768.0
+        except Exception as e:
+            raise VADAudioError(f"音訊格式轉換失敗: {e}") from e
+        
+        return audio_data.reshape(-1)
+    
+    def _run_model(self, audio_batch: np.ndarray, states: tuple) -> tuple:
+        """執行一次 ONNX 推論
+        
+        Args:
+            audio_batch: [N, samples] float32 音訊
+            states: 已堆疊的隱藏狀態，每個形狀為 (2, N, hidden_size)
+            
+        Returns:
+            (probabilities [N], 新的隱藏狀態元組)
+        """
+        ort_inputs = {self._audio_input: audio_batch}
+        if self._sr_input:
+            ort_inputs[self._sr_input] = self._sr_array
+        for (name, _), state in zip(self._state_inputs, states):
+            ort_inputs[name] = state
+        
+        ort_outputs = self._model.run(None, ort_inputs)
+        
+        probabilities = np.asarray(ort_outputs[0], dtype=np.float32).reshape(-1)
+        # 有狀態的模型依序返回新的隱藏狀態
+        new_states = tuple(ort_outputs[1:1 + len(self._state_inputs)])
+        return probabilities, new_states
+    
+    def _make_result(self, probability: float) -> VADResult:
+        """依閾值建立 VAD 結果"""
+        if probability > self._config.threshold:
+            state = VADState.SPEECH
+        else:
+            state = VADState.SILENCE
+        return VADResult(state=state, probability=probability)
+    
     def detect(
         self,
         audio_data: np.ndarray,
@@ -211,76 +309,22 @@ class SileroVAD(SingletonMixin, IVADService):
         if not self._ensure_initialized():
             raise VADInitializationError("服務尚未初始化")
         
-        # 記錄接收到的音訊格式（只記錄第一次）
-        # if not hasattr(self, '_first_vad_logged'):
-        #     self._first_vad_logged = {}
-        # if session_id not in self._first_vad_logged:
-        #     self._first_vad_logged[session_id] = True
-        #     logger.info(f"🎙️ [VAD_RECEIVED] First audio for VAD session {session_id}: shape={audio_data.shape}, dtype={audio_data.dtype}, "
-        #                f"min={audio_data.min():.4f}, max={audio_data.max():.4f}")
-        
-        # 驗證輸入
-        if not isinstance(audio_data, np.ndarray):
-            raise VADAudioError(f"音訊資料型別錯誤: {type(audio_data)}")
-        
-        if audio_data.size == 0:
-            raise VADAudioError("音訊資料為空")
-        
-        # 確保音訊格式正確
-        try:
-            if audio_data.dtype != np.float32:
-                audio_data = audio_data.astype(np.float32)
-            
-            # 正規化到 [-1, 1]
-            if np.abs(audio_data).max() > 1.0:
-                audio_data = audio_data / 32768.0
-        except Exception as e:
-            raise VADAudioError(f"音訊格式轉換失敗: {e}") from e
+        # 驗證並轉換輸入
+        audio_data = self._prepare_audio(audio_data)
         
         # 執行推論
+        started = time.perf_counter()
         try:
-            # 取得隱藏狀態
-            h, c = self._get_hidden_states(session_id)
-            
-            # Silero VAD 需要的輸入格式
-            # 檢查模型輸入以確定格式
-            input_names = [inp.name for inp in self._model.get_inputs()]
-            
-            if len(input_names) == 4:  # 新版本：input, sr, h, c
-                ort_inputs = {
-                    'input': audio_data.reshape(1, -1),
-                    'sr': np.array([16000], dtype=np.int64),  # 使用 int64
-                    'h': h,
-                    'c': c
-                }
-            else:  # 舊版本：input, sr
-                ort_inputs = {
-                    self._model.get_inputs()[0].name: audio_data.reshape(1, -1),
-                    self._model.get_inputs()[1].name: np.array([16000], dtype=np.int64)  # 使用 int64
-                }
-            
-            # 執行推論
-            ort_outputs = self._model.run(None, ort_inputs)
-            
-            # 解析輸出
-            if len(ort_outputs) == 3:  # 新版本返回 (output, h_new, c_new)
-                probability = float(ort_outputs[0][0])
+            probabilities, new_states = self._run_model(
+                audio_data.reshape(1, -1),
+                self._get_hidden_states(session_id)
+            )
+            if new_states:
                 # 更新隱藏狀態
-                self._hidden_states[session_id] = (ort_outputs[1], ort_outputs[2])
-            else:  # 舊版本只返回 output
-                probability = float(ort_outputs[0][0])
-            
-            # 判斷狀態
-            if probability > self._config.threshold:
-                state = VADState.SPEECH
-            else:
-                state = VADState.SILENCE
+                self._hidden_states[session_id] = new_states
             
-            # 建立結果
-            result = VADResult(
-                state=state,
-                probability=probability
-            )
+            result = self._make_result(float(probabilities[0]))
+            metrics.observe(Stage.VAD, time.perf_counter() - started, session_id)
             
             # 檢查狀態變化並觸發 callback
             self._check_state_change(session_id, result)
@@ -291,6 +335,78 @@ class SileroVAD(SingletonMixin, IVADService):
             logger.error(f"VAD 推論錯誤: {e}")
             raise VADDetectionError(f"VAD 推論失敗: {e}") from e
     
+    def detect_batch(
+        self,
+        audio_frames: list,
+        session_ids: list
+    ) -> list:
+        """一次推論多個 session 的 frame
+        
+        將音訊堆疊成 [N, samples]、隱藏狀態沿 batch 軸合併後執行一次 ONNX 推論，
+        再把機率與新狀態分配回各 session。長度不同的 frame 分組推論。
+        
+        Args:
+            audio_frames: 每個 session 一個 frame
+            session_ids: 對應的 session ID（不可重複）
+            
+        Returns:
+            與輸入順序對應的 VADResult 列表
+            
+        Raises:
+            VADAudioError: 音訊格式錯誤或 session 重複
+            VADDetectionError: 推論過程錯誤
+        """
+        if not self._ensure_initialized():
+            raise VADInitializationError("服務尚未初始化")
+        
+        if len(audio_frames) != len(session_ids):
+            raise VADAudioError("audio_frames 與 session_ids 數量不一致")
+        if len(set(session_ids)) != len(session_ids):
+            # 同一 session 的 frame 必須依序推論（隱藏狀態相依）
+            raise VADAudioError("同一批次中 session 不可重複")
+        
+        frames = [self._prepare_audio(frame) for frame in audio_frames]
+        
+        # 依長度分組
+        groups: Dict[int, list] = {}
+        for index, frame in enumerate(frames):
+            groups.setdefault(frame.shape[0], []).append(index)
+        
+        probabilities = [0.0] * len(frames)
+        started = time.perf_counter()
+        try:
+            for indices in groups.values():
+                audio_batch = np.stack([frames[i] for i in indices])
+                session_states = [self._get_hidden_states(session_ids[i]) for i in indices]
+                states = tuple(
+                    np.concatenate([st[k] for st in session_states], axis=1)
+                    for k in range(len(self._state_inputs))
+                )
+                
+                batch_probs, new_states = self._run_model(audio_batch, states)
+                
+                for row, i in enumerate(indices):
+                    probabilities[i] = float(batch_probs[row])
+                    if new_states:
+                        self._hidden_states[session_ids[i]] = tuple(
+                            state[:, row:row + 1, :] for state in new_states
+                        )
+        except Exception as e:
+            logger.error(f"VAD 批次推論錯誤: {e}")
+            raise VADDetectionError(f"VAD 批次推論失敗: {e}") from e
+        
+        # 批次中每個 session 都等待整個批次完成
+        elapsed = time.perf_counter() - started
+        for session_id in session_ids:
+            metrics.observe(Stage.VAD, elapsed, session_id)
+        
+        results = []
+        for session_id, probability in zip(session_ids, probabilities):
+            result = self._make_result(probability)
+            self._check_state_change(session_id, result)
+            results.append(result)
+        return results
+    
     def _check_state_change(self, session_id: str, result: VADResult):
         """檢查狀態變化並觸發 callback
         
@@ -358,7 +474,7 @@ class SileroVAD(SingletonMixin, IVADService):
             silero_vad.stop_listening("user_123")
             
         Note:
-            - 每個 session 只能有一個監聽執行緒
+            - 音訊由 audio_scheduler 的共用 worker 處理，callback 在 worker 執行緒中呼叫
             - 如果 session 已在監聽中，會返回 True 但不會重啟
             - Callback 只在狀態變化時觸發，不是每個音訊塊都會呼叫
             - 連續錯誤超過 10 次會自動停止監聽
@@ -399,23 +515,22 @@ class SileroVAD(SingletonMixin, IVADService):
                 self._config.model_path = old_path
                 raise VADModelError(f"載入指定模型失敗: {e}") from e
         
-        # 建立監聽執行緒
-        thread = threading.Thread(
-            target=self._listening_loop,
-            args=(session_id, callback),
-            daemon=True
-        )
-        
         # 註冊 session
+        session = {
+            "active": True,
+            "callback": callback,
+            "error_count": 0
+        }
         with self._session_lock:
-            self._sessions[session_id] = {
-                "active": True,
-                "thread": thread,
-                "callback": callback
-            }
-        
-        # 啟動執行緒
-        thread.start()
+            self._sessions[session_id] = session
+        
+        # 交給共用的排程器處理，有新音訊時才會佔用 worker
+        audio_scheduler.register_source(
+            session_id,
+            "vad",
+            lambda items: self._process_audio(session_id, items),
+            on_stop=lambda: self._finish_listening(session_id, session)
+        )
         logger.info(f"開始監聽 session: {session_id}")
         
         return True
@@ -438,105 +553,148 @@ class SileroVAD(SingletonMixin, IVADService):
             self._buffer_managers[session_id] = BufferManager(config)
         return self._buffer_managers[session_id]
     
-    def _listening_loop(self, session_id: str, callback: Callable):
-        """監聽循環，持續從 audio_queue 拉取音訊並偵測
+    def _process_audio(self, session_id: str, items: list):
+        """處理 audio_queue 的新音訊並偵測（在 audio_scheduler 的 worker 中執行）
         
         Args:
             session_id: Session ID
-            callback: 回調函數
+            items: 新的 TimestampedAudio 列表
         """
-        from src.core.audio_queue_manager import audio_queue
+        session = self._sessions.get(session_id)
+        if session is None or not session["active"]:
+            return
         
         # 取得 BufferManager
         buffer_mgr = self._get_buffer_manager(session_id)
-        self._stop_flags[session_id] = False
         
-        logger.info(f"監聽執行緒啟動 [{session_id}]")
+        for timestamped_audio in items:
+            audio_chunk = timestamped_audio.audio
+            # 取得 bytes 資料
+            if isinstance(audio_chunk, np.ndarray):
+                # audio_queue 回傳 int16 環形緩衝區視圖
+                data_bytes = audio_chunk.astype(np.int16, copy=False).tobytes()
+            elif hasattr(audio_chunk, 'data'):
+                data_bytes = audio_chunk.data
+            else:
+                data_bytes = audio_chunk
+            
+            # 推入 BufferManager
+            buffer_mgr.push(data_bytes)
+        
+        # 明確使用小端 int16 → float32 [-1, 1]
+        frames = [
+            np.frombuffer(frame, dtype='<i2').astype(np.float32) / 32768.0
+            for frame in buffer_mgr.pop_all()
+        ]
+        if not frames:
+            return
+        
+        # 批次模式：交給批次執行緒與其他 session 合併推論
+        batcher = self._get_batcher()
+        if batcher:
+            batcher.submit(session_id, frames)
+            return
+        
+        for audio_f32 in frames:
+            # 偵測語音
+            try:
+                result = self.detect(audio_f32, session_id)
+                # 狀態變化會在 detect 內部觸發 callback
+                
+                # 重置錯誤計數
+                session["error_count"] = 0
+                
+            except (VADAudioError, VADDetectionError) as e:
+                if self._record_error(session_id, session, e):
+                    break
+    
+    def _record_error(self, session_id: str, session: Dict[str, Any], error: Exception) -> bool:
+        """記錄偵測錯誤，連續錯誤達到上限時停止監聽
         
-        # 錯誤計數器
-        error_count = 0
+        Returns:
+            是否已停止監聽
+        """
         max_errors = 10
+        logger.error(f"VAD 偵測錯誤 [{session_id}]: {error}")
+        session["error_count"] += 1
         
-        while not self._stop_flags.get(session_id, False):
-            # 檢查是否應該停止
+        if session["error_count"] >= max_errors and session["active"]:
+            logger.error(f"連續錯誤次數達到上限 [{session_id}]，停止監聽")
+            session["active"] = False
+            audio_scheduler.unregister_source(session_id, "vad")
+            return True
+        return False
+    
+    def _get_batcher(self) -> Optional[FrameBatcher]:
+        """取得批次推論佇列（未啟用或模型無法批次時返回 None）"""
+        if self._batcher is None and self._config.batch_enabled and self._config.max_batch_size > 1:
             with self._session_lock:
-                if session_id not in self._sessions or not self._sessions[session_id]["active"]:
+                if self._batcher is None:
+                    self._batcher = FrameBatcher(
+                        self._run_batch,
+                        max_batch_size=self._config.max_batch_size,
+                        max_batch_latency=self._config.max_batch_latency,
+                        name="vad-batcher"
+                    )
+                    logger.info(f"VAD 批次推論已啟用 - max_batch_size={self._config.max_batch_size}, "
+                               f"max_batch_latency={self._config.max_batch_latency * 1000:.0f}ms")
+        return self._batcher
+    
+    def _run_batch(self, session_ids: list, frames: list):
+        """執行一個跨 session 批次（在批次執行緒中執行）"""
+        try:
+            self.detect_batch(frames, session_ids)
+            # 狀態變化會在 detect_batch 內部觸發 callback
+            for session_id in session_ids:
+                session = self._sessions.get(session_id)
+                if session is not None:
+                    session["error_count"] = 0
+        except (VADAudioError, VADDetectionError) as e:
+            for session_id in session_ids:
+                session = self._sessions.get(session_id)
+                if session is not None:
+                    self._record_error(session_id, session, e)
+    
+    def get_batch_stats(self) -> Optional[Dict[str, Any]]:
+        """取得批次推論統計（未啟用時返回 None）"""
+        return self._batcher.get_stats() if self._batcher else None
+    
+    def _finish_listening(self, session_id: str, session: Dict[str, Any]):
+        """停止監聽後的收尾：處理殘餘資料並清理資源
+        
+        Args:
+            session_id: Session ID
+            session: 註冊時的 session 資訊（已被新的監聽取代時不清理）
+        """
+        buffer_mgr = self._buffer_managers.get(session_id)
+        
+        # 先依序處理還在批次佇列中的 frames（移除後不會再進入任何批次）
+        if self._batcher:
+            for audio_f32 in self._batcher.remove_session(session_id):
+                try:
+                    self.detect(audio_f32, session_id)
+                except Exception as e:
+                    logger.error(f"處理待推論資料錯誤 [{session_id}]: {e}")
                     break
-            
-            try:
-                # 使用非破壞性的阻塞式讀取
-                timestamped_audio = audio_queue.pull_blocking_timestamp(
-                    session_id,
-                    reader_id="vad",
-                    timeout=0.01  # 保持較短超時以提升響應速度
-                )
-                
-                if timestamped_audio is not None:
-                    audio_chunk = timestamped_audio.audio
-                else:
-                    audio_chunk = None
-                
-                if audio_chunk is not None:
-                    # 取得 bytes 資料
-                    if hasattr(audio_chunk, 'data'):
-                        data_bytes = audio_chunk.data
-                    else:
-                        # 假設是 bytes 或可轉換為 bytes
-                        if isinstance(audio_chunk, bytes):
-                            data_bytes = audio_chunk
-                        else:
-                            # 如果是 numpy array，轉換為 bytes
-                            data_bytes = audio_chunk.astype(np.int16).tobytes()
-                    
-                    # 推入 BufferManager
-                    buffer_mgr.push(data_bytes)
-                    
-                    # 處理所有就緒的 frames
-                    for frame in buffer_mgr.pop_all():
-                        # 明確使用小端 int16 → float32 [-1, 1]
-                        audio_f32 = np.frombuffer(frame, dtype='<i2').astype(np.float32) / 32768.0
-                        
-                        # 偵測語音
-                        try:
-                            result = self.detect(audio_f32, session_id)
-                            # 狀態變化會在 detect 內部觸發 callback
-                            
-                            # 重置錯誤計數
-                            error_count = 0
-                            
-                        except (VADAudioError, VADDetectionError) as e:
-                            logger.error(f"VAD 偵測錯誤 [{session_id}]: {e}")
-                            error_count += 1
-                            
-                            if error_count >= max_errors:
-                                logger.error(f"連續錯誤次數達到上限 [{session_id}]，停止監聽")
-                                self._stop_flags[session_id] = True
-                                break
-                
-            except Exception as e:
-                if "timeout" not in str(e).lower():
-                    logger.error(f"監聽循環錯誤 [{session_id}]: {e}")
-                    error_count += 1
-                    
-                    if error_count >= max_errors:
-                        logger.error(f"連續錯誤次數達到上限 [{session_id}]，停止監聽")
-                        self._stop_flags[session_id] = True
-                        break
         
         # 停止前處理殘餘資料
-        tail = buffer_mgr.flush()
+        tail = buffer_mgr.flush() if buffer_mgr else None
         if tail:
             try:
                 audio_f32 = np.frombuffer(tail, dtype='<i2').astype(np.float32) / 32768.0
                 result = self.detect(audio_f32, session_id)
+                callback = session.get("callback")
                 if callback:
                     callback(result)
             except Exception as e:
                 logger.error(f"處理尾端資料錯誤 [{session_id}]: {e}")
         
-        # 清理
-        self._cleanup_session(session_id)
-        logger.info(f"監聽執行緒結束 [{session_id}]")
+        # 清理（同一 session 已重新開始監聽時保留新的資源）
+        with self._session_lock:
+            replaced = self._sessions.get(session_id, session) is not session
+        if not replaced:
+            self._cleanup_session(session_id)
+        logger.info(f"監聽結束 [{session_id}]")
     
     def _cleanup_session(self, session_id: str):
         """清理 session 相關資源
@@ -554,10 +712,6 @@ class SileroVAD(SingletonMixin, IVADService):
             self._buffer_managers[session_id].reset()
             del self._buffer_managers[session_id]
         
-        # 清理停止旗標
-        if session_id in self._stop_flags:
-            del self._stop_flags[session_id]
-        
         # 清除狀態
         if session_id in self._last_state:
             del self._last_state[session_id]
@@ -569,7 +723,7 @@ class SileroVAD(SingletonMixin, IVADService):
     def stop_listening(self, session_id: str) -> bool:
         """停止監聽特定 session
         
-        停止監聽執行緒並清理相關資源。
+        從 audio_scheduler 取消註冊，處理殘餘資料並清理相關資源。
         
         Args:
             session_id: Session ID
@@ -593,14 +747,8 @@ class SileroVAD(SingletonMixin, IVADService):
             self._sessions[session_id]["active"] = False
             logger.info(f"停止監聽 session: {session_id}")
         
-        # 設定停止旗標
-        if session_id in self._stop_flags:
-            self._stop_flags[session_id] = True
-            
-        # 等待執行緒結束（最多等待1秒）
-        thread = self._sessions.get(session_id, {}).get("thread")
-        if thread and thread.is_alive():
-            thread.join(timeout=1.0)
+        # 取消排程；正在處理中時最多等待 1 秒讓本輪結束
+        audio_scheduler.unregister_source(session_id, "vad", timeout=1.0)
         
         return True
     
@@ -643,6 +791,11 @@ class SileroVAD(SingletonMixin, IVADService):
         # 清除所有 LSTM 隱藏狀態
         self._hidden_states.clear()
         
+        # 停止批次執行緒
+        if self._batcher:
+            self._batcher.shutdown()
+            self._batcher = None
+        
         # 釋放模型
         self._model = None
         self._initialized = False
@@ -704,6 +857,13 @@ class SileroVAD(SingletonMixin, IVADService):
             return True
         return False
     
+    def warm_up(self, session_id: str = "__warmup__") -> None:
+        """以一個靜音 frame 執行一次推論（啟動時暖機，第一個 session 不必承擔 ONNX 的首次推論成本）"""
+        try:
+            self.detect(np.zeros(512, dtype=np.float32), session_id=session_id)
+        finally:
+            self._cleanup_session(session_id)
+    
     def is_initialized(self) -> bool:
         """檢查服務是否已初始化"""
         return self._initialized
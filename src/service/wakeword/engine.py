@@ -0,0 +1,257 @@
+"""OpenWakeWord 串流特徵引擎（每個 session 獨立狀態）
+
+openWakeWord 的 `Model.predict` 把 melspectrogram / embedding 歷史存在模型物件內，
+多個 session 共用同一個 Model 會互相污染特徵歷史。本引擎只共用已載入的 ONNX 模型，
+每個 session 有自己預先配置的特徵環形緩衝區，並以批次方式推論多個 session 的 frame。
+
+每個 1280 樣本（80ms）frame 的流程：
+1. melspectrogram：上一個 frame 尾端 480 樣本 + 本 frame → [N, 1760] → 每個 session 8 列
+2. embedding：各 session 最近 76 列 melspec → [N, 76, 32, 1] → 每個 session 1 個 96 維特徵
+3. classifier：各 session 最近 16 個特徵 → [N, 16, 96] → 各關鍵字分數
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+FRAME_SAMPLES = 1280      # 80ms @ 16kHz
+CONTEXT_SAMPLES = 480     # melspectrogram 需要前一個 frame 的 3 個 hop (160 * 3)
+MELSPEC_WINDOW = 76       # embedding 模型的輸入列數
+MELSPEC_BINS = 32
+EMBEDDING_DIM = 96
+WARMUP_FRAMES = 5         # 前 5 個 frame 的分數歸零（與 openWakeWord 相同）
+
+
+class _FeatureRing:
+    """固定寬度的列環形緩衝區，永遠可取得最近 window 列的連續視圖
+
+    以預先配置的陣列儲存，寫滿時把最近 window 列搬回開頭（攤銷 O(1)）。
+    """
+
+    __slots__ = ('_data', '_window', '_end')
+
+    def __init__(self, initial: np.ndarray, window: int, extra_rows: int):
+        self._window = window
+        self._data = np.empty((window + extra_rows, initial.shape[1]), dtype=np.float32)
+        rows = initial[-window:]
+        self._data[:len(rows)] = rows
+        self._end = len(rows)
+
+    def append(self, rows: np.ndarray) -> None:
+        n = rows.shape[0]
+        if self._end + n > self._data.shape[0]:
+            keep = self._window - n
+            self._data[:keep] = self._data[self._end - keep:self._end]
+            self._end = keep
+        self._data[self._end:self._end + n] = rows
+        self._end += n
+
+    def last(self, rows: int) -> np.ndarray:
+        return self._data[self._end - rows:self._end]
+
+
+class _SessionFeatures:
+    """單一 session 的串流特徵狀態"""
+
+    __slots__ = ('context', 'melspec', 'features', 'remainder', 'frames_seen', 'last_scores')
+
+    def __init__(self, initial_features: np.ndarray, feature_window: int):
+        self.context = np.zeros(CONTEXT_SAMPLES, dtype=np.float32)
+        self.melspec = _FeatureRing(
+            np.ones((MELSPEC_WINDOW, MELSPEC_BINS), dtype=np.float32),
+            MELSPEC_WINDOW,
+            extra_rows=8 * 16
+        )
+        self.features = _FeatureRing(initial_features, feature_window, extra_rows=64)
+        self.remainder = np.empty(0, dtype=np.float32)  # 不足一個 frame 的樣本
+        self.frames_seen = 0
+        self.last_scores: Dict[str, float] = {}
+
+
+class WakewordEngine:
+    """共用 ONNX 模型、每個 session 獨立特徵狀態的喚醒詞推論引擎
+
+    Args:
+        model: 已載入的 openwakeword.model.Model（使用 onnx 推論框架）
+    """
+
+    def __init__(self, model):
+        preprocessor = model.preprocessor
+        self._melspec_model = preprocessor.melspec_model
+        self._embedding_model = preprocessor.embedding_model
+        self._melspec_input = self._melspec_model.get_inputs()[0].name
+        self._embedding_input = self._embedding_model.get_inputs()[0].name
+
+        # 分類模型：(名稱, ONNX session, 輸入名稱, 特徵列數, 是否支援批次, 類別對應)
+        self._classifiers = []
+        for name, session in model.models.items():
+            model_input = session.get_inputs()[0]
+            batch_dim = model_input.shape[0]
+            self._classifiers.append((
+                name,
+                session,
+                model_input.name,
+                int(model.model_inputs[name]),
+                not isinstance(batch_dim, int) or batch_dim != 1,
+                model.class_mapping.get(name) if model.model_outputs[name] != 1 else None
+            ))
+
+        self._feature_window = max(c[3] for c in self._classifiers) if self._classifiers else 16
+        self._initial_features = self._compute_initial_features()
+        self._sessions: Dict[str, _SessionFeatures] = {}
+
+    @property
+    def labels(self) -> List[str]:
+        """所有輸出的關鍵字名稱"""
+        labels = []
+        for name, _, _, _, _, class_mapping in self._classifiers:
+            if class_mapping is None:
+                labels.append(name)
+            else:
+                labels.extend(class_mapping.values())
+        return labels
+
+    def _compute_initial_features(self) -> np.ndarray:
+        """以固定種子的雜訊計算初始特徵（所有 session 共用，只算一次）
+
+        openWakeWord 以 4 秒隨機雜訊的 embedding 填滿特徵緩衝區，這裡沿用相同做法。
+        """
+        rng = np.random.default_rng(0)
+        noise = rng.integers(-1000, 1000, 16000 * 4).astype(np.float32)
+        spec = self._melspectrogram(noise[None, :])[0]
+        windows = [
+            spec[i:i + MELSPEC_WINDOW]
+            for i in range(0, spec.shape[0] - MELSPEC_WINDOW + 1, 8)
+        ]
+        batch = np.stack(windows)[:, :, :, None].astype(np.float32)
+        return self._embed(batch)
+
+    def _melspectrogram(self, audio: np.ndarray) -> np.ndarray:
+        """[N, samples] → [N, frames, 32]（含 openWakeWord 的 x/10 + 2 轉換）"""
+        outputs = self._melspec_model.run(None, {self._melspec_input: audio})[0]
+        spec = outputs.reshape(audio.shape[0], -1, MELSPEC_BINS)
+        return spec / 10.0 + 2.0
+
+    def _embed(self, windows: np.ndarray) -> np.ndarray:
+        """[N, 76, 32, 1] → [N, 96]"""
+        outputs = self._embedding_model.run(None, {self._embedding_input: windows})[0]
+        return outputs.reshape(windows.shape[0], EMBEDDING_DIM)
+
+    # ------------------------------------------------------------------ #
+    # Session 管理
+    # ------------------------------------------------------------------ #
+
+    def _get_session(self, session_id: str) -> _SessionFeatures:
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = _SessionFeatures(self._initial_features, self._feature_window)
+            self._sessions[session_id] = state
+        return state
+
+    def reset_session(self, session_id: str) -> None:
+        """重置 session 的特徵歷史"""
+        self._sessions.pop(session_id, None)
+
+    def remove_session(self, session_id: str) -> None:
+        """移除 session 狀態"""
+        self._sessions.pop(session_id, None)
+
+    def has_session(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    # ------------------------------------------------------------------ #
+    # 推論
+    # ------------------------------------------------------------------ #
+
+    def predict_batch(self, session_ids: List[str], frames: List[np.ndarray]) -> List[Dict[str, float]]:
+        """批次推論多個 session 各一個 1280 樣本的 frame
+
+        Args:
+            session_ids: Session ID 列表（不可重複）
+            frames: 對應的 frame（int16 數值範圍的 float32）
+
+        Returns:
+            每個 session 的 {關鍵字: 分數}
+        """
+        if not session_ids:
+            return []
+        if len(set(session_ids)) != len(session_ids):
+            raise ValueError("同一批次中 session 不可重複")
+
+        states = [self._get_session(session_id) for session_id in session_ids]
+        count = len(states)
+
+        # 1. melspectrogram
+        audio = np.empty((count, CONTEXT_SAMPLES + FRAME_SAMPLES), dtype=np.float32)
+        for row, (state, frame) in enumerate(zip(states, frames)):
+            if frame.shape[0] != FRAME_SAMPLES:
+                raise ValueError(f"frame 必須為 {FRAME_SAMPLES} 樣本，收到 {frame.shape[0]}")
+            audio[row, :CONTEXT_SAMPLES] = state.context
+            audio[row, CONTEXT_SAMPLES:] = frame
+            state.context[:] = frame[-CONTEXT_SAMPLES:]
+        spec = self._melspectrogram(audio)
+
+        # 2. embedding
+        windows = np.empty((count, MELSPEC_WINDOW, MELSPEC_BINS, 1), dtype=np.float32)
+        for row, state in enumerate(states):
+            state.melspec.append(spec[row])
+            windows[row, :, :, 0] = state.melspec.last(MELSPEC_WINDOW)
+        embeddings = self._embed(windows)
+
+        for row, state in enumerate(states):
+            state.features.append(embeddings[row:row + 1])
+            state.frames_seen += 1
+
+        # 3. classifier
+        results: List[Dict[str, float]] = [{} for _ in range(count)]
+        for name, session, input_name, n_features, batched, class_mapping in self._classifiers:
+            features = np.stack([state.features.last(n_features) for state in states])
+            if batched:
+                scores = session.run(None, {input_name: features})[0].reshape(count, -1)
+            else:
+                # 模型的 batch 維度固定為 1，逐一推論（分類器很小，主要成本在 embedding）
+                scores = np.concatenate([
+                    session.run(None, {input_name: features[row:row + 1]})[0].reshape(1, -1)
+                    for row in range(count)
+                ])
+
+            for row in range(count):
+                if class_mapping is None:
+                    results[row][name] = float(scores[row, 0])
+                else:
+                    for index, label in class_mapping.items():
+                        results[row][label] = float(scores[row, int(index)])
+
+        # 前幾個 frame 的特徵歷史尚未填滿，分數歸零
+        for state, scores in zip(states, results):
+            if state.frames_seen <= WARMUP_FRAMES:
+                for label in scores:
+                    scores[label] = 0.0
+            state.last_scores = scores
+
+        return results
+
+    def predict(self, session_id: str, audio: np.ndarray) -> Dict[str, float]:
+        """推論任意長度的音訊（不足一個 frame 的樣本保留到下次）
+
+        Returns:
+            本次所有完整 frame 的最高分數；沒有完整 frame 時返回上一次的分數
+        """
+        state = self._get_session(session_id)
+        if state.remainder.size:
+            audio = np.concatenate((state.remainder, audio))
+
+        n_frames = audio.shape[0] // FRAME_SAMPLES
+        state.remainder = audio[n_frames * FRAME_SAMPLES:].copy()
+        if n_frames == 0:
+            return dict(state.last_scores) or {label: 0.0 for label in self.labels}
+
+        best: Dict[str, float] = {}
+        for i in range(n_frames):
+            frame = audio[i * FRAME_SAMPLES:(i + 1) * FRAME_SAMPLES]
+            scores = self.predict_batch([session_id], [frame])[0]
+            for label, score in scores.items():
+                if score > best.get(label, -1.0):
+                    best[label] = score
+        return best
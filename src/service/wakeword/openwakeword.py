@@ -4,6 +4,9 @@
 1. 接收音訊資料，判斷是否觸發關鍵字
 2. 直接從 audio_queue 拉取音訊處理
 3. 觸發 hook 回調
+
+ONNX 模型由所有 session 共用，但 melspectrogram / embedding 特徵歷史每個 session 獨立
+（見 engine.py），多個 session 的 frame 以批次推論。
 """
 
 import time
@@ -24,7 +27,11 @@ from src.interface.exceptions import (
 )
 from src.config.manager import ConfigManager
 from src.core.buffer_manager import BufferManager
+from src.core.audio_scheduler import audio_scheduler
+from src.core.frame_batcher import FrameBatcher
+from src.core.metrics import Stage, metrics
 from src.interface.buffer import BufferConfig
+from src.service.wakeword.engine import WakewordEngine, FRAME_SAMPLES
 
 # Get configuration from ConfigManager
 config_manager = ConfigManager()
@@ -36,7 +43,7 @@ class OpenWakeword(SingletonMixin, IWakewordService):
     核心功能：
     - 載入 ONNX 模型進行推論
     - 處理音訊判斷是否包含關鍵字
-    - 直接從 audio_queue 拉取音訊
+    - 透過共用的 audio_scheduler 從 audio_queue 拉取音訊
     - 觸發檢測 hooks
     """
     
@@ -46,9 +53,15 @@ class OpenWakeword(SingletonMixin, IWakewordService):
             self._initialized = False
             self._model = None
             
+            # 共用模型、每個 session 獨立特徵狀態的推論引擎
+            self._engine: Optional[WakewordEngine] = None
+            
+            # 跨 session 批次推論（監聽模式使用）
+            self._batcher: Optional[FrameBatcher] = None
+            
             # Session 管理
             self._sessions: Dict[str, Dict[str, Any]] = {}
-            # 結構: {session_id: {"callback": callable, "thread": thread, "active": bool}}
+            # 結構: {session_id: {"callback": callable, "active": bool, "error_count": int}}
             self._session_lock = threading.Lock()
             
             # BufferManager 管理（每個 session 一個）
@@ -57,9 +70,6 @@ class OpenWakeword(SingletonMixin, IWakewordService):
             # 防抖動追蹤
             self._last_detection_time: Dict[str, float] = {}
             
-            # 停止旗標（每個 session 一個）
-            self._stop_flags: Dict[str, bool] = {}
-            
             # 載入配置
             self._config = self._load_config()
             
@@ -95,7 +105,11 @@ class OpenWakeword(SingletonMixin, IWakewordService):
                         chunk_size=cfg.chunk_size,
                         sample_rate=cfg.sample_rate,
                         debounce_time=cfg.debounce_time,
-                        use_gpu=cfg.use_gpu
+                        use_gpu=cfg.use_gpu,
+                        # 批次推論設定（舊的 config.yaml 可能沒有，使用預設值）
+                        batch_enabled=getattr(cfg, 'batch_enabled', True),
+                        max_batch_size=getattr(cfg, 'max_batch_size', 32),
+                        max_batch_latency=getattr(cfg, 'max_batch_latency', 0.01)
                     )
             return None  # 不返回預設配置
         except Exception as e:
@@ -159,6 +173,8 @@ class OpenWakeword(SingletonMixin, IWakewordService):
                 wakeword_models=[model_path],
                 inference_framework="onnx"
             )
+            # Model 內部的特徵緩衝區只適用單一串流，改由引擎為每個 session 保存狀態
+            self._engine = WakewordEngine(self._model)
             # logger.debug("模型載入成功")
         except Exception as e:
             raise WakewordModelError(
@@ -220,54 +236,71 @@ class OpenWakeword(SingletonMixin, IWakewordService):
         #     logger.info(f"🔊 [OWW_RECEIVED] First audio for OpenWakeWord session {session_id}: shape={audio_data.shape}, "
         #                f"dtype={audio_data.dtype}, range=[{audio_data.min():.4f}, {audio_data.max():.4f}]")
         
-        # 執行推論
+        # 執行推論（使用該 session 自己的特徵歷史）
+        started = time.perf_counter()
         try:
-            predictions = self._model.predict(audio_data)
+            predictions = self._engine.predict(session_id, audio_data)
+        except Exception as e:
+            raise WakewordDetectionError(f"推論過程發生錯誤: {e}") from e
+        metrics.observe(Stage.WAKEWORD, time.perf_counter() - started, session_id)
+        
+        return self._handle_predictions(session_id, predictions)
+    
+    def _handle_predictions(
+        self,
+        session_id: str,
+        predictions: Dict[str, float]
+    ) -> Optional[WakewordDetection]:
+        """檢查分數閾值與防抖動，偵測到關鍵字時觸發 session 的回調
+        
+        Args:
+            session_id: Session ID
+            predictions: {關鍵字: 分數}
             
-            # DEBUG: 顯示預測結果
-            logger.debug(f"[{session_id}] 預測結果: {predictions}")
+        Returns:
+            如果偵測到關鍵字則回傳 WakewordDetection，否則 None
+        """
+        # DEBUG: 顯示預測結果
+        logger.debug(f"[{session_id}] 預測結果: {predictions}")
+        
+        # 檢查每個關鍵字
+        for keyword, score in predictions.items():
+            logger.debug(f"[{session_id}] {keyword}: score={score:.4f}, threshold={self._config.threshold:.4f}")
             
-            # 檢查每個關鍵字
-            for keyword, score in predictions.items():
-                logger.debug(f"[{session_id}] {keyword}: score={score:.4f}, threshold={self._config.threshold:.4f}")
+            # 檢查是否超過閾值
+            if score >= self._config.threshold:
+                current_time = time.time()
                 
-                # 檢查是否超過閾值
-                if score >= self._config.threshold:
-                    current_time = time.time()
-                    
-                    # 防抖動檢查
-                    last_time = self._last_detection_time.get(f"{session_id}_{keyword}", 0)
-                    if current_time - last_time < self._config.debounce_time:
-                        logger.debug(f"防抖動: {keyword} 在 {self._config.debounce_time}s 內重複觸發")
-                        continue
-                    
-                    # 更新最後偵測時間
-                    self._last_detection_time[f"{session_id}_{keyword}"] = current_time
-                    
-                    # 建立偵測結果
-                    detection = WakewordDetection(
-                        keyword=keyword,
-                        confidence=float(score),
-                        timestamp=current_time,
-                        session_id=session_id
-                    )
-                    
-                    # 觸發 session 的回調
-                    if session_id in self._sessions:
-                        callback = self._sessions[session_id].get("callback")
-                        if callback:
-                            try:
-                                callback(detection)
-                            except Exception as e:
-                                logger.error(f"執行回調錯誤 [{session_id}]: {e}")
-                    
-                    logger.info(f"偵測到關鍵字: {keyword} (信心度: {score:.3f})")
-                    return detection
-            
-            return None
-            
-        except Exception as e:
-            raise WakewordDetectionError(f"推論過程發生錯誤: {e}") from e
+                # 防抖動檢查
+                last_time = self._last_detection_time.get(f"{session_id}_{keyword}", 0)
+                if current_time - last_time < self._config.debounce_time:
+                    logger.debug(f"防抖動: {keyword} 在 {self._config.debounce_time}s 內重複觸發")
+                    continue
+                
+                # 更新最後偵測時間
+                self._last_detection_time[f"{session_id}_{keyword}"] = current_time
+                
+                # 建立偵測結果
+                detection = WakewordDetection(
+                    keyword=keyword,
+                    confidence=float(score),
+                    timestamp=current_time,
+                    session_id=session_id
+                )
+                
+                # 觸發 session 的回調
+                if session_id in self._sessions:
+                    callback = self._sessions[session_id].get("callback")
+                    if callback:
+                        try:
+                            callback(detection)
+                        except Exception as e:
+                            logger.error(f"執行回調錯誤 [{session_id}]: {e}")
+                
+                logger.info(f"偵測到關鍵字: {keyword} (信心度: {score:.3f})")
+                return detection
+        
+        return None
     
     def _get_buffer_manager(self, session_id: str) -> BufferManager:
         """取得或建立 session 的 BufferManager
@@ -288,170 +321,219 @@ class OpenWakeword(SingletonMixin, IWakewordService):
             self._buffer_managers[session_id] = BufferManager(config)
         return self._buffer_managers[session_id]
     
-    def _listening_loop(self, session_id: str, callback: Callable):
-        """監聽循環，持續從 audio_queue 拉取音訊並偵測
+    def _process_audio(self, session_id: str, items: list):
+        """處理 audio_queue 的新音訊並偵測（在 audio_scheduler 的 worker 中執行）
         
         Args:
             session_id: Session ID
-            callback: 回調函數
+            items: 新的 TimestampedAudio 列表
         """
-        from src.core.audio_queue_manager import audio_queue
+        session = self._sessions.get(session_id)
+        if session is None or not session.get("active"):
+            return
         
         # 取得 BufferManager
         buffer_mgr = self._get_buffer_manager(session_id)
-        self._stop_flags[session_id] = False
-        
-        logger.info(f"監聽執行緒啟動 [{session_id}]")
-        
-        # 錯誤計數器
-        error_count = 0
-        max_errors = 10
-        
-        while not self._stop_flags.get(session_id, False):
-            # 檢查是否應該停止
-            with self._session_lock:
-                if session_id not in self._sessions or not self._sessions[session_id]["active"]:
-                    break
-            
-            try:
-                # 使用非破壞性的阻塞式讀取
-                timestamped_audio = audio_queue.pull_blocking_timestamp(
-                    session_id, 
-                    reader_id="openwakeword", 
-                    timeout=0.1
-                )
-                
-                if timestamped_audio is not None:
-                    audio_chunk = timestamped_audio.audio
-                    # DEBUG: 記錄成功讀取
-                    if error_count % 20 == 0:  # 每20次記錄一次，避免太多日誌
-                        logger.debug(f"[OWW] Successfully read audio chunk for {session_id}, timestamp: {timestamped_audio.timestamp:.3f}")
-                else:
-                    audio_chunk = None
-                
-                if audio_chunk is not None:
-                    # DEBUG: 檢查收到的原始數據
-                    logger.debug(f"[{session_id}] 原始 audio_chunk 類型: {type(audio_chunk)}")
-                    if isinstance(audio_chunk, np.ndarray):
-                        logger.debug(f"[{session_id}] 原始 numpy array: dtype={audio_chunk.dtype}, "
+        frames = []
+        
+        for timestamped_audio in items:
+            audio_chunk = timestamped_audio.audio
+            # DEBUG: 檢查收到的原始數據
+            logger.debug(f"[{session_id}] 原始 audio_chunk 類型: {type(audio_chunk)}")
+            if isinstance(audio_chunk, np.ndarray):
+                logger.debug(f"[{session_id}] 原始 numpy array: dtype={audio_chunk.dtype}, "
+                           f"shape={audio_chunk.shape}, "
+                           f"range=[{audio_chunk.min():.4f}, {audio_chunk.max():.4f}]")
+            # 取得 bytes 資料
+            if hasattr(audio_chunk, 'data') and not isinstance(audio_chunk, np.ndarray):
+                data_bytes = audio_chunk.data
+            else:
+                # 假設是 bytes 或可轉換為 bytes
+                if isinstance(audio_chunk, bytes):
+                    data_bytes = audio_chunk
+                elif isinstance(audio_chunk, np.ndarray):
+                    # 如果是 numpy array，需要先檢查並正規化
+                    if audio_chunk.dtype == np.float32:
+                        # 如果是 float32，確保在正確範圍內再轉換
+                        # 可能來自上游的數據已經被錯誤處理
+                        logger.debug(f"[{session_id}] 收到 float32 array: "
                                    f"shape={audio_chunk.shape}, "
                                    f"range=[{audio_chunk.min():.4f}, {audio_chunk.max():.4f}]")
-                    # 取得 bytes 資料
-                    if hasattr(audio_chunk, 'data'):
-                        data_bytes = audio_chunk.data
+                        # 直接將 float32 轉為 int16（假設已經在 [-1, 1] 範圍）
+                        audio_int16 = (audio_chunk * 32768.0).clip(-32768, 32767).astype(np.int16)
+                        data_bytes = audio_int16.tobytes()
                     else:
-                        # 假設是 bytes 或可轉換為 bytes
-                        if isinstance(audio_chunk, bytes):
-                            data_bytes = audio_chunk
-                        elif isinstance(audio_chunk, np.ndarray):
-                            # 如果是 numpy array，需要先檢查並正規化
-                            if audio_chunk.dtype == np.float32:
-                                # 如果是 float32，確保在正確範圍內再轉換
-                                # 可能來自上游的數據已經被錯誤處理
-                                logger.debug(f"[{session_id}] 收到 float32 array: "
-                                           f"shape={audio_chunk.shape}, "
-                                           f"range=[{audio_chunk.min():.4f}, {audio_chunk.max():.4f}]")
-                                # 直接將 float32 轉為 int16（假設已經在 [-1, 1] 範圍）
-                                audio_int16 = (audio_chunk * 32768.0).clip(-32768, 32767).astype(np.int16)
-                                data_bytes = audio_int16.tobytes()
-                            else:
-                                # int16 或其他類型，直接轉換
-                                data_bytes = audio_chunk.astype(np.int16).tobytes()
-                        else:
-                            # 其他未知類型
-                            logger.warning(f"[{session_id}] 未知的音訊數據類型: {type(audio_chunk)}")
-                            continue
-                    
-                    # DEBUG: 檢查音訊數據
-                    logger.debug(f"[{session_id}] 收到音訊塊: {len(data_bytes)} bytes")
-                    
-                    # 推入 BufferManager
-                    buffer_mgr.push(data_bytes)
-                    
-                    # DEBUG: 檢查 BufferManager 狀態
-                    frames_ready = buffer_mgr.pop_all()
-                    logger.debug(f"[{session_id}] BufferManager 產生 {len(frames_ready)} 個 frames")
-                    
-                    # 處理所有就緒的 frames
-                    for idx, frame in enumerate(frames_ready):
-                        # OpenWakeWord 模型需要的是 int16 值範圍的 float32（不是歸一化的）
-                        # 即：-32768.0 到 32767.0 的 float32 值
-                        # 使用 np.int16 確保正確處理有符號整數
-                        audio_int16 = np.frombuffer(frame, dtype=np.int16)
-                        audio_f32 = audio_int16.astype(np.float32)
-                        
-                        # 移除DC偏移（如果存在）
-                        audio_mean = audio_f32.mean()
-                        if abs(audio_mean) > 100:  # 如果平均值偏離太大
-                            logger.debug(f"[{session_id}] 偵測到DC偏移: {audio_mean:.2f}，進行修正")
-                            audio_f32 = audio_f32 - audio_mean
-                        
-                        # 智能振幅檢查：OpenWakeWord 需要 int16 範圍的 float32（-32768 到 32767）
-                        # 但要避免過度處理已經良好的音訊
-                        max_abs_val = np.abs(audio_f32).max()
-                        
-                        # 只有在音訊明顯太小（< 1000）或過大（> 30000）時才進行調整
-                        if max_abs_val > 0 and max_abs_val < 1000:
-                            # 只對真正微弱的訊號進行適度放大
-                            scale_factor = 5000.0 / max_abs_val  # 溫和放大到 5000 左右
-                            audio_f32 = audio_f32 * scale_factor
-                            logger.debug(f"[{session_id}] 微弱訊號增強: 放大 {scale_factor:.2f}x "
-                                       f"(原始範圍: ±{max_abs_val:.0f}, 新範圍: ±{max_abs_val * scale_factor:.0f})")
-                        elif max_abs_val > 30000:
-                            # 防止削波，縮小過大的訊號
-                            scale_factor = 20000.0 / max_abs_val
-                            audio_f32 = audio_f32 * scale_factor
-                            logger.debug(f"[{session_id}] 削波防護: 縮小 {1/scale_factor:.2f}x "
-                                       f"(原始範圍: ±{max_abs_val:.0f}, 新範圍: ±{max_abs_val * scale_factor:.0f})")
-                        else:
-                            # 音訊品質良好，保持原貌
-                            logger.debug(f"[{session_id}] 音訊品質良好，維持原始範圍: ±{max_abs_val:.0f}")
-                        
-                        # DEBUG: 檢查 frame 資料
-                        logger.debug(f"[{session_id}] Frame {idx}: shape={audio_f32.shape}, "
-                                   f"min={audio_f32.min():.4f}, max={audio_f32.max():.4f}, "
-                                   f"mean={audio_f32.mean():.4f}, std={audio_f32.std():.4f}")
-                        
-                        # 偵測喚醒詞
-                        try:
-                            result = self.detect(audio_f32, session_id)
-                            # detect 內部會觸發 callback（如果偵測到關鍵字）
-                            
-                            # 重置錯誤計數
-                            error_count = 0
-                            
-                        except (WakewordAudioError, WakewordDetectionError) as e:
-                            logger.error(f"喚醒詞偵測錯誤 [{session_id}]: {e}")
-                            error_count += 1
-                            
-                            if error_count >= max_errors:
-                                logger.error(f"連續錯誤次數達到上限 [{session_id}]，停止監聽")
-                                self._stop_flags[session_id] = True
-                                break
+                        # int16 或其他類型，直接轉換
+                        data_bytes = audio_chunk.astype(np.int16).tobytes()
+                else:
+                    # 其他未知類型
+                    logger.warning(f"[{session_id}] 未知的音訊數據類型: {type(audio_chunk)}")
+                    continue
+            
+            # DEBUG: 檢查音訊數據
+            logger.debug(f"[{session_id}] 收到音訊塊: {len(data_bytes)} bytes")
+            
+            # 推入 BufferManager
+            buffer_mgr.push(data_bytes)
+            
+            # DEBUG: 檢查 BufferManager 狀態
+            frames_ready = buffer_mgr.pop_all()
+            logger.debug(f"[{session_id}] BufferManager 產生 {len(frames_ready)} 個 frames")
+            
+            # 處理所有就緒的 frames
+            for idx, frame in enumerate(frames_ready):
+                # OpenWakeWord 模型需要的是 int16 值範圍的 float32（不是歸一化的）
+                # 即：-32768.0 到 32767.0 的 float32 值
+                # 使用 np.int16 確保正確處理有符號整數
+                audio_int16 = np.frombuffer(frame, dtype=np.int16)
+                audio_f32 = audio_int16.astype(np.float32)
                 
-            except Exception as e:
-                if "timeout" not in str(e).lower():
-                    logger.error(f"監聽循環錯誤 [{session_id}]: {e}")
-                    error_count += 1
-                    
-                    if error_count >= max_errors:
-                        logger.error(f"連續錯誤次數達到上限 [{session_id}]，停止監聽")
-                        self._stop_flags[session_id] = True
-                        break
-        
-        # 停止前處理殘餘資料
-        tail = buffer_mgr.flush()
-        if tail:
+                # 移除DC偏移（如果存在）
+                audio_mean = audio_f32.mean()
+                if abs(audio_mean) > 100:  # 如果平均值偏離太大
+                    logger.debug(f"[{session_id}] 偵測到DC偏移: {audio_mean:.2f}，進行修正")
+                    audio_f32 = audio_f32 - audio_mean
+                
+                # 智能振幅檢查：OpenWakeWord 需要 int16 範圍的 float32（-32768 到 32767）
+                # 但要避免過度處理已經良好的音訊
+                max_abs_val = np.abs(audio_f32).max()
+                
+                # 只有在音訊明顯太小（< 1000）或過大（> 30000）時才進行調整
+                if max_abs_val > 0 and max_abs_val < 1000:
+                    # 只對真正微弱的訊號進行適度放大
+                    scale_factor = 5000.0 / max_abs_val  # 溫和放大到 5000 左右
+                    audio_f32 = audio_f32 * scale_factor
+                    logger.debug(f"[{session_id}] 微弱訊號增強: 放大 {scale_factor:.2f}x "
+                               f"(原始範圍: ±{max_abs_val:.0f}, 新範圍: ±{max_abs_val * scale_factor:.0f})")
+                elif max_abs_val > 30000:
+                    # 防止削波，縮小過大的訊號
+                    scale_factor = 20000.0 / max_abs_val
+                    audio_f32 = audio_f32 * scale_factor
+                    logger.debug(f"[{session_id}] 削波防護: 縮小 {1/scale_factor:.2f}x "
+                               f"(原始範圍: ±{max_abs_val:.0f}, 新範圍: ±{max_abs_val * scale_factor:.0f})")
+                else:
+                    # 音訊品質良好，保持原貌
+                    logger.debug(f"[{session_id}] 音訊品質良好，維持原始範圍: ±{max_abs_val:.0f}")
+                
+                # DEBUG: 檢查 frame 資料
+                logger.debug(f"[{session_id}] Frame {idx}: shape={audio_f32.shape}, "
+                           f"min={audio_f32.min():.4f}, max={audio_f32.max():.4f}, "
+                           f"mean={audio_f32.mean():.4f}, std={audio_f32.std():.4f}")
+                
+                frames.append(audio_f32)
+        
+        if not frames:
+            return
+        
+        # 批次模式：交給批次執行緒與其他 session 合併推論
+        batcher = self._get_batcher()
+        if batcher:
+            batcher.submit(session_id, frames)
+            return
+        
+        for audio_f32 in frames:
+            # 偵測喚醒詞
             try:
-                audio_f32 = np.frombuffer(tail, dtype='<i2').astype(np.float32) / 32768.0
                 result = self.detect(audio_f32, session_id)
-                # detect 內部會觸發 callback
-            except Exception as e:
-                logger.error(f"處理尾端資料錯誤 [{session_id}]: {e}")
+                # detect 內部會觸發 callback（如果偵測到關鍵字）
+                
+                # 重置錯誤計數
+                session["error_count"] = 0
+                
+            except (WakewordAudioError, WakewordDetectionError) as e:
+                if self._record_error(session_id, session, e):
+                    return
+    
+    def _record_error(self, session_id: str, session: Dict[str, Any], error: Exception) -> bool:
+        """記錄偵測錯誤，連續錯誤達到上限時停止監聽
+        
+        Returns:
+            是否已停止監聽
+        """
+        max_errors = 10
+        logger.error(f"喚醒詞偵測錯誤 [{session_id}]: {error}")
+        session["error_count"] += 1
         
-        # 清理
-        self._cleanup_session(session_id)
-        logger.info(f"監聽執行緒結束 [{session_id}]")
+        if session["error_count"] >= max_errors and session.get("active"):
+            logger.error(f"連續錯誤次數達到上限 [{session_id}]，停止監聽")
+            session["active"] = False
+            audio_scheduler.unregister_source(session_id, "openwakeword")
+            return True
+        return False
+    
+    def _get_batcher(self) -> Optional[FrameBatcher]:
+        """取得批次推論佇列（未啟用時返回 None）"""
+        if self._batcher is None and self._config.batch_enabled and self._config.max_batch_size > 1:
+            with self._session_lock:
+                if self._batcher is None:
+                    self._batcher = FrameBatcher(
+                        self._run_batch,
+                        max_batch_size=self._config.max_batch_size,
+                        max_batch_latency=self._config.max_batch_latency,
+                        name="wakeword-batcher"
+                    )
+                    logger.info(f"喚醒詞批次推論已啟用 - max_batch_size={self._config.max_batch_size}, "
+                               f"max_batch_latency={self._config.max_batch_latency * 1000:.0f}ms")
+        return self._batcher
+    
+    def _run_batch(self, session_ids: list, frames: list):
+        """執行一個跨 session 批次（在批次執行緒中執行）"""
+        started = time.perf_counter()
+        try:
+            predictions = self._engine.predict_batch(session_ids, frames)
+        except Exception as e:
+            error = WakewordDetectionError(f"批次推論過程發生錯誤: {e}")
+            for session_id in session_ids:
+                session = self._sessions.get(session_id)
+                if session is not None:
+                    self._record_error(session_id, session, error)
+            return
+        
+        # 批次中每個 session 都等待整個批次完成
+        elapsed = time.perf_counter() - started
+        for session_id in session_ids:
+            metrics.observe(Stage.WAKEWORD, elapsed, session_id)
+        
+        for session_id, scores in zip(session_ids, predictions):
+            session = self._sessions.get(session_id)
+            if session is None or not session.get("active"):
+                continue
+            session["error_count"] = 0
+            # 偵測到關鍵字時會觸發 callback
+            self._handle_predictions(session_id, scores)
+    
+    def get_batch_stats(self) -> Optional[Dict[str, Any]]:
+        """取得批次推論統計（未啟用時返回 None）"""
+        return self._batcher.get_stats() if self._batcher else None
+    
+    def _finish_listening(self, session_id: str, session: Dict[str, Any]):
+        """停止監聽後的收尾：處理殘餘資料並清理資源
+        
+        Args:
+            session_id: Session ID
+            session: 註冊時的 session 資訊（已被新的監聽取代時不清理）
+        """
+        # 先依序處理還在批次佇列中的 frames（移除後不會再進入任何批次）
+        if self._batcher:
+            for audio_f32 in self._batcher.remove_session(session_id):
+                try:
+                    self.detect(audio_f32, session_id)
+                    # detect 內部會觸發 callback
+                except Exception as e:
+                    logger.error(f"處理待推論資料錯誤 [{session_id}]: {e}")
+                    break
+        
+        # 不足一個 frame（80ms）的殘餘資料無法產生新的分數，直接捨棄
+        buffer_mgr = self._buffer_managers.get(session_id)
+        if buffer_mgr:
+            buffer_mgr.flush()
+        
+        # 清理（同一 session 已重新開始監聽時保留新的資源）
+        with self._session_lock:
+            replaced = self._sessions.get(session_id, session) is not session
+        if not replaced:
+            self._cleanup_session(session_id)
+        logger.info(f"監聽結束 [{session_id}]")
     
     def _cleanup_session(self, session_id: str):
         """清理 session 相關資源
@@ -469,9 +551,9 @@ class OpenWakeword(SingletonMixin, IWakewordService):
             self._buffer_managers[session_id].reset()
             del self._buffer_managers[session_id]
         
-        # 清理停止旗標
-        if session_id in self._stop_flags:
-            del self._stop_flags[session_id]
+        # 清理特徵歷史
+        if self._engine:
+            self._engine.remove_session(session_id)
         
         # 清除防抖動追蹤
         keys_to_remove = [k for k in self._last_detection_time.keys() 
@@ -541,32 +623,29 @@ class OpenWakeword(SingletonMixin, IWakewordService):
         audio_queue.register_reader(session_id, "openwakeword")
         logger.debug(f"Registered OpenWakeWord as reader for session {session_id}")
         
-        # 建立監聽執行緒
-        def listen_loop():
-            self._listening_loop(session_id, callback)
+        # 儲存 session 資訊
+        session = {
+            "callback": callback,
+            "active": True,
+            "model_path": model_path,
+            "error_count": 0
+        }
+        with self._session_lock:
+            self._sessions[session_id] = session
         
-        # 建立並啟動執行緒
+        # 交給共用的排程器處理，有新音訊時才會佔用 worker
         try:
-            thread = threading.Thread(
-                target=listen_loop, 
-                daemon=True, 
-                name=f"wakeword-{session_id}"
+            audio_scheduler.register_source(
+                session_id,
+                "openwakeword",
+                lambda items: self._process_audio(session_id, items),
+                on_stop=lambda: self._finish_listening(session_id, session)
             )
-            
-            # 儲存 session 資訊
-            self._sessions[session_id] = {
-                "callback": callback,
-                "thread": thread,
-                "active": True,
-                "model_path": model_path
-            }
-            
-            thread.start()
             logger.info(f"成功開始監聽 session: {session_id}")
             return True
             
         except Exception as e:
-            raise WakewordSessionError(f"無法建立監聽執行緒: {e}") from e
+            raise WakewordSessionError(f"無法註冊音訊來源: {e}") from e
     
     def stop_listening(self, session_id: str) -> bool:
         """停止監聽指定 session
@@ -593,10 +672,6 @@ class OpenWakeword(SingletonMixin, IWakewordService):
             # 標記為非活動
             session["active"] = False
         
-        # 設置停止旗標
-        if session_id in self._stop_flags:
-            self._stop_flags[session_id] = True
-        
         # 清理該 session 的檢測時間記錄，避免下次重啟時誤觸發
         keys_to_remove = [key for key in self._last_detection_time.keys() if key.startswith(f"{session_id}_")]
         for key in keys_to_remove:
@@ -611,16 +686,8 @@ class OpenWakeword(SingletonMixin, IWakewordService):
             logger.debug(f"Cleared buffer manager for session {session_id}")
         
         try:
-            # 等待執行緒結束（最多等待 1 秒）
-            thread = session.get("thread")
-            if thread and thread.is_alive():
-                thread.join(timeout=1.0)
-                if thread.is_alive():
-                    logger.warning(f"Session {session_id} 執行緒未能及時停止")
-            
-            # 清理 session 記錄（不刪除，以便重新啟動）
-            # 保留 session 但標記為非活動
-            # del self._sessions[session_id]  # 不刪除，以便重新啟動
+            # 取消排程；正在處理中時最多等待 1 秒讓本輪結束
+            audio_scheduler.unregister_source(session_id, "openwakeword", timeout=1.0)
             
             logger.info(f"已停止監聽 session: {session_id}")
             return True
@@ -762,6 +829,10 @@ class OpenWakeword(SingletonMixin, IWakewordService):
         if session_id in self._buffer_managers:
             self._buffer_managers[session_id].reset()
         
+        # 重置特徵歷史
+        if self._engine:
+            self._engine.reset_session(session_id)
+        
         return True
     
     def get_session_state(self, session_id: str) -> Optional[Dict[str, Any]]:
@@ -779,7 +850,7 @@ class OpenWakeword(SingletonMixin, IWakewordService):
                 "active": session.get("active", False),
                 "model_path": session.get("model_path"),
                 "has_callback": session.get("callback") is not None,
-                "thread_alive": session.get("thread", None) and session["thread"].is_alive()
+                "scheduled": audio_scheduler.is_registered(session_id, "openwakeword")
             }
         return None
     
@@ -870,13 +941,26 @@ class OpenWakeword(SingletonMixin, IWakewordService):
         # 清除防抖動追蹤
         self._last_detection_time.clear()
         
+        # 停止批次執行緒
+        if self._batcher:
+            self._batcher.shutdown()
+            self._batcher = None
+        
         # 釋放模型
         self._model = None
+        self._engine = None
         self._initialized = False
         
         logger.info("OpenWakeword 服務已關閉")
     
     
+    def warm_up(self, session_id: str = "__warmup__") -> None:
+        """以一個靜音 frame 執行一次推論（啟動時暖機，melspectrogram / embedding / 分類模型各跑一次）"""
+        try:
+            self.detect(np.zeros(1280, dtype=np.int16), session_id=session_id)
+        finally:
+            self._cleanup_session(session_id)
+    
     def is_initialized(self) -> bool:
         """檢查服務是否已初始化"""
         return self._initialized
@@ -4,6 +4,7 @@ from pystorex import create_action
 from src.interface.action import Action
 from src.interface.strategy import Strategy
 from src.interface.wake import WakeActivateSource, WakeDeactivateSource
+from src.service.streaming_asr.hypothesis import join_text
 from src.utils.string_case import to_camel_case, add_title_prefix
 
 
@@ -58,6 +59,11 @@ receive_audio_chunk = create_action(
     lambda session_id, audio_data: {"session_id": session_id, "audio_data": audio_data},
 )
 
+audio_chunks_ingested = create_action(
+    add_session_title(Action.AUDIO_CHUNKS_INGESTED),
+    lambda session_id, count: {"session_id": session_id, "count": count},
+)
+
 clear_audio_buffer = create_action(
     add_session_title(Action.CLEAR_AUDIO_BUFFER),
     lambda session_id: session_id,
@@ -149,6 +155,21 @@ asr_stream_stopped = create_action(
     lambda session_id: session_id,
 )
 
+transcribe_partial = create_action(
+    add_session_title(Action.TRANSCRIBE_PARTIAL),
+    lambda session_id, committed, tentative: {
+        "session_id": session_id,
+        "text": join_text(committed, tentative),
+        "committed": committed,
+        "tentative": tentative,
+    },
+)
+
+transcribe_final = create_action(
+    add_session_title(Action.TRANSCRIBE_FINAL),
+    lambda session_id, result: {"session_id": session_id, "text": result.full_text, "result": result},
+)
+
 llm_reply_started = create_action(
     add_session_title(Action.LLM_REPLY_STARTED),
     lambda session_id: session_id,
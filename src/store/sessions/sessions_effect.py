@@ -5,7 +5,6 @@ Sessions Effects  with Timestamp Support
 
 import time
 import threading
-from concurrent.futures import ThreadPoolExecutor, Future
 from typing import Optional, Dict, List
 import numpy as np
 from pystorex.effects import create_effect
@@ -21,28 +20,25 @@ from src.interface.state import State
 
 # Services - 使用現有的服務，不重新發明輪子
 from src.core.audio_queue_manager import audio_queue, TimestampedAudio
+from src.core.audio_ingest import audio_ingest
+from src.core.ingest_workers import ingest_workers
+from src.core.metrics import Stage, metrics
+from src.core.post_pipeline import post_pipeline
+from src.core.speculative_asr import Speculation, speculative_asr
+from src.core.startup import startup
 from src.service.audio_converter import audio_converter
 from src.service.audio_enhancer import audio_enhancer
-
-# DeepFilterNet 是可選的 (需要 PyTorch)
-try:
-    from src.service.denoise.deepfilternet_denoiser import deepfilternet_denoiser
-
-    HAS_DEEPFILTERNET = True
-except (ImportError, AttributeError) as e:
-    logger.warning(f"DeepFilterNet not available: {e}")
-    deepfilternet_denoiser = None
-    HAS_DEEPFILTERNET = False
-
 from src.service.recording.recording import recording  # 使用現有的錄音服務
 from src.core.buffer_manager import BufferManager, BufferConfig
-from src.service.vad.silero_vad import silero_vad
-from src.service.wakeword.openwakeword import openwakeword
+from src.service.vad import silero_vad  # 延遲載入代理，停用時不匯入 onnxruntime
+from src.service.wakeword import openwakeword  # 延遲載入代理，停用時不載入模型
 from src.service.timer.timer_service import timer_service
+from src.service.streaming_asr import streaming_asr  # STREAMING 策略的增量轉譯（可停用）
 from src.provider.provider_manager import get_provider_manager, PoolConfig
+from src.provider.batch_scheduler import get_batch_scheduler
 from src.interface.asr_provider import TranscriptionResult
 
-# FSM Transitions - 直接使用 transitions library
+# FSM Transitions - 每個策略編譯一次的轉換表
 from src.core.fsm_transitions import BatchPlugin, NonStreamingPlugin, StreamingPlugin, SessionFSM
 from src.interface.strategy import Strategy
 
@@ -69,6 +65,8 @@ from src.store.sessions.sessions_action import (
     transcribe_done,
     asr_stream_started,
     asr_stream_stopped,
+    transcribe_partial,
+    transcribe_final,
     llm_reply_started,
     llm_replying,
     llm_reply_completed,
@@ -84,6 +82,30 @@ from src.store.sessions.sessions_action import (
 )
 
 
+# DeepFilterNet 是可選的 (需要 PyTorch)，第一次降噪時才匯入，避免啟動時載入 torch
+_deepfilternet_denoiser = None
+_deepfilternet_checked = False
+_deepfilternet_lock = threading.Lock()
+
+
+def _get_deepfilternet_denoiser():
+    """延遲匯入 DeepFilterNet 降噪器（無法使用時返回 None）"""
+    global _deepfilternet_denoiser, _deepfilternet_checked
+    if _deepfilternet_checked:
+        return _deepfilternet_denoiser
+    with _deepfilternet_lock:
+        if not _deepfilternet_checked:
+            try:
+                with startup.track("denoiser", label="DeepFilterNet"):
+                    from src.service.denoise.deepfilternet_denoiser import deepfilternet_denoiser
+
+                    _deepfilternet_denoiser = deepfilternet_denoiser
+            except (ImportError, AttributeError) as e:
+                logger.warning(f"DeepFilterNet not available: {e}")
+            _deepfilternet_checked = True
+    return _deepfilternet_denoiser
+
+
 # SessionState enum 已移除 - 現在完全使用 FSM 管理狀態
 # 所有狀態查詢都通過 _get_fsm_state() 和相關 helper methods
 
@@ -117,6 +139,10 @@ class SessionEffects:
         # 監控線程
         self._monitoring_threads: Dict[str, Dict[str, threading.Thread]] = {}
 
+        # 已交給後處理管線、尚未完成收集的 session（避免同一段語音重複觸發靜音超時）
+        self._pending_utterances: set = set()
+        self._pending_utterances_lock = threading.Lock()
+
         # 從配置載入參數 - 使用正確的 ConfigManager 路徑
         config = ConfigManager()
 
@@ -130,9 +156,8 @@ class SessionEffects:
         # Provider Pool
         self._init_provider_pool()
 
-        # ThreadPoolExecutor - 從 Provider Pool 配置取得
-        max_workers = config.providers.pool.thread_pool_max_workers
-        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        # 音訊資料平面：每個 chunk 前確保 session 正在監聽
+        audio_ingest.set_activator(self._ensure_listening)
 
         logger.info(
             f"SessionEffects initialized with pre-roll={self.pre_roll_duration}s, "
@@ -142,6 +167,7 @@ class SessionEffects:
     def _init_provider_pool(self):
         """初始化 Provider Pool - 使用單例"""
         self._provider_pool = get_provider_manager()  # 使用單例而不是創建新實例
+        self._batch_scheduler = get_batch_scheduler()  # 跨 session 批次轉譯（在 pool 之前）
         # 移除重複的日誌訊息，provider_manager 已經記錄了
 
     # === FSM 驗證輔助方法 ===
@@ -172,7 +198,7 @@ class SessionEffects:
         return self._fsm_instances.get(session_id)
 
     def _can_transition(self, session_id: str, action: str) -> bool:
-        """直接使用 transitions library 檢查狀態轉換是否合法
+        """使用 FSM 轉換表檢查狀態轉換是否合法
 
         Args:
             session_id: Session ID
@@ -186,7 +212,7 @@ class SessionEffects:
         if not fsm:
             return False
 
-        # 使用 transitions 的 may_trigger() API
+        # 查詢策略的轉換表
         return fsm.may_trigger(action)
 
     def _trigger_transition(self, session_id: str, action: str) -> bool:
@@ -205,7 +231,7 @@ class SessionEffects:
             return False
 
         try:
-            # 使用 transitions 的 trigger() API 觸發狀態轉換
+            # 使用 FSM 的 trigger() API 觸發狀態轉換
             old_state = fsm.state
             logger.info(
                 f"🔄 FSM Transition: [{session_id}] Triggering '{action}' from state '{old_state}'"
@@ -229,6 +255,10 @@ class SessionEffects:
             logger.error(f"Failed to trigger transition '{action}' for session {session_id}: {e}")
             return False
 
+    def _is_streaming_session(self, session_id: str) -> bool:
+        """Session 是否使用串流轉譯（STREAMING 策略且串流轉譯服務已啟用）"""
+        return self._session_strategies.get(session_id) == Strategy.STREAMING and bool(streaming_asr)
+
     def _get_valid_actions(self, session_id: str) -> List[str]:
         """獲取當前狀態下可執行的所有動作
 
@@ -276,7 +306,7 @@ class SessionEffects:
     def _is_in_state(self, session_id: str, state: str) -> bool:
         """檢查是否在特定狀態
 
-        注意：這個方法將被移除，改用 transitions 原生的 is_<state>() 方法
+        注意：這個方法將被移除，改用 FSM 原生的 is_<state>() 方法
         """
         fsm = self._get_or_create_fsm(session_id)
         if not fsm:
@@ -286,7 +316,7 @@ class SessionEffects:
     def _is_idle(self, session_id: str) -> bool:
         """檢查是否在 idle 狀態
 
-        使用 transitions 原生的 is_idle() 方法
+        使用 FSM 原生的 is_idle() 方法
         """
         fsm = self._get_or_create_fsm(session_id)
         if not fsm:
@@ -296,12 +326,12 @@ class SessionEffects:
     def _is_processing(self, session_id: str) -> bool:
         """檢查是否在 processing 狀態（包含所有子狀態）
 
-        使用 transitions 原生的 is_processing(allow_substates=True)
+        使用 FSM 原生的 is_processing(allow_substates=True)
         """
         fsm = self._get_or_create_fsm(session_id)
         if not fsm:
             return False
-        # 使用 transitions 的原生方法檢查狀態（包含子狀態）
+        # 使用 FSM 的原生方法檢查狀態（包含子狀態）
         return (
             fsm.is_processing(allow_substates=True)
             if hasattr(fsm, "is_processing")
@@ -322,7 +352,7 @@ class SessionEffects:
     def _is_activated(self, session_id: str) -> bool:
         """檢查是否已被喚醒（在 activated 子狀態）
 
-        使用 transitions 原生的 is_processing_activated() 方法
+        使用 FSM 原生的 is_processing_activated() 方法
         """
         fsm = self._get_or_create_fsm(session_id)
         if not fsm:
@@ -336,7 +366,7 @@ class SessionEffects:
     def _is_recording(self, session_id: str) -> bool:
         """檢查是否在錄音中
 
-        使用 transitions 原生的 is_processing_recording() 方法
+        使用 FSM 原生的 is_processing_recording() 方法
         """
         fsm = self._get_or_create_fsm(session_id)
         if not fsm:
@@ -350,7 +380,7 @@ class SessionEffects:
     def _is_transcribing(self, session_id: str) -> bool:
         """檢查是否在轉譯中
 
-        使用 transitions 原生的 is_processing_transcribing() 方法
+        使用 FSM 原生的 is_processing_transcribing() 方法
         """
         fsm = self._get_or_create_fsm(session_id)
         if not fsm:
@@ -377,116 +407,42 @@ class SessionEffects:
         )
 
     def _process_audio_chunk(self, action):
-        """處理音頻片段 - 使用 session 的音訊配置"""
-        payload = action.payload
-        session_id = payload.get("session_id")
-        audio_data = payload.get("audio_data")
-
-        # 記錄接收到的音訊格式（只記錄第一次）
-        # import numpy as np
-        # if not hasattr(self, '_first_audio_logged'):
-        #     self._process_audio_chunk = {}
-        # if session_id not in self._first_audio_logged:
-        #     self._first_audio_logged[session_id] = True
-        #     if isinstance(audio_data, (bytes, bytearray)):
-        #         logger.info(f"📥 [EFFECT_RECEIVED] First audio received for {session_id}: {len(audio_data)} bytes")
-        #     elif isinstance(audio_data, np.ndarray):
-        #         logger.info(f"📥 [EFFECT_RECEIVED] First audio received for {session_id}: shape={audio_data.shape}, dtype={audio_data.dtype}")
-
-        # 從 selector 取得 session 的音訊配置
-        from src.store.main_store import store
-        from src.store.sessions.sessions_selector import get_session_audio_config
-
-        audio_config = get_session_audio_config(session_id)(store.state)
-
-        if not audio_config:
-            logger.error(f"Session {session_id} has no audio configuration!")
-            logger.error(
-                "Audio config must be set when session is created or via SET_AUDIO_METADATA"
-            )
-            return
-
-        # 從 session 的音訊配置取得參數
-        actual_sample_rate = audio_config.get("sample_rate")  # , 16000
-        actual_channels = audio_config.get("channels")  # , 1
-        actual_format = audio_config.get("format")  # , 'pcm_s16le'
+        """處理經由 store 送入的音訊片段（相容路徑）
 
-        # # 只記錄第一次的配置
-        # if not hasattr(self, '_first_config_logged'):
-        #     self._first_config_logged = {}
-        # if session_id not in self._first_config_logged:
-        #     self._first_config_logged[session_id] = True
-        #     logger.info(f"📋 [EFFECT_CONFIG] Session audio config for {session_id}: {actual_sample_rate}Hz, "
-        #                 f"{actual_channels}ch, {actual_format}")
+        API 層應直接使用 audio_ingest.ingest()；這裡交給同一個資料平面處理，
+        接收計數已由 reducer 更新，不重複計算。
+        """
+        payload = action.payload
+        audio_ingest.ingest(
+            payload.get("session_id"), payload.get("audio_data"), track_stats=False
+        )
 
-        # 獲取或初始化 session 狀態
+    def _ensure_listening(self, session_id: str):
+        """資料平面每個 chunk 前呼叫：session 不在 processing 狀態時開始監聽與喚醒詞監控"""
         # 使用 FSM 狀態查詢，不再需要手動設置狀態
         # FSM 在創建時已經是 idle 狀態，start_listening 會轉換到 processing
         fsm = self._get_or_create_fsm(session_id)
         # 使用原生方法檢查是否在 processing 狀態（包含子狀態）
         if fsm and not (hasattr(fsm, "is_processing") and fsm.is_processing(allow_substates=True)):
             # 如果不在 processing 狀態，使用原生方法觸發 start_listening
-            if fsm:
-                old_state = fsm.state
-                if hasattr(fsm, "start_listening"):
-                    fsm.start_listening()
-                else:
-                    fsm.trigger("start_listening")
-                logger.info(f"✅ FSM: [{session_id}] {old_state} → {fsm.state}")
+            old_state = fsm.state
+            if hasattr(fsm, "start_listening"):
+                fsm.start_listening()
+            else:
+                fsm.trigger("start_listening")
+            logger.info(f"✅ FSM: [{session_id}] {old_state} → {fsm.state}")
             self._start_wake_word_monitoring(session_id)
 
-        # 記錄轉換過程（只記錄第一次）
-        # if not hasattr(self, '_first_convert_logged'):
-        #     self._first_convert_logged = {}
-
-        # # 如果採樣率不是 16000，需要轉換（ASR 需要 16kHz）
-        if actual_sample_rate != 16000:
-            #     if session_id not in self._first_convert_logged:
-            #         self._first_convert_logged[session_id] = True
-            #         logger.info(f"🔄 [EFFECT_CONVERT] Converting audio from {actual_sample_rate}Hz to 16000Hz for ASR")
-
-            from src.service.audio_converter import audio_converter
-
-            # 使用 audio_converter 服務進行採樣率轉換
-            try:
-                converted_audio = audio_converter.convert_audio(
-                    audio_data,
-                    source_sample_rate=actual_sample_rate,
-                    source_channels=actual_channels,
-                )
-                # if session_id in self._first_convert_logged and self._first_convert_logged[session_id]:
-                #     self._first_convert_logged[session_id] = False  # 標記已經記錄過
-                #     if isinstance(converted_audio, np.ndarray):
-                #         logger.info(f"✅ [EFFECT_CONVERTED] Audio converted: shape={converted_audio.shape}, dtype={converted_audio.dtype}")
-                #     else:
-                #         logger.info(f"✅ [EFFECT_CONVERTED] Audio converted: {len(converted_audio)} bytes")
-            except Exception as e:
-                logger.error(f"Failed to convert audio sample rate: {e}")
-                logger.warning("Using original audio data - ASR may not work properly")
-                converted_audio = audio_data
-        else:
-            converted_audio = audio_data
-            # if session_id not in self._first_convert_logged:
-            #     # self._first_convert_logged[session_id] = True
-            #     logger.info(f"✅ [EFFECT_NO_CONVERT] Audio already at 16kHz, no conversion needed")
-
-        # 推送到時間戳隊列（只記錄第一次）
-        # if not hasattr(self, '_first_queue_logged'):
-        #     self._first_queue_logged = {}
-        timestamp = audio_queue.push(session_id, converted_audio)
-        # if session_id not in self._first_queue_logged:
-        #     self._first_queue_logged[session_id] = True
-        #     logger.info(f"📤 [EFFECT->QUEUE] First audio pushed to queue at timestamp {timestamp:.3f}")
-
-        # if timestamp > 0:
-        #     logger.trace(f"Audio pushed to queue at {timestamp:.3f} for session {session_id}")
-
     # === Wake Word Detection ===
 
     def _start_wake_word_monitoring(self, session_id: str):
         """啟動喚醒詞監控線程 - 使用 OpenWakeWord 服務"""
         logger.info(f"🎤 Starting wake word monitoring for session {session_id}")
 
+        if not openwakeword:
+            logger.warning(f"OpenWakeWord 服務已停用，session {session_id} 不監控喚醒詞")
+            return
+
         # 確保 OpenWakeWord 已初始化
         if not openwakeword.is_initialized():
             openwakeword.initialize()
@@ -542,7 +498,7 @@ class SessionEffects:
             valid_triggers = []
             if fsm:
                 # 獲取可用的觸發器
-                for trigger in fsm.machine.get_triggers(current_state):
+                for trigger in fsm.get_triggers(current_state):
                     valid_triggers.append(trigger)
             logger.warning(
                 f"Failed to trigger 'wake_activated' for session {session_id}. "
@@ -568,6 +524,13 @@ class SessionEffects:
         logger.info(f"🧹 清除 session {session_id} 的 audio_queue，避免喚醒詞干擾 ASR")
         audio_queue.clear(session_id)
 
+        # STREAMING 策略：不錄音，由串流轉譯服務邊收音邊解碼，VAD 靜音超時時結束串流
+        if self._is_streaming_session(session_id):
+            self._start_vad_monitoring(session_id)
+            self.store.dispatch(wake_activated(session_id, source))
+            self.store.dispatch(asr_stream_started(session_id))
+            return
+
         # 使用現有的 Recording 服務開始錄音
         recording_metadata = {
             "wake_time": timestamp,
@@ -629,6 +592,10 @@ class SessionEffects:
         # 獲取喚醒詞時間戳（VAD 應從喚醒詞檢測時間開始）
         wake_timestamp = self._wake_word_timestamps.get(session_id)
 
+        if not silero_vad:
+            logger.warning(f"Silero VAD 服務已停用，session {session_id} 不監控語音活動")
+            return
+
         # 確保 Silero VAD 已初始化
         if not silero_vad.is_initialized():
             silero_vad._ensure_initialized()
@@ -654,8 +621,9 @@ class SessionEffects:
                         f"🎤 Speech detected (confidence: {confidence:.3f}), silence timer reset"
                     )
                     silence_start = None
-                    # 停止靜音計時器
+                    # 停止靜音計時器，放棄這段靜音開始時的推測轉譯
                     timer_service.stop_timer(session_id)
+                    speculative_asr.cancel(session_id)
                 else:
                     logger.debug(f"🎤 Speech continues (confidence: {confidence:.3f})")
                 # 派發語音檢測 action
@@ -663,10 +631,12 @@ class SessionEffects:
             else:
                 # 只在錄音狀態下，且尚未開始計時的情況下啟動新的靜音計時器
                 fsm = self._get_or_create_fsm(session_id)
-                is_recording = (
-                    fsm
-                    and hasattr(fsm, "is_processing_recording")
-                    and fsm.is_processing_recording()
+                is_recording = fsm and (
+                    (hasattr(fsm, "is_processing_recording") and fsm.is_processing_recording())
+                    # 串流轉譯中同樣以靜音超時結束這一輪
+                    or (hasattr(fsm, "is_processing_transcribing")
+                        and fsm.is_processing_transcribing()
+                        and self._is_streaming_session(session_id))
                 )
                 if silence_start is None and is_recording:
                     silence_start = current_time
@@ -683,6 +653,9 @@ class SessionEffects:
                         self.silence_threshold,
                         lambda sid: self._on_silence_timeout(sid, current_time),
                     )
+                    # 等待靜音超時的同時先轉譯目前為止的錄音
+                    if speculative_asr.enabled and not self._is_streaming_session(session_id):
+                        self._start_speculation(session_id, current_time)
 
         # 使用 Silero VAD 服務的 start_listening 方法
         # 這會自動處理 BufferManager 和音訊分塊
@@ -699,25 +672,103 @@ class SessionEffects:
 
         # 不需要手動線程管理，Silero VAD 服務會處理
 
+    def _start_speculation(self, session_id: str, silence_start: float):
+        """靜音開始時提交推測轉譯（錄音開始到靜音開始的音訊）"""
+        recording_start = self._recording_start_timestamps.get(session_id, 0)
+        audio_chunks = audio_queue.get_audio_between_timestamps(
+            session_id, recording_start, silence_start
+        )
+        if not audio_chunks:
+            return
+
+        audio = self._combine_audio_chunks(audio_chunks)
+        speculative_asr.start(
+            session_id, audio, lambda audio: self._transcribe_speculative(session_id, audio)
+        )
+
+    def _transcribe_speculative(self, session_id: str, audio: np.ndarray) -> Optional[TranscriptionResult]:
+        """推測 worker：與靜音超時後相同的前處理與轉譯，但不派發任何 action"""
+        # 有錄音檔時最終流程直接轉譯原始音訊，否則先降噪與增強
+        if not recording.is_recording(session_id):
+            audio = self._enhance_audio(session_id, audio)
+        if audio.size == 0:
+            return None
+        # 以獨立的租用 ID 避免佔用 session 的配額（推測被丟棄時最終轉譯可能同時進行）
+        return self._run_asr(session_id, audio, lease_id=f"{session_id}:speculative", speculative=True)
+
     def _on_silence_timeout(self, session_id: str, timestamp: float):
         """處理靜音超時事件 - 批量後處理音頻"""
         logger.info(f"⏰ Silence timeout at {timestamp:.3f} for session {session_id}")
+        # timestamp 是靜音開始（語音結束）的時間，結果送出時量測整段延遲
+        metrics.observe(Stage.SILENCE_TIMEOUT, time.time() - timestamp, session_id)
+        metrics.mark(session_id, "speech_end", timestamp)
+
+        if self._is_streaming_session(session_id) and streaming_asr.is_streaming(session_id):
+            # 串流轉譯：結束串流，最終結果由 asr_stream_stopped 送出
+            self.store.dispatch(asr_stream_stopped(session_id))
+            audio_queue.clear(session_id)
+            self._cleanup_for_next_round(session_id)
+            return
 
         # 計算結束時間（加上尾部填充）
         recording_end = timestamp + self.tail_padding_duration
 
+        with self._pending_utterances_lock:
+            if session_id in self._pending_utterances:
+                logger.debug(f"Utterance for session {session_id} is already queued for post-processing")
+                return
+            self._pending_utterances.add(session_id)
+
+        # 靜音期間沒有恢復說話，靜音開始時的推測結果就是這段語音的結果
+        speculation = speculative_asr.claim(session_id)
+
+        # 停止錄音、降噪與轉譯都交給後處理管線，不佔用 timer 執行緒
+        accepted = post_pipeline.submit(
+            session_id,
+            collect=lambda _: self._collect_utterance(session_id, recording_end, speculation),
+            dsp=lambda utterance: self._preprocess_utterance(session_id, utterance),
+            asr=lambda prepared: self._transcribe_utterance(session_id, prepared),
+            finalizer=lambda: self._finish_utterance(session_id),
+        )
+        if not accepted:
+            if speculation is not None:
+                speculative_asr.discard(speculation)
+            self._drop_utterance(session_id, recording_end)
+
+    def _collect_utterance(
+        self, session_id: str, recording_end: float, speculation: Optional[Speculation] = None
+    ) -> Optional[Dict]:
+        """後處理管線 collect 階段：停止錄音並收集這段語音
+
+        Returns:
+            {"chunks": 音頻片段, "filepath": 錄音檔案路徑, "speculation": 推測轉譯}；
+            沒有收集到音訊時返回 None
+        """
         # FSM 會通過 record_stopped trigger 轉換狀態
         # 不需要手動設置狀態
+        try:
+            # 停止錄音服務（等待 WAV 檔關閉）
+            recording_info = recording.stop_recording(session_id)
 
-        # 停止錄音服務
-        recording_info = recording.stop_recording(session_id)
+            # 收集錄音數據進行後處理
+            recording_start = self._recording_start_timestamps.get(session_id, 0)
+            audio_chunks = audio_queue.get_audio_between_timestamps(
+                session_id, recording_start, recording_end
+            )
 
-        # 收集錄音數據進行後處理
-        recording_start = self._recording_start_timestamps.get(session_id, 0)
-        audio_chunks = audio_queue.get_audio_between_timestamps(
-            session_id, recording_start, recording_end
-        )
+            self._dispatch_record_stopped(session_id, recording_end, recording_info)
+        finally:
+            with self._pending_utterances_lock:
+                self._pending_utterances.discard(session_id)
+
+        recording_filepath = recording_info.get("filepath") if recording_info else None
+        if not recording_filepath and not audio_chunks:
+            logger.warning(f"No audio collected for session {session_id}")
+            return None
+
+        return {"chunks": audio_chunks, "filepath": recording_filepath, "speculation": speculation}
 
+    def _dispatch_record_stopped(self, session_id: str, recording_end: float, recording_info: Optional[Dict]):
         # 使用原生方法觸發 FSM 狀態轉換
         fsm = self._get_or_create_fsm(session_id)
         if fsm and hasattr(fsm, "record_stopped"):
@@ -732,38 +783,19 @@ class SessionEffects:
             )
         )
 
-        # 批量後處理收集到的音頻 - 傳遞錄音檔案路徑
-        recording_filepath = recording_info.get("filepath") if recording_info else None
-        if recording_filepath:
-            # 使用錄音檔案進行轉譯
-            self._batch_process_audio(session_id, audio_chunks, recording_filepath)
-        elif audio_chunks:
-            # 沒有錄音檔案時使用音頻chunks
-            self._batch_process_audio(session_id, audio_chunks, None)
-        else:
-            logger.warning(f"No audio collected for session {session_id}")
-
-        # 清空 audio queue，準備下一次對話
-        audio_queue.clear(session_id)
-        logger.debug(f"Cleared audio queue for session {session_id}")
+    def _preprocess_utterance(self, session_id: str, utterance: Dict) -> Dict:
+        """後處理管線 dsp 階段：合併音訊；沒有錄音檔案時降噪與增強
 
-        # 不需要 reset，FSM 會自動從 processing_transcribing 回到 processing_activated
-        # 但需要清理一些臨時狀態並重新啟動喚醒詞監控
-        self._cleanup_for_next_round(session_id)
+        Returns:
+            {"audio": 待轉譯音訊, "filepath": 錄音檔案路徑, "from_file": 是否以錄音檔案轉譯}
+        """
+        audio_chunks = utterance["chunks"]
+        recording_filepath = utterance["filepath"]
 
-    def _batch_process_audio(
-        self,
-        session_id: str,
-        audio_chunks: List[TimestampedAudio],
-        recording_filepath: Optional[str] = None,
-    ):
-        """批量處理錄音數據（降噪、增強、ASR）
+        if utterance.get("speculation") is not None:
+            # 已有推測轉譯，轉譯階段直接等待它的結果
+            return utterance
 
-        Args:
-            session_id: Session ID
-            audio_chunks: 音頻片段列表
-            recording_filepath: 錄音檔案路徑（如果有的話）
-        """
         if recording_filepath:
             logger.info(f"Processing recording file for session {session_id}: {recording_filepath}")
 
@@ -771,8 +803,16 @@ class SessionEffects:
             import os
 
             if os.path.exists(recording_filepath):
-                self._transcribe_recording_file(session_id, recording_filepath)
-                return
+                # 錄音檔的內容就是 audio_queue 中這段音訊，預設直接轉譯記憶體中的資料，不重新讀檔
+                config = ConfigManager()
+                recording_config = getattr(config.services, "recording", None)
+                read_file = getattr(recording_config, "transcribe_from_file", False)
+                audio = None
+                if audio_chunks and not read_file:
+                    audio = self._combine_audio_chunks(audio_chunks)
+                    if audio.size == 0:
+                        audio = None
+                return {"audio": audio, "filepath": recording_filepath, "from_file": True}
             else:
                 logger.warning(
                     f"Recording file not found: {recording_filepath}, falling back to audio chunks"
@@ -789,11 +829,18 @@ class SessionEffects:
 
         # 合併音頻片段
         combined_audio = self._combine_audio_chunks(audio_chunks)
+        enhanced_audio = self._enhance_audio(session_id, combined_audio)
+
+        return {"audio": enhanced_audio, "filepath": recording_filepath, "from_file": False}
 
+    def _enhance_audio(self, session_id: str, combined_audio: np.ndarray) -> np.ndarray:
+        """依配置降噪與增強音訊"""
         config = ConfigManager()
+        started = time.perf_counter()
 
         # 步驟 1: 降噪（可選）
-        if config.services.denoiser.enabled and HAS_DEEPFILTERNET:
+        deepfilternet_denoiser = _get_deepfilternet_denoiser() if config.services.denoiser.enabled else None
+        if deepfilternet_denoiser is not None:
             logger.info(f"Applying noise reduction for session {session_id}")
             try:
                 # DeepFilterNet 自動處理採樣率轉換 (16k→48k→16k)
@@ -805,7 +852,7 @@ class SessionEffects:
                 logger.warning(f"Denoising failed: {e}, using original audio")
                 denoised_audio = combined_audio
         else:
-            if config.services.denoiser.enabled and not HAS_DEEPFILTERNET:
+            if config.services.denoiser.enabled:
                 logger.warning(
                     "DeepFilterNet not available (PyTorch not installed), skipping denoising"
                 )
@@ -825,56 +872,78 @@ class SessionEffects:
         else:
             enhanced_audio = denoised_audio
 
-        # 步驟 3: ASR 處理
-        config = ConfigManager()
         # 將 enhanced_audio 從 bytes 轉換為 numpy array (如果需要)
         if isinstance(enhanced_audio, bytes):
             enhanced_audio = np.frombuffer(enhanced_audio, dtype=np.int16)
 
-        # MVP 版本需要先將音訊寫入臨時檔案
-        import tempfile
-        import soundfile as sf
-        import os
+        metrics.observe(Stage.ENHANCE, time.perf_counter() - started, session_id)
+        return enhanced_audio
+
+    def _transcribe_utterance(self, session_id: str, prepared: Dict) -> None:
+        """後處理管線 asr 階段：轉譯並送出 transcribe_done"""
+        speculation = prepared.get("speculation")
+        if speculation is not None:
+            result = speculative_asr.result(speculation)
+            if result is not None:
+                logger.info(f"🔮 Using speculative transcription for session {session_id}")
+                self.store.dispatch(transcribe_started(session_id, prepared["filepath"]))
+                self._dispatch_transcribe_done(session_id, result)
+                return
+            # 推測失敗：照原本的流程前處理後轉譯
+            prepared = self._preprocess_utterance(session_id, dict(prepared, speculation=None))
+
+        if prepared["from_file"]:
+            self._transcribe_recording_file(session_id, prepared["filepath"], audio=prepared["audio"])
+            return
+
+        enhanced_audio = prepared["audio"]
 
-        # 建立臨時檔案用於轉譯
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            temp_filename = temp_file.name
+        # 直接以 numpy array 轉譯，不經過暫存 WAV 檔
+        result = None  # 初始化 result
+        if enhanced_audio.size == 0:
+            logger.warning(f"Empty audio for session {session_id}, skipping transcription")
+        else:
             try:
-                # 確保音訊是 float32 格式 (-1.0 到 1.0)
-                if enhanced_audio.dtype == np.int16:
-                    audio_float32 = enhanced_audio.astype(np.float32) / 32768.0
-                else:
-                    audio_float32 = enhanced_audio
+                result = self._run_asr(session_id, enhanced_audio)
+                if result:
+                    logger.info(f"Transcription result: {result.full_text[:100]}...")
+            except Exception as e:
+                logger.error(f"Transcription error: {e}")
+                self.store.dispatch(error_raised(session_id, str(e)))
 
-                # 寫入 WAV 檔案
-                sf.write(temp_filename, audio_float32, 16000)
-                logger.debug(f"Written temporary audio file: {temp_filename}")
+        self._dispatch_transcribe_done(session_id, result)
 
-                # 使用 lease_context 而非 lease（lease 返回 tuple，lease_context 是 context manager）
-                result = None  # 初始化 result
-                with self._provider_pool.lease_context(
-                    session_id, timeout=config.providers.pool.lease_timeout
-                ) as (provider, error):
-                    if provider:
-                        try:
-                            # MVP 版本使用 transcribe_file 方法
-                            result = provider.transcribe_file(temp_filename)
-                            logger.info(f"Transcription result: {result.full_text[:100]}...")
+    def _run_asr(
+        self, session_id: str, audio: np.ndarray, lease_id: Optional[str] = None,
+        speculative: bool = False
+    ) -> Optional[TranscriptionResult]:
+        """以批次排程器或 provider pool 轉譯記憶體中的音訊
 
-                        except Exception as e:
-                            logger.error(f"Transcription error: {e}")
-                            self.store.dispatch(error_raised(session_id, str(e)))
-                    else:
-                        logger.error(f"Failed to get provider for session {session_id}: {error}")
+        Args:
+            lease_id: 向 provider pool 租用時使用的 ID（預設為 session_id）
+            speculative: 推測轉譯；不進入批次排程器，避免與真正的最終轉譯排在同一個批次佇列
 
-            finally:
-                # 清理臨時檔案
-                try:
-                    os.unlink(temp_filename)
-                    logger.debug(f"Removed temporary audio file: {temp_filename}")
-                except Exception as e:
-                    logger.warning(f"Failed to remove temporary file {temp_filename}: {e}")
+        Returns:
+            轉譯結果；無法租用 provider 時返回 None。轉譯失敗時拋出例外
+        """
+        stage = Stage.SPECULATIVE_DECODE if speculative else Stage.DECODE
+        if self._batch_scheduler.enabled and not speculative:
+            # 與同時結束的其他 session 合併成一次批次推論（decode 含等待組成批次的時間）
+            with metrics.timer(stage, session_id):
+                return self._batch_scheduler.transcribe(session_id, audio)
+
+        config = ConfigManager()
+        # 使用 lease_context 而非 lease（lease 返回 tuple，lease_context 是 context manager）
+        with self._provider_pool.lease_context(
+            lease_id or session_id, timeout=config.providers.pool.lease_timeout
+        ) as (provider, error):
+            if not provider:
+                logger.error(f"Failed to get provider for session {session_id}: {error}")
+                return None
+            with metrics.timer(stage, session_id):
+                return provider.transcribe_audio(audio, session_id=session_id)
 
+    def _dispatch_transcribe_done(self, session_id: str, result: Optional[TranscriptionResult]):
         # 使用原生方法觸發 FSM 狀態轉換
         fsm = self._get_or_create_fsm(session_id)
         if fsm and hasattr(fsm, "transcribe_done"):
@@ -882,9 +951,10 @@ class SessionEffects:
             fsm.transcribe_done()
             logger.info(f"✅ FSM: [{session_id}] {old_state} → {fsm.state}")
 
-        # Dispatch transcribe_done action with result
+        # Dispatch transcribe_done action with result（API 層送出結果時量測 publish 延遲）
+        metrics.mark(session_id, "decoded")
         self.store.dispatch(transcribe_done(session_id, result))
-        
+
         # 停止 ASR 回饋音
         self.store.dispatch(play_asr_feedback(session_id, "stop"))
         logger.info(f"🔇 Dispatched ASR feedback stop for session {session_id}")
@@ -892,12 +962,43 @@ class SessionEffects:
         # Reset session 只在最後統一處理，避免重複調用
         # self._reset_session(session_id)  # 移到 handle_transcribe_done 統一處理
 
-    def _transcribe_recording_file(self, session_id: str, filepath: str):
+    def _finish_utterance(self, session_id: str):
+        """後處理結束（含失敗）：準備下一次對話"""
+        if session_id not in self._fsm_instances:
+            # 後處理期間 session 已被刪除
+            return
+
+        # 清空 audio queue，準備下一次對話
+        audio_queue.clear(session_id)
+        logger.debug(f"Cleared audio queue for session {session_id}")
+
+        # 不需要 reset，FSM 會自動從 processing_transcribing 回到 processing_activated
+        # 但需要清理一些臨時狀態並重新啟動喚醒詞監控
+        self._cleanup_for_next_round(session_id)
+
+    def _drop_utterance(self, session_id: str, recording_end: float):
+        """後處理管線已滿：放棄這段語音，FSM 與客戶端照常進入下一輪"""
+        logger.error(f"❌ Post-processing pipeline is full, dropping utterance for session {session_id}")
+
+        # 只送出停止信號，不在 timer 執行緒上等待 WAV 檔關閉
+        recording_info = recording.stop_recording(session_id, wait=False)
+        self._dispatch_record_stopped(session_id, recording_end, recording_info)
+        with self._pending_utterances_lock:
+            self._pending_utterances.discard(session_id)
+        self.store.dispatch(error_raised(session_id, "Post-processing pipeline is full"))
+        self._dispatch_transcribe_done(session_id, None)
+        self._finish_utterance(session_id)
+
+    def _transcribe_recording_file(
+        self, session_id: str, filepath: str, audio: Optional[np.ndarray] = None
+    ):
         """直接使用錄音檔案進行轉譯
 
         Args:
             session_id: Session ID
             filepath: 錄音檔案路徑
+            audio: 與錄音檔內容相同的記憶體音訊（int16 或 float32）；
+                   提供時直接轉譯，不再重新讀取剛寫入的檔案
         """
         logger.info(f"Transcribing recording file: {filepath}")
 
@@ -908,48 +1009,52 @@ class SessionEffects:
         result = None  # 初始化 result
 
         try:
-            # 使用 lease_context 取得 ASR provider
-            with self._provider_pool.lease_context(
-                session_id, timeout=config.providers.pool.lease_timeout
-            ) as (provider, error):
-                if provider:
-                    try:
-                        # 直接使用錄音檔案進行轉譯
-                        result = provider.transcribe_file(filepath)
-
-                        if result and result.full_text:
-                            logger.info(f"✅ Transcription successful for {session_id}")
-                            logger.block("📝 Transcription:", [result.full_text])
-
-                        else:
-                            logger.warning(f"Empty transcription result for {session_id}")
-
-                    except Exception as e:
-                        logger.error(f"Transcription error: {e}")
-                        self.store.dispatch(error_raised(session_id, str(e)))
+            if audio is not None and self._batch_scheduler.enabled:
+                # 與同時結束的其他 session 合併成一次批次推論
+                try:
+                    with metrics.timer(Stage.DECODE, session_id):
+                        result = self._batch_scheduler.transcribe(session_id, audio)
+                except Exception as e:
+                    logger.error(f"Transcription error: {e}")
+                    self.store.dispatch(error_raised(session_id, str(e)))
                 else:
-                    logger.error(f"Failed to get provider for session {session_id}: {error}")
+                    if result and result.full_text:
+                        logger.info(f"✅ Transcription successful for {session_id}")
+                        logger.block("📝 Transcription:", [result.full_text])
+                    else:
+                        logger.warning(f"Empty transcription result for {session_id}")
+            else:
+                # 使用 lease_context 取得 ASR provider
+                with self._provider_pool.lease_context(
+                    session_id, timeout=config.providers.pool.lease_timeout
+                ) as (provider, error):
+                    if provider:
+                        try:
+                            with metrics.timer(Stage.DECODE, session_id):
+                                if audio is not None:
+                                    result = provider.transcribe_audio(audio, session_id=session_id)
+                                else:
+                                    # 直接使用錄音檔案進行轉譯
+                                    result = provider.transcribe_file(filepath)
+
+                            if result and result.full_text:
+                                logger.info(f"✅ Transcription successful for {session_id}")
+                                logger.block("📝 Transcription:", [result.full_text])
+
+                            else:
+                                logger.warning(f"Empty transcription result for {session_id}")
+
+                        except Exception as e:
+                            logger.error(f"Transcription error: {e}")
+                            self.store.dispatch(error_raised(session_id, str(e)))
+                    else:
+                        logger.error(f"Failed to get provider for session {session_id}: {error}")
 
         except Exception as e:
             logger.error(f"Failed to transcribe recording: {e}")
             self.store.dispatch(error_raised(session_id, str(e)))
 
-        # 使用原生方法觸發 FSM 狀態轉換
-        fsm = self._get_or_create_fsm(session_id)
-        if fsm and hasattr(fsm, "transcribe_done"):
-            old_state = fsm.state
-            fsm.transcribe_done()
-            logger.info(f"✅ FSM: [{session_id}] {old_state} → {fsm.state}")
-
-        # Dispatch transcribe_done action with result
-        self.store.dispatch(transcribe_done(session_id, result))
-        
-        # 停止 ASR 回饋音
-        self.store.dispatch(play_asr_feedback(session_id, "stop"))
-        logger.info(f"🔇 Dispatched ASR feedback stop for session {session_id}")
-
-        # Reset session 只在最後統一處理，避免重複調用
-        # self._reset_session(session_id)  # 移到 handle_transcribe_done 統一處理
+        self._dispatch_transcribe_done(session_id, result)
 
     def _combine_audio_chunks(self, chunks: List[TimestampedAudio]) -> np.ndarray:
         """合併音頻片段"""
@@ -1003,6 +1108,8 @@ class SessionEffects:
         if timer_service.is_active(session_id):
             timer_service.stop_timer(session_id)
             logger.info(f"⏰ Stopped active timer for session {session_id}")
+        # 放棄尚未使用的推測轉譯
+        speculative_asr.cancel(session_id)
 
         # 清理時間戳記錄
         self._wake_word_timestamps.pop(session_id, None)
@@ -1036,6 +1143,8 @@ class SessionEffects:
         if timer_service.is_active(session_id):
             timer_service.stop_timer(session_id)
             logger.info(f"⏰ Stopped active timer for session {session_id}")
+        # 放棄尚未使用的推測轉譯
+        speculative_asr.cancel(session_id)
 
         # 清理時間戳記錄
         self._wake_word_timestamps.pop(session_id, None)
@@ -1089,6 +1198,8 @@ class SessionEffects:
         if timer_service.is_active(session_id):
             timer_service.stop_timer(session_id)
             logger.info(f"⏰ Stopped timer for session {session_id} during cleanup")
+        # 放棄尚未使用的推測轉譯
+        speculative_asr.cancel(session_id)
 
         # 清理狀態
         # 狀態隨 FSM 實例一起被清理
@@ -1100,8 +1211,15 @@ class SessionEffects:
         # 清理 FSM 實例
         self._fsm_instances.pop(session_id, None)
 
+        # 先釋放會寫入音頻隊列的來源（串流轉換 worker、資料平面快取與計數、尚未處理的接收佇列），
+        # 否則清理後轉換 worker 的輸出仍會 push 進來，重新建立這個 session 的隊列
+        audio_converter.release_session(session_id)
+        audio_ingest.release_session(session_id)
+        ingest_workers.release_session(session_id)
+
         # 清理音頻隊列
         audio_queue.clear(session_id)
+        metrics.release_session(session_id)
 
     def _stop_all_monitoring(self, session_id: str):
         """停止所有監控線程"""
@@ -1114,6 +1232,13 @@ class SessionEffects:
         except Exception as e:
             logger.warning(f"Error stopping VAD monitoring for session {session_id}: {e}")
 
+        # 丟棄進行中的串流轉譯（不產生最終結果）
+        if streaming_asr and streaming_asr.is_streaming(session_id):
+            try:
+                streaming_asr.stop_stream(session_id, finalize=False)
+            except Exception as e:
+                logger.warning(f"Error stopping streaming ASR for session {session_id}: {e}")
+
         # 停止 OpenWakeWord 服務
         try:
             openwakeword.stop_listening(session_id)
@@ -1151,6 +1276,8 @@ class SessionEffects:
         if timer_service.is_active(session_id):
             timer_service.stop_timer(session_id)
             logger.info(f"⏰ Stopped active timer for session {session_id} during reset")
+        # 放棄尚未使用的推測轉譯
+        speculative_asr.cancel(session_id)
 
         # FSM 狀態會保持在 processing_activated，準備下一輪喚醒詞檢測
         # 不需要手動設置狀態
@@ -1336,6 +1463,9 @@ class SessionEffects:
 
         logger.info(f"Initializing listening for session {session_id}")
 
+        # 音訊配置已更新，資料平面重新讀取
+        audio_ingest.invalidate(session_id)
+
         # FSM 會在下面的 start_listening 轉換中處理狀態變更
 
         # 設定策略（如果還沒設定）
@@ -1440,6 +1570,9 @@ class SessionEffects:
 
         logger.info(f"Upload started for session {session_id}: {file_name}")
 
+        # 音訊配置已更新，資料平面重新讀取
+        audio_ingest.invalidate(session_id)
+
         # 確保策略是 BATCH
         if session_id not in self._session_strategies:
             self._session_strategies[session_id] = Strategy.BATCH
@@ -1505,23 +1638,34 @@ class SessionEffects:
             logger.warning(f"⚠️ No audio chunks in queue for session {session_id}")
             return
 
-        # 將 AudioChunk 轉換為 TimestampedAudio 格式（如果需要的話）
-        from src.core.audio_queue_manager import TimestampedAudio
-        import time
+        # 將 AudioChunk 轉換為 TimestampedAudio 格式
+        timestamped_chunks = [
+            TimestampedAudio(
+                timestamp=chunk.timestamp,
+                audio=chunk.to_numpy(preserve_dtype=True),
+                duration=chunk.duration,
+            )
+            for chunk in chunks
+        ]
 
-        timestamped_chunks = []
-        for i, chunk in enumerate(chunks):
-            # 如果 chunk 已經是 TimestampedAudio，直接使用
-            if hasattr(chunk, "timestamp") and hasattr(chunk, "data"):
-                timestamped_chunks.append(chunk)
-            else:
-                # 否則創建一個簡單的 TimestampedAudio
-                timestamped_chunks.append(
-                    TimestampedAudio(timestamp=time.time() + i * 0.1, data=chunk)  # 簡單的時間戳
-                )
+        # BATCH FSM: processing → processing_transcribing，轉譯完成時 transcribe_done 回到 idle
+        fsm = self._get_or_create_fsm(session_id)
+        if fsm and fsm.may_trigger("transcribe_started"):
+            old_state = fsm.state
+            fsm.transcribe_started()
+            logger.info(f"✅ FSM: [{session_id}] {old_state} → {fsm.state}")
 
-        # 調用批次處理方法進行轉譯
-        self._batch_process_audio(session_id, timestamped_chunks, None)
+        # 交給後處理管線（降噪、增強、ASR），不佔用 effect 執行緒
+        accepted = post_pipeline.submit(
+            session_id,
+            collect=lambda _: {"chunks": timestamped_chunks, "filepath": None},
+            dsp=lambda utterance: self._preprocess_utterance(session_id, utterance),
+            asr=lambda prepared: self._transcribe_utterance(session_id, prepared),
+        )
+        if not accepted:
+            logger.error(f"❌ Post-processing pipeline is full, batch transcription rejected for session {session_id}")
+            self.store.dispatch(error_raised(session_id, "Post-processing pipeline is full"))
+            return
 
         logger.info(f"✅ Batch transcription initiated for session {session_id}")
 
@@ -1551,6 +1695,19 @@ class SessionEffects:
                 fsm.trigger("asr_stream_started")
             logger.info(f"✅ FSM: [{session_id}] {old_state} → {fsm.state}")
 
+        if not streaming_asr:
+            logger.warning(f"Streaming ASR service is disabled, session {session_id} will not be transcribed")
+            return
+
+        # 從喚醒前的預錄時間開始串流解碼，每次解碼結果以 transcribe_partial 推送
+        streaming_asr.start_stream(
+            session_id,
+            on_partial=lambda sid, committed, tentative: self.store.dispatch(
+                transcribe_partial(sid, committed, tentative)
+            ),
+            start_timestamp=self._recording_start_timestamps.get(session_id),
+        )
+
     @create_effect(dispatch=False)
     def handle_asr_stream_stopped(self, action_stream):
         """處理 ASR 串流停止"""
@@ -1559,11 +1716,19 @@ class SessionEffects:
         )
 
     def _on_asr_stream_stopped(self, action):
-        """處理 ASR 串流停止事件"""
+        """處理 ASR 串流停止事件：解碼剩餘音訊並送出最終結果"""
         session_id = action.payload
 
         logger.info(f"ASR stream stopped for session {session_id}")
 
+        result = None
+        if streaming_asr and streaming_asr.is_streaming(session_id):
+            try:
+                result = streaming_asr.stop_stream(session_id)
+            except Exception as e:
+                logger.error(f"Streaming ASR error: {e}")
+                self.store.dispatch(error_raised(session_id, str(e)))
+
         # 觸發 FSM 狀態轉換
         # 使用原生方法觸發 ASR 串流停止
         fsm = self._get_or_create_fsm(session_id)
@@ -1574,3 +1739,13 @@ class SessionEffects:
             else:
                 fsm.trigger("asr_stream_stopped")
             logger.info(f"✅ FSM: [{session_id}] {old_state} → {fsm.state}")
+
+        if result is not None:
+            logger.info(f"Streaming transcription result: {result.full_text[:100]}...")
+            self.store.dispatch(transcribe_final(session_id, result))
+            # 沿用既有的 transcribe_done，未處理 partial/final 的客戶端行為不變
+            metrics.mark(session_id, "decoded")
+            self.store.dispatch(transcribe_done(session_id, result))
+
+        # 停止 ASR 回饋音
+        self.store.dispatch(play_asr_feedback(session_id, "stop"))
@@ -23,6 +23,7 @@ from src.store.sessions.sessions_action import (
     session_expired,
     reset_session,
     receive_audio_chunk,
+    audio_chunks_ingested,
     clear_audio_buffer,
     upload_started,
     upload_completed,
@@ -39,6 +40,7 @@ from src.store.sessions.sessions_action import (
     transcribe_done,
     asr_stream_started,
     asr_stream_stopped,
+    transcribe_partial,
     llm_reply_started,
     llm_replying,
     llm_reply_completed,
@@ -215,6 +217,22 @@ def handle_receive_audio_chunk(state: Map, action) -> Map:
     })
 
 
+def handle_audio_chunks_ingested(state: Map, action) -> Map:
+    """處理資料平面回寫的接收計數（多個 chunk 合併為一次更新）"""
+    payload = action.payload
+    session_id = payload.get("session_id")
+    
+    session = get_session(state, session_id)
+    if not session:
+        return state
+    
+    chunks_received = session.get("audio_chunks_received", 0) + payload.get("count", 0)
+    
+    return update_session(state, session_id, {
+        "audio_chunks_received": chunks_received
+    })
+
+
 def handle_start_listening(state: Map, action) -> Map:
     """處理開始監聽"""
     payload = action.payload
@@ -482,7 +500,18 @@ def handle_asr_stream_stopped(state: Map, action) -> Map:
     session_id = action.payload
     
     return update_session(state, session_id, {
-        "is_streaming": False
+        "is_streaming": False,
+        "partial_text": None
+    })
+
+
+def handle_transcribe_partial(state: Map, action) -> Map:
+    """處理串流轉譯中間結果"""
+    payload = action.payload
+    session_id = payload.get("session_id")
+    
+    return update_session(state, session_id, {
+        "partial_text": payload.get("text")
     })
 
 
@@ -518,6 +547,7 @@ sessions_reducer = create_reducer(
     on(reset_session, handle_reset_session),
     # 音訊處理
     on(receive_audio_chunk, handle_receive_audio_chunk),
+    on(audio_chunks_ingested, handle_audio_chunks_ingested),
     on(start_listening, handle_start_listening),
     
     # 喚醒相關
@@ -537,6 +567,7 @@ sessions_reducer = create_reducer(
     on(transcribe_done, handle_transcribe_done),
     on(asr_stream_started, handle_asr_stream_started),
     on(asr_stream_stopped, handle_asr_stream_stopped),
+    on(transcribe_partial, handle_transcribe_partial),
     
     # 上傳相關
     on(upload_started, handle_upload_started),
@@ -42,6 +42,7 @@ class SessionState(TypedDict):
     is_vad_speech: bool  # VAD 是否偵測到語音
     is_transcribing: bool  # 是否正在轉譯
     is_streaming: bool  # 是否為串流模式
+    partial_text: Optional[str]  # 串流轉譯目前的中間文字
     
     # === 上傳相關 ===
     upload_file: Optional[str]  # 上傳的檔案名稱
@@ -107,6 +108,7 @@ def create_initial_session_state(
         is_vad_speech=False,
         is_transcribing=False,
         is_streaming=(strategy == "streaming"),
+        partial_text=None,
         
         # 上傳相關
         upload_file=None,
@@ -0,0 +1,195 @@
+"""匯入時間稽核工具
+
+在全新的 Python 行程中以 `python -X importtime` 匯入指定模組，解析每個模組的匯入時間，
+依頂層套件彙總，並列出被匯入的重量級套件（torch、scipy、gradio...）。
+每個 worker 都要付出一次匯入成本，新增的頂層匯入可以在這裡先看出來。
+
+使用方式：
+    python -m src.utils.import_audit src.store.main_store
+    python -m src.utils.import_audit src.store.main_store --top 30 --budget-ms 1500
+    python -m src.utils.import_audit main --forbid torch,gradio
+
+超出 --budget-ms 或匯入了 --forbid 中的套件時以 exit code 1 結束，可用於 CI。
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# 預設配置下 src.store.main_store 不應該匯入的套件（只在對應功能第一次使用時載入）
+HEAVY_MODULES = (
+    'torch',           # DeepFilterNet、openai-whisper
+    'df',              # DeepFilterNet
+    'scipy',           # 重新取樣、音訊增強
+    'cupy',            # scipy 轉換器的 GPU 模式
+    'onnxruntime',     # Silero VAD
+    'openwakeword',    # 喚醒詞模型
+    'faster_whisper',  # Provider Pool 載入模型時
+    'ctranslate2',
+    'whisper',
+    'gradio',          # 波形視覺化
+    'matplotlib',
+)
+
+_MARKER = '--import-audit--'
+_HEADER = 'import time:'
+
+
+@dataclass
+class ImportRecord:
+    """-X importtime 的一行"""
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.name.split('.', 1)[0]
+
+
+@dataclass
+class ImportReport:
+    """一次匯入的稽核結果"""
+    module: str
+    records: List[ImportRecord] = field(default_factory=list)
+    loaded: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def total_ms(self) -> float:
+        """匯入的總時間（最外層匯入的 cumulative 總和）"""
+        return sum(r.cumulative_us for r in self.records if r.depth == 0) / 1000
+
+    def by_package(self) -> List[Tuple[str, float, int]]:
+        """依頂層套件彙總 self 時間，由大到小
+
+        Returns:
+            [(套件, 毫秒, 模組數)]
+        """
+        totals: Dict[str, List[float]] = {}
+        for record in self.records:
+            entry = totals.setdefault(record.package, [0.0, 0])
+            entry[0] += record.self_us / 1000
+            entry[1] += 1
+        return sorted(((name, ms, count) for name, (ms, count) in totals.items()),
+                      key=lambda item: item[1], reverse=True)
+
+    def slowest(self, top: int = 20) -> List[ImportRecord]:
+        """self 時間最長的模組"""
+        return sorted(self.records, key=lambda r: r.self_us, reverse=True)[:top]
+
+    def heavy_modules(self, names: Iterable[str] = HEAVY_MODULES) -> List[str]:
+        """被匯入的重量級套件"""
+        loaded = set(self.loaded)
+        return [name for name in names if name in loaded]
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """解析 -X importtime 的輸出（stderr）
+
+    格式：`import time: <self us> | <cumulative us> | <縮排><模組>`，縮排每 2 格一層。
+    """
+    records = []
+    for line in output.splitlines():
+        if not line.startswith(_HEADER):
+            continue
+        parts = line[len(_HEADER):].split('|', 2)
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # 表頭 "self [us] | cumulative | imported package"
+        raw_name = parts[2][1:]  # '|' 後固定有一個空白
+        name = raw_name.lstrip(' ')
+        records.append(ImportRecord(
+            name=name,
+            self_us=self_us,
+            cumulative_us=cumulative_us,
+            depth=(len(raw_name) - len(name)) // 2,
+        ))
+    return records
+
+
+def audit(module: str, python: str = sys.executable, cwd: str = PROJECT_ROOT,
+          timeout: float = 120.0) -> ImportReport:
+    """在全新的行程中匯入模組並返回稽核結果
+
+    直譯器啟動時的匯入（site、encodings）不計入。匯入失敗時 error 為最後一行錯誤訊息。
+    """
+    code = (
+        "import sys\n"
+        f"sys.stderr.write({_MARKER!r} + '\\n'); sys.stderr.flush()\n"
+        f"import {module}\n"
+        "print('\\n'.join(sorted(sys.modules)))\n"
+    )
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [cwd, env.get('PYTHONPATH')]))
+    result = subprocess.run(
+        [python, '-X', 'importtime', '-c', code],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=timeout,
+    )
+
+    stderr = result.stderr.split(_MARKER + '\n', 1)[-1]
+    report = ImportReport(module=module, records=parse_importtime(stderr))
+    if result.returncode != 0:
+        errors = [line for line in stderr.splitlines() if line and not line.startswith(_HEADER)]
+        report.error = errors[-1] if errors else f"exit code {result.returncode}"
+    else:
+        report.loaded = result.stdout.split()
+    return report
+
+
+def format_report(report: ImportReport, top: int = 20) -> List[str]:
+    """稽核結果的文字報表"""
+    lines = [f"匯入 {report.module}: {report.total_ms:.1f} ms，{len(report.records)} 個模組"]
+    if report.error:
+        lines.append(f"匯入失敗: {report.error}")
+
+    lines.append("")
+    lines.append(f"{'套件':<28} {'self(ms)':>10} {'模組數':>6}")
+    for name, ms, count in report.by_package()[:top]:
+        lines.append(f"{name:<28} {ms:>10.1f} {count:>6}")
+
+    lines.append("")
+    lines.append(f"{'模組':<48} {'self(ms)':>10} {'累計(ms)':>10}")
+    for record in report.slowest(top):
+        lines.append(f"{record.name:<48} {record.self_us / 1000:>10.1f} "
+                     f"{record.cumulative_us / 1000:>10.1f}")
+
+    heavy = report.heavy_modules()
+    lines.append("")
+    lines.append(f"重量級套件: {', '.join(heavy) if heavy else '無'}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="匯入時間稽核（python -X importtime）")
+    parser.add_argument("module", nargs="?", default="src.store.main_store", help="要匯入的模組")
+    parser.add_argument("--top", type=int, default=20, help="列出前幾名")
+    parser.add_argument("--budget-ms", type=float, default=0, help="匯入時間上限（毫秒，0 表示不檢查）")
+    parser.add_argument("--forbid", default="", help="不允許匯入的套件（逗號分隔）")
+    args = parser.parse_args(argv)
+
+    report = audit(args.module)
+    print("\n".join(format_report(report, args.top)))
+
+    failed = report.error is not None
+    if args.budget_ms and report.total_ms > args.budget_ms:
+        print(f"超出匯入時間預算: {report.total_ms:.1f} ms > {args.budget_ms:.0f} ms")
+        failed = True
+    forbidden = report.heavy_modules([name.strip() for name in args.forbid.split(",") if name.strip()])
+    if forbidden:
+        print(f"匯入了不允許的套件: {', '.join(forbidden)}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""延遲匯入工具
+
+torch、scipy、cupy、onnxruntime、gradio 等重量級套件只在真正用到的功能第一次執行時才匯入，
+只負責接收音訊的 worker（例如 Redis ingest）不必在啟動時付出數秒與數百 MB 的代價。
+
+- lazy_import(name): 返回模組代理，第一次存取屬性時才匯入
+- is_available(name): 不匯入模組，只檢查是否已安裝
+- lazy_exports(package, exports): 套件 __init__ 的 PEP 562 __getattr__，匯出名稱第一次存取時才匯入子模組
+
+使用範例：
+    from src.utils.lazy_import import is_available, lazy_import
+
+    signal = lazy_import("scipy.signal")        # 此時尚未匯入 scipy
+    SCIPY_AVAILABLE = is_available("scipy")
+
+    def resample(audio):
+        return signal.resample_poly(audio, 1, 3)   # 第一次呼叫時才匯入
+
+    # 套件 __init__.py
+    __getattr__, __dir__ = lazy_exports(__name__, {"WaveformVisualizer": ".waveform_visualizer"})
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class LazyModule(types.ModuleType):
+    """第一次存取屬性時才匯入的模組代理
+
+    匯入失敗（未安裝）時在存取屬性的地方拋出 ImportError，呼叫端應先以 is_available() 檢查。
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+        self.__dict__['_lazy_lock'] = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        """模組是否已經匯入（不會觸發匯入）"""
+        return self.__dict__['_lazy_module'] is not None or self.__name__ in sys.modules
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """返回模組；尚未匯入時返回第一次存取屬性才匯入的代理"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_available(name: str) -> bool:
+    """模組是否已安裝（不匯入模組本身，子模組會匯入父套件）"""
+    if name in sys.modules:
+        return sys.modules[name] is not None
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """產生套件 __init__ 的 __getattr__ 與 __dir__（PEP 562）
+
+    Args:
+        package: 套件名稱（__name__）
+        exports: {匯出名稱: 子模組（相對名稱如 ".panels" 或絕對名稱）}
+
+    Returns:
+        (__getattr__, __dir__)
+    """
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        # 快取到套件，之後的存取不再經過 __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
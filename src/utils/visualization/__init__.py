@@ -1,16 +1,19 @@
 """視覺化工具模組
 
 提供音訊波形視覺化和分析工具。
+gradio 與 matplotlib 在第一次存取視覺化類別時才匯入，匯入 src.utils 不受影響。
 """
 
-from .waveform_visualizer import WaveformVisualizer
-from .panels import (
-    RealtimeWaveformPanel,
-    HistoryTimelinePanel,
-    VADDetectorPanel,
-    WakewordTriggerPanel,
-    EnergySpectrumPanel
-)
+from src.utils.lazy_import import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'WaveformVisualizer': '.waveform_visualizer',
+    'RealtimeWaveformPanel': '.panels',
+    'HistoryTimelinePanel': '.panels',
+    'VADDetectorPanel': '.panels',
+    'WakewordTriggerPanel': '.panels',
+    'EnergySpectrumPanel': '.panels',
+})
 
 __all__ = [
     'WaveformVisualizer',
@@ -19,4 +22,4 @@ __all__ = [
     'VADDetectorPanel',
     'WakewordTriggerPanel',
     'EnergySpectrumPanel'
-]
\ No newline at end of file
+]
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+AudioEnhancer DSP 核心基準測試
+
+比較原本逐樣本迴圈的高通濾波、壓縮器、噪音門與向量化實作
+（lfilter IIR + 累積和滑動 RMS）的處理時間，並確認輸出一致。
+另外以 100ms chunk 搭配 EnhancerState 串流處理，確認高通濾波與整段處理結果相同，
+並量測串流模式每個 chunk 的處理時間。
+
+使用方式：
+    python tests/benchmarks/bench_audio_enhancer.py
+    python tests/benchmarks/bench_audio_enhancer.py --seconds 30 --rounds 5
+    python tests/benchmarks/bench_audio_enhancer.py --min-speedup 20   # 低於門檻時 exit code 1
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# 添加專案根目錄到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..'))
+
+SAMPLE_RATE = 16000
+TOLERANCE = 1e-4
+
+
+# ---------- 原本的逐樣本實作（作為基準與正確性參考） ----------
+
+def legacy_highpass(audio: np.ndarray, alpha: float) -> np.ndarray:
+    filtered = np.zeros_like(audio)
+    filtered[0] = audio[0]
+    for i in range(1, len(audio)):
+        filtered[i] = alpha * (filtered[i-1] + audio[i] - audio[i-1])
+    return filtered
+
+
+def _legacy_sliding_rms(audio: np.ndarray, window_size: int) -> np.ndarray:
+    envelope = np.zeros_like(audio)
+    for i in range(len(audio)):
+        start = max(0, i - window_size // 2)
+        end = min(len(audio), i + window_size // 2)
+        envelope[i] = np.sqrt(np.mean(audio[start:end] ** 2))
+    return envelope
+
+
+def legacy_compression(audio: np.ndarray, threshold: float = -20, ratio: float = 2.5) -> np.ndarray:
+    threshold_linear = 10 ** (threshold / 20.0)
+    envelope = _legacy_sliding_rms(audio, min(512, len(audio) // 4))
+    gain_reduction = np.ones_like(audio)
+    over_threshold = envelope > threshold_linear
+    if np.any(over_threshold):
+        gain_reduction[over_threshold] = (envelope[over_threshold] / threshold_linear) ** (1/ratio - 1)
+    return audio * gain_reduction
+
+
+def legacy_gate(audio: np.ndarray, threshold: float = -40) -> np.ndarray:
+    rms_envelope = _legacy_sliding_rms(audio, min(1024, len(audio) // 8))
+    threshold_linear = 10 ** (threshold / 20.0)
+    gate_gain = np.where(rms_envelope > threshold_linear, 1.0, 0.1)
+    smoothed_gain = np.copy(gate_gain)
+    for i in range(1, len(smoothed_gain)):
+        smoothed_gain[i] = 0.9 * smoothed_gain[i-1] + 0.1 * gate_gain[i]
+    return audio * smoothed_gain
+
+
+# ---------- 測試工具 ----------
+
+def _make_utterance(seconds: float, seed: int = 0) -> np.ndarray:
+    """產生測試音訊：低頻嗡聲 + 雜訊，中間夾著一段較大聲的「語音」"""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    audio = 0.05 * np.sin(2 * np.pi * 50 * t) + rng.normal(0, 0.005, n)
+    speech = slice(n // 4, 3 * n // 4)
+    audio[speech] += 0.4 * np.sin(2 * np.pi * 220 * t[speech]) * np.sin(2 * np.pi * 3 * t[speech])
+    return audio.astype(np.float32)
+
+
+def _best_time(func, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(enhancer, seconds: float, rounds: int, chunk_ms: int) -> dict:
+    """執行基準測試
+
+    Returns:
+        {"stages": [...], "streaming": {...}}
+    """
+    from src.service.audio_enhancer import EnhancerState
+
+    audio = _make_utterance(seconds)
+    alpha = enhancer.highpass_alpha
+
+    cases = [
+        ("highpass",
+         lambda: legacy_highpass(audio, alpha),
+         lambda: enhancer.apply_highpass_simple(audio, alpha)),
+        ("compression",
+         lambda: legacy_compression(audio),
+         lambda: enhancer.apply_compression(audio)),
+        ("gate",
+         lambda: legacy_gate(audio),
+         lambda: enhancer.apply_gate(audio)),
+    ]
+
+    stages = []
+    for name, legacy, vectorized in cases:
+        max_diff = float(np.max(np.abs(legacy() - vectorized())))
+        # 舊實作很慢，只跑一次
+        legacy_time = _best_time(legacy, 1)
+        vectorized_time = _best_time(vectorized, rounds)
+        stages.append({
+            "stage": name,
+            "legacy_ms": legacy_time * 1000,
+            "vectorized_ms": vectorized_time * 1000,
+            "speedup": legacy_time / vectorized_time,
+            "max_diff": max_diff,
+        })
+
+    # 串流模式：100ms chunk，狀態跨 chunk 延續
+    chunk = int(SAMPLE_RATE * chunk_ms / 1000)
+    chunks = [audio[i:i + chunk] for i in range(0, len(audio), chunk)]
+
+    state = EnhancerState()
+    streamed = np.concatenate([enhancer.apply_highpass_simple(c, alpha, state=state) for c in chunks])
+    highpass_diff = float(np.max(np.abs(streamed - enhancer.apply_highpass_simple(audio, alpha))))
+
+    state = EnhancerState()
+    chunk_times = []
+    for c in chunks:
+        start = time.perf_counter()
+        processed = enhancer.apply_highpass_simple(c, alpha, state=state)
+        processed = enhancer.apply_gate(processed, state=state)
+        enhancer.apply_compression(processed, state=state)
+        chunk_times.append(time.perf_counter() - start)
+
+    streaming = {
+        "chunk_ms": chunk_ms,
+        "chunks": len(chunks),
+        "highpass_max_diff": highpass_diff,
+        "avg_chunk_ms": float(np.mean(chunk_times)) * 1000,
+        "max_chunk_ms": float(np.max(chunk_times)) * 1000,
+    }
+    return {"stages": stages, "streaming": streaming}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AudioEnhancer DSP 核心基準測試")
+    parser.add_argument("--seconds", type=float, default=10.0,
+                        help="測試音訊長度（秒）")
+    parser.add_argument("--rounds", type=int, default=5,
+                        help="向量化實作重複次數（取最佳）")
+    parser.add_argument("--chunk-ms", type=int, default=100,
+                        help="串流模式的 chunk 長度（毫秒）")
+    parser.add_argument("--min-speedup", type=float, default=None,
+                        help="任一階段加速倍數低於此值，或輸出不一致時以 exit code 1 結束")
+    args = parser.parse_args()
+
+    from src.service.audio_enhancer import audio_enhancer
+
+    results = run_benchmark(audio_enhancer, args.seconds, args.rounds, args.chunk_ms)
+
+    print(f"\nAudioEnhancer DSP 基準測試 (audio={args.seconds}s @ {SAMPLE_RATE}Hz, rounds={args.rounds})")
+    print(f"{'stage':>12} | {'legacy ms':>10} | {'vectorized ms':>13} | {'speedup':>8} | {'max diff':>9}")
+    print("-" * 66)
+    for r in results["stages"]:
+        print(f"{r['stage']:>12} | {r['legacy_ms']:>10.1f} | {r['vectorized_ms']:>13.2f} | "
+              f"{r['speedup']:>7.1f}x | {r['max_diff']:>9.2e}")
+
+    s = results["streaming"]
+    print(f"\n串流模式 ({s['chunks']} x {s['chunk_ms']}ms chunk): "
+          f"平均 {s['avg_chunk_ms']:.3f}ms / chunk, 最大 {s['max_chunk_ms']:.3f}ms, "
+          f"高通濾波與整段處理差異 {s['highpass_max_diff']:.2e}")
+
+    failed = [r["stage"] for r in results["stages"] if r["max_diff"] > TOLERANCE]
+    if s["highpass_max_diff"] > TOLERANCE:
+        failed.append("streaming highpass")
+    if args.min_speedup is not None:
+        failed += [f"{r['stage']} speedup" for r in results["stages"] if r["speedup"] < args.min_speedup]
+    if failed:
+        print(f"\n未通過: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+串流重新取樣基準測試
+
+比較目前逐 chunk 獨立重新取樣（ScipyConverter._resample_scipy：每次重新設計濾波器、
+chunk 邊界重置狀態）與 StreamingResampler（快取 polyphase 濾波器組、跨 chunk 保留歷史）
+在 44.1kHz / 48kHz → 16kHz、100ms chunk 下的處理時間與 chunk 邊界誤差。
+
+誤差以整段一次 resample_poly 的結果為參考（RMS 誤差，dB 相對於訊號）。
+44.1kHz 的比例 (160/441) 超過 _resample_scipy 的 polyphase 上限，目前會退回 FFT 重新取樣，
+因此另外列出逐 chunk resample_poly（相同濾波品質、不保留狀態）的時間作為對照。
+
+使用方式：
+    python tests/benchmarks/bench_audio_resampler.py
+    python tests/benchmarks/bench_audio_resampler.py --rates 44100,48000 --seconds 30 --channels 2
+    python tests/benchmarks/bench_audio_resampler.py --min-speedup 1.5   # 低於門檻時 exit code 1
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# 添加專案根目錄到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..'))
+
+TARGET_RATE = 16000
+
+
+def _make_audio(seconds: float, rate: int, channels: int, seed: int = 0) -> np.ndarray:
+    """產生測試音訊（掃頻 + 雜訊，多聲道為交錯格式）"""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * rate)
+    t = np.arange(n) / rate
+    sweep = 0.4 * np.sin(2 * np.pi * (100 + 700 * t / seconds) * t)
+    audio = np.stack([sweep + rng.normal(0, 0.01, n) for _ in range(channels)], axis=1)
+    return audio.reshape(-1).astype(np.float32)
+
+
+def _error_db(result: np.ndarray, reference: np.ndarray) -> float:
+    n = min(len(result), len(reference))
+    noise = np.sqrt(np.mean((result[:n] - reference[:n]) ** 2))
+    power = np.sqrt(np.mean(reference[:n] ** 2))
+    return float(20 * np.log10(max(noise, 1e-12) / power))
+
+
+def _best_time(func, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(converter, rates: list, seconds: float, chunk_ms: int, channels: int,
+                  rounds: int = 5) -> list:
+    """執行基準測試
+
+    Returns:
+        每個來源取樣率一筆結果
+    """
+    from math import gcd
+    from scipy import signal
+    from src.service.audio_converter.scipy_converter import StreamingResampler
+
+    results = []
+    for rate in rates:
+        audio = _make_audio(seconds, rate, channels)
+        frame = int(rate * chunk_ms / 1000) * channels
+        chunks = [audio[i:i + frame] for i in range(0, len(audio), frame)]
+
+        mono = audio.reshape(-1, channels).mean(axis=1)
+        divisor = gcd(TARGET_RATE, rate)
+        reference = signal.resample_poly(mono, TARGET_RATE // divisor, rate // divisor)
+
+        # 目前的路徑：每個 chunk 獨立轉聲道 + 重新取樣
+        def run_legacy():
+            return [
+                converter._resample_scipy(converter._convert_channels(c, channels, 1), rate, TARGET_RATE)
+                for c in chunks
+            ]
+
+        # 逐 chunk resample_poly（與串流重新取樣器相同的濾波器，但每次重新設計且不保留狀態）
+        def run_poly():
+            return [
+                signal.resample_poly(converter._convert_channels(c, channels, 1),
+                                     TARGET_RATE // divisor, rate // divisor)
+                for c in chunks
+            ]
+
+        # 串流重新取樣器（同一個實例處理所有 chunk）
+        resampler = StreamingResampler(rate, TARGET_RATE, channels)
+
+        def run_streaming():
+            streamed = [resampler.process(c) for c in chunks]
+            streamed.append(resampler.flush())
+            return streamed
+
+        legacy = run_legacy()
+        streamed = run_streaming()
+        legacy_time = _best_time(run_legacy, rounds)
+        poly_time = _best_time(run_poly, rounds)
+        streaming_time = _best_time(run_streaming, rounds)
+
+        results.append({
+            "rate": rate,
+            "chunks": len(chunks),
+            "legacy_ms_per_chunk": legacy_time / len(chunks) * 1000,
+            "poly_ms_per_chunk": poly_time / len(chunks) * 1000,
+            "streaming_ms_per_chunk": streaming_time / len(chunks) * 1000,
+            "speedup": legacy_time / streaming_time,
+            "legacy_error_db": _error_db(np.concatenate(legacy), reference),
+            "streaming_error_db": _error_db(np.concatenate(streamed), reference),
+            "length_match": len(np.concatenate(streamed)) == len(reference),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="串流重新取樣基準測試")
+    parser.add_argument("--rates", default="44100,48000",
+                        help="來源取樣率（逗號分隔）")
+    parser.add_argument("--seconds", type=float, default=10.0,
+                        help="測試音訊長度（秒）")
+    parser.add_argument("--chunk-ms", type=int, default=100,
+                        help="chunk 長度（毫秒）")
+    parser.add_argument("--rounds", type=int, default=5,
+                        help="重複次數（取最佳）")
+    parser.add_argument("--channels", type=int, default=1,
+                        help="來源聲道數（交錯格式，混成單聲道）")
+    parser.add_argument("--min-speedup", type=float, default=None,
+                        help="任一取樣率加速倍數低於此值時以 exit code 1 結束")
+    args = parser.parse_args()
+
+    from src.service.audio_converter.scipy_converter import scipy_converter
+
+    rates = [int(x) for x in args.rates.split(",") if x.strip()]
+    results = run_benchmark(scipy_converter, rates, args.seconds, args.chunk_ms, args.channels,
+                            args.rounds)
+
+    print(f"\n串流重新取樣基準測試 (→{TARGET_RATE}Hz, chunk={args.chunk_ms}ms, "
+          f"channels={args.channels}, audio={args.seconds}s)")
+    print(f"{'source Hz':>9} | {'legacy ms/chunk':>15} | {'poly ms/chunk':>13} | {'streaming ms/chunk':>18} | "
+          f"{'speedup':>7} | {'legacy err dB':>13} | {'streaming err dB':>16}")
+    print("-" * 111)
+    for r in results:
+        print(f"{r['rate']:>9} | {r['legacy_ms_per_chunk']:>15.3f} | {r['poly_ms_per_chunk']:>13.3f} | "
+              f"{r['streaming_ms_per_chunk']:>18.3f} | {r['speedup']:>6.2f}x | "
+              f"{r['legacy_error_db']:>13.1f} | {r['streaming_error_db']:>16.1f}")
+
+    failed = [f"{r['rate']}Hz length" for r in results if not r["length_match"]]
+    if args.min_speedup is not None:
+        failed += [f"{r['rate']}Hz speedup" for r in results if r["speedup"] < args.min_speedup]
+    if failed:
+        print(f"\n未通過: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+gRPC StreamingRecognize 負載測試
+
+同時開啟 N 個 StreamingRecognize 串流，每個串流送出 test_audio/*.wav 其中一個檔案
+（依序輪流分配），以 chunk 為單位送出原始 PCM（預設依真實時間節奏），並統計：
+- 協商延遲：送出 config 到收到 session_ready
+- 完成延遲：送完最後一個 chunk 到收到 transcribe_done / transcribe_final
+- 每個串流收到的 partial、backpressure 與 error 事件數
+- 整體送出的音訊秒數與吞吐量（音訊秒 / 實際秒）
+
+需要先以 api.grpc.enabled: true 啟動 ASR Hub。
+WAV 以檔案原本的取樣率與聲道數送出，由伺服器端的資料平面轉換。
+
+使用方式：
+    python tests/benchmarks/bench_grpc_streams.py
+    python tests/benchmarks/bench_grpc_streams.py --streams 16 --chunk-ms 50
+    python tests/benchmarks/bench_grpc_streams.py --streams 32 --speed 0   # 不依真實時間節奏，盡快送出
+"""
+
+import argparse
+import asyncio
+import glob
+import os
+import sys
+import time
+import wave
+
+# 添加專案根目錄到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..'))
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..')
+
+
+def load_wav(path: str):
+    """讀取 16-bit PCM WAV，回傳 (frames, sample_rate, channels)"""
+    with wave.open(path, 'rb') as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM WAV is supported")
+        return wf.readframes(wf.getnframes()), wf.getframerate(), wf.getnchannels()
+
+
+def percentile(values, q: float) -> float:
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_stream(index: int, stub, pb, wav, chunk_ms: int, speed: float, timeout: float) -> dict:
+    """跑一個 StreamingRecognize 串流並回傳統計"""
+    name, frames, sample_rate, channels = wav
+    bytes_per_chunk = sample_rate * channels * 2 * chunk_ms // 1000
+    stats = {
+        "file": name,
+        "audio_seconds": len(frames) / (sample_rate * channels * 2),
+        "ready_latency": None,
+        "done_latency": None,
+        "partials": 0,
+        "backpressure": 0,
+        "errors": 0,
+        "text": "",
+    }
+
+    ready = asyncio.Event()
+    sent_at = {}
+
+    async def requests():
+        sent_at["config"] = time.perf_counter()
+        yield pb.StreamingRecognizeRequest(config=pb.StreamingConfig(
+            request_id=f"bench-{index}",
+            strategy="non_streaming",
+            sample_rate=sample_rate,
+            channels=channels,
+            format="pcm_s16le",
+        ))
+        await ready.wait()
+
+        start = time.perf_counter()
+        for n, offset in enumerate(range(0, len(frames), bytes_per_chunk)):
+            if speed > 0:
+                # 依真實時間節奏送出（speed=2 表示兩倍速）
+                delay = start + n * chunk_ms / 1000 / speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield pb.StreamingRecognizeRequest(audio=frames[offset:offset + bytes_per_chunk])
+        sent_at["last_chunk"] = time.perf_counter()
+
+    call = stub.StreamingRecognize(requests(), timeout=timeout)
+    async for response in call:
+        event = response.WhichOneof("event")
+        now = time.perf_counter()
+        if event == "session_ready":
+            stats["ready_latency"] = now - sent_at["config"]
+            ready.set()
+        elif event == "partial":
+            stats["partials"] += 1
+        elif event == "backpressure":
+            stats["backpressure"] += 1
+        elif event == "error":
+            stats["errors"] += 1
+        elif event in ("done", "final"):
+            if stats["done_latency"] is None and "last_chunk" in sent_at:
+                stats["done_latency"] = now - sent_at["last_chunk"]
+            stats["text"] = getattr(response, event).text
+
+    return stats
+
+
+async def run(args) -> int:
+    import grpc
+    from src.api.grpc.proto import asr_hub_pb2 as pb
+    from src.api.grpc.proto import asr_hub_pb2_grpc as pb_grpc
+
+    paths = sorted(glob.glob(args.files))
+    if not paths and not os.path.isabs(args.files):
+        paths = sorted(glob.glob(os.path.join(PROJECT_ROOT, args.files)))
+    if not paths:
+        print(f"找不到 WAV 檔案: {args.files}")
+        return 1
+    wavs = [(os.path.basename(p), *load_wav(p)) for p in paths]
+
+    print(f"目標: {args.target}，串流數: {args.streams}，chunk: {args.chunk_ms}ms，"
+          f"速度: {'不限' if args.speed <= 0 else f'{args.speed}x'}")
+    print(f"檔案: {', '.join(name for name, *_ in wavs)}")
+
+    async with grpc.aio.insecure_channel(args.target) as channel:
+        stub = pb_grpc.ASRHubStub(channel)
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            run_stream(i, stub, pb, wavs[i % len(wavs)], args.chunk_ms, args.speed, args.timeout)
+            for i in range(args.streams)
+        ), return_exceptions=True)
+        elapsed = time.perf_counter() - start
+
+    failures = [r for r in results if isinstance(r, BaseException)]
+    stats = [r for r in results if not isinstance(r, BaseException)]
+
+    print()
+    print(f"{'#':>3}  {'檔案':<12} {'音訊(s)':>8} {'就緒(ms)':>9} {'完成(ms)':>9} {'partial':>7} {'背壓':>4}  結果")
+    for i, s in enumerate(stats):
+        ready_ms = f"{s['ready_latency'] * 1000:.1f}" if s['ready_latency'] is not None else "-"
+        done_ms = f"{s['done_latency'] * 1000:.1f}" if s['done_latency'] is not None else "-"
+        print(f"{i:>3}  {s['file']:<12} {s['audio_seconds']:>8.2f} {ready_ms:>9} {done_ms:>9} "
+              f"{s['partials']:>7} {s['backpressure']:>4}  {s['text'][:40]}")
+
+    audio_seconds = sum(s["audio_seconds"] for s in stats)
+    ready = [s["ready_latency"] * 1000 for s in stats if s["ready_latency"] is not None]
+    done = [s["done_latency"] * 1000 for s in stats if s["done_latency"] is not None]
+
+    print()
+    print(f"完成串流: {len(stats)}/{args.streams}（失敗 {len(failures)}，未收到結果 {len(stats) - len(done)}）")
+    print(f"總音訊: {audio_seconds:.1f}s，實際耗時: {elapsed:.1f}s，吞吐量: {audio_seconds / elapsed:.1f}x 即時")
+    print(f"就緒延遲 p50/p95: {percentile(ready, 50):.1f} / {percentile(ready, 95):.1f} ms")
+    print(f"完成延遲 p50/p95: {percentile(done, 50):.1f} / {percentile(done, 95):.1f} ms")
+    print(f"背壓事件: {sum(s['backpressure'] for s in stats)}，錯誤事件: {sum(s['errors'] for s in stats)}")
+    for failure in failures[:5]:
+        print(f"  串流失敗: {failure!r}")
+
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gRPC StreamingRecognize 負載測試")
+    parser.add_argument("--target", default="127.0.0.1:50051", help="gRPC 伺服器位址")
+    parser.add_argument("--streams", type=int, default=8, help="同時進行的串流數")
+    parser.add_argument("--files", default="test_audio/*.wav", help="WAV 檔案 glob（相對於專案根目錄）")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="每個 chunk 的長度（毫秒）")
+    parser.add_argument("--speed", type=float, default=1.0, help="送出速度倍率，0 表示不限速")
+    parser.add_argument("--timeout", type=float, default=300.0, help="每個串流的逾時秒數")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+延遲直方圖基準測試
+
+量測 metrics.observe()、metrics.timer() 與停用時的每次記錄開銷（單執行緒與多執行緒），
+並以對數常態分佈的樣本比較直方圖百分位數與精確值（numpy.percentile）的相對誤差。
+
+使用方式：
+    python tests/benchmarks/bench_metrics.py
+    python tests/benchmarks/bench_metrics.py --ops 500000 --threads 8
+    python tests/benchmarks/bench_metrics.py --max-overhead-us 5   # observe 超過門檻時 exit code 1
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+# 添加專案根目錄到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..'))
+
+SESSION_ID = "bench-session"
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+def bench_observe(registry, stage: str, ops: int) -> float:
+    """每次 observe 的耗時（微秒）"""
+    observe = registry.observe
+    started = time.perf_counter()
+    for _ in range(ops):
+        observe(stage, 0.0123, SESSION_ID)
+    return (time.perf_counter() - started) / ops * 1e6
+
+
+def bench_timer(registry, stage: str, ops: int) -> float:
+    """每次 with metrics.timer() 的耗時（微秒）"""
+    timer = registry.timer
+    started = time.perf_counter()
+    for _ in range(ops):
+        with timer(stage, SESSION_ID):
+            pass
+    return (time.perf_counter() - started) / ops * 1e6
+
+
+def bench_threads(registry, stage: str, ops: int, threads: int) -> float:
+    """多執行緒同時記錄同一個直方圖：每次 observe 的平均耗時（微秒，以總牆鐘時間計）"""
+    per_thread = ops // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        bench_observe(registry, stage, per_thread)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return (time.perf_counter() - started) / (per_thread * threads) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="延遲直方圖基準測試")
+    parser.add_argument("--ops", type=int, default=200000, help="每項量測的記錄次數")
+    parser.add_argument("--threads", type=int, default=4, help="多執行緒量測的執行緒數")
+    parser.add_argument("--samples", type=int, default=100000, help="準確度比較的樣本數")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-overhead-us", type=float, default=0, help="observe 開銷上限（微秒，0 表示不檢查）")
+    args = parser.parse_args()
+
+    from src.core.metrics import LatencyHistogram, Stage, metrics
+
+    metrics.reset()
+    metrics.bind_session(SESSION_ID, "bench")
+
+    enabled = metrics.enabled
+    metrics.enabled = False
+    disabled_us = bench_observe(metrics, Stage.DECODE, args.ops)
+    metrics.enabled = True
+    observe_us = bench_observe(metrics, Stage.DECODE, args.ops)
+    timer_us = bench_timer(metrics, Stage.DECODE, args.ops)
+    threads_us = bench_threads(metrics, Stage.DECODE, args.ops, args.threads)
+    metrics.enabled = enabled
+
+    print(f"記錄次數: {args.ops}")
+    print(f"{'量測':<28} {'us/op':>8}")
+    print(f"{'observe（停用）':<28} {disabled_us:>8.3f}")
+    print(f"{'observe':<28} {observe_us:>8.3f}")
+    print(f"{'timer':<28} {timer_us:>8.3f}")
+    print(f"{f'observe（{args.threads} 執行緒）':<28} {threads_us:>8.3f}")
+
+    # 準確度：對數常態分佈（中位數約 50ms，長尾到數秒）
+    rng = np.random.default_rng(args.seed)
+    samples = rng.lognormal(mean=np.log(0.05), sigma=1.0, size=args.samples)
+    histogram = LatencyHistogram()
+    for value in samples:
+        histogram.record(float(value))
+
+    print()
+    print(f"樣本數: {args.samples}")
+    print(f"{'百分位數':<10} {'精確(ms)':>10} {'直方圖(ms)':>12} {'誤差':>8}")
+    for q, estimate in zip(QUANTILES, histogram.percentiles(QUANTILES)):
+        exact = float(np.percentile(samples, q * 100))
+        print(f"p{q * 100:<9g} {exact * 1000:>10.3f} {estimate * 1000:>12.3f} "
+              f"{(estimate - exact) / exact * 100:>7.2f}%")
+
+    metrics.release_session(SESSION_ID)
+    metrics.reset()
+
+    if args.max_overhead_us and observe_us > args.max_overhead_us:
+        print(f"observe 開銷 {observe_us:.3f}us 超過上限 {args.max_overhead_us}us")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Session FSM 建立 / 銷毀基準測試
+
+比較每個 session 一個 transitions HierarchicalGraphMachine（改用轉換表之前的做法）
+與編譯後的轉換表（SessionFSM 只保存目前狀態）：
+- 每秒可建立並銷毀的 session 數（建立 FSM + 跑完一輪轉換 + 釋放）
+- 每個 session FSM 常駐的記憶體（tracemalloc）
+- 單次 trigger 的耗時
+
+legacy 需要安裝 transitions（pip install transitions）。
+
+使用方式：
+    python tests/benchmarks/bench_session_fsm.py
+    python tests/benchmarks/bench_session_fsm.py --sessions 20000 --strategy streaming
+    python tests/benchmarks/bench_session_fsm.py --modes table
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+# 添加專案根目錄到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..'))
+
+
+# 每個策略跑一輪的事件序列
+ROUNDS = {
+    "non_streaming": ["start_listening", "wake_activated", "record_started", "record_stopped",
+                      "transcribe_done", "wake_deactivated"],
+    "streaming": ["start_listening", "wake_activated", "asr_stream_started", "asr_stream_stopped",
+                  "wake_deactivated"],
+    "batch": ["upload_started", "upload_completed", "transcribe_started", "transcribe_done"],
+}
+
+
+def make_legacy_factory(plugin):
+    """改用轉換表之前的 SessionFSM：每個實例建立一個 HierarchicalGraphMachine"""
+    from transitions.extensions.diagrams import HierarchicalGraphMachine as Machine
+    from src.core.fsm_transitions import build_definition, get_transition_table
+    from src.interface.state import State
+
+    states, _ = build_definition(plugin)
+    table = get_transition_table(plugin)
+    # 以完整狀態名稱定義轉換（與轉換表相同的行為，避免 batch 的子狀態名稱無法解析）
+    transitions = [
+        {"trigger": event, "source": state, "dest": table.dest(state, event)}
+        for state in table.states
+        for event in table.get_triggers(state)
+    ]
+
+    class LegacySessionFSM:
+        def __init__(self):
+            self.strategy = plugin.name
+            self.machine = Machine(
+                model=self,
+                states=states,
+                transitions=transitions,
+                initial=State.IDLE,
+                title=plugin.name,
+                graph_engine="mermaid",
+                show_conditions=True,
+                auto_transitions=False,
+            )
+
+    return LegacySessionFSM
+
+
+def make_table_factory(plugin):
+    from src.core.fsm_transitions import SessionFSM
+    return lambda: SessionFSM(plugin)
+
+
+def bench(factory, events, sessions: int) -> dict:
+    """建立 / 跑完一輪 / 銷毀，並量測常駐記憶體與 trigger 耗時"""
+    factory()  # 預熱（編譯轉換表、匯入模組）
+
+    # 建立 + 一輪轉換 + 銷毀
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(sessions):
+        fsm = factory()
+        for event in events:
+            getattr(fsm, event)()
+        del fsm
+    churn = time.perf_counter() - start
+
+    # 只建立（同時存在 sessions 個），量測記憶體
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    live = [factory() for _ in range(sessions)]
+    create = time.perf_counter() - start
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    memory = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    # 單次 trigger
+    count = 0
+    start = time.perf_counter()
+    for fsm in live:
+        for event in events:
+            getattr(fsm, event)()
+            count += 1
+    trigger = time.perf_counter() - start
+
+    start = time.perf_counter()
+    del live
+    gc.collect()
+    destroy = time.perf_counter() - start
+
+    return {
+        "churn_per_sec": sessions / churn,
+        "create_per_sec": sessions / create,
+        "destroy_ms": destroy * 1000,
+        "bytes_per_session": memory / sessions,
+        "trigger_us": trigger / count * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session FSM 建立 / 銷毀基準測試")
+    parser.add_argument("--modes", default="legacy,table", help="要測試的實作（legacy, table）")
+    parser.add_argument("--strategy", default="non_streaming", choices=sorted(ROUNDS), help="策略")
+    parser.add_argument("--sessions", type=int, default=5000, help="session 數")
+    args = parser.parse_args()
+
+    from src.core.fsm_transitions import PLUGINS
+
+    plugin = PLUGINS[args.strategy]
+    events = ROUNDS[args.strategy]
+
+    print(f"策略: {args.strategy}，session: {args.sessions}，每輪事件: {len(events)}")
+    print()
+    print(f"{'實作':<8} {'建立+轉換+銷毀/s':>18} {'建立/s':>10} {'銷毀(ms)':>9} "
+          f"{'每 session(bytes)':>18} {'trigger(us)':>12}")
+
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        if mode == "legacy":
+            try:
+                factory = make_legacy_factory(plugin)
+            except ImportError:
+                print(f"{mode:<8} 未安裝 transitions，略過")
+                continue
+        elif mode == "table":
+            factory = make_table_factory(plugin)
+        else:
+            print(f"未知的實作: {mode}")
+            continue
+
+        result = bench(factory, events, args.sessions)
+        print(f"{mode:<8} {result['churn_per_sec']:>18.0f} {result['create_per_sec']:>10.0f} "
+              f"{result['destroy_ms']:>9.1f} {result['bytes_per_session']:>18.0f} "
+              f"{result['trigger_us']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+計時器抖動（churn）基準測試
+
+模擬大量 session 在語音與靜音之間切換：每秒對隨機的 session 執行 rate 次「停止舊計時器 +
+開始新倒數」，比較共用時間輪（TimingWheel）與每個倒數一個 threading.Timer：
+- 達到的操作速率與每次操作（取消 + 排程）的耗時 p50 / p99
+- 到期 callback 的觸發延遲 p50 / p99 / max
+- 行程 CPU 時間與最多同時存在的執行緒數
+
+使用方式：
+    python tests/benchmarks/bench_timer_wheel.py
+    python tests/benchmarks/bench_timer_wheel.py --rate 10000 --sessions 2000 --seconds 10
+    python tests/benchmarks/bench_timer_wheel.py --modes wheel --tick 0.005
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+# 添加專案根目錄到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..'))
+
+
+def percentile(values, q: float) -> float:
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class ThreadingTimers:
+    """基準：每個倒數一個 threading.Timer（改用時間輪之前的做法）"""
+
+    def schedule(self, delay, callback, *args):
+        timer = threading.Timer(delay, callback, args=args)
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def shutdown(self):
+        pass
+
+
+def run_churn(scheduler, rate: int, sessions: int, seconds: float,
+              min_delay: float, max_delay: float, seed: int) -> dict:
+    """以固定速率對隨機 session 重新開始倒數，回傳統計"""
+    rng = random.Random(seed)
+    handles = [None] * sessions
+    lateness = []
+    lateness_lock = threading.Lock()
+    op_times = []
+    peak_threads = threading.active_count()
+
+    def on_timeout(deadline):
+        late = time.monotonic() - deadline
+        with lateness_lock:
+            lateness.append(late)
+
+    batch = max(1, rate // 100)        # 每 10ms 送出一批
+    interval = batch / rate
+    total_ops = int(rate * seconds)
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    ops = 0
+    while ops < total_ops:
+        for _ in range(min(batch, total_ops - ops)):
+            index = rng.randrange(sessions)
+            delay = rng.uniform(min_delay, max_delay)
+            op_start = time.perf_counter()
+            if handles[index] is not None:
+                handles[index].cancel()
+            handles[index] = scheduler.schedule(delay, on_timeout, time.monotonic() + delay)
+            op_times.append(time.perf_counter() - op_start)
+            ops += 1
+        peak_threads = max(peak_threads, threading.active_count())
+        sleep = start + (ops / batch) * interval - time.perf_counter()
+        if sleep > 0:
+            time.sleep(sleep)
+    churn_elapsed = time.perf_counter() - start
+
+    # 等待剩下的計時器到期
+    drain_until = time.perf_counter() + max_delay + 0.5
+    while time.perf_counter() < drain_until:
+        peak_threads = max(peak_threads, threading.active_count())
+        time.sleep(0.05)
+    cpu = time.process_time() - cpu_start
+
+    return {
+        "ops": ops,
+        "ops_per_sec": ops / churn_elapsed,
+        "op_p50_us": percentile(op_times, 50) * 1e6,
+        "op_p99_us": percentile(op_times, 99) * 1e6,
+        "fired": len(lateness),
+        "late_p50_ms": percentile(lateness, 50) * 1000,
+        "late_p99_ms": percentile(lateness, 99) * 1000,
+        "late_max_ms": max(lateness) * 1000 if lateness else float('nan'),
+        "cpu_seconds": cpu,
+        "peak_threads": peak_threads,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="計時器抖動基準測試")
+    parser.add_argument("--modes", default="wheel,threading", help="要測試的實作（wheel, threading）")
+    parser.add_argument("--rate", type=int, default=10000, help="每秒重新開始倒數的次數")
+    parser.add_argument("--sessions", type=int, default=1000, help="session 數（每個 session 最多一個計時器）")
+    parser.add_argument("--seconds", type=float, default=5.0, help="抖動持續秒數")
+    parser.add_argument("--min-delay", type=float, default=0.05, help="倒數時間下限（秒）")
+    parser.add_argument("--max-delay", type=float, default=1.5, help="倒數時間上限（秒）")
+    parser.add_argument("--tick", type=float, default=0.01, help="時間輪 tick（秒）")
+    parser.add_argument("--workers", type=int, default=4, help="時間輪 callback 執行緒數")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from src.service.timer.timing_wheel import TimingWheel
+
+    print(f"速率: {args.rate}/s，session: {args.sessions}，持續: {args.seconds}s，"
+          f"倒數: {args.min_delay}-{args.max_delay}s")
+    print()
+    print(f"{'實作':<10} {'ops/s':>9} {'op p50(us)':>11} {'op p99(us)':>11} {'觸發數':>7} "
+          f"{'延遲 p50(ms)':>13} {'p99(ms)':>8} {'max(ms)':>8} {'CPU(s)':>7} {'執行緒':>6}")
+
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        if mode == "wheel":
+            scheduler = TimingWheel(tick=args.tick, callback_workers=args.workers, name="bench-wheel")
+        elif mode == "threading":
+            scheduler = ThreadingTimers()
+        else:
+            print(f"未知的實作: {mode}")
+            continue
+
+        result = run_churn(scheduler, args.rate, args.sessions, args.seconds,
+                           args.min_delay, args.max_delay, args.seed)
+        scheduler.shutdown()
+        print(f"{mode:<10} {result['ops_per_sec']:>9.0f} {result['op_p50_us']:>11.1f} "
+              f"{result['op_p99_us']:>11.1f} {result['fired']:>7} {result['late_p50_ms']:>13.2f} "
+              f"{result['late_p99_ms']:>8.2f} {result['late_max_ms']:>8.2f} "
+              f"{result['cpu_seconds']:>7.2f} {result['peak_threads']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Silero VAD 批次推論基準測試
+
+比較逐 session 推論（detect，batch=1）與跨 session 批次推論（detect_batch）
+每個 CPU 核心可服務的 session 數。
+
+每個 session 每 frame_ms 產生一個 frame，因此：
+    sessions-per-core = frame 時長 / 每個 frame 消耗的 CPU 時間
+
+使用方式：
+    python tests/benchmarks/bench_vad_batching.py
+    python tests/benchmarks/bench_vad_batching.py --sessions 1,16,64 --rounds 20
+    python tests/benchmarks/bench_vad_batching.py --model models/silero_vad.onnx --frame-ms 32
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# 添加專案根目錄到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..'))
+
+
+def _make_frames(num_sessions: int, frame_samples: int, seed: int = 0) -> list:
+    """產生每個 session 一個的測試 frame（雜訊 + 部分正弦波模擬語音）"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(frame_samples) / 16000.0
+    frames = []
+    for i in range(num_sessions):
+        frame = rng.normal(0, 0.02, frame_samples).astype(np.float32)
+        if i % 2:
+            frame += (0.3 * np.sin(2 * np.pi * (200 + 10 * i) * t)).astype(np.float32)
+        frames.append(frame)
+    return frames
+
+
+def _measure(fn, rounds: int) -> float:
+    """執行 rounds 次並返回消耗的 CPU 時間（秒）"""
+    fn()  # 預熱
+    started = time.process_time()
+    for _ in range(rounds):
+        fn()
+    return time.process_time() - started
+
+
+def run_benchmark(vad, session_counts: list, rounds: int, frame_ms: int) -> list:
+    """執行基準測試
+
+    Returns:
+        每個 session 數量的結果 dict 列表
+    """
+    frame_samples = int(16000 * frame_ms / 1000)
+    frame_seconds = frame_ms / 1000.0
+    results = []
+
+    for num_sessions in session_counts:
+        session_ids = [f"bench_{i}" for i in range(num_sessions)]
+        frames = _make_frames(num_sessions, frame_samples)
+
+        def unbatched():
+            for session_id, frame in zip(session_ids, frames):
+                vad.detect(frame, session_id)
+
+        def batched():
+            vad.detect_batch(frames, session_ids)
+
+        unbatched_cpu = _measure(unbatched, rounds)
+        batched_cpu = _measure(batched, rounds)
+
+        total_frames = num_sessions * rounds
+        unbatched_per_frame = unbatched_cpu / total_frames
+        batched_per_frame = batched_cpu / total_frames
+
+        results.append({
+            'sessions': num_sessions,
+            'unbatched_ms_per_frame': unbatched_per_frame * 1000,
+            'batched_ms_per_frame': batched_per_frame * 1000,
+            'unbatched_sessions_per_core': frame_seconds / unbatched_per_frame,
+            'batched_sessions_per_core': frame_seconds / batched_per_frame,
+            'speedup': unbatched_per_frame / batched_per_frame
+        })
+
+        # 清理 benchmark 使用的隱藏狀態
+        for session_id in session_ids:
+            vad._hidden_states.pop(session_id, None)
+            vad._last_state.pop(session_id, None)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Silero VAD 批次推論基準測試")
+    parser.add_argument("--sessions", default="1,4,16,32,64",
+                        help="要測試的 session 數量（逗號分隔）")
+    parser.add_argument("--rounds", type=int, default=20,
+                        help="每個 session 推論的 frame 數")
+    parser.add_argument("--frame-ms", type=int, default=200,
+                        help="frame 長度（毫秒），預設與監聽模式的 200ms 窗口相同")
+    parser.add_argument("--model", default=None,
+                        help="覆蓋設定中的模型路徑")
+    args = parser.parse_args()
+
+    from src.service.vad.silero_vad import silero_vad
+
+    if args.model:
+        silero_vad._config.model_path = args.model
+        silero_vad._load_model()
+        silero_vad._initialized = True
+
+    session_counts = [int(x) for x in args.sessions.split(",") if x.strip()]
+    results = run_benchmark(silero_vad, session_counts, args.rounds, args.frame_ms)
+
+    print(f"\nSilero VAD 批次推論基準測試 (frame={args.frame_ms}ms, rounds={args.rounds}, "
+          f"cpu_count={os.cpu_count()})")
+    print(f"{'sessions':>8} | {'unbatched ms/frame':>18} | {'batched ms/frame':>16} | "
+          f"{'unbatched sess/core':>19} | {'batched sess/core':>17} | {'speedup':>7}")
+    print("-" * 102)
+    for r in results:
+        print(f"{r['sessions']:>8} | {r['unbatched_ms_per_frame']:>18.3f} | "
+              f"{r['batched_ms_per_frame']:>16.3f} | {r['unbatched_sessions_per_core']:>19.1f} | "
+              f"{r['batched_sessions_per_core']:>17.1f} | {r['speedup']:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
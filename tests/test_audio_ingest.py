@@ -0,0 +1,233 @@
+"""
+音訊資料平面正規化測試
+
+驗證所有接收協定（HTTP SSE、Redis、WebRTC）× 輸入格式的組合，
+每個 chunk 從 API 進入 audio_queue 只經過一次轉換：
+- 已是 16kHz 單聲道 int16 的直接推入，不呼叫轉換器
+- 其他原始 PCM 只呼叫一次 audio_converter.convert_audio
+- 壓縮格式只送進一次 FFmpeg 串流 worker
+
+Store、FFmpeg 與 audio_queue 以 monkeypatch 取代，只測試資料平面本身。
+
+使用方式：
+    python -m pytest tests/test_audio_ingest.py -q
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../'))
+
+from src.core.audio_ingest import audio_ingest
+from src.core.ingest_workers import ingest_workers
+from src.interface.audio import AudioChunk
+from src.service.audio_converter import audio_converter
+
+CHUNK_MS = 100
+CHUNKS = 5
+
+# (format, sample_rate, channels, 預期轉換次數)
+FORMATS = [
+    ("pcm_s16le", 16000, 1, 0),
+    ("int16", 16000, 1, 0),
+    ("pcm_s16le", 48000, 1, 1),
+    ("pcm_s16le", 44100, 2, 1),
+    ("pcm_f32le", 16000, 1, 1),
+    ("pcm_f32le", 48000, 2, 1),
+    ("opus", 48000, 1, 1),
+]
+
+PROTOCOLS = ["http_sse", "redis", "webrtc"]
+
+
+def _encode(audio_format: str, sample_rate: int, channels: int) -> bytes:
+    """產生一個 CHUNK_MS 長度的交錯格式音訊 chunk"""
+    n = sample_rate * CHUNK_MS // 1000
+    t = np.arange(n) / sample_rate
+    mono = 0.3 * np.sin(2 * np.pi * 440 * t)
+    audio = np.repeat(mono, channels).astype(np.float32)
+    if audio_format in ("pcm_f32le", "f32le", "float32"):
+        return audio.tobytes()
+    if audio_format in ("pcm_s16le", "pcm", "s16le", "int16"):
+        return (audio * 32767).astype(np.int16).tobytes()
+    # 壓縮格式的內容不會被解碼（FFmpeg 已被取代）
+    return b"OggS" + bytes(64)
+
+
+@pytest.fixture
+def data_plane(monkeypatch):
+    """以記錄器取代 store、audio_queue 與轉換器的外部相依"""
+    session_configs = {}
+    pushed = {}
+    calls = {"convert_audio": 0, "feed_stream": 0}
+
+    monkeypatch.setattr(audio_ingest, "_get_audio_config", lambda sid: session_configs.get(sid))
+    monkeypatch.setattr(audio_ingest, "_activator", None)
+    monkeypatch.setattr(audio_ingest, "_dispatch_counts", lambda counts: None)
+
+    from src.core import audio_ingest as audio_ingest_module
+
+    def push(session_id, data):
+        samples = np.asarray(data) if isinstance(data, np.ndarray) else np.frombuffer(data, dtype=np.int16)
+        pushed.setdefault(session_id, []).append(samples)
+        return time.time()
+
+    monkeypatch.setattr(audio_ingest_module.audio_queue, "push", push)
+
+    real_convert = audio_converter.convert_audio
+
+    def convert_audio(*args, **kwargs):
+        calls["convert_audio"] += 1
+        return real_convert(*args, **kwargs)
+
+    def feed_stream(*args, **kwargs):
+        calls["feed_stream"] += 1
+        return True
+
+    monkeypatch.setattr(audio_converter, "convert_audio", convert_audio)
+    monkeypatch.setattr(audio_converter, "feed_stream", feed_stream)
+
+    yield session_configs, pushed, calls
+
+    for session_id in session_configs:
+        audio_converter.release_session(session_id)
+        audio_ingest.release_session(session_id)
+        ingest_workers.release_session(session_id)
+
+
+def _send(protocol: str, session_id: str, chunk: bytes, config: dict) -> None:
+    """以各協定伺服器的呼叫方式送入一個 chunk"""
+    if protocol == "http_sse":
+        # HTTPSSEServer._handle_emit_audio_chunk：入列後由 ingest worker 處理
+        ingest_workers.submit(session_id, chunk)
+    elif protocol == "redis":
+        # RedisServer._handle_emit_audio_chunk：依 session 音訊配置處理
+        assert audio_ingest.ingest(session_id, chunk)
+    elif protocol == "webrtc":
+        # RoomManager._process_audio_stream：以音訊幀本身的格式標記
+        assert audio_ingest.ingest(session_id, AudioChunk(
+            data=chunk,
+            sample_rate=config["sample_rate"],
+            channels=config["channels"],
+            format=config["format"],
+        ))
+
+
+def _wait_for_workers(session_id: str, timeout: float = 5.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        stats = ingest_workers.get_stats()["sessions"].get(session_id)
+        if stats and stats["processed"] >= stats["submitted"]:
+            return
+        time.sleep(0.01)
+    raise AssertionError(f"ingest workers did not drain session {session_id}")
+
+
+@pytest.mark.parametrize("protocol", PROTOCOLS)
+@pytest.mark.parametrize("audio_format,sample_rate,channels,expected_conversions", FORMATS)
+def test_each_chunk_is_converted_exactly_once(
+    data_plane, protocol, audio_format, sample_rate, channels, expected_conversions
+):
+    session_configs, pushed, calls = data_plane
+    session_id = f"{protocol}-{audio_format}-{sample_rate}-{channels}"
+    config = {"sample_rate": sample_rate, "channels": channels, "format": audio_format}
+    session_configs[session_id] = config
+
+    chunk = _encode(audio_format, sample_rate, channels)
+    for _ in range(CHUNKS):
+        _send(protocol, session_id, chunk, config)
+    if protocol == "http_sse":
+        _wait_for_workers(session_id)
+
+    assert calls["convert_audio"] + calls["feed_stream"] == expected_conversions * CHUNKS
+
+    if audio_converter.is_raw_pcm(audio_format):
+        # 每個 chunk 推入一次；轉換兩次時長度會再縮短為 16000/sample_rate 倍
+        samples = np.concatenate(pushed[session_id])
+        expected = CHUNKS * 16000 * CHUNK_MS // 1000
+        assert len(pushed[session_id]) == CHUNKS
+        assert abs(len(samples) - expected) <= expected * 0.05
+    else:
+        # 壓縮格式由 FFmpeg worker 解碼後自行推入
+        assert session_id not in pushed
+
+
+def test_canonical_chunk_is_pushed_unchanged(data_plane):
+    session_configs, pushed, calls = data_plane
+    session_configs["canonical"] = {"sample_rate": 16000, "channels": 1, "format": "pcm_s16le"}
+
+    chunk = _encode("pcm_s16le", 16000, 1)
+    assert audio_ingest.ingest("canonical", chunk)
+
+    assert calls == {"convert_audio": 0, "feed_stream": 0}
+    assert pushed["canonical"][0].tobytes() == chunk
+
+
+def test_tagged_chunk_overrides_session_config(data_plane):
+    session_configs, pushed, calls = data_plane
+    # session 宣告 48kHz，但音訊幀已由來源重新取樣為 16kHz
+    session_configs["tagged"] = {"sample_rate": 48000, "channels": 1, "format": "pcm_s16le"}
+
+    chunk = _encode("pcm_s16le", 16000, 1)
+    assert audio_ingest.ingest("tagged", AudioChunk(data=chunk, sample_rate=16000, channels=1))
+
+    assert calls["convert_audio"] == 0
+    assert pushed["tagged"][0].tobytes() == chunk
+
+
+def test_unknown_session_is_rejected(data_plane):
+    _, pushed, calls = data_plane
+
+    assert not audio_ingest.ingest("missing", _encode("pcm_s16le", 16000, 1))
+
+    assert calls == {"convert_audio": 0, "feed_stream": 0}
+    assert "missing" not in pushed
+
+
+def test_pulled_chunk_to_numpy_matches_bytes():
+    # audio_queue.pull() 返回 int16 視圖，to_numpy() 必須與 bytes 的 chunk 一樣歸一化
+    from src.core.audio_queue_manager import audio_queue
+
+    session_id = "pull-to-numpy"
+    chunk = _encode("pcm_s16le", 16000, 1)
+    audio_queue.push(session_id, AudioChunk(data=chunk, sample_rate=16000, channels=1))
+    try:
+        pulled = audio_queue.pull(session_id, count=1)[0]
+    finally:
+        audio_queue.remove(session_id)
+
+    expected = AudioChunk(data=chunk).to_numpy()
+    assert pulled.to_numpy().dtype == np.float32
+    np.testing.assert_array_equal(pulled.to_numpy(), expected)
+    assert pulled.to_numpy(preserve_dtype=True).tobytes() == chunk
+
+
+def test_pull_available_after_remove_does_not_recreate_queue():
+    from src.core.audio_queue_manager import audio_queue
+
+    session_id = "late-reader"
+    audio_queue.push(session_id, AudioChunk(data=_encode("pcm_s16le", 16000, 1), sample_rate=16000, channels=1))
+    audio_queue.remove(session_id)
+
+    assert audio_queue.pull_available(session_id, "late", timeout=0.01) == []
+    assert session_id not in audio_queue._rings
+
+
+def test_pulled_audio_is_read_only():
+    # 環形緩衝區的零複製視圖由所有讀者共用，原地修改會破壞其他讀者的資料
+    from src.core.audio_queue_manager import audio_queue
+
+    session_id = "read-only-view"
+    audio_queue.push(session_id, AudioChunk(data=_encode("pcm_s16le", 16000, 1), sample_rate=16000, channels=1))
+    try:
+        audio = audio_queue.pull(session_id, count=1)[0].data
+    finally:
+        audio_queue.remove(session_id)
+
+    assert not audio.flags.writeable
+    with pytest.raises(ValueError):
+        audio[0] = 0
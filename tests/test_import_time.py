@@ -0,0 +1,111 @@
+"""
+匯入時間回歸測試
+
+在全新的行程中匯入 src.store.main_store（每個 worker 啟動時的匯入路徑）：
+- 匯入時間不可超過預算（預設 1500ms，可用 ASRHUB_IMPORT_BUDGET_MS 調整）
+- 預設配置下不可匯入 torch、scipy、onnxruntime、gradio 等重量級套件，
+  它們只在對應功能第一次使用時才載入
+
+未安裝 pystorex 等執行依賴時略過 main_store 的測試。
+
+使用方式：
+    python -m pytest tests/test_import_time.py -q
+    ASRHUB_IMPORT_BUDGET_MS=800 python -m pytest tests/test_import_time.py -q
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../'))
+
+from src.utils.import_audit import HEAVY_MODULES, audit, format_report, parse_importtime
+from src.utils.lazy_import import is_available, lazy_import
+
+IMPORT_BUDGET_MS = float(os.environ.get("ASRHUB_IMPORT_BUDGET_MS", 1500))
+
+
+@pytest.fixture(scope="module")
+def main_store_report():
+    report = audit("src.store.main_store")
+    if report.error and report.error.startswith("ModuleNotFoundError"):
+        pytest.skip(f"缺少執行依賴: {report.error}")
+    assert report.error is None, "\n".join(format_report(report))
+    return report
+
+
+def test_main_store_import_budget(main_store_report):
+    assert main_store_report.total_ms <= IMPORT_BUDGET_MS, "\n".join(format_report(main_store_report))
+
+
+def test_main_store_skips_heavy_modules(main_store_report):
+    assert main_store_report.heavy_modules() == [], "\n".join(format_report(main_store_report))
+
+
+def test_parse_importtime():
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |     src.utils.singleton",
+        "import time:        80 |        200 |   src.utils",
+        "import time:       300 |        500 | src",
+        "import time:        50 |         50 | json",
+        "Traceback (most recent call last):",
+    ])
+    records = parse_importtime(output)
+    assert [(r.name, r.depth) for r in records] == [
+        ("src.utils.singleton", 2), ("src.utils", 1), ("src", 0), ("json", 0)
+    ]
+    assert records[0].self_us == 120 and records[2].cumulative_us == 500
+
+
+def test_lazy_import_defers_until_attribute_access(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / "asrhub_lazy_probe.py").write_text("VALUE = 42\n", encoding="utf-8")
+    monkeypatch.delitem(sys.modules, "asrhub_lazy_probe", raising=False)
+
+    module = lazy_import("asrhub_lazy_probe")
+    assert is_available("asrhub_lazy_probe")
+    assert "asrhub_lazy_probe" not in sys.modules
+    assert not module.is_loaded
+
+    assert module.VALUE == 42
+    assert "asrhub_lazy_probe" in sys.modules
+    assert module.is_loaded
+
+
+def test_lazy_import_missing_module():
+    assert not is_available("asrhub_missing_module")
+    module = lazy_import("asrhub_missing_module")
+    with pytest.raises(ImportError):
+        module.anything
+
+
+def test_lazy_exports(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    package = tmp_path / "asrhub_lazy_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text(
+        "from src.utils.lazy_import import lazy_exports\n"
+        "__getattr__, __dir__ = lazy_exports(__name__, {'VALUE': '.heavy'})\n",
+        encoding="utf-8",
+    )
+    (package / "heavy.py").write_text("VALUE = 42\n", encoding="utf-8")
+    for name in ("asrhub_lazy_pkg", "asrhub_lazy_pkg.heavy"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    import asrhub_lazy_pkg
+    assert "asrhub_lazy_pkg.heavy" not in sys.modules
+    assert "VALUE" in dir(asrhub_lazy_pkg)
+
+    assert asrhub_lazy_pkg.VALUE == 42
+    assert "asrhub_lazy_pkg.heavy" in sys.modules
+    with pytest.raises(AttributeError):
+        asrhub_lazy_pkg.MISSING
+
+
+def test_heavy_modules_not_imported_by_lazy_layer():
+    # 匯入延遲匯入層與稽核工具本身不應載入任何重量級套件
+    report = audit("src.utils.lazy_import")
+    assert report.error is None
+    assert report.heavy_modules(HEAVY_MODULES) == []
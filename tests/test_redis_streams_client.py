@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Redis Streams 客戶端測試程式
+測試 Redis Streams API（api.redis.streams.enabled: true）的完整流程：
+1. XADD create_session 到共用的 requests 串流，從 request 回應串流取得 session_id
+2. XADD start_listening 到 session 的輸入串流
+3. 以二進位欄位 XADD WAV 音訊（依真實時間節奏，MAXLEN 限制長度）
+4. 從 session 的輸出串流讀取轉譯結果
+
+可同時開多個 session，觀察它們被分配到不同的 ASRHub 節點。
+需要先啟動 redis-server 與一或多個 ASRHub 節點（consumer_name 不同）。
+
+使用方式：
+    python tests/test_redis_streams_client.py
+    python tests/test_redis_streams_client.py --file test_audio/large.wav --sessions 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import wave
+
+# 添加 src 到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import redis
+
+from src.api.redis.channels import RedisStreamKeys, RedisStreamTypes
+from src.utils.id_provider import new_id
+from src.utils.logger import logger
+from src.config.manager import ConfigManager
+
+# 輸入串流的 MAXLEN：ASRHub 處理落後超過這個長度時最舊的音訊會被修剪
+INPUT_MAXLEN = 2000
+
+
+def run_session(client: redis.Redis, keys: RedisStreamKeys, path: str, chunk_ms: int, wait: float):
+    """用一個 session 送出一個 WAV 檔案並等待轉譯結果"""
+    request_id = new_id()
+
+    # 1. 建立 session（由其中一個節點處理）
+    client.xadd(keys.requests, {
+        keys.TYPE: RedisStreamTypes.CREATE_SESSION,
+        keys.DATA: json.dumps({"request_id": request_id, "strategy": "non_streaming"}),
+    })
+    reply = client.xread({keys.request_out(request_id): "0"}, count=1, block=10000)
+    if not reply:
+        logger.error(f"❌ 建立 session 逾時 (request_id: {request_id})")
+        return
+    session_id = json.loads(reply[0][1][0][1][keys.DATA.encode()])["session_id"]
+    logger.info(f"✅ Session 建立: {session_id}")
+
+    session_in = keys.session_in(session_id)
+    session_out = keys.session_out(session_id)
+
+    with wave.open(path, 'rb') as wf:
+        sample_rate, channels = wf.getframerate(), wf.getnchannels()
+        frames = wf.readframes(wf.getnframes())
+
+    # 2. 設定音訊參數（與音訊在同一個串流，順序保證）
+    client.xadd(session_in, {
+        keys.TYPE: RedisStreamTypes.START_LISTENING,
+        keys.DATA: json.dumps({"sample_rate": sample_rate, "channels": channels, "format": "int16"}),
+    })
+
+    # 3. 二進位音訊（不經 base64）
+    chunk_bytes = sample_rate * channels * 2 * chunk_ms // 1000
+    start = time.time()
+    for n, offset in enumerate(range(0, len(frames), chunk_bytes)):
+        client.xadd(session_in, {
+            keys.TYPE: RedisStreamTypes.EMIT_AUDIO_CHUNK,
+            keys.DATA: frames[offset:offset + chunk_bytes],
+        }, maxlen=INPUT_MAXLEN, approximate=True)
+        delay = start + (n + 1) * chunk_ms / 1000 - time.time()
+        if delay > 0:
+            time.sleep(delay)
+    logger.info(f"📤 [{session_id}] 音訊送出完成: {len(frames)} bytes")
+
+    # 4. 讀取輸出串流
+    last_id = "0"
+    deadline = time.time() + wait
+    while time.time() < deadline:
+        reply = client.xread({session_out: last_id}, block=1000)
+        for _, messages in reply or []:
+            for last_id, fields in messages:
+                message_type = fields[keys.TYPE.encode()].decode()
+                data = json.loads(fields[keys.DATA.encode()])
+                if message_type == RedisStreamTypes.TRANSCRIBE_DONE:
+                    logger.info(f"📝 [{session_id}] 轉譯結果: {data.get('text')}")
+                    deadline = 0
+                elif message_type == RedisStreamTypes.ERROR:
+                    logger.error(f"❌ [{session_id}] 錯誤: [{data.get('error_code')}] {data.get('error_message')}")
+                else:
+                    logger.debug(f"📨 [{session_id}] {message_type}")
+
+    client.xadd(session_in, {keys.TYPE: RedisStreamTypes.DELETE_SESSION, keys.DATA: b""})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Redis Streams 客戶端測試")
+    parser.add_argument("--file", default="test_audio/small.wav", help="16-bit PCM WAV 檔案")
+    parser.add_argument("--sessions", type=int, default=1, help="同時進行的 session 數")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="每個音訊 chunk 的長度（毫秒）")
+    parser.add_argument("--wait", type=float, default=30.0, help="送完後等待轉譯結果的秒數")
+    args = parser.parse_args()
+
+    config = ConfigManager()
+    redis_config = config.api.redis
+    client = redis.Redis(
+        host=redis_config.host,
+        port=redis_config.port,
+        db=redis_config.db,
+        password=redis_config.password if redis_config.password else None,
+    )
+    keys = RedisStreamKeys(getattr(redis_config, 'channel_prefix', None) or "asr_hub:")
+
+    threads = [
+        threading.Thread(target=run_session, args=(client, keys, args.file, args.chunk_ms, args.wait))
+        for _ in range(args.sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
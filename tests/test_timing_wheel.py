@@ -0,0 +1,63 @@
+"""
+時間輪回歸測試
+
+使用方式：
+    python -m pytest tests/test_timing_wheel.py -q
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../'))
+
+from src.service.timer.timing_wheel import TimingWheel
+
+IDLE_SECONDS = 3 * 3600
+
+
+def test_schedule_after_idle_does_not_replay_missed_ticks():
+    wheel = TimingWheel(tick=0.01, name="test-wheel")
+    try:
+        warm_up = threading.Event()
+        wheel.schedule(0.0, warm_up.set)
+        assert warm_up.wait(1.0)
+
+        # 模擬閒置 3 小時：排程執行緒在沒有計時器時不會推進 _current_tick
+        with wheel._cond:
+            wheel._origin -= IDLE_SECONDS
+
+        fired = threading.Event()
+        started = time.monotonic()
+        wheel.schedule(0.05, fired.set)
+        assert time.monotonic() - started < 0.1
+
+        assert fired.wait(1.0)
+        assert time.monotonic() - started < 0.3
+    finally:
+        wheel.shutdown()
+
+
+def test_resume_continues_from_remaining_time():
+    from src.service.timer.timer_service import timer_service
+
+    session_id = "test-resume-session"
+    fired = threading.Event()
+    try:
+        assert timer_service.start_countdown(session_id, 1.0, lambda _sid: fired.set())
+        time.sleep(0.6)
+        assert timer_service.pause_timer(session_id)
+        remaining = timer_service.get_remaining_time(session_id)
+        assert 0.2 < remaining < 0.6
+
+        time.sleep(0.5)
+        assert not fired.is_set()
+
+        resumed = time.monotonic()
+        assert timer_service.resume_timer(session_id)
+        assert fired.wait(2.0)
+        # 從剩餘秒數繼續倒數，而不是重新倒數完整的 1 秒
+        assert time.monotonic() - resumed < remaining + 0.2
+    finally:
+        timer_service.stop_timer(session_id)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+WebSocket 客戶端測試程式
+測試 WebSocket API 的麥克風音訊串流（一條連線：協商一次 → 二進位音訊 → 事件推回）
+"""
+
+import os
+import sys
+import json
+import signal
+import asyncio
+import threading
+from typing import Optional, Dict, Any
+
+# 添加 src 到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import pyaudio
+import websockets  # pip install websockets
+
+from src.utils.id_provider import new_id
+from src.utils.logger import logger
+from src.config.manager import ConfigManager
+from src.api.websocket.endpoints import WSEndpoints, WSMessageTypes
+
+
+class WebSocketClient:
+    """WebSocket 客戶端實現"""
+
+    def __init__(self):
+        """初始化 WebSocket 客戶端"""
+        # 載入配置
+        self.config = ConfigManager()
+
+        # API 設定
+        self.host = self.config.api.websocket.host
+        self.port = self.config.api.websocket.port
+        self.url = f"ws://{self.host}:{self.port}{WSEndpoints.AUDIO_STREAM}"
+
+        # 會話資訊
+        self.request_id: str = new_id()
+        self.session_id: Optional[str] = None
+        self.is_running = False
+
+        # 音訊設定（從配置載入）
+        self.FORMAT = pyaudio.paInt16  # 對應 pcm_s16le
+        self.CHANNELS = self.config.audio.default_channels
+        self.RATE = self.config.audio.default_sample_rate
+        self.CHUNK = self.config.audio.buffer_size
+
+        # PyAudio
+        self.audio: Optional[pyaudio.PyAudio] = None
+        self.stream = None
+
+    async def run(self):
+        """連線、協商並開始串流"""
+        self.audio = pyaudio.PyAudio()
+        self.is_running = True
+
+        logger.info(f"🔄 正在連接 {self.url} ...")
+        async with websockets.connect(self.url) as websocket:
+            # 協商 session 與音訊格式（只做一次）
+            await websocket.send(json.dumps({
+                "type": WSMessageTypes.START,
+                "request_id": self.request_id,
+                "strategy": "non_streaming",
+                "sample_rate": self.RATE,
+                "channels": self.CHANNELS,
+                "format": "pcm_s16le",
+            }))
+
+            ready = json.loads(await websocket.recv())
+            if ready.get("type") != WSMessageTypes.SESSION_READY:
+                logger.error(f"❌ 協商失敗: {ready}")
+                return
+            self.session_id = ready["session_id"]
+            logger.info(f"✅ Session 就緒: {self.session_id}")
+
+            receiver = asyncio.create_task(self._receive_events(websocket))
+            try:
+                await self._stream_microphone(websocket)
+            finally:
+                receiver.cancel()
+                if self.is_running:
+                    await websocket.send(json.dumps({"type": WSMessageTypes.STOP}))
+
+    async def _stream_microphone(self, websocket):
+        """讀取麥克風並以二進位訊息送出（每個 chunk 不帶任何 metadata）"""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        self.stream = self.audio.open(
+            format=self.FORMAT,
+            channels=self.CHANNELS,
+            rate=self.RATE,
+            input=True,
+            frames_per_buffer=self.CHUNK
+        )
+        logger.info("🎤 麥克風已開啟，開始錄音...")
+        logger.info("按 Ctrl+C 停止")
+
+        def capture():
+            """麥克風讀取執行緒（pyaudio 為阻塞式 API）"""
+            while self.is_running:
+                try:
+                    audio_data = self.stream.read(self.CHUNK, exception_on_overflow=False)
+                    loop.call_soon_threadsafe(queue.put_nowait, audio_data)
+                except Exception as e:
+                    if self.is_running:
+                        logger.error(f"音訊讀取錯誤: {e}")
+                    break
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+        threading.Thread(target=capture, daemon=True, name="MicCapture").start()
+
+        while True:
+            audio_data = await queue.get()
+            if audio_data is None:
+                break
+            await websocket.send(audio_data)
+
+    async def _receive_events(self, websocket):
+        """接收伺服器推回的事件"""
+        try:
+            async for message in websocket:
+                if isinstance(message, bytes):
+                    continue
+                self._handle_event(json.loads(message))
+        except websockets.ConnectionClosed as e:
+            logger.info(f"🔌 連線已關閉: code={e.code}")
+            self.is_running = False
+
+    def _handle_event(self, data: Dict[str, Any]):
+        """處理事件"""
+        event_type = data.get("type")
+
+        if event_type == WSMessageTypes.TRANSCRIBE_DONE:
+            logger.info("=" * 60)
+            logger.info(f"📝 轉譯結果: {data.get('text', '')}")
+            if data.get("language"):
+                logger.info(f"   語言: {data['language']}")
+            if data.get("duration"):
+                logger.info(f"   時長: {data['duration']:.2f} 秒")
+            logger.info("=" * 60)
+
+        elif event_type == WSMessageTypes.TRANSCRIBE_PARTIAL:
+            logger.info(f"✏️  {data.get('committed', '')}[{data.get('tentative', '')}]")
+
+        elif event_type == WSMessageTypes.TRANSCRIBE_FINAL:
+            logger.info(f"📝 串流轉譯最終結果: {data.get('text', '')}")
+
+        elif event_type == WSMessageTypes.PLAY_ASR_FEEDBACK:
+            icon = "🔊" if data.get("command") == "play" else "🔇"
+            logger.info(f"{icon} ASR 回饋音: {data.get('command')}")
+
+        elif event_type == WSMessageTypes.BACKPRESSURE:
+            logger.warning(f"⏳ 伺服器處理落後: 佇列 {data.get('queue_depth')}，暫停 {data.get('retry_after'):.2f} 秒")
+
+        elif event_type == WSMessageTypes.ERROR:
+            logger.error(f"❌ 錯誤: [{data.get('error_code')}] {data.get('error_message')}")
+
+        else:
+            logger.debug(f"📨 事件: {event_type}")
+
+    def stop(self):
+        """停止客戶端"""
+        logger.info("\n🛑 正在停止客戶端...")
+        self.is_running = False
+
+        if self.stream:
+            try:
+                self.stream.stop_stream()
+                self.stream.close()
+            except:
+                pass
+
+        if self.audio:
+            try:
+                self.audio.terminate()
+            except:
+                pass
+
+        logger.info("✅ 客戶端已停止")
+
+
+def main():
+    """主程式"""
+    client = WebSocketClient()
+
+    # 設定信號處理
+    def signal_handler(sig, frame):
+        logger.info("\n收到中斷信號")
+        client.stop()
+
+    signal.signal(signal.SIGINT, signal_handler)
+
+    try:
+        asyncio.run(client.run())
+    except Exception as e:
+        logger.error(f"執行錯誤: {e}")
+    finally:
+        client.stop()
+
+
+if __name__ == "__main__":
+    logger.info("")
+    logger.info("=" * 60)
+    logger.info("🚀 WebSocket 客戶端測試")
+    logger.info("🎤 音訊來源: 麥克風")
+    logger.info("⚡ 傳輸方式: 持久連線 + 二進位音訊訊息（無 metadata）")
+    logger.info("=" * 60)
+    logger.info("")
+
+    main()